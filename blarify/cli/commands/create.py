@@ -282,6 +282,32 @@ def add_arguments(parser: ArgumentParser) -> None:
         help="File/folder names to skip during analysis",
     )
     parser.add_argument("--only-hierarchy", action="store_true", help="Build only the hierarchy without LSP analysis")
+    parser.add_argument(
+        "--hierarchy-workers",
+        type=int,
+        default=1,
+        help="Number of processes used to parse files while building the hierarchy",
+    )
+    parser.add_argument(
+        "--parse-cache-dir",
+        default=None,
+        help="Directory of an on-disk cache of parsed files, reused by later builds of the same repository",
+    )
+    parser.add_argument(
+        "--reference-cache-dir",
+        default=None,
+        help="Directory of an on-disk cache of resolved references, reused by later builds of the same repository",
+    )
+    parser.add_argument(
+        "--llm-cache-dir",
+        default=None,
+        help="Directory of an on-disk cache of generated documentation, unchanged nodes skip the LLM on later runs",
+    )
+    parser.add_argument(
+        "--embedding-cache-dir",
+        default=None,
+        help="Directory of an on-disk cache of documentation embeddings, unchanged documentation isn't embedded again",
+    )
 
     # Documentation options
     parser.add_argument(
@@ -446,6 +472,11 @@ def execute(args: Namespace) -> int:
                     graph_environment=graph_environment,
                     db_manager=db_manager,
                     generate_embeddings=True,
+                    hierarchy_workers=getattr(args, "hierarchy_workers", 1),
+                    parse_cache_dir=getattr(args, "parse_cache_dir", None),
+                    reference_cache_dir=getattr(args, "reference_cache_dir", None),
+                    llm_cache_dir=getattr(args, "llm_cache_dir", None),
+                    embedding_cache_dir=getattr(args, "embedding_cache_dir", None),
                 )
 
                 # Update progress for different phases
@@ -466,8 +497,8 @@ def execute(args: Namespace) -> int:
                     create_documentation=args.docs,
                 )
 
-                nodes = graph.get_nodes_as_objects()
-                relationships = graph.get_relationships_as_objects()
+                node_count = graph.get_node_count()
+                relationship_count = graph.get_relationship_count()
 
                 progress.update(task, description="Complete!", completed=100)
 
@@ -494,8 +525,8 @@ def execute(args: Namespace) -> int:
     # Print summary
     elapsed_time = time.time() - start_time
     console.print(f"\n[green]✓[/green] Graph built successfully in {elapsed_time:.1f} seconds!")
-    console.print(f"  • Nodes: [cyan]{len(nodes)}[/cyan]")
-    console.print(f"  • Relationships: [cyan]{len(relationships)}[/cyan]")
+    console.print(f"  • Nodes: [cyan]{node_count}[/cyan]")
+    console.print(f"  • Relationships: [cyan]{relationship_count}[/cyan]")
 
     if args.docs:
         console.print("  • Documentation: [green]Generated[/green]")
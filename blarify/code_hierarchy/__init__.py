@@ -1 +1,2 @@
 from .tree_sitter_helper import TreeSitterHelper
+from .tree_sitter_helper_registry import TreeSitterHelperRegistry
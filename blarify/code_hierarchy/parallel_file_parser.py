@@ -0,0 +1,110 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Type, TYPE_CHECKING
+
+from blarify.code_hierarchy.parsed_file import ParsedFile
+from blarify.code_hierarchy.tree_sitter_helper_registry import TreeSitterHelperRegistry
+from blarify.code_hierarchy.languages import FallbackDefinitions, LanguageDefinitions
+from blarify.graph.node import FolderNode
+
+if TYPE_CHECKING:
+    from blarify.graph.graph_environment import GraphEnvironment
+    from blarify.project_file_explorer import File
+
+FolderChain = List[Tuple[str, str, int]]
+
+_worker_graph_environment: Optional["GraphEnvironment"] = None
+_worker_languages: Dict[str, Type[LanguageDefinitions]] = {}
+_worker_tree_sitter_helpers: Optional[TreeSitterHelperRegistry] = None
+
+
+@dataclass
+class FileParseTask:
+    file: "File"
+    folder_chain: FolderChain
+
+
+def folder_chain_from_folder_node(folder_node: FolderNode) -> FolderChain:
+    """Returns (path, name, level) for every folder from the root down to folder_node."""
+    chain: FolderChain = []
+    node: Optional[FolderNode] = folder_node
+    while node is not None:
+        chain.append((node.path, node.name, node.level))
+        node = node.parent
+    chain.reverse()
+    return chain
+
+
+def _initialize_worker(
+    graph_environment: Optional["GraphEnvironment"], languages: Dict[str, Type[LanguageDefinitions]]
+) -> None:
+    global _worker_graph_environment, _worker_languages, _worker_tree_sitter_helpers
+    _worker_graph_environment = graph_environment
+    _worker_languages = languages
+    _worker_tree_sitter_helpers = TreeSitterHelperRegistry(graph_environment=graph_environment)
+
+
+def _build_folder_chain(folder_chain: FolderChain) -> Optional[FolderNode]:
+    parent: Optional[FolderNode] = None
+    for path, name, level in folder_chain:
+        parent = FolderNode(
+            path=path, name=name, level=level, parent=parent, graph_environment=_worker_graph_environment
+        )
+    return parent
+
+
+def _parse_file(task: FileParseTask) -> ParsedFile:
+    # The folder chain only has to reproduce the parent identifiers so node ids match a serial build
+    parent_folder = _build_folder_chain(task.folder_chain)
+    language = _worker_languages.get(task.file.extension, FallbackDefinitions)
+    tree_sitter_helper = _worker_tree_sitter_helpers.get(language)
+
+    nodes = tree_sitter_helper.create_nodes_and_relationships_in_file(task.file, parent_folder=parent_folder)
+    file_node = nodes[0]
+    file_node.skeletonize()
+
+    return ParsedFile.from_nodes(nodes)
+
+
+class ParallelFileParser:
+    """
+    Parses files and skeletonizes their nodes on a process pool.
+
+    Results are yielded in the same order the tasks were submitted so the caller can merge
+    them into the graph deterministically.
+
+    Tree-sitter trees can't leave the worker processes, so only the files references are
+    found in are parsed again in the main process, when relationships are created from them.
+    """
+
+    max_workers: int
+    chunksize: int
+
+    def __init__(
+        self,
+        max_workers: int,
+        languages: Dict[str, Type[LanguageDefinitions]],
+        graph_environment: Optional["GraphEnvironment"] = None,
+        chunksize: int = 16,
+    ):
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(graph_environment, languages),
+        )
+
+    def parse_files(self, tasks: List[FileParseTask]) -> Iterator[ParsedFile]:
+        return self._executor.map(_parse_file, tasks, chunksize=self.chunksize)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ParallelFileParser":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.shutdown()
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+import os
+import zlib
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+
+from blarify.code_hierarchy.parsed_file import ParsedFile
+from blarify.utils.sqlite_lru_cache import SqliteLruCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when ParsedFile or the way nodes are extracted changes, so stale entries stop matching
+PARSE_CACHE_FORMAT_VERSION = "1"
+
+
+def _get_blarify_version() -> str:
+    try:
+        return version("blarify")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ParseCache:
+    """
+    Opt-in on-disk cache of ParsedFile snapshots.
+
+    Entries are keyed by the file content hash, the language, the blarify version and the id
+    the file node gets in the graph, since skeleton texts embed the hashed ids of the nodes.
+    """
+
+    DEFAULT_MAX_SIZE_MB = 512
+
+    def __init__(self, cache_dir: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self._store = SqliteLruCache(
+            path=os.path.join(cache_dir, "parse_cache.sqlite"),
+            max_size_bytes=int(max_size_mb * 1024 * 1024),
+        )
+        self._blarify_version = _get_blarify_version()
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    def get_key(self, content: bytes, language: str, file_node_id: str) -> str:
+        key = hashlib.sha256(content)
+        for part in (language, self._blarify_version, PARSE_CACHE_FORMAT_VERSION, file_node_id):
+            key.update(b"\0" + part.encode("utf-8"))
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[ParsedFile]:
+        value = self._store.get(key)
+        if value is None:
+            return None
+        return ParsedFile.from_dict(json.loads(zlib.decompress(value)))
+
+    def set(self, key: str, parsed_file: ParsedFile) -> None:
+        value = zlib.compress(json.dumps(parsed_file.to_dict()).encode("utf-8"))
+        self._store.set(key, value)
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"Parse cache: {self.hits} hits, {self.misses} misses ({100 * self._store.hit_rate:.1f}% hit rate), "
+            f"{self._store.evictions} evictions, {self._store.total_size / (1024 * 1024):.1f} MB stored"
+        )
+
+    def close(self) -> None:
+        self._store.close()
@@ -0,0 +1,121 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+from blarify.graph.node import NodeLabels
+from blarify.stats.complexity import NestingStats
+
+if TYPE_CHECKING:
+    from blarify.code_references.types import Reference
+    from blarify.graph.node import DefinitionNode, Node
+
+RangeTuple = Tuple[int, int, int, int]
+StatsTuple = Tuple[int, int, float, float]
+
+FILE_NODE_INDEX = -1
+
+
+def pack_reference(reference: "Reference") -> RangeTuple:
+    node_range = reference.range
+    return node_range.start.line, node_range.start.character, node_range.end.line, node_range.end.character
+
+
+def pack_stats(stats: NestingStats) -> StatsTuple:
+    return stats.max_indentation, stats.min_indentation, stats.average_indentation, stats.sd
+
+
+@dataclass
+class ParsedDefinition:
+    label: NodeLabels
+    name: str
+    level: int
+    parent_index: int
+    definition_range: RangeTuple
+    node_range: RangeTuple
+    code_text: str
+    stats: StatsTuple = (0, 0, 0, 0)
+    parameter_count: int = 0
+
+
+@dataclass
+class ParsedFile:
+    """
+    Picklable snapshot of the nodes TreeSitterHelper creates for a single file.
+
+    Definitions are stored in creation (preorder) order, parent_index points at the
+    definition that defines them or FILE_NODE_INDEX for the file node itself. Stats are
+    kept so nodes rebuilt from a snapshot can be exported before tree-sitter nodes are bound.
+    """
+
+    path: str
+    name: str
+    level: int
+    is_raw: bool
+    code_text: str
+    node_range: RangeTuple
+    definitions: List[ParsedDefinition] = field(default_factory=list)
+    stats: StatsTuple = (0, 0, 0, 0)
+
+    @staticmethod
+    def from_nodes(nodes: List["Node"]) -> "ParsedFile":
+        file_node = next(node for node in nodes if node.label == NodeLabels.FILE)
+        definition_nodes = [node for node in nodes if node is not file_node]
+
+        indexes: Dict[int, int] = {id(file_node): FILE_NODE_INDEX}
+        definitions: List[ParsedDefinition] = []
+        for index, node in enumerate(definition_nodes):
+            indexes[id(node)] = index
+            definitions.append(ParsedFile._definition_from_node(node, indexes[id(node.parent)]))
+
+        return ParsedFile(
+            path=file_node.path,
+            name=file_node.name,
+            level=file_node.level,
+            is_raw="RAW" in file_node.extra_labels,
+            code_text=file_node.code_text,
+            node_range=pack_reference(file_node.node_range),
+            definitions=definitions,
+            stats=pack_stats(file_node.stats),
+        )
+
+    @staticmethod
+    def _definition_from_node(node: "DefinitionNode", parent_index: int) -> ParsedDefinition:
+        return ParsedDefinition(
+            label=node.label,
+            name=node.name,
+            level=node.level,
+            parent_index=parent_index,
+            definition_range=pack_reference(node.definition_range),
+            node_range=pack_reference(node.node_range),
+            code_text=node.code_text,
+            stats=pack_stats(node.stats),
+            parameter_count=getattr(node, "parameter_count", 0),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        as_dict = asdict(self)
+        for definition in as_dict["definitions"]:
+            definition["label"] = definition["label"].value
+        return as_dict
+
+    @staticmethod
+    def from_dict(as_dict: Dict[str, Any]) -> "ParsedFile":
+        definitions = [
+            ParsedDefinition(
+                **{
+                    **definition,
+                    "label": NodeLabels(definition["label"]),
+                    "definition_range": tuple(definition["definition_range"]),
+                    "node_range": tuple(definition["node_range"]),
+                    "stats": tuple(definition["stats"]),
+                }
+            )
+            for definition in as_dict["definitions"]
+        ]
+        return ParsedFile(
+            **{
+                **as_dict,
+                "node_range": tuple(as_dict["node_range"]),
+                "stats": tuple(as_dict["stats"]),
+                "definitions": definitions,
+            }
+        )
@@ -1,12 +1,15 @@
-from tree_sitter import Tree, Parser
+from tree_sitter import Tree, Parser, Query, QueryError
 
 from blarify.code_hierarchy.languages.FoundRelationshipScope import FoundRelationshipScope
+from blarify.code_hierarchy.parsed_file import ParsedFile, RangeTuple, pack_reference
 from blarify.graph.node import NodeFactory
+from blarify.graph.node.utils.source_span import SourceSpan
 from blarify.code_references.types import Reference, Range, Point
 from .languages import LanguageDefinitions, BodyNodeNotFound, FallbackDefinitions
 from blarify.graph.node import NodeLabels
+from blarify.stats.complexity import NestingStats
 from blarify.project_file_explorer import File
-from typing import List, TYPE_CHECKING, Tuple, Optional, Type
+from typing import Dict, List, TYPE_CHECKING, Tuple, Optional, Type
 from blarify.graph.relationship import RelationshipType
 
 if TYPE_CHECKING:
@@ -15,12 +18,17 @@ if TYPE_CHECKING:
     from blarify.code_references.types import Reference
     from blarify.graph.graph_environment import GraphEnvironment
 
+# Tokens between an object and the member accessed on it, across the supported languages
+MEMBER_ACCESS_TOKENS = {".", "?.", "->", "::"}
+
+IDENTIFIER_QUERY = "(identifier) @identifier"
+
 
 class TreeSitterHelper:
     language_definitions: Type[LanguageDefinitions]
     parser: Parser
     current_path: str
-    base_node_source_code: str
+    base_node_source: bytes
     created_nodes: List["Node"]
     graph_environment: Optional["GraphEnvironment"]
 
@@ -30,22 +38,75 @@ class TreeSitterHelper:
         self.language_definitions = language_definitions
         self.parsers = self.language_definitions.get_parsers_for_extensions()
         self.graph_environment = graph_environment
+        self._line_start_bytes: Optional[List[int]] = None
+        # None for the grammars without an identifier node type, their trees are walked instead
+        self._identifier_queries: Dict[str, Optional[Query]] = {}
 
     def get_all_identifiers(self, node: "FileNode") -> List["Reference"]:
         self.current_path = node.path
-        return self._traverse_and_find_identifiers(node._tree_sitter_node)
-
-    def _traverse_and_find_identifiers(self, node: "TreeSitterNode") -> List["Reference"]:
+        return [
+            self._get_reference_from_node(identifier)
+            for identifier in self._find_identifiers(node._tree_sitter_node, node.extension)
+        ]
+
+    def get_all_identifiers_with_names(self, node: "FileNode") -> List[Tuple[str, "Reference"]]:
+        """
+        Returns every identifier of the file with the name its definition is looked up by.
+
+        Member accesses are named by the whole access expression, since a.save and b.save can be
+        defined in different files.
+        """
+        self.current_path = node.path
+        return [
+            (self._get_lookup_name(identifier), self._get_reference_from_node(identifier))
+            for identifier in self._find_identifiers(node._tree_sitter_node, node.extension)
+        ]
+
+    def _get_lookup_name(self, node: "TreeSitterNode") -> str:
+        previous_sibling = node.prev_sibling
+        if node.parent is not None and previous_sibling is not None and previous_sibling.type in MEMBER_ACCESS_TOKENS:
+            node = node.parent
+        return node.text.decode("utf-8", errors="replace") if node.text is not None else ""
+
+    def _find_identifiers(self, node: "TreeSitterNode", extension: str) -> List["TreeSitterNode"]:
+        """Returns the identifier nodes under node in source order, matched by a query when the grammar allows."""
+        query = self._get_identifier_query(extension)
+        if query is None:
+            return self._traverse_and_find_identifiers(node)
+        # Captures don't come out in source order
+        return sorted(query.captures(node).get("identifier", []), key=lambda identifier: identifier.start_byte)
+
+    def _get_identifier_query(self, extension: str) -> Optional[Query]:
+        if extension not in self._identifier_queries:
+            parser = self.parsers.get(extension)
+            query = None
+            if parser is not None and parser.language is not None:
+                try:
+                    query = Query(parser.language, IDENTIFIER_QUERY)
+                except QueryError:
+                    # The grammar has no identifier node type, identifiers are found by walking the tree
+                    query = None
+            self._identifier_queries[extension] = query
+        return self._identifier_queries[extension]
+
+    def _traverse_and_find_identifiers(self, node: "TreeSitterNode") -> List["TreeSitterNode"]:
+        """Preorder walk with a tree cursor, it allocates no child lists and isn't bounded by the recursion limit."""
         identifiers = []
-
-        if node.type == "identifier":
-            reference = self._get_reference_from_node(node)
-            identifiers.append(reference)
-
-        for child in node.children:
-            identifiers.extend(self._traverse_and_find_identifiers(child))
-
-        return identifiers
+        cursor = node.walk()
+        depth = 0
+        while True:
+            if cursor.node.type == "identifier":
+                identifiers.append(cursor.node)
+
+            if cursor.goto_first_child():
+                depth += 1
+                continue
+
+            while depth > 0 and not cursor.goto_next_sibling():
+                cursor.goto_parent()
+                depth -= 1
+            if depth == 0:
+                return identifiers
 
     def get_reference_type(
         self, original_node: "DefinitionNode", reference: "Reference", node_referenced: "DefinitionNode"
@@ -74,7 +135,8 @@ class TreeSitterHelper:
     ) -> List["Node"]:
         self.current_path = file.uri_path
         self.created_nodes = []
-        self.base_node_source_code = self._get_content_from_file(file)
+        self.base_node_source = self._get_content_from_file(file)
+        self._line_start_bytes = None
 
         if self._does_path_have_valid_extension(file.uri_path):
             self._handle_paths_with_valid_extension(file=file, parent_folder=parent_folder)
@@ -85,13 +147,127 @@ class TreeSitterHelper:
 
         return [file_node]
 
+    def create_nodes_from_parsed_file(
+        self, parsed_file: ParsedFile, file: File, parent_folder: Optional["FolderNode"] = None
+    ) -> List["Node"]:
+        """
+        Rebuild the nodes of a file from a ParsedFile snapshot without parsing it.
+
+        The snapshot already carries the skeletonized code text and stats. Tree-sitter nodes,
+        which are only needed to resolve relationships, are bound later by bind_tree_sitter_nodes.
+        """
+        self.current_path = file.uri_path
+
+        file_node = NodeFactory.create_file_node(
+            path=parsed_file.path,
+            name=parsed_file.name,
+            level=parsed_file.level,
+            node_range=self._reference_from_range_tuple(parsed_file.node_range),
+            definition_range=self._reference_from_range_tuple(parsed_file.node_range),
+            code_text=parsed_file.code_text,
+            parent=parent_folder,
+            graph_environment=self.graph_environment,
+        )
+        if parsed_file.is_raw:
+            file_node.add_extra_label("RAW")
+            return [file_node]
+
+        file_node._stats = NestingStats(*parsed_file.stats)
+        file_node.has_pending_tree_sitter_nodes = True
+
+        created_nodes: List["Node"] = [file_node]
+        for definition in parsed_file.definitions:
+            # created_nodes is shifted by one because the file node sits at index 0
+            parent_node = created_nodes[definition.parent_index + 1]
+            node = NodeFactory.create_node_based_on_label(
+                kind=definition.label,
+                name=definition.name,
+                path=parsed_file.path,
+                definition_range=self._reference_from_range_tuple(definition.definition_range),
+                node_range=self._reference_from_range_tuple(definition.node_range),
+                code_text=definition.code_text,
+                body_node=None,
+                level=definition.level,
+                parent=parent_node,
+                tree_sitter_node=None,
+                graph_environment=self.graph_environment,
+            )
+            node._stats = NestingStats(*definition.stats)
+            if definition.label == NodeLabels.FUNCTION:
+                node._parameter_count = definition.parameter_count
+
+            parent_node.relate_node_as_define_relationship(node)
+            created_nodes.append(node)
+
+        return created_nodes
+
+    def bind_tree_sitter_nodes(self, file_node: "FileNode") -> None:
+        """Parse the file of a node rebuilt from a ParsedFile and attach tree-sitter nodes to it and its definitions."""
+        if not file_node.has_pending_tree_sitter_nodes:
+            return
+
+        self.current_path = file_node.path
+        tree = self._parse(self._read_file_content(file_node.pure_path), file_node.extension)
+        self._bind_tree_sitter_nodes(tree, [file_node, *self._get_definitions_in_preorder(file_node)])
+        file_node.has_pending_tree_sitter_nodes = False
+
+    def _get_definitions_in_preorder(self, node: "DefinitionNode") -> List["DefinitionNode"]:
+        definitions = []
+        stack = list(reversed(node._defines))
+        while stack:
+            definition = stack.pop()
+            definitions.append(definition)
+            stack.extend(reversed(definition._defines))
+        return definitions
+
+    def _bind_tree_sitter_nodes(self, tree: Tree, nodes: List["Node"]) -> None:
+        file_node, definition_nodes = nodes[0], nodes[1:]
+        file_node._tree_sitter_node = tree.root_node
+        file_node.body_node = tree.root_node
+
+        # Nested definitions may share the exact same range, they are stored outermost first
+        seen_ranges: Dict[RangeTuple, int] = {}
+        for node in definition_nodes:
+            node_range = pack_reference(node.node_range)
+            candidates = self._find_definition_candidates(tree.root_node, node_range)
+            occurrence = seen_ranges.get(node_range, 0)
+            seen_ranges[node_range] = occurrence + 1
+            if occurrence >= len(candidates):
+                continue
+
+            tree_sitter_node = candidates[-1 - occurrence]
+            node._tree_sitter_node = tree_sitter_node
+            node.body_node = self._try_process_body_node_snippet(tree_sitter_node)
+
+    def _find_definition_candidates(self, root: "TreeSitterNode", node_range: RangeTuple) -> List["TreeSitterNode"]:
+        start_point, end_point = (node_range[0], node_range[1]), (node_range[2], node_range[3])
+        candidates = []
+        candidate = root.descendant_for_point_range(start_point, end_point)
+        while candidate is not None:
+            is_same_range = candidate.start_point == start_point and candidate.end_point == end_point
+            if not is_same_range:
+                break
+            if self.language_definitions.should_create_node(candidate):
+                candidates.append(candidate)
+            candidate = candidate.parent
+        return candidates
+
+    def _reference_from_range_tuple(self, node_range: RangeTuple) -> "Reference":
+        return Reference(
+            range=Range(
+                start=Point(line=node_range[0], character=node_range[1]),
+                end=Point(line=node_range[2], character=node_range[3]),
+            ),
+            uri=self.current_path,
+        )
+
     def _does_path_have_valid_extension(self, path: str) -> bool:
         if self.language_definitions == FallbackDefinitions:
             return False
         return any(path.endswith(extension) for extension in self.language_definitions.get_language_file_extensions())
 
     def _handle_paths_with_valid_extension(self, file: File, parent_folder: Optional["FolderNode"] = None) -> None:
-        tree = self._parse(self.base_node_source_code, file.extension)
+        tree = self._parse(self.base_node_source, file.extension)
 
         file_node = self._create_file_node_from_module_node(
             module_node=tree.root_node, file=file, parent_folder=parent_folder
@@ -100,10 +276,9 @@ class TreeSitterHelper:
 
         self._traverse(tree.root_node, context_stack=[file_node])
 
-    def _parse(self, code: str, extension: str) -> Tree:
+    def _parse(self, source: bytes, extension: str) -> Tree:
         parser = self.parsers[extension]
-        as_bytes = bytes(code, "utf-8")
-        return parser.parse(as_bytes)
+        return parser.parse(source)
 
     def _create_file_node_from_module_node(
         self, module_node: "TreeSitterNode", file: File, parent_folder: "FolderNode" = None
@@ -114,46 +289,85 @@ class TreeSitterHelper:
             level=file.level,
             node_range=self._get_reference_from_node(module_node),
             definition_range=self._get_reference_from_node(module_node),
-            code_text=self.base_node_source_code,
+            code_text=self._get_whole_source_span(),
             body_node=module_node,
             parent=parent_folder,
             tree_sitter_node=module_node,
             graph_environment=self.graph_environment,
         )
 
-    def _get_content_from_file(self, file: File) -> str:
-        try:
-            with open(file.path, "r") as file:
-                return file.read()
-        except UnicodeDecodeError:
-            # if content cannot be read, return empty string
-            return ""
+    def _get_content_from_file(self, file: File) -> bytes:
+        return self._read_file_content(file.path)
 
-    def _traverse(self, tree_sitter_node: "TreeSitterNode", context_stack: List["Node"]) -> None:
-        """Perform a recursive preorder traversal of the tree."""
+    def _read_file_content(self, path: str) -> bytes:
+        """
+        Read a file as the UTF-8 bytes tree-sitter parses and every node of the file keeps a span of.
 
-        if context_stack is None:
-            context_stack = []
+        Line breaks are translated to \\n like reading the file as text does, so ranges and code text don't change.
+        """
+        with open(path, "rb") as file:
+            source = file.read()
 
-        node_was_created = False
-        if node_was_created := self.language_definitions.should_create_node(tree_sitter_node):
-            node = self._handle_definition_node(tree_sitter_node, context_stack)
+        if not source.isascii():
+            try:
+                source.decode("utf-8")
+            except UnicodeDecodeError:
+                # if content cannot be read, return empty content
+                return b""
 
-            self.created_nodes.append(node)
-            context_stack.append(node)
+        if b"\r" in source:
+            source = source.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return source
 
-        for child in tree_sitter_node.named_children:
-            self._traverse(child, context_stack)
+    def _get_whole_source_span(self) -> SourceSpan:
+        return SourceSpan(self.base_node_source, 0, len(self.base_node_source))
 
-        if node_was_created:
-            context_stack.pop()
+    def _traverse(self, tree_sitter_node: "TreeSitterNode", context_stack: List["Node"]) -> None:
+        """
+        Perform a preorder traversal of the named nodes of the tree with a tree cursor.
+
+        The cursor moves over the tree without allocating child lists, and deep trees don't hit the
+        recursion limit. Definitions stay on the context stack until their subtree is left.
+        """
+
+        if context_stack is None:
+            context_stack = []
+
+        cursor = tree_sitter_node.walk()
+        # Depth of the tree-sitter node of each definition pushed on the context stack
+        definition_depths: List[int] = []
+        depth = 0
+        while True:
+            current_node = cursor.node
+            if current_node.is_named and self.language_definitions.should_create_node(current_node):
+                node = self._handle_definition_node(current_node, context_stack)
+
+                self.created_nodes.append(node)
+                context_stack.append(node)
+                definition_depths.append(depth)
+
+            # Anonymous nodes are tokens, only named nodes are descended into like named_children did
+            if current_node.is_named and cursor.goto_first_child():
+                depth += 1
+                continue
+
+            while True:
+                while definition_depths and definition_depths[-1] >= depth:
+                    definition_depths.pop()
+                    context_stack.pop()
+                if depth == 0:
+                    return
+                if cursor.goto_next_sibling():
+                    break
+                cursor.goto_parent()
+                depth -= 1
 
     def _handle_definition_node(self, tree_sitter_node: "TreeSitterNode", context_stack: List["Node"]) -> "Node":
         """Handle the printing of node information for class and function definitions."""
         identifier_name, identifier_reference = self._process_identifier_node(node=tree_sitter_node)
 
         node_reference = self._get_reference_from_node(tree_sitter_node)
-        node_snippet = tree_sitter_node.text.decode("utf-8")
+        node_snippet = SourceSpan(self.base_node_source, tree_sitter_node.start_byte, tree_sitter_node.end_byte)
         body_node = self._try_process_body_node_snippet(tree_sitter_node)
         parent_node = self.get_parent_node(context_stack)
 
@@ -185,11 +399,29 @@ class TreeSitterHelper:
         return identifier_name
 
     def _get_code_snippet_from_base_file(self, node_range: "Range") -> str:
+        line_start_bytes = self._get_line_start_bytes()
         start_line = node_range.start.line
         end_line = node_range.end.line
-        code_lines = self.base_node_source_code.split("\n")
-        code_snippet = "\n".join(code_lines[start_line : end_line + 1])
-        return code_snippet
+        if start_line >= len(line_start_bytes):
+            return ""
+
+        start_byte = line_start_bytes[start_line]
+        # The line break ending the last line isn't part of the snippet
+        has_next_line = end_line + 1 < len(line_start_bytes)
+        end_byte = line_start_bytes[end_line + 1] - 1 if has_next_line else len(self.base_node_source)
+        return SourceSpan(self.base_node_source, start_byte, end_byte).decode()
+
+    def _get_line_start_bytes(self) -> List[int]:
+        """Byte offset at which each line of the current file starts, computed once per file."""
+        if self._line_start_bytes is None:
+            source = self.base_node_source
+            line_start_bytes = [0]
+            line_break = source.find(b"\n")
+            while line_break != -1:
+                line_start_bytes.append(line_break + 1)
+                line_break = source.find(b"\n", line_break + 1)
+            self._line_start_bytes = line_start_bytes
+        return self._line_start_bytes
 
     def _get_reference_from_node(self, node: "TreeSitterNode") -> "Reference":
         return Reference(
@@ -228,7 +460,7 @@ class TreeSitterHelper:
             level=file.level,
             node_range=self._empty_reference(),
             definition_range=self._empty_reference(),
-            code_text=self.base_node_source_code,
+            code_text=self._get_whole_source_span(),
             body_node=None,
             parent=parent_folder,
             tree_sitter_node=None,
@@ -0,0 +1,38 @@
+import threading
+from typing import Dict, Optional, Type, TYPE_CHECKING
+
+from blarify.code_hierarchy.tree_sitter_helper import TreeSitterHelper
+from blarify.code_hierarchy.languages import LanguageDefinitions
+
+if TYPE_CHECKING:
+    from blarify.graph.graph_environment import GraphEnvironment
+
+
+class TreeSitterHelperRegistry:
+    """
+    Hands out one TreeSitterHelper per language for the lifetime of a build.
+
+    TreeSitterHelper keeps per-file state and tree-sitter parsers are not safe to share
+    between threads, so every thread gets its own set of helpers.
+    """
+
+    graph_environment: Optional["GraphEnvironment"]
+
+    def __init__(self, graph_environment: Optional["GraphEnvironment"] = None):
+        self.graph_environment = graph_environment
+        self._local = threading.local()
+
+    def get(self, language_definitions: Type[LanguageDefinitions]) -> TreeSitterHelper:
+        helpers = self._get_thread_helpers()
+        helper = helpers.get(language_definitions)
+        if helper is None:
+            helper = TreeSitterHelper(language_definitions=language_definitions, graph_environment=self.graph_environment)
+            helpers[language_definitions] = helper
+        return helper
+
+    def _get_thread_helpers(self) -> Dict[Type[LanguageDefinitions], TreeSitterHelper]:
+        helpers = getattr(self._local, "helpers", None)
+        if helpers is None:
+            helpers = {}
+            self._local.helpers = helpers
+        return helpers
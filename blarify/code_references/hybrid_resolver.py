@@ -6,12 +6,14 @@ scip-typescript are available for these languages. For other programming languag
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Set
 from enum import Enum
 
 from blarify.graph.node import DefinitionNode
 from .types.Reference import Reference
 from .lsp_helper import LspQueryHelper
+from .reference_cache import ReferenceCache
 from .scip_helper import ScipReferenceResolver
 
 logger = logging.getLogger(__name__)
@@ -39,6 +41,8 @@ class HybridReferenceResolver:
         root_uri: str,
         mode: ResolverMode = ResolverMode.AUTO,
         scip_index_path: Optional[str] = None,
+        changed_files: Optional[List[str]] = None,
+        reference_cache: Optional[ReferenceCache] = None,
         **lsp_kwargs: Any,
     ):
         """
@@ -48,10 +52,16 @@ class HybridReferenceResolver:
             root_uri: Root URI of the project
             mode: Resolver mode to use
             scip_index_path: Path to SCIP index file
+            changed_files: Files known to have changed since the last run, limits the check for a
+                stale SCIP index to them
+            reference_cache: Optional on-disk cache of references, only the definitions missing from
+                it are sent to SCIP or LSP
             **lsp_kwargs: Arguments to pass to LspQueryHelper
         """
         self.root_uri = root_uri
         self.mode = mode
+        self.changed_files = changed_files
+        self.reference_cache = reference_cache
 
         # Initialize SCIP resolver
         from blarify.utils.path_calculator import PathCalculator
@@ -68,6 +78,9 @@ class HybridReferenceResolver:
         self._use_lsp = False
         self._setup_resolvers()
 
+        if self.reference_cache:
+            self.reference_cache.refresh(changed_files)
+
     def _setup_resolvers(self):
         """Determine which resolvers to use based on mode and availability."""
         # Check project language to determine if SCIP is applicable
@@ -119,7 +132,7 @@ class HybridReferenceResolver:
         """Try to set up SCIP resolver."""
         try:
             # Try to generate index if needed
-            if not self.scip_resolver.generate_index_if_needed("blarify"):
+            if not self.scip_resolver.generate_index_if_needed("blarify", changed_files=self.changed_files):
                 return False
 
             # Try to load the index
@@ -157,6 +170,30 @@ class HybridReferenceResolver:
         if not nodes:
             return {}
 
+        if self.reference_cache is None:
+            return self._resolve_references_batch(nodes)[0]
+
+        namespace = "scip" if self._use_scip else "lsp"
+        results = self.reference_cache.get_many(namespace, nodes)
+        misses = [node for node in nodes if node not in results]
+
+        if misses:
+            start_time = time.time()
+            resolved, unresolved_nodes = self._resolve_references_batch(misses)
+            self.reference_cache.set_many(
+                namespace,
+                {node: references for node, references in resolved.items() if node not in unresolved_nodes},
+                resolve_seconds=time.time() - start_time,
+            )
+            results.update(resolved)
+
+        self.reference_cache.log_stats()
+        return results
+
+    def _resolve_references_batch(
+        self, nodes: List[DefinitionNode]
+    ) -> tuple[Dict[DefinitionNode, List[Reference]], Set[DefinitionNode]]:
+        """Returns the references of the nodes and the nodes whose references couldn't be resolved."""
         total_nodes = len(nodes)
         logger.info(f"🚀 Starting hybrid reference resolution for {total_nodes} nodes")
 
@@ -170,7 +207,7 @@ class HybridReferenceResolver:
 
                 logger.info(f"📚 SCIP results: {total_refs} references")
 
-                return results
+                return results, set()
 
             except Exception as e:
                 logger.error(f"SCIP resolution failed: {e}")
@@ -178,17 +215,54 @@ class HybridReferenceResolver:
         # Fall back to LSP if SCIP failed or is disabled
         if self._use_lsp:
             logger.info("🔧 Using LSP resolver")
-            return self.lsp_resolver.get_paths_where_nodes_are_referenced_batch(nodes)
+            results = self.lsp_resolver.get_paths_where_nodes_are_referenced_batch(nodes)
+            return results, self.lsp_resolver.unresolved_nodes
 
         # No resolvers available
         logger.error("No reference resolvers available")
-        return {node: [] for node in nodes}
+        return {node: [] for node in nodes}, set(nodes)
 
     def get_paths_where_node_is_referenced(self, node: DefinitionNode) -> List[Reference]:
         """Get references for a single node."""
         results = self.get_paths_where_nodes_are_referenced_batch([node])
         return results.get(node, [])
 
+    def get_definition_paths_for_references(self, references: List[Reference], extension: str) -> List[str]:
+        """
+        Get the file defining the symbol used at each reference.
+
+        The SCIP index answers first when it is loaded, the references it doesn't cover are sent to
+        the LSP servers concurrently.
+
+        Args:
+            references: References whose start is the position of the symbol
+            extension: File extension of the references, selects the LSP servers
+
+        Returns:
+            The uri of the definition of each reference, in order, "" when it has none
+        """
+        if not references:
+            return []
+
+        definition_paths: List[Optional[str]] = [None] * len(references)
+        if self._use_scip:
+            try:
+                definition_paths = self.scip_resolver.get_definition_paths_for_references(references)
+            except Exception as e:
+                logger.error(f"SCIP definition lookup failed: {e}")
+
+        missing = [index for index, path in enumerate(definition_paths) if path is None]
+        if missing:
+            if self._use_scip:
+                logger.info(f"📚 SCIP resolved {len(references) - len(missing)}/{len(references)} definitions")
+            lsp_paths = self.lsp_resolver.get_definition_paths_for_references(
+                [references[index] for index in missing], extension
+            )
+            for index, path in zip(missing, lsp_paths):
+                definition_paths[index] = path
+
+        return [path or "" for path in definition_paths]
+
     def get_resolver_info(self) -> Dict[str, Any]:
         """Get information about the current resolver configuration."""
         from blarify.utils.project_detector import ProjectDetector
@@ -208,6 +282,16 @@ class HybridReferenceResolver:
             info["scip_stats"] = self.scip_resolver.get_statistics()
             info["scip_language"] = getattr(self.scip_resolver, "language", "unknown")
 
+        if self.reference_cache:
+            stats = self.reference_cache.stats
+            info["reference_cache_stats"] = {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "hit_rate": stats.hit_rate,
+                "invalidated": stats.invalidated,
+                "time_saved_seconds": stats.time_saved,
+            }
+
         return info
 
     def initialize_directory(self, file) -> None:  # type: ignore
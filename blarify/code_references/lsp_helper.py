@@ -1,10 +1,12 @@
-from typing import TYPE_CHECKING, Optional, Dict, List
+from typing import TYPE_CHECKING, Callable, Optional, Dict, List, Set
 import psutil
 import concurrent.futures
 import os
 from blarify.vendor.multilspy import SyncLanguageServer
 from blarify.utils.path_calculator import PathCalculator
 from .types.Reference import Reference
+from .lsp_reference_scheduler import LspReferenceScheduler, ServerStats
+from .lsp_server_pool import LspServerPool, PoolStats, ServerSlot
 from blarify.vendor.multilspy.multilspy_config import MultilspyConfig
 from blarify.vendor.multilspy.multilspy_logger import MultilspyLogger
 from blarify.vendor.multilspy.lsp_protocol_handler.server import Error
@@ -36,6 +38,16 @@ class ProgressTracker:
         self.start_time = time.time()
         self.last_update_time = 0
         self.update_interval = 2.0  # Update every 2 seconds
+        self.server_stats: List[ServerStats] = []
+
+    def register_server_stats(self, stats: ServerStats):
+        """Report the live stats of a server instance along with the progress"""
+        with self.lock:
+            self.server_stats.append(stats)
+
+    def get_server_stats(self) -> Dict[str, ServerStats]:
+        with self.lock:
+            return {stats.name: stats for stats in self.server_stats}
 
     def update(self, nodes_completed: int):
         """Update progress and log if enough time has passed"""
@@ -71,6 +83,8 @@ class ProgressTracker:
         logger.info(
             f"🔄 Progress: [{bar}] {self.completed_nodes}/{self.total_nodes} ({percentage:.1f}%) | {elapsed_time:.0f}s elapsed | {eta_str}"
         )
+        for stats in self.server_stats:
+            logger.info(f"   {stats.describe()}")
 
     def force_update(self):
         """Force a progress update regardless of time interval"""
@@ -204,13 +218,16 @@ class LspResourceOptimizer:
 
 class LspQueryHelper:
     root_uri: str
-    language_to_lsp_servers: dict[str, list[SyncLanguageServer]]  # Changed to list of servers
-    entered_lsp_servers: dict[str, list]  # Track contexts for each server instance
+    language_to_lsp_pool: dict[str, LspServerPool[SyncLanguageServer]]  # Running server instances per language
     LSP_USAGES = 0
     MAX_LSP_INSTANCES_PER_LANGUAGE = 10  # Configurable number of instances
-    BASE_TIMEOUT = 30  # Base timeout in seconds
-    PER_REQUEST_TIMEOUT = 2  # Additional timeout per request in seconds
-    MAX_BATCH_SIZE = 50  # Maximum requests per batch before chunking
+    REQUEST_TIMEOUT = 30  # Timeout for a single references request in seconds
+    MAX_IN_FLIGHT_PER_SERVER = 8  # Concurrent requests per server instance
+    MAX_REQUEST_ATTEMPTS = 2  # Server instances a request is tried on before giving up
+    MAX_REQUESTS_PER_SERVER = 5000  # Requests a server instance serves before it is recycled
+    HEALTH_CHECK_INTERVAL = 30.0  # Seconds between liveness pings of the pooled servers
+    HEALTH_CHECK_TIMEOUT = 5.0  # Seconds a server has to answer a liveness ping
+    MAX_CONSECUTIVE_TIMEOUTS = 2  # Requests in a row a server instance may time out before it is replaced
 
     def __init__(
         self,
@@ -218,17 +235,35 @@ class LspQueryHelper:
         host: Optional[str] = None,
         port: Optional[int] = None,
         max_lsp_instances: int = None,
-        base_timeout: int = 30,
-        per_request_timeout: int = 2,
-        max_batch_size: int = 50,
+        base_timeout: Optional[int] = None,
+        per_request_timeout: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
         auto_optimize: bool = True,
+        request_timeout: int = 30,
+        max_in_flight_per_server: int = 8,
+        max_request_attempts: int = 2,
+        warm_spares: Optional[int] = None,
+        max_requests_per_server: Optional[int] = 5000,
+        health_check_interval: Optional[float] = 30.0,
     ):
+        """
+        base_timeout, per_request_timeout and max_batch_size are DEPRECATED, requests are no longer
+        sent in batches. base_timeout is still honored as the request timeout when given.
+
+        warm_spares is the number of started servers kept ready per language to replace failing or
+        recycled ones. When not given, spares only use the headroom the optimizer sees beyond the
+        running instances, so there are none without auto_optimize.
+        """
         self.root_uri = root_uri
-        self.entered_lsp_servers = {}
-        self.language_to_lsp_servers = {}
-        self.BASE_TIMEOUT = base_timeout
-        self.PER_REQUEST_TIMEOUT = per_request_timeout
-        self.MAX_BATCH_SIZE = max_batch_size
+        self.language_to_lsp_pool = {}
+        # Nodes of the last batch whose references couldn't be resolved and were returned empty
+        self.unresolved_nodes: Set["DefinitionNode"] = set()
+        self.REQUEST_TIMEOUT = base_timeout or request_timeout
+        self.MAX_IN_FLIGHT_PER_SERVER = max_in_flight_per_server
+        self.MAX_REQUEST_ATTEMPTS = max_request_attempts
+        self.WARM_SPARES = warm_spares
+        self.MAX_REQUESTS_PER_SERVER = max_requests_per_server
+        self.HEALTH_CHECK_INTERVAL = health_check_interval
         self.auto_optimize = auto_optimize
 
         # Set default max instances (will be overridden per language if auto_optimize is True)
@@ -294,28 +329,54 @@ class LspQueryHelper:
 
     def _get_or_create_lsp_servers(self, extension, timeout=60, count=None) -> List[SyncLanguageServer]:
         """Get or create multiple LSP server instances for a language"""
+        pool = self._get_or_create_lsp_pool(extension, timeout)
+        return [slot.server for slot in pool.slots(count)]
+
+    def _get_or_create_lsp_pool(self, extension, timeout=60) -> LspServerPool[SyncLanguageServer]:
+        """Get or create the pool of LSP server instances for the language of the extension"""
         language_definitions = self.get_language_definition_for_extension(extension)
         language = language_definitions.get_language_name()
 
-        if count is None:
-            count = self.MAX_LSP_INSTANCES_PER_LANGUAGE
+        if language not in self.language_to_lsp_pool:
+            self.language_to_lsp_pool[language] = LspServerPool(
+                name=language,
+                start_server=lambda: self._start_lsp_server_instance(language_definitions, timeout),
+                stop_server=lambda server, context: self._stop_lsp_server_instance(language, server, context),
+                is_alive=self._is_lsp_server_alive,
+                size=self.MAX_LSP_INSTANCES_PER_LANGUAGE,
+                spares=self._get_warm_spare_count(language),
+                max_requests_per_server=self.MAX_REQUESTS_PER_SERVER,
+                health_check_interval=self.HEALTH_CHECK_INTERVAL,
+                max_consecutive_timeouts=self._get_max_consecutive_timeouts(),
+            )
+
+        return self.language_to_lsp_pool[language]
 
-        # Initialize the language entry if it doesn't exist
-        if language not in self.language_to_lsp_servers:
-            self.language_to_lsp_servers[language] = []
-            self.entered_lsp_servers[language] = []
+    def _get_max_consecutive_timeouts(self) -> int:
+        """A single instance has no other instance to retry on, so it is replaced on its first timeout."""
+        if self.MAX_LSP_INSTANCES_PER_LANGUAGE == 1:
+            return 1
+        return self.MAX_CONSECUTIVE_TIMEOUTS
 
-        existing_servers = self.language_to_lsp_servers[language]
+    def _get_warm_spare_count(self, language: str) -> int:
+        """
+        Spares use the headroom the optimizer sees beyond the running instances, at most half the
+        pool size. Without headroom no spare is started, failing servers are cold-started instead.
+        """
+        if self.WARM_SPARES is not None:
+            return self.WARM_SPARES
+        if not self.auto_optimize:
+            return 0
 
-        # Create additional servers if we need more
-        while len(existing_servers) < count:
-            new_lsp = self._create_lsp_server(language_definitions, timeout)
-            existing_servers.append(new_lsp)
-            context = self._initialize_lsp_server_instance(language, new_lsp)
-            self.entered_lsp_servers[language].append(context)
-            logger.info(f"Created LSP server instance {len(existing_servers)} for {language}")
+        optimal = LspResourceOptimizer.get_optimal_lsp_instances(language)
+        headroom = optimal - self.MAX_LSP_INSTANCES_PER_LANGUAGE
+        return max(0, min(headroom, self.MAX_LSP_INSTANCES_PER_LANGUAGE // 2))
 
-        return existing_servers[:count]
+    def _start_lsp_server_instance(self, language_definitions: "LanguageDefinitions", timeout=60):
+        """Create and start a single LSP server instance, returns it with its entered context"""
+        lsp = self._create_lsp_server(language_definitions, timeout)
+        context = self._initialize_lsp_server_instance(language_definitions.get_language_name(), lsp)
+        return lsp, context
 
     def _initialize_lsp_server_instance(self, language, lsp):
         """Initialize a single LSP server instance and return its context"""
@@ -323,6 +384,20 @@ class LspQueryHelper:
         context.__enter__()
         return context
 
+    def _is_lsp_server_alive(self, lsp: SyncLanguageServer) -> bool:
+        """Liveness ping, the server process must be running and its event loop responsive"""
+        process = lsp.language_server.server.process
+        if process is None or process.returncode is not None or not psutil.pid_exists(process.pid):
+            return False
+        if not lsp.loop.is_running():
+            return False
+
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), lsp.loop).result(timeout=self.HEALTH_CHECK_TIMEOUT)
+        return True
+
+    def get_pool_stats(self) -> Dict[str, PoolStats]:
+        return {language: pool.stats for language, pool in self.language_to_lsp_pool.items()}
+
     def initialize_directory(self, file) -> None:
         """
         DEPRECATED, LSP servers are started on demand
@@ -346,6 +421,7 @@ class LspQueryHelper:
         Returns:
             Dictionary mapping each node to its list of references
         """
+        self.unresolved_nodes = set()
         if not nodes:
             return {}
 
@@ -380,23 +456,26 @@ class LspQueryHelper:
             try:
                 # Get multiple LSP server instances for this language
                 first_node = language_nodes[0]
-                lsp_servers = self._get_or_create_lsp_servers(first_node.extension)
+                pool = self._get_or_create_lsp_pool(first_node.extension)
+                slots = pool.slots()
 
                 logger.info(
-                    f"🔧 [{lang_index}/{len(nodes_by_language)}] Processing {len(language_nodes)} {language} nodes with {len(lsp_servers)} LSP server instances"
+                    f"🔧 [{lang_index}/{len(nodes_by_language)}] Processing {len(language_nodes)} {language} nodes with {len(slots)} LSP server instances"
                 )
 
                 # Distribute nodes across multiple server instances
                 language_results = self._batch_request_references_with_multiple_servers(
-                    language_nodes, lsp_servers, progress
+                    language_nodes, slots, progress, pool
                 )
                 results.update(language_results)
+                logger.info(f"🏊 {pool.stats.describe()}")
 
             except Exception as e:
                 logger.error(f"❌ Error processing nodes for language {language}: {e}")
                 # Fallback to empty results for failed language
                 for node in language_nodes:
                     results[node] = []
+                self.unresolved_nodes.update(language_nodes)
                 # Still update progress for failed nodes
                 progress.update(len(language_nodes))
 
@@ -407,16 +486,21 @@ class LspQueryHelper:
     def _batch_request_references_with_multiple_servers(
         self,
         nodes: List["DefinitionNode"],
-        lsp_servers: List[SyncLanguageServer],
+        lsp_servers: List[ServerSlot[SyncLanguageServer]],
         progress: ProgressTracker,
+        pool: LspServerPool[SyncLanguageServer],
     ) -> Dict["DefinitionNode", List[Reference]]:
         """
-        Distribute nodes across multiple LSP server instances and process them concurrently.
+        Process nodes concurrently on multiple LSP server instances through a shared work queue.
+
+        Every instance keeps at most MAX_IN_FLIGHT_PER_SERVER requests running and pulls more as
+        they complete, requests that time out or fail are retried on another instance.
 
         Args:
             nodes: List of nodes using the same language
-            lsp_servers: List of LSP server instances for this language
+            lsp_servers: Pool slots of the LSP server instances for this language
             progress: Progress tracker to update as nodes are completed
+            pool: Pool the slots belong to, servers failing a request are swapped for a warm spare
 
         Returns:
             Dictionary mapping each node to its references
@@ -424,244 +508,101 @@ class LspQueryHelper:
         if not lsp_servers:
             logger.error("No LSP servers available")
             progress.update(len(nodes))  # Mark failed nodes as completed
+            self.unresolved_nodes.update(nodes)
             return {node: [] for node in nodes}
 
-        # Distribute nodes across available servers using round-robin
-        server_node_groups = [[] for _ in lsp_servers]
-        for i, node in enumerate(nodes):
-            server_index = i % len(lsp_servers)
-            server_node_groups[server_index].append(node)
-
-        # Create concurrent tasks for each server
-        import concurrent.futures
-        import threading
-
-        results: Dict["DefinitionNode", List[Reference]] = {}
-        results_lock = threading.Lock()
-
-        def process_server_group(server_index: int):
-            server = lsp_servers[server_index]
-            server_nodes = server_node_groups[server_index]
-
-            if not server_nodes:
-                return
-
-            # Process this group of nodes with one server instance
-            group_results = self._batch_request_references_for_language(server_nodes, server, progress)
-
-            # Thread-safe result collection
-            with results_lock:
-                results.update(group_results)
+        scheduler = LspReferenceScheduler(
+            servers=lsp_servers,
+            send_request=lambda slot, node: self._send_pooled_reference_request(pool, slot, node),
+            server_names=[slot.name for slot in lsp_servers],
+            max_in_flight=self.MAX_IN_FLIGHT_PER_SERVER,
+            request_timeout=self.REQUEST_TIMEOUT,
+            max_attempts=self.MAX_REQUEST_ATTEMPTS,
+            progress=progress,
+            server_generation=lambda slot: slot.generation,
+        )
+        responses = scheduler.run(nodes)
 
-        # Execute all server groups concurrently using ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(lsp_servers)) as executor:
-            futures = []
-            for server_index in range(len(lsp_servers)):
-                if server_node_groups[server_index]:  # Only submit if there are nodes to process
-                    future = executor.submit(process_server_group, server_index)
-                    futures.append(future)
+        for stats in scheduler.stats:
+            logger.info(f"📈 {stats.describe()}")
 
-            # Wait for all server groups to complete
-            concurrent.futures.wait(futures)
+        self.unresolved_nodes.update(node for node, response in responses.items() if response is None)
 
-            # Check for any exceptions
-            for future in futures:
-                try:
-                    future.result()  # This will raise any exception that occurred
-                except Exception as e:
-                    logger.error(f"❌ Error in server group processing: {e}")
+        return {
+            node: [Reference(reference) for reference in response] if response else []
+            for node, response in responses.items()
+        }
 
-        return results
+    def _send_pooled_reference_request(
+        self, pool: LspServerPool[SyncLanguageServer], slot: ServerSlot[SyncLanguageServer], node: "DefinitionNode"
+    ) -> "concurrent.futures.Future[list]":
+        return self._send_pooled_request(pool, slot, lambda server: self._send_reference_request(server, node))
 
-    def _batch_request_references_for_language(
+    def _send_pooled_request(
         self,
-        nodes: List["DefinitionNode"],
-        lsp_server: SyncLanguageServer,
-        progress: ProgressTracker = None,
-    ) -> Dict["DefinitionNode", List[Reference]]:
+        pool: LspServerPool[SyncLanguageServer],
+        slot: ServerSlot[SyncLanguageServer],
+        send_request: Callable[[SyncLanguageServer], "concurrent.futures.Future[list]"],
+    ) -> "concurrent.futures.Future[list]":
         """
-        Send concurrent reference requests for multiple nodes to the same LSP server.
-        Uses dynamic timeout calculation and chunking for large batches.
+        Send the request to the instance currently behind the slot and report the outcome to the pool.
 
-        Args:
-            nodes: List of nodes using the same language
-            lsp_server: The LSP server instance for this language
-            progress: Optional progress tracker to update
-
-        Returns:
-            Dictionary mapping each node to its references
+        The returned future completes once the pool has recorded the outcome, so a retry already sees the
+        slot swapped. Cancelling it, as the scheduler does on timeouts, cancels the request and reports a timeout.
         """
-        if not nodes:
-            return {}
-
-        # If batch is too large, split into smaller chunks
-        if len(nodes) > self.MAX_BATCH_SIZE:
-            return self._process_large_batch_in_chunks(nodes, lsp_server, progress)
-
-        # Calculate dynamic timeout based on batch size
-        dynamic_timeout = self._calculate_batch_timeout(len(nodes))
-
-        results: Dict["DefinitionNode", List[Reference]] = {}
-
-        # Create async tasks for all requests
-        async def batch_requests():
-            tasks = []
-            for node in nodes:
-                task = lsp_server.language_server.request_references(
-                    relative_file_path=PathCalculator.get_relative_path_from_uri(root_uri=self.root_uri, uri=node.path),
-                    line=node.definition_range.start_dict["line"],
-                    column=node.definition_range.start_dict["character"],
-                )
-                tasks.append((node, task))
-
-            # Wait for all requests to complete
-            task_results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
-
-            # Process results
-            for (node, _), result in zip(tasks, task_results):
-                if isinstance(result, Exception):
-                    logger.warning(f"Error getting references for {node.name}: {result}")
-                    results[node] = []
-                else:
-                    results[node] = [Reference(ref) for ref in result] if result else []
-
-            return results
-
-        # Execute the batch request in the LSP server's event loop
+        instance = pool.checkout(slot)
         try:
-            future = asyncio.run_coroutine_threadsafe(batch_requests(), lsp_server.loop)
-            batch_results = future.result(timeout=dynamic_timeout)
-
-            # Update progress tracker
-            if progress:
-                progress.update(len(nodes))
-
-            return batch_results
-        except concurrent.futures.TimeoutError:
-            logger.error(
-                f"⏰ Batch request timed out after {dynamic_timeout}s for {len(nodes)} nodes, falling back to smaller batches"
-            )
-            # Fallback: split into smaller chunks and retry
-            return self._process_large_batch_in_chunks(
-                nodes, lsp_server, progress, chunk_size=max(1, self.MAX_BATCH_SIZE // 2)
-            )
-        except Exception as e:
-            logger.exception(f"Batch request failed: {e}")
-            # Update progress even for failed nodes
-            if progress:
-                progress.update(len(nodes))
-            # Fallback to empty results
-            return {node: [] for node in nodes}
-
-    def _calculate_batch_timeout(self, batch_size: int) -> int:
-        """Calculate dynamic timeout based on batch size"""
-        timeout = self.BASE_TIMEOUT + (batch_size * self.PER_REQUEST_TIMEOUT)
-        # Cap at reasonable maximum (5 minutes)
-        return min(timeout, 300)
-
-    def _process_large_batch_in_chunks(
-        self,
-        nodes: List["DefinitionNode"],
-        lsp_server: SyncLanguageServer,
-        progress: ProgressTracker = None,
-        chunk_size: int = None,
-    ) -> Dict["DefinitionNode", List[Reference]]:
-        """Process large batches by splitting into smaller chunks"""
-        if chunk_size is None:
-            chunk_size = self.MAX_BATCH_SIZE
-
-        all_results = {}
+            request = send_request(instance.server)
+        except Exception:
+            pool.checkin(slot, instance, failed=True)
+            raise
 
-        for i in range(0, len(nodes), chunk_size):
-            chunk = nodes[i : i + chunk_size]
+        future: "concurrent.futures.Future[list]" = concurrent.futures.Future()
 
+        def checkin(done: "concurrent.futures.Future[list]") -> None:
+            timed_out = done.cancelled()
+            error = None if timed_out else done.exception()
+            pool.checkin(slot, instance, failed=isinstance(error, (ConnectionResetError, Error)), timed_out=timed_out)
             try:
-                chunk_results = self._batch_request_references_simple(chunk, lsp_server, progress)
-                all_results.update(chunk_results)
-
-            except Exception as e:
-                logger.error(f"❌ Error processing chunk: {e}")
-                # Add empty results for failed chunk and update progress
-                for node in chunk:
-                    all_results[node] = []
-                if progress:
-                    progress.update(len(chunk))
-
-        return all_results
-
-    def _batch_request_references_simple(
-        self,
-        nodes: List["DefinitionNode"],
-        lsp_server: SyncLanguageServer,
-        progress: ProgressTracker = None,
-    ) -> Dict["DefinitionNode", List[Reference]]:
-        """
-        Simple batch processing without chunking (used by chunk processor to avoid recursion).
-
-        Args:
-            nodes: List of nodes using the same language
-            lsp_server: The LSP server instance for this language
-            progress: Optional progress tracker to update
-
-        Returns:
-            Dictionary mapping each node to its references
-        """
-        if not nodes:
-            return {}
-
-        # Calculate dynamic timeout based on batch size
-        dynamic_timeout = self._calculate_batch_timeout(len(nodes))
-
-        results: Dict["DefinitionNode", List[Reference]] = {}
-
-        # Create async tasks for all requests
-        async def batch_requests():
-            tasks = []
-            for node in nodes:
-                task = lsp_server.language_server.request_references(
-                    relative_file_path=PathCalculator.get_relative_path_from_uri(root_uri=self.root_uri, uri=node.path),
-                    line=node.definition_range.start_dict["line"],
-                    column=node.definition_range.start_dict["character"],
-                )
-                tasks.append((node, task))
-
-            # Wait for all requests to complete
-            task_results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
-
-            # Process results
-            for (node, _), result in zip(tasks, task_results):
-                if isinstance(result, Exception):
-                    logger.warning(f"Error getting references for {node.name}: {result}")
-                    results[node] = []
+                if timed_out:
+                    future.cancel()
+                elif error is not None:
+                    future.set_exception(error)
                 else:
-                    results[node] = [Reference(ref) for ref in result] if result else []
-
-            return results
-
-        # Execute the batch request in the LSP server's event loop
-        try:
-            future = asyncio.run_coroutine_threadsafe(batch_requests(), lsp_server.loop)
-            batch_results = future.result(timeout=dynamic_timeout)
-
-            # Update progress tracker
-            if progress:
-                progress.update(len(nodes))
-
-            return batch_results
-        except concurrent.futures.TimeoutError:
-            logger.error(f"⏰ Simple batch timed out after {dynamic_timeout}s for {len(nodes)} nodes")
-            # Update progress even for failed nodes
-            if progress:
-                progress.update(len(nodes))
-            # For simple batch, just return empty results on timeout
-            return {node: [] for node in nodes}
-        except Exception as e:
-            logger.exception(f"❌ Simple batch request failed: {e}")
-            # Update progress even for failed nodes
-            if progress:
-                progress.update(len(nodes))
-            # Fallback to empty results
-            return {node: [] for node in nodes}
+                    future.set_result(done.result())
+            except concurrent.futures.InvalidStateError:
+                # Cancelled by the caller while the response arrived
+                pass
+
+        def cancel_request(outcome: "concurrent.futures.Future[list]") -> None:
+            if outcome.cancelled():
+                request.cancel()
+
+        request.add_done_callback(checkin)
+        future.add_done_callback(cancel_request)
+        return future
+
+    def _send_reference_request(
+        self, lsp_server: SyncLanguageServer, node: "DefinitionNode"
+    ) -> "concurrent.futures.Future[list]":
+        """Schedule a references request on the server's event loop"""
+        request = lsp_server.language_server.request_references(
+            relative_file_path=PathCalculator.get_relative_path_from_uri(root_uri=self.root_uri, uri=node.path),
+            line=node.definition_range.start_dict["line"],
+            column=node.definition_range.start_dict["character"],
+        )
+        return asyncio.run_coroutine_threadsafe(request, lsp_server.loop)
+
+    def _send_definition_request(
+        self, lsp_server: SyncLanguageServer, reference: Reference
+    ) -> "concurrent.futures.Future[list]":
+        """Schedule a definition request on the server's event loop"""
+        request = lsp_server.language_server.request_definition(
+            relative_file_path=PathCalculator.get_relative_path_from_uri(root_uri=self.root_uri, uri=reference.uri),
+            line=reference.range.start.line,
+            column=reference.range.start.character,
+        )
+        return asyncio.run_coroutine_threadsafe(request, lsp_server.loop)
 
     def _request_references_with_exponential_backoff(self, node, lsp):
         timeout = 10
@@ -679,71 +620,53 @@ class LspQueryHelper:
                 logger.warning(
                     f"Error requesting references for {self.root_uri}, {node.definition_range}, attempting to restart LSP server with timeout {timeout}"
                 )
-                self._restart_lsp_for_extension(extension=node.extension)
-                lsp = self._get_or_create_lsp_server(extension=node.extension, timeout=timeout)
+                lsp = self._restart_lsp_for_extension(extension=node.extension, lsp=lsp, timeout=timeout)
 
         logger.exception("Failed to get references, returning empty list")
         return []
 
-    def _restart_lsp_for_extension(self, extension):
-        language_definitions = self.get_language_definition_for_extension(extension)
-        language_name = language_definitions.get_language_name()
-        self.exit_lsp_server(language_name)
-
-        logger.warning(f"Restarting LSP servers for {language_name}")
-        try:
-            # Recreate one server instance for immediate use
-            new_lsp = self._create_lsp_server(language_definitions)
+    def _restart_lsp_for_extension(self, extension, lsp=None, timeout=60) -> SyncLanguageServer:
+        """
+        Swap the failing server for a warm spare of its pool, the other instances keep running.
 
-            # Initialize the language entry
-            if language_name not in self.language_to_lsp_servers:
-                self.language_to_lsp_servers[language_name] = []
-                self.entered_lsp_servers[language_name] = []
+        The replacement uses timeout for its requests so that retries get more time.
+        """
+        language_name = self.get_language_definition_for_extension(extension).get_language_name()
+        pool = self._get_or_create_lsp_pool(extension)
 
-            # Add the new server instance
-            self.language_to_lsp_servers[language_name].append(new_lsp)
-            context = self._initialize_lsp_server_instance(language_name, new_lsp)
-            self.entered_lsp_servers[language_name].append(context)
+        logger.warning(f"Restarting LSP server for {language_name}")
+        new_lsp = pool.replace(lsp) if lsp is not None else None
+        if new_lsp is None:
+            new_lsp = self._get_or_create_lsp_server(extension)
 
-            logger.warning(f"LSP server restarted for {language_name}")
-        except ConnectionResetError:
-            logger.exception("Connection reset error")
+        new_lsp.timeout = timeout
+        logger.warning(f"LSP server restarted for {language_name}")
+        return new_lsp
 
     def exit_lsp_server(self, language) -> None:
-        # Handle multiple server instances per language
-        if language in self.entered_lsp_servers:
-            contexts = self.entered_lsp_servers[language]
-            for i, context in enumerate(contexts):
-                try:
-                    # Try to exit context manager with timeout, this is to ensure that we don't hang indefinitely
-                    # It happens sometimes especially with c#
-                    def exit_context():
-                        context.__exit__(None, None, None)
-
-                    thread = threading.Thread(target=exit_context)
-                    thread.start()
-                    thread.join(timeout=5)  # Wait up to 5 seconds
-
-                    if thread.is_alive():
-                        logger.warning(f"Context manager exit timed out for {language} instance {i}")
-                        raise TimeoutError("Context manager exit timed out")
-                    logger.info(f"Properly exited context manager for {language} instance {i}")
-                except Exception as e:
-                    logger.warning(f"Error exiting context manager for {language} instance {i}: {e}")
-                    # If context exit fails, fall back to manual cleanup for this specific server
-                    if language in self.language_to_lsp_servers and i < len(self.language_to_lsp_servers[language]):
-                        self._manual_cleanup_lsp_server_instance(self.language_to_lsp_servers[language][i])
-
-            del self.entered_lsp_servers[language]
-        else:
-            # No context managers, do manual cleanup for all instances
-            if language in self.language_to_lsp_servers:
-                for server in self.language_to_lsp_servers[language]:
-                    self._manual_cleanup_lsp_server_instance(server)
+        pool = self.language_to_lsp_pool.pop(language, None)
+        if pool is not None:
+            pool.shutdown()
 
-        # Remove from the language server dict
-        if language in self.language_to_lsp_servers:
-            del self.language_to_lsp_servers[language]
+    def _stop_lsp_server_instance(self, language, lsp_server: SyncLanguageServer, context) -> None:
+        try:
+            # Try to exit context manager with timeout, this is to ensure that we don't hang indefinitely
+            # It happens sometimes especially with c#
+            def exit_context():
+                context.__exit__(None, None, None)
+
+            thread = threading.Thread(target=exit_context)
+            thread.start()
+            thread.join(timeout=5)  # Wait up to 5 seconds
+
+            if thread.is_alive():
+                logger.warning(f"Context manager exit timed out for {language}")
+                raise TimeoutError("Context manager exit timed out")
+            logger.info(f"Properly exited context manager for {language}")
+        except Exception as e:
+            logger.warning(f"Error exiting context manager for {language}: {e}")
+            # If context exit fails, fall back to manual cleanup for this specific server
+            self._manual_cleanup_lsp_server_instance(lsp_server)
 
     def _manual_cleanup_lsp_server_instance(self, lsp_server: SyncLanguageServer) -> None:
         """Manual cleanup for a single LSP server instance."""
@@ -798,6 +721,48 @@ class LspQueryHelper:
 
         return definitions[0]["uri"]
 
+    def get_definition_paths_for_references(self, references: List[Reference], extension: str) -> List[str]:
+        """
+        Resolve the definition paths of many references concurrently on the server instances of the language.
+
+        Requests go through the same work queue as the reference requests, so they are retried on
+        another instance when one times out or fails.
+
+        Returns:
+            The uri of the first definition of each reference, in order, "" when it has none or its
+            request failed on every attempt
+        """
+        if not references:
+            return []
+
+        pool = self._get_or_create_lsp_pool(extension)
+        slots = pool.slots()
+        if not slots:
+            logger.error("No LSP servers available")
+            return ["" for _ in references]
+
+        scheduler = LspReferenceScheduler(
+            servers=slots,
+            send_request=lambda slot, index: self._send_pooled_request(
+                pool, slot, lambda server: self._send_definition_request(server, references[index])
+            ),
+            server_names=[slot.name for slot in slots],
+            max_in_flight=self.MAX_IN_FLIGHT_PER_SERVER,
+            request_timeout=self.REQUEST_TIMEOUT,
+            max_attempts=self.MAX_REQUEST_ATTEMPTS,
+            server_generation=lambda slot: slot.generation,
+        )
+        responses = scheduler.run(range(len(references)))
+
+        for stats in scheduler.stats:
+            logger.info(f"📈 {stats.describe()}")
+
+        definition_paths = []
+        for index in range(len(references)):
+            definitions = responses.get(index)
+            definition_paths.append(definitions[0]["uri"] if definitions else "")
+        return definition_paths
+
     def _request_definition_with_exponential_backoff(self, reference: Reference, lsp, extension):
         timeout = 10
         for _ in range(1, 3):
@@ -814,14 +779,13 @@ class LspQueryHelper:
                 logger.warning(
                     f"Error requesting definitions for {self.root_uri}, {reference.start_dict}, attempting to restart LSP server with timeout {timeout}"
                 )
-                self._restart_lsp_for_extension(extension)
-                lsp = self._get_or_create_lsp_server(extension=extension, timeout=timeout)
+                lsp = self._restart_lsp_for_extension(extension, lsp=lsp, timeout=timeout)
 
         logger.exception("Failed to get references, returning empty list")
         return []
 
     def shutdown_exit_close(self) -> None:
-        languages = list(self.language_to_lsp_servers.keys())
+        languages = list(self.language_to_lsp_pool.keys())
 
         for language in languages:
             try:
@@ -829,7 +793,6 @@ class LspQueryHelper:
             except Exception as e:
                 logger.exception(f"Error shutting down LSP server for {language}: {e}")
 
-        # Ensure all dictionaries are cleared
-        self.entered_lsp_servers.clear()
-        self.language_to_lsp_servers.clear()
+        # Ensure all pools are cleared
+        self.language_to_lsp_pool.clear()
         logger.info("LSP servers have been shut down")
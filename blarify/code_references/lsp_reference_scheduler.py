@@ -0,0 +1,240 @@
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Generic, List, Optional, Sequence, Set, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from .lsp_helper import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+Server = TypeVar("Server")
+
+# Returned by a failed attempt, None is a valid response
+_FAILED = object()
+
+
+@dataclass
+class ServerStats:
+    """Live counters for one server instance, updated as its requests complete."""
+
+    name: str
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    in_flight: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.completed if self.completed else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second since the server started receiving work."""
+        elapsed = time.time() - self.started_at
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"{self.name}: {self.completed} done, {self.in_flight} in flight, {self.throughput:.1f} req/s, "
+            f"avg {self.average_latency * 1000:.0f}ms, max {self.max_latency * 1000:.0f}ms, "
+            f"{self.timed_out} timeouts, {self.failed} failed"
+        )
+
+
+@dataclass
+class _WorkItem:
+    node: Any
+    # (server index, server generation) of every attempt
+    tried_servers: Set[Tuple[int, int]] = field(default_factory=set)
+
+
+class _WorkQueue:
+    """
+    Shared queue of pending requests plus a private queue per server for retries.
+
+    Workers take from their server's private queue first, so a request that failed on one
+    instance is retried on the instance it was handed to.
+    """
+
+    def __init__(self, nodes: Sequence[Any], server_count: int):
+        self._shared: Deque[_WorkItem] = deque(_WorkItem(node) for node in nodes)
+        self._private: List[Deque[_WorkItem]] = [deque() for _ in range(server_count)]
+        self._outstanding = len(nodes)
+        self._condition = threading.Condition()
+
+    def get(self, server_index: int) -> Optional[_WorkItem]:
+        """Blocks until there is work for the server, returns None once every request is done."""
+        with self._condition:
+            while True:
+                if self._private[server_index]:
+                    return self._private[server_index].popleft()
+                if self._shared:
+                    return self._shared.popleft()
+                if self._outstanding == 0:
+                    return None
+                self._condition.wait()
+
+    def retry(self, item: _WorkItem, server_index: int) -> None:
+        with self._condition:
+            self._private[server_index].append(item)
+            self._condition.notify_all()
+
+    def done(self) -> None:
+        with self._condition:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._condition.notify_all()
+
+
+class LspReferenceScheduler(Generic[Server]):
+    """
+    Spreads reference requests over several server instances through a shared work queue.
+
+    Each instance runs at most max_in_flight requests at a time and pulls the next one as soon
+    as a slot frees up, so fast instances take more work and a slow one only holds back its own
+    requests. Requests that time out or fail are retried on an instance that hasn't tried them.
+
+    server_generation tells when a server is backed by a new instance, a request can then be
+    retried on the same server, which is what lets a single server retry once it was replaced.
+    """
+
+    def __init__(
+        self,
+        servers: Sequence[Server],
+        send_request: Callable[[Server, Any], "concurrent.futures.Future[Any]"],
+        server_names: Optional[Sequence[str]] = None,
+        max_in_flight: int = 8,
+        request_timeout: float = 30,
+        max_attempts: int = 2,
+        progress: Optional["ProgressTracker"] = None,
+        server_generation: Optional[Callable[[Server], int]] = None,
+    ):
+        if not servers:
+            raise ValueError("At least one server is required")
+
+        self.servers = list(servers)
+        self.send_request = send_request
+        self.max_in_flight = max(1, max_in_flight)
+        self.request_timeout = request_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.progress = progress
+        self.server_generation = server_generation
+        names = server_names or [f"server-{index + 1}" for index in range(len(self.servers))]
+        self.stats = [ServerStats(name=name) for name in names]
+        self._stats_lock = threading.Lock()
+
+        if progress:
+            for stats in self.stats:
+                progress.register_server_stats(stats)
+
+    def run(self, nodes: Sequence[Any]) -> Dict[Any, Optional[Any]]:
+        """
+        Sends a request for every node and returns the raw responses.
+
+        Nodes whose requests failed on every attempt map to None.
+        """
+        results: Dict[Any, Optional[Any]] = {}
+        if not nodes:
+            return results
+
+        work_queue = _WorkQueue(nodes, len(self.servers))
+        results_lock = threading.Lock()
+
+        def worker(server_index: int) -> None:
+            while (item := work_queue.get(server_index)) is not None:
+                response = self._send(server_index, item)
+                if response is _FAILED:
+                    retry_server = self._pick_retry_server(item)
+                    if retry_server is not None:
+                        work_queue.retry(item, retry_server)
+                        continue
+                    logger.warning(f"Giving up on references for {getattr(item.node, 'name', item.node)}")
+                    response = None
+
+                with results_lock:
+                    results[item.node] = response
+                work_queue.done()
+                if self.progress:
+                    self.progress.update(1)
+
+        workers = [
+            threading.Thread(target=worker, args=(server_index,), daemon=True)
+            for server_index in range(len(self.servers))
+            for _ in range(self.max_in_flight)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        return results
+
+    def _send(self, server_index: int, item: _WorkItem) -> Any:
+        stats = self.stats[server_index]
+        item.tried_servers.add((server_index, self._get_generation(server_index)))
+        with self._stats_lock:
+            stats.in_flight += 1
+
+        start = time.time()
+        future: Optional["concurrent.futures.Future[Any]"] = None
+        try:
+            future = self.send_request(self.servers[server_index], item.node)
+            response = future.result(timeout=self.request_timeout)
+        except concurrent.futures.TimeoutError:
+            if future:
+                future.cancel()
+            logger.warning(f"⏰ {stats.name} timed out after {self.request_timeout}s")
+            with self._stats_lock:
+                stats.in_flight -= 1
+                stats.timed_out += 1
+            return _FAILED
+        except Exception as e:
+            logger.warning(f"Error getting references from {stats.name}: {e}")
+            with self._stats_lock:
+                stats.in_flight -= 1
+                stats.failed += 1
+            return _FAILED
+
+        latency = time.time() - start
+        with self._stats_lock:
+            stats.in_flight -= 1
+            stats.completed += 1
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+        return response
+
+    def _pick_retry_server(self, item: _WorkItem) -> Optional[int]:
+        if len(item.tried_servers) >= self.max_attempts:
+            return None
+
+        candidates = [
+            index
+            for index in range(len(self.servers))
+            if (index, self._get_generation(index)) not in item.tried_servers
+        ]
+        if not candidates:
+            return None
+
+        # Prefer a server that hasn't tried the request, then the least loaded one, then the lowest latency so far
+        tried_indexes = {index for index, _ in item.tried_servers}
+        with self._stats_lock:
+            return min(
+                candidates,
+                key=lambda index: (
+                    index in tried_indexes,
+                    self.stats[index].in_flight,
+                    self.stats[index].average_latency,
+                ),
+            )
+
+    def _get_generation(self, server_index: int) -> int:
+        if self.server_generation is None:
+            return 0
+        return self.server_generation(self.servers[server_index])
@@ -0,0 +1,415 @@
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+Server = TypeVar("Server")
+
+
+@dataclass
+class PoolStats:
+    """Lifetime counters for the server instances of one pool."""
+
+    name: str
+    started: int = 0
+    stopped: int = 0
+    recycled: int = 0
+    replaced: int = 0
+    spares_used: int = 0
+    cold_starts: int = 0
+    timeouts: int = 0
+    health_checks: int = 0
+    failed_health_checks: int = 0
+    requests: int = 0
+    warm_spares: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"{self.name} pool: {self.started} started, {self.warm_spares} warm spares, {self.requests} requests, "
+            f"{self.recycled} recycled, {self.replaced} replaced, {self.spares_used} spares used, "
+            f"{self.cold_starts} cold starts, {self.timeouts} timeouts, "
+            f"{self.failed_health_checks}/{self.health_checks} failed health checks"
+        )
+
+
+@dataclass(eq=False)
+class PooledServer(Generic[Server]):
+    """A running server instance and the context it was entered with."""
+
+    server: Server
+    context: Any
+    number: int
+    requests: int = 0
+    in_flight: int = 0
+    consecutive_timeouts: int = 0
+    retiring: bool = False
+    started_at: float = field(default_factory=time.time)
+
+
+class ServerSlot(Generic[Server]):
+    """
+    Stable handle for one position of the pool.
+
+    Requests are sent to whatever instance currently backs the slot, the pool swaps it when the
+    instance is recycled or replaced so callers can keep holding on to the slot. The generation
+    changes every time the pool decides to swap the instance, while replacement is pending until
+    a cold-started instance is up.
+    """
+
+    def __init__(self, name: str, instance: PooledServer[Server]):
+        self.name = name
+        self.instance = instance
+        self.generation = 0
+        self.replacement: Optional["concurrent.futures.Future[None]"] = None
+
+    @property
+    def replacing(self) -> bool:
+        return self.replacement is not None
+
+    @property
+    def server(self) -> Server:
+        return self.instance.server
+
+
+class LspServerPool(Generic[Server]):
+    """
+    Keeps a fixed number of server instances running for one language, backed by warm spares.
+
+    Instances that fail a request, time out max_consecutive_timeouts requests in a row or fail a
+    liveness check are swapped for a spare instead of being restarted in place, instances are recycled
+    after max_requests_per_server requests to cap their memory growth, and spares are refilled in the
+    background. When no spare is warm the replacement is cold-started in the background too, only
+    requests to the slot being replaced wait for it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        start_server: Callable[[], Tuple[Server, Any]],
+        stop_server: Callable[[Server, Any], None],
+        is_alive: Callable[[Server], bool],
+        size: int,
+        spares: int = 1,
+        max_requests_per_server: Optional[int] = None,
+        health_check_interval: Optional[float] = 30.0,
+        max_consecutive_timeouts: int = 2,
+    ):
+        self.name = name
+        self.start_server = start_server
+        self.stop_server = stop_server
+        self.is_alive = is_alive
+        self.size = max(1, size)
+        self.spare_count = max(0, spares)
+        self.max_requests_per_server = max_requests_per_server
+        self.health_check_interval = health_check_interval
+        self.max_consecutive_timeouts = max(1, max_consecutive_timeouts)
+        self.stats = PoolStats(name=name)
+
+        self._slots: List[ServerSlot[Server]] = []
+        self._spares: List[PooledServer[Server]] = []
+        self._warming = 0
+        self._started_count = 0
+        self._closed = False
+        self._lock = threading.RLock()
+        self._background = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(2, self.spare_count + 1), thread_name_prefix=f"lsp-pool-{name}"
+        )
+        self._stop_health_checks = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def slots(self, count: Optional[int] = None) -> List[ServerSlot[Server]]:
+        """
+        Returns the first count slots of the pool, starting the missing instances concurrently.
+
+        Missing instances are taken from the warm spares first. The spares are refilled and the
+        health checks started in the background.
+        """
+        count = self.size if count is None else max(1, min(count, self.size))
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"LSP server pool {self.name} is shut down")
+
+            while len(self._slots) < count and self._spares:
+                self._add_slot(self._take_spare())
+            missing = count - len(self._slots)
+
+        if missing > 0:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=missing) as executor:
+                instances = list(executor.map(lambda _: self._start_instance(), range(missing)))
+            with self._lock:
+                for instance in instances:
+                    self._add_slot(instance)
+
+        self._refill_spares()
+        self._ensure_health_checks()
+
+        with self._lock:
+            return self._slots[:count]
+
+    def checkout(self, slot: ServerSlot[Server]) -> PooledServer[Server]:
+        """
+        Returns the instance a request should be sent to, pair every call with checkin.
+
+        Waits for the replacement of the slot first if one is being cold-started, other slots don't wait.
+        """
+        self._wait_for_replacement(slot)
+        with self._lock:
+            instance = slot.instance
+            instance.requests += 1
+            instance.in_flight += 1
+            self.stats.requests += 1
+
+            if self.max_requests_per_server and instance.requests >= self.max_requests_per_server:
+                self._recycle(slot)
+
+            return instance
+
+    def checkin(
+        self, slot: ServerSlot[Server], instance: PooledServer[Server], failed: bool = False, timed_out: bool = False
+    ) -> None:
+        """
+        Records the end of a request, a failed request replaces the instance if the slot still uses it.
+
+        A timed out request counts as failed once the instance timed out max_consecutive_timeouts
+        requests in a row, a wedged server keeps its process running and passes the liveness ping.
+        """
+        with self._lock:
+            instance.in_flight -= 1
+            if timed_out:
+                self.stats.timeouts += 1
+                instance.consecutive_timeouts += 1
+                if instance.consecutive_timeouts >= self.max_consecutive_timeouts:
+                    logger.warning(f"{slot.name} timed out {instance.consecutive_timeouts} requests in a row")
+                    failed = True
+            elif not failed:
+                instance.consecutive_timeouts = 0
+
+            if failed and slot.instance is instance and not slot.replacing:
+                logger.warning(f"Replacing {slot.name} after a failed request")
+                self._replace(slot)
+            self._stop_if_drained(instance)
+
+    def replace(self, server: Server) -> Optional[Server]:
+        """Swaps the instance running server for a spare, or a cold-started instance, and returns the new server."""
+        with self._lock:
+            slot = next((slot for slot in self._slots if slot.instance.server is server), None)
+            if slot is None:
+                return None
+            if not slot.replacing:
+                instance = slot.instance
+                self._replace(slot)
+                self._stop_if_drained(instance)
+
+        self._wait_for_replacement(slot)
+        return slot.server
+
+    def check_health(self) -> None:
+        """Pings every running instance and spare, and replaces the ones that don't answer."""
+        with self._lock:
+            slots = list(self._slots)
+            spares = list(self._spares)
+
+        for slot in slots:
+            instance = slot.instance
+            if self._ping(instance):
+                continue
+            logger.warning(f"{slot.name} failed its health check, replacing it")
+            with self._lock:
+                if slot.instance is instance and not slot.replacing:
+                    self._replace(slot)
+                self._stop_if_drained(instance)
+
+        for spare in spares:
+            if self._ping(spare):
+                continue
+            logger.warning(f"Warm spare #{spare.number} of {self.name} failed its health check, discarding it")
+            with self._lock:
+                if spare in self._spares:
+                    self._spares.remove(spare)
+                    self.stats.warm_spares = len(self._spares)
+                    self._stop_later(spare)
+
+        self._refill_spares()
+
+    def shutdown(self) -> None:
+        """Stops the health checks and every instance, including the spares."""
+        with self._lock:
+            self._closed = True
+            instances = [slot.instance for slot in self._slots] + self._spares
+            self._slots = []
+            self._spares = []
+            self.stats.warm_spares = 0
+
+        self._stop_health_checks.set()
+        if self._health_thread and self._health_thread is not threading.current_thread():
+            self._health_thread.join(timeout=5)
+
+        self._background.shutdown(wait=True)
+        for instance in instances:
+            self._stop_instance(instance)
+
+    def _add_slot(self, instance: PooledServer[Server]) -> None:
+        self._slots.append(ServerSlot(f"{self.name}#{len(self._slots) + 1}", instance))
+
+    def _take_spare(self) -> PooledServer[Server]:
+        spare = self._spares.pop(0)
+        self.stats.spares_used += 1
+        self.stats.warm_spares = len(self._spares)
+        return spare
+
+    def _recycle(self, slot: ServerSlot[Server]) -> None:
+        """Moves the slot to a spare once one is warm, the old instance finishes its in-flight requests first."""
+        if not self._spares:
+            self._refill_spares()
+            return
+
+        logger.info(f"Recycling {slot.name} after {slot.instance.requests} requests")
+        slot.instance.retiring = True
+        slot.instance = self._take_spare()
+        slot.generation += 1
+        self.stats.recycled += 1
+        self._refill_spares()
+
+    def _replace(self, slot: ServerSlot[Server]) -> None:
+        """Swaps in a spare, or cold-starts the replacement in the background when none is warm."""
+        slot.generation += 1
+        if not self._spares:
+            try:
+                slot.replacement = self._background.submit(self._cold_replace, slot, slot.instance)
+            except RuntimeError:
+                # The executor is shut down already
+                pass
+            return
+
+        slot.instance.retiring = True
+        slot.instance = self._take_spare()
+        self.stats.replaced += 1
+        self._refill_spares()
+
+    def _cold_replace(self, slot: ServerSlot[Server], instance: PooledServer[Server]) -> None:
+        try:
+            replacement = self._start_instance()
+        except Exception as e:
+            logger.warning(f"Could not replace {slot.name}, keeping the current instance: {e}")
+            with self._lock:
+                slot.replacement = None
+            return
+
+        with self._lock:
+            slot.replacement = None
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self.stats.cold_starts += 1
+                if slot.instance is instance:
+                    instance.retiring = True
+                    slot.instance = replacement
+                    self.stats.replaced += 1
+                    self._stop_if_drained(instance)
+                else:
+                    # The slot moved on in the meantime, keep the instance as a spare
+                    self._spares.append(replacement)
+                    self.stats.warm_spares = len(self._spares)
+        if closed:
+            self._stop_instance(replacement)
+            return
+        self._refill_spares()
+
+    def _wait_for_replacement(self, slot: ServerSlot[Server]) -> None:
+        replacement = slot.replacement
+        if replacement is not None:
+            concurrent.futures.wait([replacement])
+
+    def _stop_if_drained(self, instance: PooledServer[Server]) -> None:
+        if instance.retiring and instance.in_flight <= 0:
+            instance.retiring = False
+            self._stop_later(instance)
+
+    def _refill_spares(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.spare_count - len(self._spares) - self._warming
+            for _ in range(max(0, missing)):
+                self._warming += 1
+                self._background.submit(self._warm_spare)
+
+    def _warm_spare(self) -> None:
+        try:
+            spare = self._start_instance()
+        except Exception as e:
+            logger.warning(f"Could not start a warm spare for {self.name}: {e}")
+            with self._lock:
+                self._warming -= 1
+            return
+
+        with self._lock:
+            self._warming -= 1
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._spares.append(spare)
+                self.stats.warm_spares = len(self._spares)
+        if closed:
+            self._stop_instance(spare)
+
+    def _start_instance(self) -> PooledServer[Server]:
+        server, context = self.start_server()
+        with self._lock:
+            self._started_count += 1
+            self.stats.started += 1
+            number = self._started_count
+        logger.info(f"Started LSP server instance {number} for {self.name}")
+        return PooledServer(server=server, context=context, number=number)
+
+    def _stop_later(self, instance: PooledServer[Server]) -> None:
+        try:
+            self._background.submit(self._stop_instance, instance)
+        except RuntimeError:
+            # The executor is shut down already
+            self._stop_instance(instance)
+
+    def _stop_instance(self, instance: PooledServer[Server]) -> None:
+        try:
+            self.stop_server(instance.server, instance.context)
+        except Exception as e:
+            logger.warning(f"Error stopping LSP server instance {instance.number} for {self.name}: {e}")
+        with self._lock:
+            self.stats.stopped += 1
+
+    def _ping(self, instance: PooledServer[Server]) -> bool:
+        with self._lock:
+            self.stats.health_checks += 1
+        try:
+            alive = self.is_alive(instance.server)
+        except Exception:
+            alive = False
+        if not alive:
+            with self._lock:
+                self.stats.failed_health_checks += 1
+        return alive
+
+    def _ensure_health_checks(self) -> None:
+        if not self.health_check_interval:
+            return
+        with self._lock:
+            if self._health_thread is not None or self._closed:
+                return
+            self._health_thread = threading.Thread(
+                target=self._run_health_checks, name=f"lsp-pool-{self.name}-health", daemon=True
+            )
+            self._health_thread.start()
+
+    def _run_health_checks(self) -> None:
+        while not self._stop_health_checks.wait(self.health_check_interval):
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.warning(f"Health check of the {self.name} pool failed: {e}")
@@ -0,0 +1,280 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Set
+
+from blarify.utils.path_calculator import PathCalculator
+from .scip_index_manifest import ScipIndexManifest
+from .types.Reference import Reference
+
+if TYPE_CHECKING:
+    from blarify.graph.node import DefinitionNode
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored references or the way they are resolved change, so stale entries stop matching
+REFERENCE_CACHE_FORMAT_VERSION = "1"
+
+IDENTIFIER_PATTERN = re.compile(rb"[A-Za-z_$][A-Za-z0-9_$]*")
+
+# SQLite limits the number of parameters of a statement
+_MAX_PARAMETERS = 500
+
+
+def _get_source_extensions() -> List[str]:
+    from blarify.code_hierarchy.languages import (
+        PythonDefinitions,
+        JavascriptDefinitions,
+        RubyDefinitions,
+        TypescriptDefinitions,
+        CsharpDefinitions,
+        GoDefinitions,
+        PhpDefinitions,
+        JavaDefinitions,
+    )
+
+    extensions: Set[str] = set()
+    for definitions in (
+        PythonDefinitions,
+        JavascriptDefinitions,
+        RubyDefinitions,
+        TypescriptDefinitions,
+        CsharpDefinitions,
+        GoDefinitions,
+        PhpDefinitions,
+        JavaDefinitions,
+    ):
+        extensions.update(definitions.get_language_file_extensions())
+    return sorted(extensions)
+
+
+def _chunks(values: Sequence[str], size: int = _MAX_PARAMETERS) -> Iterable[Sequence[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+@dataclass
+class ReferenceCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidated: int = 0
+    seconds_per_definition: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def time_saved(self) -> float:
+        """Estimated seconds the resolvers would have spent on the cache hits."""
+        return self.hits * self.seconds_per_definition
+
+
+class ReferenceCache:
+    """
+    Opt-in on-disk cache of the references of every definition, reused across builds.
+
+    Entries are valid as long as the project fingerprint, made of the content hashes of the
+    source files, doesn't change. When files change only the entries they can affect are dropped:
+    definitions in the changed files, definitions referenced from them and definitions whose name
+    appears in them, since a new reference has to spell the name out.
+    """
+
+    # Past this share of changed files it is cheaper to start over than to scan them
+    MAX_CHANGED_FILES_RATIO = 0.25
+
+    def __init__(self, cache_dir: str, root_path: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.root_path = PathCalculator.uri_to_path(root_path)
+        self.stats = ReferenceCacheStats()
+
+        self._manifest = ScipIndexManifest(
+            os.path.join(cache_dir, f"references.v{REFERENCE_CACHE_FORMAT_VERSION}"),
+            self.root_path,
+            _get_source_extensions(),
+        )
+        self._resolve_seconds = 0.0
+        self._resolved = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            os.path.join(cache_dir, "reference_cache.sqlite"), check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries (namespace TEXT NOT NULL, definition_id TEXT NOT NULL, "
+            "path TEXT NOT NULL, name TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (namespace, definition_id))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_path ON entries (path)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_name ON entries (name)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS referencing_files "
+            "(namespace TEXT NOT NULL, definition_id TEXT NOT NULL, path TEXT NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS referencing_files_path ON referencing_files (path)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        self.stats.seconds_per_definition = float(self._get_meta("seconds_per_definition") or 0.0)
+
+    def refresh(self, changed_files: Optional[List[str]] = None) -> None:
+        """
+        Drops the entries the source changes since the last build can affect.
+
+        Args:
+            changed_files: Absolute paths or uris of the files known to have changed, the whole
+                project is checked when None
+        """
+        with self._lock:
+            if self._get_meta("fingerprint") != self._manifest.get_fingerprint() or not self._manifest.exists:
+                # The entries don't match the recorded sources, nothing in them can be trusted
+                self._manifest.refresh()
+                self._clear()
+            else:
+                paths = [PathCalculator.uri_to_path(path) for path in changed_files] if changed_files else None
+                if changed_files is not None and not paths:
+                    return
+                changed = self._manifest.refresh(paths)
+                if not changed:
+                    logger.info("Reference cache: no source changes since the last build")
+                    return
+                self._invalidate(changed)
+
+            self._manifest.save()
+            self._set_meta("fingerprint", self._manifest.get_fingerprint())
+
+    def get_many(self, namespace: str, nodes: Sequence["DefinitionNode"]) -> Dict["DefinitionNode", List[Reference]]:
+        """Returns the cached references of the nodes found in the cache."""
+        nodes_by_id = {node.id: node for node in nodes}
+        results: Dict["DefinitionNode", List[Reference]] = {}
+
+        with self._lock:
+            for ids in _chunks(list(nodes_by_id)):
+                rows = self._connection.execute(
+                    f"SELECT definition_id, value FROM entries WHERE namespace = ? "
+                    f"AND definition_id IN ({', '.join('?' * len(ids))})",
+                    (namespace, *ids),
+                ).fetchall()
+                for definition_id, value in rows:
+                    results[nodes_by_id[definition_id]] = self._decode(value)
+
+            self.stats.hits += len(results)
+            self.stats.misses += len(nodes_by_id) - len(results)
+        return results
+
+    def set_many(
+        self, namespace: str, results: Dict["DefinitionNode", List[Reference]], resolve_seconds: float
+    ) -> None:
+        """
+        Stores freshly resolved references.
+
+        Args:
+            resolve_seconds: Time it took to resolve them, used to estimate the time saved by hits
+        """
+        if not results:
+            return
+
+        with self._lock:
+            self._connection.execute("BEGIN")
+            for node, references in results.items():
+                key = (namespace, node.id)
+                self._connection.execute("DELETE FROM referencing_files WHERE namespace = ? AND definition_id = ?", key)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, definition_id, path, name, value) VALUES (?, ?, ?, ?, ?)",
+                    (*key, self._relative_path(node.path), node.name, sqlite3.Binary(self._encode(references))),
+                )
+                self._connection.executemany(
+                    "INSERT INTO referencing_files (namespace, definition_id, path) VALUES (?, ?, ?)",
+                    [(*key, path) for path in {self._relative_path(reference.uri) for reference in references}],
+                )
+            self._connection.execute("COMMIT")
+
+            self._resolve_seconds += resolve_seconds
+            self._resolved += len(results)
+            self.stats.seconds_per_definition = self._resolve_seconds / self._resolved
+            self._set_meta("seconds_per_definition", str(self.stats.seconds_per_definition))
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"Reference cache: {self.stats.hits} hits, {self.stats.misses} misses "
+            f"({100 * self.stats.hit_rate:.1f}% hit rate), {self.stats.invalidated} invalidated, "
+            f"~{self.stats.time_saved:.1f}s saved"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _invalidate(self, changed: List[str]) -> None:
+        if len(changed) > max(1, self._manifest.file_count * self.MAX_CHANGED_FILES_RATIO):
+            logger.info(f"Reference cache: {len(changed)} source files changed, starting over")
+            self._clear()
+            return
+
+        names: Set[str] = set()
+        for relative_path in changed:
+            try:
+                with open(os.path.join(self.root_path, relative_path), "rb") as f:
+                    names.update(token.decode("ascii") for token in IDENTIFIER_PATTERN.findall(f.read()))
+            except OSError:
+                # Deleted, its references are dropped through referencing_files
+                continue
+
+        before = self._count_entries()
+        self._connection.execute("BEGIN")
+        for paths in _chunks(changed):
+            placeholders = ", ".join("?" * len(paths))
+            self._connection.execute(f"DELETE FROM entries WHERE path IN ({placeholders})", paths)
+            self._connection.execute(
+                f"DELETE FROM entries WHERE (namespace, definition_id) IN "
+                f"(SELECT namespace, definition_id FROM referencing_files WHERE path IN ({placeholders}))",
+                paths,
+            )
+        for chunk in _chunks(sorted(names)):
+            self._connection.execute(f"DELETE FROM entries WHERE name IN ({', '.join('?' * len(chunk))})", chunk)
+        self._connection.execute(
+            "DELETE FROM referencing_files WHERE NOT EXISTS (SELECT 1 FROM entries WHERE "
+            "entries.namespace = referencing_files.namespace AND entries.definition_id = referencing_files.definition_id)"
+        )
+        self._connection.execute("COMMIT")
+
+        self.stats.invalidated += before - self._count_entries()
+        logger.info(
+            f"Reference cache: {len(changed)} source files changed, {self.stats.invalidated} entries invalidated"
+        )
+
+    def _clear(self) -> None:
+        self.stats.invalidated += self._count_entries()
+        self._connection.execute("DELETE FROM entries")
+        self._connection.execute("DELETE FROM referencing_files")
+
+    def _count_entries(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _relative_path(self, uri: str) -> str:
+        return os.path.relpath(PathCalculator.uri_to_path(uri), self.root_path)
+
+    @staticmethod
+    def _encode(references: List[Reference]) -> bytes:
+        return zlib.compress(
+            json.dumps([[reference.uri, *reference.to_range_tuple()] for reference in references]).encode("utf-8")
+        )
+
+    @staticmethod
+    def _decode(value: bytes) -> List[Reference]:
+        return [
+            Reference.from_range_tuple((start_line, start_character, end_line, end_character), uri)
+            for uri, start_line, start_character, end_line, end_character in json.loads(zlib.decompress(value))
+        ]
@@ -11,13 +11,17 @@ while maintaining identical accuracy.
 import os
 import logging
 from typing import Dict, List, Optional, TYPE_CHECKING, Any
-from pathlib import Path
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from blarify.graph.node import DefinitionNode
+from blarify.utils.path_prefix_trie import PathPrefixTrie
 from .types.Reference import Reference
 from .lsp_helper import ProgressTracker
+from .scip_index_manifest import ScipIndexManifest
+from .scip_lookup_table import NO_POSITION, ScipLookupTable
 
 logger = logging.getLogger(__name__)
 
@@ -116,24 +120,51 @@ if not scip_available:
         "  3. Or install protobuf: pip install protobuf>=6.30.0"
     )
 
+# Resolved once, protobuf enum attribute lookups are slow in the per-occurrence loops
+DEFINITION_ROLE: int = scip.SymbolRole.Definition  # type: ignore[union-attr]
+ACCESS_ROLES: int = (
+    scip.SymbolRole.ReadAccess  # type: ignore[union-attr]
+    | scip.SymbolRole.WriteAccess  # type: ignore[union-attr]
+    | scip.SymbolRole.Import  # type: ignore[union-attr]
+)
+
+# A symbol resolved in the lookup table of the index holding it
+TableSymbol: TypeAlias = tuple[ScipLookupTable, int]
+
+
+def _parse_index(data: bytes) -> ScipIndex:
+    index = scip.Index()  # type: ignore[union-attr]
+    index.ParseFromString(data)
+    return index
+
+
+def _compile_lookup_table(index_path: str) -> Optional[bytes]:
+    # Module level so process pool workers can run it
+    return ScipLookupTable.compile_file(index_path, _parse_index)
+
 
 class ScipReferenceResolver:
     """Fast reference resolution using SCIP (Source Code Intelligence Protocol) index."""
 
-    def __init__(self, root_path: str, scip_index_path: Optional[str] = None, language: Optional[str] = None):
+    def __init__(
+        self,
+        root_path: str,
+        scip_index_path: Optional[str] = None,
+        language: Optional[str] = None,
+        index_load_workers: Optional[int] = None,
+    ):
         self.root_path = root_path
         self.scip_index_path = scip_index_path or os.path.join(root_path, "index.scip")
         self.language = language or self._detect_project_language()
-        self._index: Optional[ScipIndex] = None
-        self._symbol_to_occurrences: Dict[str, List[ScipOccurrence]] = {}
-        self._document_by_path: Dict[str, ScipDocument] = {}
-        self._occurrence_to_document: Dict[int, ScipDocument] = {}  # Use id() as key
+        self.index_load_workers = index_load_workers or os.cpu_count() or 1
+        self._table: Optional[ScipLookupTable] = None
         self._loaded = False
 
         self._monorepo_mode = False
-        self._package_indexes: Dict[str, tuple[ScipIndex, Dict[str, List[ScipOccurrence]], Dict[str, ScipDocument], Dict[int, ScipDocument], Dict[int, str]]] = {}
+        self._package_tables: Dict[str, ScipLookupTable] = {}
+        self._package_roots: PathPrefixTrie[str] = PathPrefixTrie()
         self._path_to_package: Dict[str, str] = {}
-        self._occurrence_to_repo_path: Dict[int, str] = {}
+        self._document_uris: Dict[str, str] = {}
 
     def _detect_project_language(self) -> str:
         """Auto-detect the project language."""
@@ -342,9 +373,7 @@ class ScipReferenceResolver:
             load_time = time.time() - start_time
 
             # Check if any indexes were loaded (either single or monorepo)
-            total_docs = len(self._document_by_path) if not self._monorepo_mode else sum(
-                len(data[2]) for data in self._package_indexes.values()
-            )
+            total_docs = sum(len(table.get_document_paths()) for table in self._get_loaded_tables())
 
             if total_docs == 0:
                 logger.warning("No SCIP indexes found or loaded")
@@ -360,7 +389,7 @@ class ScipReferenceResolver:
             return False
 
     def _load_index(self):
-        """Load and parse the SCIP index file(s). Detects and handles monorepos."""
+        """Load the SCIP index file(s). Detects and handles monorepos."""
         if self.language in ["typescript", "javascript"]:
             tsconfig_files = self._find_all_tsconfigs()
 
@@ -371,18 +400,17 @@ class ScipReferenceResolver:
                 return
 
         if os.path.exists(self.scip_index_path):
-            with open(self.scip_index_path, "rb") as f:
-                data = f.read()
-
-            self._index = scip.Index()  # type: ignore[union-attr]
-            self._index.ParseFromString(data)  # type: ignore[union-attr]
-
-            self._symbol_to_occurrences, self._document_by_path, self._occurrence_to_document, self._occurrence_to_repo_path = self._build_lookup_tables(self._index)
+            self._table = self._load_lookup_table(self.scip_index_path)
         else:
             logger.warning(f"SCIP index not found at {self.scip_index_path}")
 
     def _load_multiple_indexes(self, tsconfig_files: List[tuple[str, str]]) -> None:
-        """Load multiple SCIP indexes for monorepo support."""
+        """Load multiple SCIP indexes for monorepo support.
+
+        Packages without an up to date compiled lookup table are compiled concurrently in a process
+        pool, the tables are then memory-mapped so every process shares the same pages.
+        """
+        index_paths: Dict[str, str] = {}
         for package_root, _ in tsconfig_files:
             index_path = os.path.join(package_root, "index.scip")
 
@@ -390,141 +418,237 @@ class ScipReferenceResolver:
                 logger.warning(f"Index not found for package at {package_root}, skipping")
                 continue
 
-            try:
-                with open(index_path, "rb") as f:
-                    data = f.read()
+            index_paths[package_root] = index_path
+
+        packages_to_compile = {
+            package_root: index_path
+            for package_root, index_path in index_paths.items()
+            if not ScipLookupTable.is_compiled(index_path)
+        }
+        compiled_tables = self._compile_package_tables(packages_to_compile)
 
-                index = scip.Index()  # type: ignore[union-attr]
-                index.ParseFromString(data)
+        for package_root, index_path in index_paths.items():
+            if package_root in packages_to_compile and package_root not in compiled_tables:
+                continue
 
-                symbol_to_occurrences, document_by_path, occurrence_to_document, occurrence_to_repo_path = self._build_lookup_tables(index, package_root)
+            try:
+                path_prefix = os.path.relpath(package_root, self.root_path)
+                compiled = compiled_tables.get(package_root)
+                if compiled is not None:
+                    table = ScipLookupTable(memoryview(compiled), path_prefix=path_prefix)
+                else:
+                    table = ScipLookupTable.load_compiled(index_path, path_prefix=path_prefix)
 
-                self._package_indexes[package_root] = (index, symbol_to_occurrences, document_by_path, occurrence_to_document, occurrence_to_repo_path)
+                self._package_tables[package_root] = table
+                self._package_roots.insert(package_root, package_root)
 
-                for doc_path in document_by_path.keys():
+                document_paths = table.get_document_paths()
+                for doc_path in document_paths:
                     full_path = os.path.join(self.root_path, doc_path)
                     self._path_to_package[full_path] = package_root
 
-                logger.info(f"Loaded index for package at {package_root}: {len(document_by_path)} documents")
+                logger.info(f"Loaded index for package at {package_root}: {len(document_paths)} documents")
 
             except Exception as e:
                 logger.error(f"Failed to load index for package at {package_root}: {e}")
 
-    def _get_index_for_path(self, file_path: str) -> Optional[tuple[Dict[str, List[ScipOccurrence]], Dict[str, ScipDocument], Dict[int, ScipDocument], Dict[int, str]]]:
-        """Get the correct index data for a given file path in monorepo mode.
+    def _compile_package_tables(self, index_paths: Dict[str, str]) -> Dict[str, Optional[bytes]]:
+        """Compile the lookup tables of several package indexes, in parallel when there is more than one.
+
+        Args:
+            index_paths: Dictionary mapping package_root to index_path
+
+        Returns:
+            Dictionary mapping package_root to the result of ScipLookupTable.compile_file for the
+            packages that compiled successfully
+        """
+        results: Dict[str, Optional[bytes]] = {}
+        if not index_paths:
+            return results
+
+        start_time = time.time()
+        max_workers = min(self.index_load_workers, len(index_paths))
+
+        if max_workers <= 1:
+            for package_root, index_path in index_paths.items():
+                try:
+                    results[package_root] = _compile_lookup_table(index_path)
+                except Exception as e:
+                    logger.error(f"Failed to load index for package at {package_root}: {e}")
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                future_to_package = {
+                    executor.submit(_compile_lookup_table, index_path): package_root
+                    for package_root, index_path in index_paths.items()
+                }
+
+                for future in as_completed(future_to_package):
+                    package_root = future_to_package[future]
+                    try:
+                        results[package_root] = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to load index for package at {package_root}: {e}")
+
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"Compiled {len(results)}/{len(index_paths)} SCIP lookup tables in {elapsed_time:.2f}s "
+            f"with {max_workers} workers"
+        )
+        return results
+
+    def _get_loaded_tables(self) -> List[ScipLookupTable]:
+        if self._monorepo_mode:
+            return list(self._package_tables.values())
+        return [self._table] if self._table else []
+
+    def _get_table_for_path(self, file_path: str) -> Optional[ScipLookupTable]:
+        """Get the lookup table holding a given file path.
 
         Args:
             file_path: Absolute file path
 
         Returns:
-            Tuple of (symbol_to_occurrences, document_by_path, occurrence_to_document, occurrence_to_repo_path) or None if not found
+            The lookup table of the index covering the file, or None if not found
         """
         if not self._monorepo_mode:
-            return (self._symbol_to_occurrences, self._document_by_path, self._occurrence_to_document, self._occurrence_to_repo_path)
+            return self._table
 
-        package_roots = sorted(self._package_indexes.keys(), key=len, reverse=True)
-        for package_root in package_roots:
-            if file_path.startswith(package_root):
-                _, symbol_map, doc_map, occ_map, repo_path_map = self._package_indexes[package_root]
-                return (symbol_map, doc_map, occ_map, repo_path_map)
+        package_root = self._get_package_root_for_path(file_path)
+        if package_root:
+            return self._package_tables[package_root]
 
         logger.warning(f"No index found for file path: {file_path}")
         return None
 
-    def _build_lookup_tables(self, index: ScipIndex, package_root: Optional[str] = None) -> tuple[Dict[str, List[ScipOccurrence]], Dict[str, ScipDocument], Dict[int, ScipDocument], Dict[int, str]]:
-        """Build efficient lookup tables from a SCIP index.
+    def _get_package_root_for_path(self, file_path: str) -> Optional[str]:
+        return self._package_roots.longest_prefix_value(file_path)
+
+    def _load_lookup_table(self, index_path: str, package_root: Optional[str] = None) -> ScipLookupTable:
+        """Memory-map the compiled lookup table of a SCIP index, compiling it on first use.
 
         Args:
-            index: The SCIP index to build lookup tables from
+            index_path: Path to the index.scip file
             package_root: Package root for monorepo normalization (paths will be made relative to self.root_path)
 
         Returns:
-            Tuple of (symbol_to_occurrences, document_by_path, occurrence_to_document, occurrence_to_repo_path)
+            The lookup table, with document paths relative to self.root_path
         """
-        symbol_to_occurrences: Dict[str, List[ScipOccurrence]] = {}
-        document_by_path: Dict[str, ScipDocument] = {}
-        occurrence_to_document: Dict[int, ScipDocument] = {}
-        occurrence_to_repo_path: Dict[int, str] = {}
+        path_prefix = os.path.relpath(package_root, self.root_path) if package_root else None
+        return ScipLookupTable.load_or_build(index_path, _parse_index, path_prefix=path_prefix)
 
-        for document in index.documents:
-            if package_root:
-                package_relative_to_repo = os.path.relpath(package_root, self.root_path)
-                normalized_path = os.path.join(package_relative_to_repo, document.relative_path)
-            else:
-                normalized_path = document.relative_path
+    def generate_index_if_needed(self, project_name: str = "blarify", changed_files: Optional[List[str]] = None) -> bool:
+        """Generate SCIP index if it doesn't exist or its sources changed.
 
-            document_by_path[normalized_path] = document
+        Changes are detected against a content-hash manifest saved next to each index, so files
+        that were only touched don't trigger a reindex.
 
-            for occurrence in document.occurrences:
-                if occurrence.symbol not in symbol_to_occurrences:
-                    symbol_to_occurrences[occurrence.symbol] = []
-                symbol_to_occurrences[occurrence.symbol].append(occurrence)
-                occurrence_to_document[id(occurrence)] = document
-                occurrence_to_repo_path[id(occurrence)] = normalized_path
-
-        return symbol_to_occurrences, document_by_path, occurrence_to_document, occurrence_to_repo_path
+        Args:
+            project_name: Name of the project
+            changed_files: Paths or file URIs known to have changed since the last run. When given,
+                only these files are checked instead of walking the whole tree.
+        """
+        changed_paths = [path.replace("file://", "") for path in changed_files] if changed_files is not None else None
 
-    def generate_index_if_needed(self, project_name: str = "blarify") -> bool:
-        """Generate SCIP index if it doesn't exist or is outdated."""
         # Check for monorepo
         if self.language in ["typescript", "javascript"]:
             tsconfig_files = self._find_all_tsconfigs()
 
             if len(tsconfig_files) > 1:
                 logger.info(f"Detected TypeScript monorepo with {len(tsconfig_files)} packages")
-                return self._generate_indexes_if_needed_monorepo(tsconfig_files)
+                return self._generate_indexes_if_needed_monorepo(tsconfig_files, changed_paths)
 
         # Single index project
-        if os.path.exists(self.scip_index_path):
-            # Check if index is newer than source files (simple heuristic)
-            index_mtime = os.path.getmtime(self.scip_index_path)
+        manifest = ScipIndexManifest(self.scip_index_path, self.root_path, self._get_source_extensions())
+        if self._is_index_up_to_date(self.scip_index_path, manifest, changed_paths):
+            logger.info(f"📚 SCIP index for {self.language} is up to date")
+            return True
 
-            # Get appropriate file extensions based on language
-            if self.language == "python":
-                source_files = list(Path(self.root_path).rglob("*.py"))
-            elif self.language in ["typescript", "javascript"]:
-                source_files = []
-                for ext in ["*.ts", "*.tsx", "*.js", "*.jsx"]:
-                    source_files.extend(list(Path(self.root_path).rglob(ext)))
-            else:
-                source_files = list(Path(self.root_path).rglob("*.py"))  # Default to Python
+        logger.info(f"🔄 Generating SCIP index for {self.language}...")
+        if not self._generate_index(project_name):
+            return False
 
-            if source_files:
-                newest_source = max(os.path.getmtime(f) for f in source_files)
-                if index_mtime > newest_source:
-                    logger.info(f"📚 SCIP index for {self.language} is up to date")
-                    return True
+        manifest.save()
+        return True
 
-        logger.info(f"🔄 Generating SCIP index for {self.language}...")
-        return self._generate_index(project_name)
+    def _get_source_extensions(self) -> List[str]:
+        if self.language in ["typescript", "javascript"]:
+            return [".ts", ".tsx", ".js", ".jsx"]
+        return [".py"]  # Default to Python
+
+    def _is_index_up_to_date(
+        self, index_path: str, manifest: ScipIndexManifest, changed_paths: Optional[List[str]]
+    ) -> bool:
+        """Check an index against its manifest, refreshing the manifest with the current sources.
 
-    def _generate_indexes_if_needed_monorepo(self, tsconfig_files: List[tuple[str, str]]) -> bool:
+        Args:
+            index_path: Path to the index.scip file
+            manifest: Manifest of the sources the index was generated from
+            changed_paths: Absolute paths known to have changed, or None to check every source file
+
+        Returns:
+            True if the index exists and none of its sources changed
+        """
+        if not os.path.exists(index_path):
+            manifest.refresh()
+            return False
+
+        if manifest.exists:
+            changed = manifest.refresh(changed_paths)
+            if changed:
+                logger.info(f"{len(changed)} source files changed since {index_path} was generated")
+                return False
+            manifest.save()
+            return True
+
+        # Index generated before manifests existed, fall back to comparing mtimes once
+        manifest.refresh()
+        if manifest.get_newest_mtime_ns() < os.stat(index_path).st_mtime_ns:
+            manifest.save()
+            return True
+        return False
+
+    def _generate_indexes_if_needed_monorepo(
+        self, tsconfig_files: List[tuple[str, str]], changed_paths: Optional[List[str]] = None
+    ) -> bool:
         """Generate SCIP indexes for monorepo packages only if needed.
 
+        Only the packages whose sources changed are reindexed, the compiled lookup tables of the
+        other packages are kept as they are.
+
         Args:
             tsconfig_files: List of (package_root, tsconfig_path) tuples
+            changed_paths: Absolute paths known to have changed, or None to check every source file
 
         Returns:
             True if all indexes exist and are up to date or were successfully generated
         """
+        package_roots: PathPrefixTrie[str] = PathPrefixTrie()
+        for package_root, _ in tsconfig_files:
+            package_roots.insert(package_root, package_root)
+
+        changed_paths_by_package: Dict[str, List[str]] = {}
+        for path in changed_paths or []:
+            package_root = package_roots.longest_prefix_value(path)
+            if package_root:
+                changed_paths_by_package.setdefault(package_root, []).append(path)
+
         packages_needing_update: List[tuple[str, str]] = []
+        manifests: Dict[str, ScipIndexManifest] = {}
 
         for package_root, tsconfig_path in tsconfig_files:
             index_path = os.path.join(package_root, "index.scip")
+            manifest = ScipIndexManifest(index_path, package_root, self._get_source_extensions())
+            package_changed_paths = (
+                changed_paths_by_package.get(package_root, []) if changed_paths is not None else None
+            )
 
-            if os.path.exists(index_path):
-                # Check if index is newer than source files in this package
-                index_mtime = os.path.getmtime(index_path)
-                source_files = []
-                for ext in ["*.ts", "*.tsx", "*.js", "*.jsx"]:
-                    source_files.extend(list(Path(package_root).rglob(ext)))
-
-                if source_files:
-                    newest_source = max(os.path.getmtime(f) for f in source_files)
-                    if index_mtime > newest_source:
-                        logger.info(f"📚 SCIP index for {os.path.basename(package_root)} is up to date")
-                        continue
+            if self._is_index_up_to_date(index_path, manifest, package_changed_paths):
+                logger.info(f"📚 SCIP index for {os.path.basename(package_root)} is up to date")
+                continue
 
+            manifests[package_root] = manifest
             packages_needing_update.append((package_root, tsconfig_path))
 
         if not packages_needing_update:
@@ -534,6 +658,9 @@ class ScipReferenceResolver:
         logger.info(f"🔄 Generating SCIP indexes for {len(packages_needing_update)} packages...")
         index_mapping = self._generate_indexes_parallel(packages_needing_update, max_workers=4)
 
+        for package_root in index_mapping:
+            manifests[package_root].save()
+
         return len(index_mapping) == len(packages_needing_update)
 
     def _generate_index(self, project_name: str, tsconfig_path: Optional[str] = None, package_root: Optional[str] = None, output_path: Optional[str] = None) -> bool:
@@ -637,29 +764,11 @@ class ScipReferenceResolver:
             return []
 
         # Find the symbol for this node
-        symbol = self._find_symbol_for_node(node)
-        if not symbol:
+        table_symbol = self._find_table_symbol_for_node(node)
+        if not table_symbol:
             return []
 
-        # Get all occurrences of this symbol
-        occurrences = self._symbol_to_occurrences.get(symbol, [])
-        references = []
-
-        for occurrence in occurrences:
-            # Use the helper function to check if this is a reference
-            if not self._is_reference_occurrence(occurrence):
-                continue
-
-            # Find the document for this occurrence
-            doc = self._find_document_for_occurrence(occurrence)
-            if not doc:
-                continue
-
-            # Convert SCIP occurrence to Reference
-            ref = self._occurrence_to_reference(occurrence, doc)
-            if ref:
-                references.append(ref)
-        return references
+        return self._get_references_for_symbol_index(*table_symbol)
 
     def get_references_batch(self, nodes: List[DefinitionNode]) -> Dict[DefinitionNode, List[Reference]]:
         """Get references for multiple nodes efficiently using SCIP index."""
@@ -681,7 +790,7 @@ class ScipReferenceResolver:
         total_nodes = len(nodes)
         logger.info(f"🚀 Starting SCIP reference queries for {total_nodes} nodes")
 
-        # Pre-compute symbols for all nodes to avoid repeated path calculations
+        # Pre-compute symbols for all nodes, resolving the nodes of each document in one pass
         logger.info("📝 Pre-computing symbol mappings...")
         node_to_symbol = self._batch_find_symbols_for_nodes(nodes)
         nodes_with_symbols = [node for node, symbol in node_to_symbol.items() if symbol is not None]
@@ -699,10 +808,9 @@ class ScipReferenceResolver:
             batch = nodes_with_symbols[i : i + batch_size]
 
             for node in batch:
-                symbol = node_to_symbol[node]
-                if symbol is not None:
-                    file_path = node.path.replace("file://", "")
-                    results[node] = self._get_references_for_symbol(symbol, file_path)
+                table_symbol = node_to_symbol[node]
+                if table_symbol is not None:
+                    results[node] = self._get_references_for_symbol_index(*table_symbol)
                 else:
                     results[node] = []  # No symbol found for this node
                 progress.update(1)
@@ -713,111 +821,165 @@ class ScipReferenceResolver:
         progress.complete()
         return results
 
+    def get_definition_paths_for_references(self, references: List[Reference]) -> List[Optional[str]]:
+        """Find the file defining the symbol used at each reference, like an LSP definition request.
+
+        References are grouped by document, so each lookup table scans its occurrences once.
+
+        Args:
+            references: References whose start is the position of the symbol
+
+        Returns:
+            The uri of the file holding the definition of each reference, in order, "" when the symbol
+            is defined outside the indexes and None when the reference isn't indexed
+        """
+        from blarify.utils.path_calculator import PathCalculator
+
+        definition_paths: List[Optional[str]] = [None] * len(references)
+        if not references or not self.ensure_loaded():
+            return definition_paths
+
+        reference_indexes_by_table: Dict[ScipLookupTable, Dict[int, List[int]]] = {}
+        for index, reference in enumerate(references):
+            table = self._get_table_for_path(PathCalculator.uri_to_path(reference.uri))
+            if not table:
+                continue
+
+            relative_path = PathCalculator.get_relative_path_from_uri(
+                root_uri=f"file://{self.root_path}", uri=reference.uri
+            )
+            document_index = table.find_document(relative_path)
+            if document_index is not None:
+                reference_indexes_by_table.setdefault(table, {}).setdefault(document_index, []).append(index)
+
+        for table, reference_indexes_by_document in reference_indexes_by_table.items():
+            table.load_occurrence_symbols(reference_indexes_by_document)
+            definition_uris: Dict[int, str] = {}
+
+            for document_index, reference_indexes in reference_indexes_by_document.items():
+                occurrence_symbols = table.get_occurrence_symbols(document_index)
+                for index in reference_indexes:
+                    start = references[index].range.start
+                    symbol_index = occurrence_symbols.get((start.line, start.character))
+                    if symbol_index is None:
+                        continue
+
+                    if symbol_index not in definition_uris:
+                        definition_uris[symbol_index] = self._find_definition_uri(table, symbol_index)
+                    definition_paths[index] = definition_uris[symbol_index]
+
+        return definition_paths
+
+    def _find_definition_uri(self, table: ScipLookupTable, symbol_index: int) -> str:
+        """Get the uri of the file defining a symbol, looking in the other packages' tables in monorepo mode."""
+        definition_document = table.find_definition_document(symbol_index)
+        if definition_document is not None:
+            return self._get_document_uri(table.get_document_path(definition_document))
+
+        if self._monorepo_mode:
+            symbol = table.get_symbol(symbol_index)
+            for other_table in self._get_loaded_tables():
+                if other_table is table:
+                    continue
+                other_symbol_index = other_table.find_symbol(symbol)
+                if other_symbol_index is None:
+                    continue
+                definition_document = other_table.find_definition_document(other_symbol_index)
+                if definition_document is not None:
+                    return self._get_document_uri(other_table.get_document_path(definition_document))
+
+        return ""
+
     def _find_symbol_for_node(self, node: DefinitionNode) -> Optional[str]:
         """Find the SCIP symbol identifier for a given node."""
+        table_symbol = self._find_table_symbol_for_node(node)
+        if not table_symbol:
+            return None
+
+        table, symbol_index = table_symbol
+        return table.get_symbol(symbol_index)
+
+    def _find_table_symbol_for_node(self, node: DefinitionNode) -> Optional[TableSymbol]:
+        """Find the lookup table and symbol index defined by a given node."""
         from blarify.utils.path_calculator import PathCalculator
 
         file_path = node.path.replace("file://", "")
-        index_data = self._get_index_for_path(file_path)
+        table = self._get_table_for_path(file_path)
 
-        if not index_data:
+        if not table:
             return None
 
-        _, document_by_path, _, _ = index_data
-
         relative_path = PathCalculator.get_relative_path_from_uri(root_uri=f"file://{self.root_path}", uri=node.path)
-        document = document_by_path.get(relative_path)
+        document_index = table.find_document(relative_path)
 
-        if not document:
+        if document_index is None:
             return None
 
-        for occurrence in document.occurrences:
-            if not (occurrence.symbol_roles & scip.SymbolRole.Definition):  # type: ignore[union-attr]
-                continue
-
-            if (
-                occurrence.range
-                and len(occurrence.range) >= 2
-                and occurrence.range[0] == node.definition_range.start_dict["line"]
-                and occurrence.range[1] == node.definition_range.start_dict["character"]
-            ):
-                return occurrence.symbol
+        position_to_symbol = self._build_position_to_symbol_map(table, document_index)
+        symbol_index = position_to_symbol.get(self._get_definition_position(node))
+        return (table, symbol_index) if symbol_index is not None else None
 
-        return None
+    def _get_definition_position(self, node: DefinitionNode) -> tuple[int, int]:
+        start = node.definition_range.start_dict
+        return (start["line"], start["character"])
 
-    def _build_position_to_symbol_map(self, document: ScipDocument) -> Dict[tuple[int, int], str]:
-        """Build a position-to-symbol mapping for a document.
+    def _build_position_to_symbol_map(self, table: ScipLookupTable, document_index: int) -> Dict[tuple[int, int], int]:
+        """Get the position-to-symbol mapping of a document, built once per document.
 
         Args:
-            document: The SCIP document to process
+            table: The lookup table holding the document
+            document_index: Index of the document in the table
 
         Returns:
-            Dictionary mapping (line, character) to symbol
+            Dictionary mapping (line, character) to the symbol index
         """
-        position_to_symbol: Dict[tuple[int, int], str] = {}
+        return table.get_definition_symbols(document_index)
 
-        for occurrence in document.occurrences:
-            if not (occurrence.symbol_roles & scip.SymbolRole.Definition):  # type: ignore[union-attr]
-                continue
-            if occurrence.range and len(occurrence.range) >= 2:
-                pos_key = (occurrence.range[0], occurrence.range[1])
-                position_to_symbol[pos_key] = occurrence.symbol
-
-        return position_to_symbol
-
-    def _match_nodes_to_symbols(self, nodes: List[DefinitionNode], document_by_path: Dict[str, ScipDocument]) -> Dict[DefinitionNode, Optional[str]]:
+    def _match_nodes_to_symbols(self, nodes: List[DefinitionNode], table: ScipLookupTable) -> Dict[DefinitionNode, Optional[int]]:
         """Match nodes to their symbols using document position index.
 
         Args:
             nodes: List of nodes to match
-            document_by_path: Document lookup by relative path
+            table: Lookup table of the index covering the nodes
 
         Returns:
-            Dictionary mapping nodes to their symbols
+            Dictionary mapping nodes to their symbol indexes in the table
         """
         from blarify.utils.path_calculator import PathCalculator
 
         nodes_by_path: Dict[str, List[DefinitionNode]] = {}
         for node in nodes:
-            relative_path = PathCalculator.get_relative_path_from_uri(
-                root_uri=f"file://{self.root_path}", uri=node.path
-            )
-            if relative_path not in nodes_by_path:
-                nodes_by_path[relative_path] = []
-            nodes_by_path[relative_path].append(node)
+            if node.path not in nodes_by_path:
+                nodes_by_path[node.path] = []
+            nodes_by_path[node.path].append(node)
 
-        node_to_symbol: Dict[DefinitionNode, Optional[str]] = {}
+        node_to_symbol: Dict[DefinitionNode, Optional[int]] = {}
 
-        for relative_path, path_nodes in nodes_by_path.items():
-            document = document_by_path.get(relative_path)
-            if not document:
+        for path, path_nodes in nodes_by_path.items():
+            relative_path = PathCalculator.get_relative_path_from_uri(root_uri=f"file://{self.root_path}", uri=path)
+            document_index = table.find_document(relative_path)
+            if document_index is None:
                 for node in path_nodes:
                     node_to_symbol[node] = None
                 continue
 
-            position_to_symbol = self._build_position_to_symbol_map(document)
+            position_to_symbol = self._build_position_to_symbol_map(table, document_index)
 
             for node in path_nodes:
-                pos_key = (node.definition_range.start_dict["line"], node.definition_range.start_dict["character"])
-                node_to_symbol[node] = position_to_symbol.get(pos_key)
+                node_to_symbol[node] = position_to_symbol.get(self._get_definition_position(node))
 
         return node_to_symbol
 
-    def _batch_find_symbols_for_nodes(self, nodes: List[DefinitionNode]) -> Dict[DefinitionNode, Optional[str]]:
+    def _batch_find_symbols_for_nodes(self, nodes: List[DefinitionNode]) -> Dict[DefinitionNode, Optional[TableSymbol]]:
         """Efficiently find symbols for multiple nodes by grouping by document."""
-        node_to_symbol: Dict[DefinitionNode, Optional[str]] = {}
+        nodes_by_table: List[tuple[ScipLookupTable, List[DefinitionNode]]] = []
+        node_to_symbol: Dict[DefinitionNode, Optional[TableSymbol]] = {}
 
         if self._monorepo_mode:
             nodes_by_package: Dict[str, List[DefinitionNode]] = {}
 
             for node in nodes:
-                file_path = node.path.replace("file://", "")
-                package_root = None
-
-                for pkg_root in sorted(self._package_indexes.keys(), key=len, reverse=True):
-                    if file_path.startswith(pkg_root):
-                        package_root = pkg_root
-                        break
+                package_root = self._get_package_root_for_path(node.path.replace("file://", ""))
 
                 if package_root:
                     if package_root not in nodes_by_package:
@@ -827,50 +989,42 @@ class ScipReferenceResolver:
                     node_to_symbol[node] = None
 
             for package_root, package_nodes in nodes_by_package.items():
-                _, _, document_by_path, _, _ = self._package_indexes[package_root]
-                node_to_symbol.update(self._match_nodes_to_symbols(package_nodes, document_by_path))
+                nodes_by_table.append((self._package_tables[package_root], package_nodes))
+        elif self._table:
+            nodes_by_table.append((self._table, nodes))
         else:
-            node_to_symbol = self._match_nodes_to_symbols(nodes, self._document_by_path)
+            node_to_symbol = {node: None for node in nodes}
+
+        for table, table_nodes in nodes_by_table:
+            for node, symbol_index in self._match_nodes_to_symbols(table_nodes, table).items():
+                node_to_symbol[node] = (table, symbol_index) if symbol_index is not None else None
 
         return node_to_symbol
 
-    def _is_reference_occurrence(self, occurrence: ScipOccurrence) -> bool:
+    def _is_reference_occurrence(self, symbol_roles: int) -> bool:
         """Check if an occurrence is a reference (not a definition).
 
         TypeScript and JavaScript SCIP indexers use symbol_roles=0 for references,
         while Python uses proper ReadAccess/WriteAccess flags.
 
         Args:
-            occurrence: The SCIP occurrence to check
+            symbol_roles: The symbol roles of the SCIP occurrence to check
 
         Returns:
             True if this is a reference occurrence, False otherwise
         """
         # Always skip definitions
-        if occurrence.symbol_roles & scip.SymbolRole.Definition:  # type: ignore[union-attr]
+        if symbol_roles & DEFINITION_ROLE:
             return False
 
         # Language-specific behavior
         if self.language in ["typescript", "javascript"]:
             # TypeScript/JavaScript: symbol_roles=0 indicates a reference
             # Also accept explicit access flags if present
-            return (
-                occurrence.symbol_roles == 0
-                or (occurrence.symbol_roles & (
-                    scip.SymbolRole.ReadAccess |  # type: ignore[union-attr]
-                    scip.SymbolRole.WriteAccess |  # type: ignore[union-attr]
-                    scip.SymbolRole.Import  # type: ignore[union-attr]
-                )) != 0
-            )
+            return symbol_roles == 0 or (symbol_roles & ACCESS_ROLES) != 0
         else:
             # Python and other languages: require explicit access flags
-            return (
-                occurrence.symbol_roles & (
-                    scip.SymbolRole.ReadAccess |  # type: ignore[union-attr]
-                    scip.SymbolRole.WriteAccess |  # type: ignore[union-attr]
-                    scip.SymbolRole.Import  # type: ignore[union-attr]
-                )
-            ) != 0
+            return (symbol_roles & ACCESS_ROLES) != 0
 
     def _get_references_for_symbol(self, symbol: str, file_path: Optional[str] = None) -> List[Reference]:
         """Get references for a specific symbol (optimized version).
@@ -884,87 +1038,67 @@ class ScipReferenceResolver:
         """
         references: List[Reference] = []
 
-        if self._monorepo_mode and file_path:
-            index_data = self._get_index_for_path(file_path)
-            if not index_data:
-                return references
+        table = self._get_table_for_path(file_path) if file_path else self._table
+        if not table:
+            return references
 
-            symbol_to_occurrences, _, occurrence_to_document, occurrence_to_repo_path = index_data
-            occurrences = symbol_to_occurrences.get(symbol, [])
+        symbol_index = table.find_symbol(symbol)
+        if symbol_index is None:
+            return references
 
-            for occurrence in occurrences:
-                if not self._is_reference_occurrence(occurrence):
-                    continue
+        return self._get_references_for_symbol_index(table, symbol_index)
 
-                doc = occurrence_to_document.get(id(occurrence))
-                if not doc:
-                    continue
+    def _get_references_for_symbol_index(self, table: ScipLookupTable, symbol_index: int) -> List[Reference]:
+        """Get references for a symbol already resolved in a lookup table.
 
-                repo_path = occurrence_to_repo_path.get(id(occurrence))
-                ref = self._occurrence_to_reference(occurrence, doc, repo_path)
-                if ref:
-                    references.append(ref)
-        else:
-            occurrences = self._symbol_to_occurrences.get(symbol, [])
+        Args:
+            table: The lookup table holding the symbol
+            symbol_index: Index of the symbol in the table
 
-            for occurrence in occurrences:
-                if not self._is_reference_occurrence(occurrence):
-                    continue
+        Returns:
+            List of references to the symbol
+        """
+        references: List[Reference] = []
 
-                doc = self._occurrence_to_document.get(id(occurrence))
-                if not doc:
-                    continue
+        for occurrence in table.get_symbol_occurrences(symbol_index):
+            if not self._is_reference_occurrence(table.get_occurrence_roles(occurrence)):
+                continue
 
-                repo_path = self._occurrence_to_repo_path.get(id(occurrence))
-                ref = self._occurrence_to_reference(occurrence, doc, repo_path)
-                if ref:
-                    references.append(ref)
+            ref = self._occurrence_to_reference(table, occurrence)
+            if ref:
+                references.append(ref)
 
         return references
 
-    def _find_document_for_occurrence(self, occurrence: ScipOccurrence) -> Optional[ScipDocument]:
-        """Find the document containing an occurrence."""
-        return self._occurrence_to_document.get(id(occurrence))
-
-    def _occurrence_to_reference(self, occurrence: ScipOccurrence, document: ScipDocument, repo_relative_path: Optional[str] = None) -> Optional[Reference]:
+    def _occurrence_to_reference(self, table: ScipLookupTable, occurrence: int) -> Optional[Reference]:
         """Convert a SCIP occurrence to a Reference object."""
-        if not occurrence.range or len(occurrence.range) < 3:
+        occurrence_range = table.get_occurrence_range(occurrence)
+        if occurrence_range[3] == NO_POSITION:
             return None
 
         try:
-            # SCIP range format: [start_line, start_character, end_character]
-            # or [start_line, start_character, end_line, end_character]
-            start_line = occurrence.range[0]
-            start_char = occurrence.range[1]
-            end_char = occurrence.range[2] if len(occurrence.range) == 3 else occurrence.range[3]
-            end_line = start_line if len(occurrence.range) == 3 else occurrence.range[2]
-
-            relative_path = repo_relative_path if repo_relative_path else document.relative_path
-
-            # Create a Reference object compatible with the existing system
-            reference_data = {
-                "uri": f"file://{os.path.join(self.root_path, relative_path)}",
-                "range": {
-                    "start": {"line": start_line, "character": start_char},
-                    "end": {"line": end_line, "character": end_char},
-                },
-                "relativePath": relative_path,
-                "absolutePath": os.path.join(self.root_path, relative_path),
-            }
-
-            return Reference(reference_data)
+            relative_path = table.get_document_path(table.get_occurrence_document(occurrence))
+            return Reference.from_range_tuple(occurrence_range, self._get_document_uri(relative_path))
 
         except Exception as e:
             logger.warning(f"Error converting occurrence to reference: {e}")
             return None
 
+    def _get_document_uri(self, relative_path: str) -> str:
+        uri = self._document_uris.get(relative_path)
+        if uri is None:
+            uri = unquote(f"file://{os.path.join(self.root_path, relative_path)}")
+            self._document_uris[relative_path] = uri
+        return uri
+
     def get_statistics(self) -> Dict[str, int]:
         """Get statistics about the loaded SCIP index."""
         if not self.ensure_loaded():
             return {}
 
+        tables = self._get_loaded_tables()
         return {
-            "documents": len(self._document_by_path),
-            "symbols": len(self._symbol_to_occurrences),
-            "total_occurrences": sum(len(occs) for occs in self._symbol_to_occurrences.values()),
+            "documents": sum(len(table.get_document_paths()) for table in tables),
+            "symbols": sum(table.symbol_count for table in tables),
+            "total_occurrences": sum(table.occurrence_count for table in tables),
         }
@@ -0,0 +1,150 @@
+"""Content-hash manifests of the sources a SCIP index was generated from."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+
+# Directories indexers don't look into, walking them would only slow change detection down
+SKIPPED_DIRECTORIES = {"node_modules", "__pycache__"}
+
+# size, mtime in nanoseconds, sha256 of the content
+ManifestEntry = Tuple[int, int, str]
+
+
+class ScipIndexManifest:
+    """
+    Records the size, mtime and content hash of every source file an index was generated from.
+
+    Files whose size and mtime match their entry are assumed unchanged and the rest are hashed,
+    so touching or checking out files without changing their content doesn't trigger a reindex.
+    Paths are stored relative to source_root.
+    """
+
+    path: str
+    source_root: str
+    extensions: Tuple[str, ...]
+    exists: bool
+
+    def __init__(self, index_path: str, source_root: str, extensions: Sequence[str]):
+        self.path = index_path + MANIFEST_SUFFIX
+        self.source_root = source_root
+        self.extensions = tuple(extensions)
+        self.exists = False
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._pending: Dict[str, Optional[ManifestEntry]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable SCIP index manifest {self.path}: {e}")
+            return
+
+        if data.get("version") != MANIFEST_FORMAT_VERSION or tuple(data.get("extensions", ())) != self.extensions:
+            return
+
+        self._entries = {path: (entry[0], entry[1], entry[2]) for path, entry in data.get("files", {}).items()}
+        self.exists = True
+
+    def refresh(self, paths: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Returns the relative paths of the source files added, modified or removed since the
+        manifest was saved. The new state is kept until save() is called.
+
+        Args:
+            paths: Absolute paths to limit the check to, the whole source root is walked when None
+        """
+        if paths is None:
+            candidates = set(self._iter_source_files())
+            candidates.update(self._entries)
+        else:
+            candidates = {
+                relative_path
+                for path in paths
+                if path.endswith(self.extensions)
+                and not (relative_path := os.path.relpath(path, self.source_root)).startswith("..")
+            }
+
+        changed_files: List[str] = []
+        for relative_path in sorted(candidates):
+            entry = self._entries.get(relative_path)
+            current = self._get_current_entry(relative_path, entry)
+
+            if current is None:
+                if entry is not None:
+                    changed_files.append(relative_path)
+                    self._pending[relative_path] = None
+            elif entry is None or current[2] != entry[2]:
+                changed_files.append(relative_path)
+                self._pending[relative_path] = current
+            elif current != entry:
+                # Touched without changing the content, remember the new mtime to skip hashing next time
+                self._pending[relative_path] = current
+
+        return changed_files
+
+    @property
+    def file_count(self) -> int:
+        return len(self._entries)
+
+    def get_fingerprint(self) -> str:
+        """Hash of the saved content hashes, it changes whenever any recorded file changes."""
+        fingerprint = hashlib.sha256()
+        for relative_path, entry in sorted(self._entries.items()):
+            fingerprint.update(f"{relative_path}\0{entry[2]}\n".encode("utf-8"))
+        return fingerprint.hexdigest()
+
+    def get_newest_mtime_ns(self) -> int:
+        """Newest mtime among the files known after the last refresh."""
+        entries = {**self._entries, **self._pending}
+        return max((entry[1] for entry in entries.values() if entry is not None), default=0)
+
+    def save(self) -> None:
+        for relative_path, entry in self._pending.items():
+            if entry is None:
+                self._entries.pop(relative_path, None)
+            else:
+                self._entries[relative_path] = entry
+        self._pending = {}
+
+        data = {"version": MANIFEST_FORMAT_VERSION, "extensions": list(self.extensions), "files": self._entries}
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "w") as f:
+                json.dump(data, f)
+            os.replace(temporary_path, self.path)
+            self.exists = True
+        except OSError as e:
+            logger.warning(f"Could not write SCIP index manifest {self.path}: {e}")
+
+    def _iter_source_files(self) -> Iterator[str]:
+        for current_path, dirs, files in os.walk(self.source_root):
+            dirs[:] = [name for name in dirs if name not in SKIPPED_DIRECTORIES and not name.startswith(".")]
+            for name in files:
+                if name.endswith(self.extensions):
+                    yield os.path.relpath(os.path.join(current_path, name), self.source_root)
+
+    def _get_current_entry(self, relative_path: str, entry: Optional[ManifestEntry]) -> Optional[ManifestEntry]:
+        path = os.path.join(self.source_root, relative_path)
+        try:
+            stat = os.stat(path)
+            if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                return entry
+
+            with open(path, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return None
+
+        return (stat.st_size, stat.st_mtime_ns, content_hash)
@@ -0,0 +1,422 @@
+"""Compiled, memory-mapped lookup tables for SCIP indexes.
+
+Parsing an ``index.scip`` into protobuf objects and keeping them alive to answer reference
+queries costs several GB on large repositories. ScipLookupTable compiles an index once into a
+columnar file next to it (``index.scip.lookup``):
+
+- an interned, sorted symbol table and a document table
+- occurrence columns (symbol, document, start line, start character, end line, end character,
+  roles) ordered by symbol, with per-symbol offsets into them
+- per-document offsets into the definition occurrences
+
+Later runs memory-map that file, so loading is constant time and the columns are only paged in
+as they are read.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_TABLE_SUFFIX = ".lookup"
+NO_POSITION = -1
+
+# Role bit SCIP uses for definitions, see scip.proto SymbolRole
+DEFINITION_ROLE = 1
+
+_MAGIC = b"BLSCIP01"
+# magic, source size, source mtime, symbols, documents, occurrences, definitions, symbols blob, documents blob
+_HEADER = struct.Struct("<8s8q")
+
+_OCCURRENCE_COLUMNS = (
+    "occurrence_symbols",
+    "occurrence_documents",
+    "occurrence_start_lines",
+    "occurrence_start_characters",
+    "occurrence_end_lines",
+    "occurrence_end_characters",
+    "occurrence_roles",
+)
+
+Position = Tuple[int, int]
+
+
+def _sections(
+    symbols: int, documents: int, occurrences: int, definitions: int, symbols_blob: int, documents_blob: int
+) -> List[Tuple[str, str, int]]:
+    """Returns (name, typecode, length) for every section of the file, in file order."""
+    return [
+        ("symbol_string_offsets", "q", symbols + 1),
+        ("symbols_blob", "B", symbols_blob),
+        ("document_string_offsets", "q", documents + 1),
+        ("documents_blob", "B", documents_blob),
+        ("symbol_occurrence_offsets", "q", symbols + 1),
+        *((column, "i", occurrences) for column in _OCCURRENCE_COLUMNS),
+        ("document_definition_offsets", "q", documents + 1),
+        ("definition_occurrences", "q", definitions),
+    ]
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+def _pack_strings(strings: List[str]) -> Tuple[array, bytes]:
+    offsets = array("q", [0])
+    encoded = bytearray()
+    for string in strings:
+        encoded += string.encode("utf-8")
+        offsets.append(len(encoded))
+    return offsets, bytes(encoded)
+
+
+def _normalize_range(occurrence_range: Any) -> Tuple[int, int, int, int]:
+    # SCIP ranges are [start_line, start_character, end_character] or
+    # [start_line, start_character, end_line, end_character]
+    if len(occurrence_range) < 2:
+        return NO_POSITION, NO_POSITION, NO_POSITION, NO_POSITION
+    if len(occurrence_range) == 2:
+        return occurrence_range[0], occurrence_range[1], NO_POSITION, NO_POSITION
+    if len(occurrence_range) == 3:
+        return occurrence_range[0], occurrence_range[1], occurrence_range[0], occurrence_range[2]
+    return occurrence_range[0], occurrence_range[1], occurrence_range[2], occurrence_range[3]
+
+
+class ScipLookupTable:
+    """
+    Read-only columnar view over a compiled SCIP index.
+
+    Document paths are stored as they appear in the index, path_prefix is prepended when they
+    are looked up so the compiled file doesn't depend on where the repository is checked out.
+    """
+
+    symbol_count: int
+    document_count: int
+    occurrence_count: int
+    path_prefix: Optional[str]
+
+    def __init__(self, buffer: memoryview, path_prefix: Optional[str] = None):
+        magic, _, _, symbols, documents, occurrences, definitions, symbols_blob, documents_blob = _HEADER.unpack_from(
+            buffer
+        )
+        if magic != _MAGIC:
+            raise ValueError("Not a compiled SCIP lookup table")
+
+        self._buffer = buffer
+        self.symbol_count = symbols
+        self.document_count = documents
+        self.occurrence_count = occurrences
+        self.path_prefix = path_prefix
+
+        offset = _HEADER.size
+        for name, typecode, length in _sections(
+            symbols, documents, occurrences, definitions, symbols_blob, documents_blob
+        ):
+            size = length * struct.calcsize(typecode)
+            section = buffer[offset : offset + size]
+            setattr(self, f"_{name}", section if typecode == "B" else section.cast(typecode))
+            offset += size + _padding(size)
+
+        # Built on the first lookup by path, decoding every document path is O(documents)
+        self._document_index_by_path: Optional[Dict[str, int]] = None
+        self._definition_symbols_by_document: Dict[int, Dict[Position, int]] = {}
+        self._occurrence_symbols_by_document: Dict[int, Dict[Position, int]] = {}
+
+    @classmethod
+    def load_or_build(
+        cls, index_path: str, parse_index: Callable[[bytes], Any], path_prefix: Optional[str] = None
+    ) -> "ScipLookupTable":
+        """
+        Memory-maps the compiled table next to index_path, compiling it first when it is
+        missing or was built from a different version of the index.
+        """
+        source_stat = os.stat(index_path)
+        table_path = index_path + LOOKUP_TABLE_SUFFIX
+
+        table = cls._map_if_current(table_path, source_stat, path_prefix)
+        if table is not None:
+            logger.debug(f"Memory-mapped compiled SCIP lookup table {table_path}")
+            return table
+
+        compiled = cls.compile_file(index_path, parse_index)
+        if compiled is not None:
+            return cls(memoryview(compiled), path_prefix=path_prefix)
+
+        return cls.load_compiled(index_path, path_prefix)
+
+    @classmethod
+    def load_compiled(cls, index_path: str, path_prefix: Optional[str] = None) -> "ScipLookupTable":
+        """Memory-maps the table compile_file wrote for index_path."""
+        table_path = index_path + LOOKUP_TABLE_SUFFIX
+        table = cls._map_if_current(table_path, os.stat(index_path), path_prefix)
+        if table is None:
+            raise ValueError(f"Compiled SCIP lookup table {table_path} could not be read back")
+        return table
+
+    @classmethod
+    def is_compiled(cls, index_path: str) -> bool:
+        """Whether an up to date compiled table exists next to index_path."""
+        try:
+            with open(index_path + LOOKUP_TABLE_SUFFIX, "rb") as table_file:
+                header = table_file.read(_HEADER.size)
+            source_stat = os.stat(index_path)
+        except OSError:
+            return False
+        return cls._is_current_header(header, source_stat)
+
+    @classmethod
+    def compile_file(cls, index_path: str, parse_index: Callable[[bytes], Any]) -> Optional[bytes]:
+        """
+        Compiles index_path into the table file next to it.
+
+        Returns None once the file is written, or the compiled table when it couldn't be written
+        so the caller can keep it in memory instead.
+        """
+        source_stat = os.stat(index_path)
+        table_path = index_path + LOOKUP_TABLE_SUFFIX
+
+        with open(index_path, "rb") as index_file:
+            index = parse_index(index_file.read())
+        compiled = cls.compile(index, source_size=source_stat.st_size, source_mtime_ns=source_stat.st_mtime_ns)
+        del index
+
+        try:
+            temporary_path = f"{table_path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as table_file:
+                table_file.write(compiled)
+            os.replace(temporary_path, table_path)
+        except OSError as e:
+            logger.warning(f"Could not write compiled SCIP lookup table to {table_path}, keeping it in memory: {e}")
+            return compiled
+
+        return None
+
+    @staticmethod
+    def _is_current_header(header: Any, source_stat: os.stat_result) -> bool:
+        if len(header) < _HEADER.size:
+            return False
+        magic, source_size, source_mtime_ns, *_ = _HEADER.unpack_from(header)
+        return magic == _MAGIC and source_size == source_stat.st_size and source_mtime_ns == source_stat.st_mtime_ns
+
+    @classmethod
+    def _map_if_current(
+        cls, table_path: str, source_stat: os.stat_result, path_prefix: Optional[str]
+    ) -> Optional["ScipLookupTable"]:
+        try:
+            with open(table_path, "rb") as table_file:
+                mapped = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if not cls._is_current_header(mapped, source_stat):
+            return None
+
+        return cls(memoryview(mapped), path_prefix=path_prefix)
+
+    @staticmethod
+    def compile(index: Any, source_size: int = 0, source_mtime_ns: int = 0) -> bytes:
+        """Compiles a parsed SCIP index into the binary table format."""
+        symbol_ids: Dict[str, int] = {}
+        document_paths: List[str] = []
+        columns = {column: array("i") for column in _OCCURRENCE_COLUMNS}
+        definition_occurrences = array("q")
+        document_definition_offsets = array("q", [0])
+
+        for document_index, document in enumerate(index.documents):
+            document_paths.append(document.relative_path)
+            for occurrence in document.occurrences:
+                start_line, start_character, end_line, end_character = _normalize_range(occurrence.range)
+                if occurrence.symbol_roles & DEFINITION_ROLE and start_line != NO_POSITION:
+                    definition_occurrences.append(len(columns["occurrence_symbols"]))
+
+                columns["occurrence_symbols"].append(symbol_ids.setdefault(occurrence.symbol, len(symbol_ids)))
+                columns["occurrence_documents"].append(document_index)
+                columns["occurrence_start_lines"].append(start_line)
+                columns["occurrence_start_characters"].append(start_character)
+                columns["occurrence_end_lines"].append(end_line)
+                columns["occurrence_end_characters"].append(end_character)
+                columns["occurrence_roles"].append(occurrence.symbol_roles)
+            document_definition_offsets.append(len(definition_occurrences))
+
+        # Symbols are sorted so they can be binary searched in the mapped file without a dict
+        sorted_symbols = sorted(symbol_ids)
+        rank_by_symbol_id = array("i", bytes(4 * len(sorted_symbols)))
+        for rank, symbol in enumerate(sorted_symbols):
+            rank_by_symbol_id[symbol_ids[symbol]] = rank
+        del symbol_ids
+
+        # Counting sort of the occurrences by symbol rank, stable so each symbol keeps index order
+        occurrences = len(columns["occurrence_symbols"])
+        symbol_occurrence_offsets = array("q", bytes(8 * (len(sorted_symbols) + 1)))
+        for symbol_id in columns["occurrence_symbols"]:
+            symbol_occurrence_offsets[rank_by_symbol_id[symbol_id] + 1] += 1
+        for rank in range(len(sorted_symbols)):
+            symbol_occurrence_offsets[rank + 1] += symbol_occurrence_offsets[rank]
+
+        next_position = array("q", symbol_occurrence_offsets)
+        new_position = array("q", bytes(8 * occurrences))
+        for old_position, symbol_id in enumerate(columns["occurrence_symbols"]):
+            rank = rank_by_symbol_id[symbol_id]
+            new_position[old_position] = next_position[rank]
+            next_position[rank] += 1
+
+        columns["occurrence_symbols"] = array(
+            "i", (rank_by_symbol_id[symbol_id] for symbol_id in columns["occurrence_symbols"])
+        )
+        for column, values in columns.items():
+            sorted_values = array("i", bytes(4 * occurrences))
+            for old_position, value in enumerate(values):
+                sorted_values[new_position[old_position]] = value
+            columns[column] = sorted_values
+
+        definition_occurrences = array("q", (new_position[position] for position in definition_occurrences))
+
+        symbol_string_offsets, symbols_blob = _pack_strings(sorted_symbols)
+        document_string_offsets, documents_blob = _pack_strings(document_paths)
+        section_data: Dict[str, Any] = {
+            "symbol_string_offsets": symbol_string_offsets,
+            "symbols_blob": symbols_blob,
+            "document_string_offsets": document_string_offsets,
+            "documents_blob": documents_blob,
+            "symbol_occurrence_offsets": symbol_occurrence_offsets,
+            **columns,
+            "document_definition_offsets": document_definition_offsets,
+            "definition_occurrences": definition_occurrences,
+        }
+
+        compiled = bytearray(
+            _HEADER.pack(
+                _MAGIC,
+                source_size,
+                source_mtime_ns,
+                len(sorted_symbols),
+                len(document_paths),
+                occurrences,
+                len(definition_occurrences),
+                len(symbols_blob),
+                len(documents_blob),
+            )
+        )
+        for name, _, _ in _sections(
+            len(sorted_symbols),
+            len(document_paths),
+            occurrences,
+            len(definition_occurrences),
+            len(symbols_blob),
+            len(documents_blob),
+        ):
+            data = section_data[name]
+            data_bytes = data if isinstance(data, bytes) else data.tobytes()
+            compiled += data_bytes
+            compiled += bytes(_padding(len(data_bytes)))
+
+        return bytes(compiled)
+
+    def get_symbol(self, symbol_index: int) -> str:
+        start, end = self._symbol_string_offsets[symbol_index], self._symbol_string_offsets[symbol_index + 1]
+        return bytes(self._symbols_blob[start:end]).decode("utf-8")
+
+    def find_symbol(self, symbol: str) -> Optional[int]:
+        symbol_index = bisect.bisect_left(range(self.symbol_count), symbol, key=self.get_symbol)
+        if symbol_index < self.symbol_count and self.get_symbol(symbol_index) == symbol:
+            return symbol_index
+        return None
+
+    def get_document_path(self, document_index: int) -> str:
+        start, end = self._document_string_offsets[document_index], self._document_string_offsets[document_index + 1]
+        relative_path = bytes(self._documents_blob[start:end]).decode("utf-8")
+        return os.path.join(self.path_prefix, relative_path) if self.path_prefix else relative_path
+
+    def get_document_paths(self) -> List[str]:
+        return [self.get_document_path(document_index) for document_index in range(self.document_count)]
+
+    def find_document(self, path: str) -> Optional[int]:
+        if self._document_index_by_path is None:
+            self._document_index_by_path = {
+                document_path: document_index for document_index, document_path in enumerate(self.get_document_paths())
+            }
+        return self._document_index_by_path.get(path)
+
+    def get_symbol_occurrences(self, symbol_index: int) -> range:
+        """Returns the positions of the symbol's occurrences, in the order they appear in the index."""
+        return range(self._symbol_occurrence_offsets[symbol_index], self._symbol_occurrence_offsets[symbol_index + 1])
+
+    def get_occurrence_document(self, occurrence: int) -> int:
+        return self._occurrence_documents[occurrence]
+
+    def get_occurrence_roles(self, occurrence: int) -> int:
+        return self._occurrence_roles[occurrence]
+
+    def get_occurrence_range(self, occurrence: int) -> Tuple[int, int, int, int]:
+        return (
+            self._occurrence_start_lines[occurrence],
+            self._occurrence_start_characters[occurrence],
+            self._occurrence_end_lines[occurrence],
+            self._occurrence_end_characters[occurrence],
+        )
+
+    def iter_document_definitions(self, document_index: int) -> Iterator[Tuple[Position, int]]:
+        """Yields ((line, character), symbol index) for the definitions of a document, in index order."""
+        start = self._document_definition_offsets[document_index]
+        end = self._document_definition_offsets[document_index + 1]
+        for definition in self._definition_occurrences[start:end]:
+            position = (self._occurrence_start_lines[definition], self._occurrence_start_characters[definition])
+            yield position, self._occurrence_symbols[definition]
+
+    def get_definition_symbols(self, document_index: int) -> Dict[Position, int]:
+        """
+        Returns the symbol index defined at each (line, character) of a document.
+
+        Built on first use and kept, when several definitions start at the same position the
+        first one in the index wins.
+        """
+        definition_symbols = self._definition_symbols_by_document.get(document_index)
+        if definition_symbols is None:
+            definition_symbols = {}
+            for position, symbol_index in self.iter_document_definitions(document_index):
+                definition_symbols.setdefault(position, symbol_index)
+            self._definition_symbols_by_document[document_index] = definition_symbols
+        return definition_symbols
+
+    def get_occurrence_symbols(self, document_index: int) -> Dict[Position, int]:
+        """
+        Returns the symbol index occurring at each (line, character) of a document, references included.
+
+        Occurrences are stored by symbol, so building it scans every occurrence of the table, use
+        load_occurrence_symbols to build several documents in one scan.
+        """
+        self.load_occurrence_symbols([document_index])
+        return self._occurrence_symbols_by_document[document_index]
+
+    def load_occurrence_symbols(self, document_indexes: Iterable[int]) -> None:
+        """Builds and keeps the occurrence positions of the documents not built yet, in one scan."""
+        missing: Dict[int, Dict[Position, int]] = {
+            document_index: {}
+            for document_index in document_indexes
+            if document_index not in self._occurrence_symbols_by_document
+        }
+        if not missing:
+            return
+
+        for occurrence, document_index in enumerate(self._occurrence_documents):
+            occurrence_symbols = missing.get(document_index)
+            if occurrence_symbols is None:
+                continue
+            start_line = self._occurrence_start_lines[occurrence]
+            if start_line != NO_POSITION:
+                position = (start_line, self._occurrence_start_characters[occurrence])
+                occurrence_symbols.setdefault(position, self._occurrence_symbols[occurrence])
+
+        self._occurrence_symbols_by_document.update(missing)
+
+    def find_definition_document(self, symbol_index: int) -> Optional[int]:
+        """Returns the document of the first definition of the symbol, None when it is defined outside the index."""
+        for occurrence in self.get_symbol_occurrences(symbol_index):
+            if self._occurrence_roles[occurrence] & DEFINITION_ROLE:
+                return self._occurrence_documents[occurrence]
+        return None
@@ -1,8 +1,12 @@
+from typing import Tuple
 from urllib.parse import unquote
 
 from dataclasses import dataclass
 
-@dataclass
+RangeTuple = Tuple[int, int, int, int]
+
+
+@dataclass(slots=True)
 class Point:
     line: int
     character: int
@@ -12,7 +16,7 @@ class Point:
             return False
         return self.line == value.line and self.character == value.character
 
-@dataclass
+@dataclass(slots=True)
 class Range:
     start: Point
     end: Point
@@ -23,7 +27,7 @@ class Range:
         return self.start == value.start and self.end == value.end
 
 
-@dataclass
+@dataclass(slots=True)
 class Reference:
     range: Range
     uri: str
@@ -39,6 +43,18 @@ class Reference:
         else:
             raise ValueError("Invalid Reference initialization")
 
+    @classmethod
+    def from_range_tuple(cls, range_tuple: RangeTuple, uri: str) -> "Reference":
+        """Builds a Reference from a packed range, the uri is expected to be decoded already."""
+        reference = cls.__new__(cls)
+        start_line, start_character, end_line, end_character = range_tuple
+        reference.range = Range(Point(start_line, start_character), Point(end_line, end_character))
+        reference.uri = uri
+        return reference
+
+    def to_range_tuple(self) -> RangeTuple:
+        return self.range.start.line, self.range.start.character, self.range.end.line, self.range.end.character
+
     def _initialize_from_dict(self, reference: dict) -> Range:
         self.range = Range(
             Point(reference["range"]["start"]["line"], reference["range"]["start"]["character"]),
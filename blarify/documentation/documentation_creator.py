@@ -34,8 +34,10 @@ from .queries import (
 from .queries.workflow_queries import cleanup_orphaned_documentation_query
 from ..graph.graph_environment import GraphEnvironment
 from ..graph.relationship.relationship_creator import RelationshipCreator
+from ..services.embedding_cache import EmbeddingCache
 from ..services.embedding_service import EmbeddingService
 from .utils.bottom_up_batch_processor import BottomUpBatchProcessor
+from .utils.llm_response_cache import LlmResponseCache
 from .result_models import DocumentationResult, FrameworkDetectionResult
 
 logger = logging.getLogger(__name__)
@@ -57,6 +59,8 @@ class DocumentationCreator:
         graph_environment: GraphEnvironment,
         max_workers: int = 5,
         overwrite_documentation: bool = False,
+        response_cache: Optional[LlmResponseCache] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ) -> None:
         """
         Initialize the documentation creator.
@@ -68,12 +72,18 @@ class DocumentationCreator:
             company_id: Company/entity ID for database queries
             repo_id: Repository ID for database queries
             max_workers: Maximum number of threads for parallel processing
+            response_cache: Optional on-disk cache of generated descriptions, so unchanged nodes
+                don't call the LLM again
+            embedding_cache: Optional on-disk cache of embeddings by content hash, so unchanged
+                documentation isn't embedded again
         """
         self.db_manager = db_manager
         self.agent_caller = agent_caller
         self.graph_environment = graph_environment
         self.max_workers = max_workers
         self.overwrite_documentation = overwrite_documentation
+        self.response_cache = response_cache
+        self.embedding_cache = embedding_cache
 
     def create_documentation(
         self,
@@ -255,6 +265,8 @@ class DocumentationCreator:
                 overwrite_documentation=self.overwrite_documentation,
                 generate_embeddings=generate_embeddings,
                 processing_run_id=previous_run_id,
+                response_cache=self.response_cache,
+                embedding_cache=self.embedding_cache,
             )
 
             result = processor.process_node(root_path)
@@ -271,6 +283,8 @@ class DocumentationCreator:
                 documentation_nodes=result.documentation_nodes,
                 source_nodes=result.source_nodes,
                 total_nodes_processed=result.total_nodes_processed,
+                llm_cache_hits=result.llm_cache_hits,
+                llm_cache_misses=result.llm_cache_misses,
                 warnings=[result.error] if result.error else [],
             )
 
@@ -353,6 +367,8 @@ class DocumentationCreator:
                 max_workers=self.max_workers,
                 overwrite_documentation=self.overwrite_documentation,
                 generate_embeddings=generate_embeddings,
+                response_cache=self.response_cache,
+                embedding_cache=self.embedding_cache,
             )
 
             result = processor.process_node(root_path)
@@ -369,6 +385,8 @@ class DocumentationCreator:
                 documentation_nodes=result.documentation_nodes,
                 source_nodes=result.source_nodes,
                 total_nodes_processed=total_processed,
+                llm_cache_hits=result.llm_cache_hits,
+                llm_cache_misses=result.llm_cache_misses,
                 analyzed_nodes=[
                     {
                         "type": "full_codebase",
@@ -451,7 +469,7 @@ class DocumentationCreator:
                 logger.warning(f"Could not create vector index (may already exist): {e}")
 
             # Initialize embedding service
-            embedding_service = EmbeddingService(batch_size=batch_size)
+            embedding_service = EmbeddingService(batch_size=batch_size, cache=self.embedding_cache)
 
             # Track processed nodes to avoid infinite loops
             processed_node_ids = set()
@@ -555,6 +573,8 @@ class DocumentationCreator:
             logger.info(
                 f"Embedding complete: processed={total_processed}, embedded={total_embedded}, skipped={total_skipped}"
             )
+            if self.embedding_cache:
+                self.embedding_cache.log_stats()
 
             return stats
 
@@ -4,6 +4,7 @@ from .batch_processing_queries import (
     check_pending_nodes_query,
     get_child_descriptions_query,
     get_direct_callers_of_nodes_in_files_query,
+    get_documentation_dependency_graph_query,
     get_latest_processing_run_id_query,
     get_leaf_nodes_batch_query,
     get_leaf_nodes_under_node_query,
@@ -11,6 +12,7 @@ from .batch_processing_queries import (
     get_processable_nodes_with_descriptions_query,
     get_remaining_pending_functions_query,
     mark_nodes_completed_query,
+    mark_nodes_in_progress_query,
     reset_processing_status_for_nodes_query,
 )
 
@@ -18,6 +20,7 @@ __all__ = [
     "check_pending_nodes_query",
     "get_child_descriptions_query",
     "get_direct_callers_of_nodes_in_files_query",
+    "get_documentation_dependency_graph_query",
     "get_latest_processing_run_id_query",
     "get_leaf_nodes_batch_query",
     "get_leaf_nodes_under_node_query",
@@ -25,5 +28,6 @@ __all__ = [
     "get_processable_nodes_with_descriptions_query",
     "get_remaining_pending_functions_query",
     "mark_nodes_completed_query",
+    "mark_nodes_in_progress_query",
     "reset_processing_status_for_nodes_query",
 ]
@@ -111,6 +111,67 @@ def get_processable_nodes_with_descriptions_query() -> LiteralString:
     """
 
 
+def get_documentation_dependency_graph_query() -> LiteralString:
+    """
+    Get every node under a root node with the ids of its hierarchy and call children.
+
+    Loads the whole dependency graph in one round trip so documentation can be scheduled in
+    memory. Nodes already completed in this run come with their description, so their parents
+    can use it without processing them again.
+
+    Expected params: $entity_id, $repo_id, $root_node_id, $run_id
+    """
+    return """
+    MATCH (root:NODE {node_id: $root_node_id, entityId: $entity_id, repoId: $repo_id})
+    CALL apoc.path.subgraphNodes(root, {
+      relationshipFilter: 'CONTAINS>|FUNCTION_DEFINITION>|CLASS_DEFINITION>|CALLS>',
+      labelFilter: '-DOCUMENTATION',
+      minLevel: 1
+    })
+    YIELD node AS n
+
+    OPTIONAL MATCH (n)-[:CONTAINS|FUNCTION_DEFINITION|CLASS_DEFINITION]->(hier_child:NODE)
+    WHERE NOT hier_child:DOCUMENTATION
+    WITH n, collect(DISTINCT hier_child.node_id) as hier_child_ids
+
+    OPTIONAL MATCH (n)-[:CALLS]->(call_child:NODE)
+    WHERE NOT call_child:DOCUMENTATION
+    WITH n, hier_child_ids, collect(DISTINCT call_child.node_id) as call_child_ids,
+         coalesce(n.processing_status = 'completed' AND n.processing_run_id = $run_id, false) as completed
+
+    OPTIONAL MATCH (doc:DOCUMENTATION)-[:DESCRIBES]->(n)
+    WHERE completed
+    WITH n, hier_child_ids, call_child_ids, completed, head(collect(doc.content)) as description
+
+    RETURN n.node_id as id,
+           n.name as name,
+           labels(n) as labels,
+           n.path as path,
+           n.start_line as start_line,
+           n.end_line as end_line,
+           coalesce(n.text, '') as content,
+           hier_child_ids,
+           call_child_ids,
+           completed,
+           description
+    """
+
+
+def mark_nodes_in_progress_query() -> LiteralString:
+    """
+    Mark nodes as in progress for a run before they are documented.
+
+    Expected params: $entity_id, $repo_id, $node_ids, $run_id
+    """
+    return """
+    UNWIND $node_ids as node_id
+    MATCH (n:NODE {node_id: node_id, entityId: $entity_id, repoId: $repo_id})
+    SET n.processing_status = 'in_progress',
+        n.processing_run_id = $run_id
+    RETURN count(n) as in_progress_count
+    """
+
+
 def mark_nodes_completed_query() -> LiteralString:
     """
     Mark nodes as completed after documentation has been saved.
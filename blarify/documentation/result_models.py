@@ -40,6 +40,12 @@ class DocumentationResult(BaseModel):
     processing_time_seconds: float = 0.0
     """Total processing time in seconds"""
 
+    llm_cache_hits: int = 0
+    """Descriptions served from the LLM response cache instead of calling the LLM"""
+
+    llm_cache_misses: int = 0
+    """Descriptions generated by the LLM while the response cache was enabled"""
+
     # Error handling
     error: Optional[str] = None
     """Error message if processing failed"""
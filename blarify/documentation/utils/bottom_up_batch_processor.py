@@ -8,8 +8,8 @@ nodes in batches using database queries, avoiding memory exhaustion for large co
 import logging
 import re
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Any, Tuple
 
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Union
@@ -20,12 +20,16 @@ from blarify.agents.prompt_templates import (
     LEAF_NODE_ANALYSIS_TEMPLATE,
     PARENT_NODE_ANALYSIS_TEMPLATE,
     FUNCTION_WITH_CALLS_ANALYSIS_TEMPLATE,
+    PromptTemplate,
 )
 from blarify.documentation.queries.batch_processing_queries import (
     get_child_descriptions_query,
-    get_leaf_nodes_under_node_query,
-    get_remaining_pending_functions_query,
+    get_documentation_dependency_graph_query,
+    mark_nodes_in_progress_query,
 )
+from blarify.documentation.utils.dependency_graph import DocumentationDependencyGraph
+from blarify.documentation.utils.llm_response_cache import LlmResponseCache
+from blarify.services.embedding_cache import EmbeddingCache
 from blarify.repositories.graph_db_manager.db_manager import AbstractDbManager
 from blarify.repositories.graph_db_manager.dtos.node_with_content_dto import NodeWithContentDto
 from blarify.repositories.graph_db_manager.queries import (
@@ -34,9 +38,7 @@ from blarify.repositories.graph_db_manager.queries import (
 from blarify.graph.node.documentation_node import DocumentationNode
 from blarify.graph.relationship.relationship_creator import RelationshipCreator
 from blarify.documentation.queries import (
-    get_processable_nodes_with_descriptions_query,
     mark_nodes_completed_query,
-    check_pending_nodes_query,
 )
 
 # Note: We don't import concrete Node classes as we work with DTOs in documentation layer
@@ -56,6 +58,8 @@ class ProcessingResult(BaseModel):
     error: Optional[str] = None
     total_nodes_processed: int = 0
     save_status: Optional[Dict[str, Any]] = None  # Optional save status information
+    llm_cache_hits: int = 0  # Descriptions served from the LLM response cache
+    llm_cache_misses: int = 0  # Descriptions the LLM had to generate with the cache enabled
     information_nodes: List[Dict[str, Any]] = Field(default_factory=list)  # DocumentationNode objects (as dicts)
 
     # New fields for proper Node object handling
@@ -88,10 +92,12 @@ class BottomUpBatchProcessor:
     Processes code hierarchies using query-based batch processing.
 
     This processor analyzes leaf nodes first, then builds up understanding
-    through parent nodes, using database queries to manage processing state
-    and avoid memory exhaustion for large codebases.
+    through parent nodes. Processing state is persisted in the database so
+    incremental runs can skip the nodes completed by a previous run.
     """
 
+    SAVE_BATCH_SIZE = 100  # Documentation nodes written back per database round trip
+
     def __init__(
         self,
         db_manager: AbstractDbManager,
@@ -103,6 +109,8 @@ class BottomUpBatchProcessor:
         batch_size: int = 1000,
         generate_embeddings: bool = False,
         processing_run_id: Optional[str] = None,
+        response_cache: Optional[LlmResponseCache] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize the query-based batch processor.
@@ -116,8 +124,10 @@ class BottomUpBatchProcessor:
             max_workers: Maximum number of threads for parallel processing
             root_node: Optional root node to start processing from
             overwrite_documentation: Whether to overwrite existing documentation
-            batch_size: Number of nodes to process in each batch
+            batch_size: Number of nodes marked or saved per database query, saves are capped at SAVE_BATCH_SIZE
             processing_run_id: Optional run ID for incremental updates (reuses previous run's ID)
+            response_cache: Optional on-disk cache of generated descriptions, reused across runs
+            embedding_cache: Optional on-disk cache of documentation embeddings, reused across runs
         """
         self.db_manager = db_manager
         self.agent_caller = agent_caller
@@ -127,6 +137,7 @@ class BottomUpBatchProcessor:
         self.overwrite_documentation = overwrite_documentation
         self.batch_size = batch_size
         self.generate_embeddings = generate_embeddings
+        self.response_cache = response_cache
 
         # Use provided run_id or generate new one
         self.processing_run_id = processing_run_id or str(uuid.uuid4())
@@ -136,7 +147,7 @@ class BottomUpBatchProcessor:
         if self.generate_embeddings:
             from blarify.services.embedding_service import EmbeddingService
 
-            self.embedding_service = EmbeddingService()
+            self.embedding_service = EmbeddingService(cache=embedding_cache)
 
         # Track nodes during processing
         self.all_documentation_nodes: List[DocumentationNode] = []
@@ -164,9 +175,15 @@ class BottomUpBatchProcessor:
                 if not root_node:
                     return ProcessingResult(node_path=node_path, error=f"Node not found: {node_path}")
 
+            cache_hits, cache_misses = self._get_cache_counters()
+
             # Process using queries
             total_processed = self._process_node_query_based(root_node)
 
+            final_hits, final_misses = self._get_cache_counters()
+            if self.response_cache:
+                self.response_cache.log_stats()
+
             return ProcessingResult(
                 node_path=node_path,
                 hierarchical_analysis={"complete": True},
@@ -175,6 +192,8 @@ class BottomUpBatchProcessor:
                 information_nodes=[],
                 documentation_nodes=self.all_documentation_nodes,
                 source_nodes=self.all_source_nodes,
+                llm_cache_hits=final_hits - cache_hits,
+                llm_cache_misses=final_misses - cache_misses,
             )
 
         except Exception as e:
@@ -182,62 +201,79 @@ class BottomUpBatchProcessor:
             return ProcessingResult(node_path=node_path, error=str(e))
 
     def _process_node_query_based(self, root_node: NodeWithContentDto) -> int:
-        """Process using database queries without memory storage."""
+        """
+        Process every node under the root bottom-up, then the root itself.
+
+        The hierarchy and call graph are loaded once into an in-memory dependency counter. A node
+        is submitted to the thread pool as soon as its last child completes, and the documentation
+        is written back in batches on a separate thread while the pool keeps working.
+        """
+        graph, nodes, descriptions = self._load_dependency_graph(root_node)
+        pending_ids = [node_id for node_id in nodes if node_id not in descriptions]
+        self._mark_nodes_in_progress(pending_ids)
+        logger.info(f"Loaded {len(graph)} nodes under {root_node.path}, {len(pending_ids)} to document")
 
         total_processed = 0
-        max_iterations = 1000  # Safety limit
-
-        # Phase 1: Process all leaf nodes first
-        iteration = 0
-        while iteration < max_iterations:
-            iteration += 1
-
-            # Try to process leaf nodes first
-            leaf_count = self._process_leaf_batch(root_node)
-            if leaf_count == 0:
-                break
-            total_processed += leaf_count
-            logger.info(f"Processed {leaf_count} leaf nodes in iteration {iteration}")
-
-        # Phase 2: Process parent nodes and handle cycles
-        iteration = 0
-        consecutive_stuck_iterations = 0
-
-        while iteration < max_iterations:
-            iteration += 1
-
-            # Try to process parent nodes with completed children
-            parent_count = self._process_parent_batch(root_node)
-            if parent_count > 0:
-                total_processed += parent_count
-                consecutive_stuck_iterations = 0  # Reset stuck counter
-                logger.info(f"Processed {parent_count} parent nodes in iteration {iteration}")
-                continue
-
-            # Check if any nodes remain
-            if not self._has_pending_nodes(root_node):
-                logger.info("No pending nodes remaining")
-                break
-
-            # If we're stuck (no parents processable but nodes remain),
-            # process remaining functions (likely in cycles)
-            consecutive_stuck_iterations += 1
-
-            if consecutive_stuck_iterations >= 2:
-                # Process remaining functions with whatever descriptions are available
-                logger.info("Detected potential cycles - processing remaining functions")
-                remaining_count = self._process_remaining_functions_batch(root_node)
-
-                if remaining_count > 0:
-                    total_processed += remaining_count
-                    consecutive_stuck_iterations = 0  # Reset after progress
-                    logger.info(f"Processed {remaining_count} remaining functions")
-                else:
-                    # No functions left, might just be the root node
-                    logger.info("No remaining functions to process")
-                    break
+        save_executor = ThreadPoolExecutor(max_workers=1)
+        save_futures: List[Future[None]] = []
+        unsaved: List[DocumentationNode] = []
+        save_batch_size = max(1, min(self.batch_size, self.SAVE_BATCH_SIZE))
 
-        # Phase 3: Process root node if needed
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight: Dict[Future[Optional[DocumentationNode]], str] = {}
+
+            def submit(node_ids: List[str]) -> None:
+                for node_id in node_ids:
+                    node = nodes[node_id]
+                    child_ids = graph.get_children(node_id)
+                    if child_ids:
+                        child_descriptions = [descriptions[child] for child in child_ids if child in descriptions]
+                        future = executor.submit(self._process_parent_node, node, child_descriptions)
+                    else:
+                        future = executor.submit(self._process_leaf_node, node)
+                    in_flight[future] = node_id
+
+            submit(graph.start())
+
+            while graph.remaining:
+                if not in_flight:
+                    # Nothing can become ready any more, the remaining nodes wait on a cycle
+                    blocked = graph.release_blocked(prefer=lambda node_id: "FUNCTION" in nodes[node_id].labels)
+                    logger.info(f"Detected potential cycles - processing {len(blocked)} remaining nodes")
+                    submit(blocked)
+                    continue
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = in_flight.pop(future)
+                    try:
+                        doc_node = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing node {nodes[node_id].name}: {e}")
+                        doc_node = None
+
+                    if doc_node:
+                        descriptions[node_id] = doc_node
+                        unsaved.append(doc_node)
+                        if len(unsaved) >= save_batch_size:
+                            save_futures.append(save_executor.submit(self._save_documentation_batch, unsaved))
+                            unsaved = []
+
+                    self.all_source_nodes.append(nodes[node_id])
+                    total_processed += 1
+                    submit(graph.complete(node_id))
+
+        if unsaved:
+            save_futures.append(save_executor.submit(self._save_documentation_batch, unsaved))
+        for future in save_futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error saving documentation batch: {e}")
+        save_executor.shutdown()
+        logger.info(f"Processed {total_processed} nodes under {root_node.path}")
+
+        # Process root node once everything under it is saved
         root_count = self._process_root_node(root_node)
         if root_count > 0:
             total_processed += root_count
@@ -245,216 +281,65 @@ class BottomUpBatchProcessor:
 
         return total_processed
 
-    def _process_leaf_batch(self, root_node: NodeWithContentDto) -> int:
-        """Process a batch of leaf nodes."""
-        # Get leaf nodes from database
-        query = get_leaf_nodes_under_node_query()
-        params = {
-            "run_id": self.processing_run_id,
-            "batch_size": self.batch_size,
-            "root_node_id": root_node.id,
-        }
-
-        batch_results = self.db_manager.query(query, params)
-        if not batch_results:
-            return 0
-
-        # Process batch with thread pool
-        documentation_nodes = []
-        source_nodes = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = []
-
-            for node_data in batch_results:
-                # Create NodeWithContentDto from query result
-                node = NodeWithContentDto(
-                    id=node_data["id"],
-                    name=node_data["name"],
-                    labels=node_data["labels"],
-                    path=node_data["path"],
-                    start_line=node_data.get("start_line"),
-                    end_line=node_data.get("end_line"),
-                    content=node_data.get("content", ""),
-                )
-                source_nodes.append(node)
-                future = executor.submit(self._process_leaf_node, node)
-                futures.append((future, node.id))
-
-            # Harvest results as they complete
-            for future in as_completed([f[0] for f in futures]):
-                try:
-                    doc_node = future.result(timeout=30)
-                    if doc_node:
-                        documentation_nodes.append(doc_node)
-                except Exception as e:
-                    logger.error(f"Error processing leaf node: {e}")
-
-        # Save batch to database immediately
-        if documentation_nodes:
-            self._save_documentation_batch(documentation_nodes)
-
-        # Track source nodes
-        self.all_source_nodes.extend(source_nodes)
-
-        return len(batch_results)
-
-    def _process_parent_batch(self, root_node: NodeWithContentDto) -> int:
-        """Process a batch of parent nodes with child descriptions."""
-        # Get parent nodes with descriptions from database
-        query = get_processable_nodes_with_descriptions_query()
-        params = {
-            "run_id": self.processing_run_id,
-            "root_node_id": root_node.id,
-            "batch_size": self.batch_size,
-        }
-
-        batch_results = self.db_manager.query(query, params)
-        if not batch_results:
-            return 0
-
-        # Process batch with thread pool
-        documentation_nodes = []
-        source_nodes = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = []
-
-            for node_data in batch_results:
-                # Extract node info
-                node = NodeWithContentDto(
-                    id=node_data["id"],
-                    name=node_data["name"],
-                    labels=node_data["labels"],
-                    path=node_data["path"],
-                    start_line=node_data.get("start_line"),
-                    end_line=node_data.get("end_line"),
-                    content=node_data.get("content", ""),
-                )
-                source_nodes.append(node)
-
-                # Extract child descriptions
-                hier_descriptions = node_data.get("hier_descriptions", [])
-                call_descriptions = node_data.get("call_descriptions", [])
-
-                # Convert descriptions to DocumentationNode-like objects for processing
-                child_descriptions = []
-                for desc in hier_descriptions + call_descriptions:
-                    if desc and desc.get("description"):
-                        # Create minimal DocumentationNode for child context
-                        child_doc = DocumentationNode(
-                            content=desc["description"],
-                            info_type="child_description",
-                            source_path=desc.get("path", ""),
-                            source_name=desc.get("name", ""),
-                            source_id=desc.get("id", ""),
-                            source_labels=desc.get("labels", []),
-                            source_type="child",
-                            graph_environment=self.graph_environment,
-                        )
-                        child_descriptions.append(child_doc)
-
-                future = executor.submit(self._process_parent_node, node, child_descriptions)
-                futures.append((future, node.id))
-
-            # Harvest results
-            for future in as_completed([f[0] for f in futures]):
-                try:
-                    doc_node = future.result(timeout=30)
-                    if doc_node:
-                        documentation_nodes.append(doc_node)
-                except Exception as e:
-                    logger.error(f"Error processing parent node: {e}")
-
-        # Save batch immediately
-        if documentation_nodes:
-            self._save_documentation_batch(documentation_nodes)
-
-        # Track source nodes
-        self.all_source_nodes.extend(source_nodes)
-
-        return len(batch_results)
-
-    def _process_remaining_functions_batch(self, root_node: NodeWithContentDto) -> int:
+    def _load_dependency_graph(
+        self, root_node: NodeWithContentDto
+    ) -> Tuple[DocumentationDependencyGraph, Dict[str, NodeWithContentDto], Dict[str, DocumentationNode]]:
         """
-        Process remaining FUNCTION nodes that may be in cycles.
+        Load the nodes under the root with their children in a single query.
 
-        This method processes functions without requiring all their children to be completed,
-        using whatever child descriptions are available.
+        Returns:
+            The dependency graph, the nodes by id and the descriptions of the nodes already
+            completed in this run
         """
-        # Get remaining functions from database
-        query = get_remaining_pending_functions_query()
+        query = get_documentation_dependency_graph_query()
         params = {
             "run_id": self.processing_run_id,
-            "batch_size": self.batch_size,
             "root_node_id": root_node.id,
         }
 
-        batch_results = self.db_manager.query(query, params)
-        if not batch_results:
-            return 0
+        graph = DocumentationDependencyGraph()
+        nodes: Dict[str, NodeWithContentDto] = {}
+        descriptions: Dict[str, DocumentationNode] = {}
+
+        for node_data in self.db_manager.query(query, params) or []:
+            node = NodeWithContentDto(
+                id=node_data["id"],
+                name=node_data["name"],
+                labels=node_data["labels"],
+                path=node_data["path"],
+                start_line=node_data.get("start_line"),
+                end_line=node_data.get("end_line"),
+                content=node_data.get("content", ""),
+            )
+            nodes[node.id] = node
 
-        logger.debug(f"Processing {len(batch_results)} remaining functions (potential cycles)")
+            completed = bool(node_data.get("completed"))
+            child_ids = (node_data.get("hier_child_ids") or []) + (node_data.get("call_child_ids") or [])
+            graph.add_node(node.id, child_ids, completed=completed)
 
-        # Process batch with thread pool
-        documentation_nodes = []
-        source_nodes = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = []
-
-            for node_data in batch_results:
-                # Extract node info
-                node = NodeWithContentDto(
-                    id=node_data["id"],
-                    name=node_data["name"],
-                    labels=node_data["labels"],
-                    path=node_data["path"],
-                    start_line=node_data.get("start_line"),
-                    end_line=node_data.get("end_line"),
-                    content=node_data.get("content", ""),
+            if completed and node_data.get("description"):
+                # Create minimal DocumentationNode for child context
+                descriptions[node.id] = DocumentationNode(
+                    content=node_data["description"],
+                    info_type="child_description",
+                    source_path=node.path,
+                    source_name=node.name,
+                    source_id=node.id,
+                    source_labels=node.labels,
+                    source_type="child",
+                    graph_environment=self.graph_environment,
                 )
-                source_nodes.append(node)
-
-                # Extract child descriptions (may be incomplete due to cycles)
-                hier_descriptions = node_data.get("hier_descriptions", [])
-                call_descriptions = node_data.get("call_descriptions", [])
-
-                # Convert descriptions to DocumentationNode-like objects for processing
-                child_descriptions = []
-                for desc in hier_descriptions + call_descriptions:
-                    if desc and desc.get("description"):
-                        # Create minimal DocumentationNode for child context
-                        child_doc = DocumentationNode(
-                            content=desc["description"],
-                            info_type="child_description",
-                            source_path=desc.get("path", ""),
-                            source_name=desc.get("name", ""),
-                            source_id=desc.get("id", ""),
-                            source_labels=desc.get("labels", []),
-                            source_type="child",
-                            graph_environment=self.graph_environment,
-                        )
-                        child_descriptions.append(child_doc)
-
-                # Reuse _process_parent_node for processing (no special cycle handling)
-                future = executor.submit(self._process_parent_node, node, child_descriptions)
-                futures.append((future, node.id))
-
-            # Harvest results
-            for future in as_completed([f[0] for f in futures]):
-                try:
-                    doc_node = future.result(timeout=30)
-                    if doc_node:
-                        documentation_nodes.append(doc_node)
-                except Exception as e:
-                    logger.error(f"Error processing remaining function: {e}")
 
-        # Save batch immediately
-        if documentation_nodes:
-            self._save_documentation_batch(documentation_nodes)
+        return graph, nodes, descriptions
 
-        # Track source nodes
-        self.all_source_nodes.extend(source_nodes)
-
-        return len(batch_results)
+    def _mark_nodes_in_progress(self, node_ids: List[str]) -> None:
+        query = mark_nodes_in_progress_query()
+        for start in range(0, len(node_ids), self.batch_size):
+            params = {
+                "node_ids": node_ids[start : start + self.batch_size],
+                "run_id": self.processing_run_id,
+            }
+            self.db_manager.query(query, params)
 
     def _process_root_node(self, root_node: NodeWithContentDto) -> int:
         """
@@ -531,17 +416,6 @@ class BottomUpBatchProcessor:
 
         logger.debug(f"Saved {len(documentation_nodes)} documentation nodes to database")
 
-    def _has_pending_nodes(self, root_node: NodeWithContentDto) -> bool:
-        """Check if there are still pending nodes under the root node."""
-        query = check_pending_nodes_query()
-        params = {"root_node_id": root_node.id}
-
-        result = self.db_manager.query(query, params)
-        if result:
-            pending_count = result[0].get("pending_count", 0)
-            return pending_count > 0
-        return False
-
     def _process_leaf_node(self, node: NodeWithContentDto) -> Optional[DocumentationNode]:
         """
         Process a leaf node (FUNCTION with no calls or FILE with no children).
@@ -556,7 +430,6 @@ class BottomUpBatchProcessor:
         try:
             # Use standard leaf template for both functions and files
             # No cycle detection needed - leaf nodes can't be in cycles
-            system_prompt, input_prompt = LEAF_NODE_ANALYSIS_TEMPLATE.get_prompts()
             prompt_dict = {
                 "node_name": node.name,
                 "node_labels": " | ".join(node.labels),
@@ -565,9 +438,7 @@ class BottomUpBatchProcessor:
             }
 
             # Generate description using LLM
-            description = self.agent_caller.call_dumb_agent(
-                system_prompt=system_prompt, input_dict=prompt_dict, input_prompt=input_prompt
-            )
+            description = self._generate_description(LEAF_NODE_ANALYSIS_TEMPLATE, prompt_dict)
 
             # Create DocumentationNode
             doc_node = DocumentationNode(
@@ -620,7 +491,7 @@ class BottomUpBatchProcessor:
                 child_calls_context = self._create_function_calls_context(child_descriptions)
 
                 # Always use FUNCTION_WITH_CALLS_ANALYSIS_TEMPLATE (no cycle checking)
-                system_prompt, input_prompt = FUNCTION_WITH_CALLS_ANALYSIS_TEMPLATE.get_prompts()
+                template = FUNCTION_WITH_CALLS_ANALYSIS_TEMPLATE
                 prompt_dict = {
                     "node_name": node.name,
                     "node_labels": " | ".join(node.labels),
@@ -632,7 +503,7 @@ class BottomUpBatchProcessor:
                 }
             else:
                 # Parent node (class, file, folder)
-                system_prompt, input_prompt = PARENT_NODE_ANALYSIS_TEMPLATE.get_prompts()
+                template = PARENT_NODE_ANALYSIS_TEMPLATE
 
                 # Create enhanced content based on node type
                 if "FOLDER" in node.labels:
@@ -651,9 +522,7 @@ class BottomUpBatchProcessor:
                 }
 
             # Generate description using LLM
-            description = self.agent_caller.call_dumb_agent(
-                system_prompt=system_prompt, input_dict=prompt_dict, input_prompt=input_prompt
-            )
+            description = self._generate_description(template, prompt_dict)
 
             # Create DocumentationNode
             doc_node = DocumentationNode(
@@ -685,6 +554,29 @@ class BottomUpBatchProcessor:
                 graph_environment=self.graph_environment,
             )
 
+    def _generate_description(self, template: PromptTemplate, prompt_dict: Dict[str, Any]) -> str:
+        """Call the LLM with the template, unless the response cache has a description for the same prompt."""
+        cache_key = None
+        if self.response_cache:
+            cache_key = self.response_cache.get_key(template, self.agent_caller.dumb_agent, prompt_dict)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        system_prompt, input_prompt = template.get_prompts()
+        description = self.agent_caller.call_dumb_agent(
+            system_prompt=system_prompt, input_dict=prompt_dict, input_prompt=input_prompt
+        )
+
+        if cache_key and isinstance(description, str) and description:
+            self.response_cache.set(cache_key, description)
+        return description
+
+    def _get_cache_counters(self) -> Tuple[int, int]:
+        if not self.response_cache:
+            return 0, 0
+        return self.response_cache.hits, self.response_cache.misses
+
     def _create_child_descriptions_summary(self, child_descriptions: List[DocumentationNode]) -> str:
         """
         Create enhanced content for folder nodes by summarizing child descriptions.
@@ -0,0 +1,90 @@
+"""
+In-memory dependency counter used to schedule documentation generation bottom-up.
+"""
+
+from typing import Callable, Dict, Iterable, List, Set
+
+
+class DocumentationDependencyGraph:
+    """
+    Tracks how many children (hierarchy and call edges) of every node are still undocumented.
+
+    A node is ready as soon as its last child completes. Children outside the graph are not
+    dependencies, and nodes that are already completed never block their parents.
+    """
+
+    def __init__(self) -> None:
+        self._children: Dict[str, List[str]] = {}
+        self._parents: Dict[str, Set[str]] = {}
+        self._pending_children: Dict[str, int] = {}
+        self._completed: Set[str] = set()
+        self._released: Set[str] = set()
+
+    def add_node(self, node_id: str, child_ids: Iterable[str], completed: bool = False) -> None:
+        self._children[node_id] = list(dict.fromkeys(child_id for child_id in child_ids if child_id != node_id))
+        if completed:
+            self._completed.add(node_id)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._children
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def get_children(self, node_id: str) -> List[str]:
+        """Children of the node that are part of the graph, in the order they were added."""
+        return [child_id for child_id in self._children.get(node_id, ()) if child_id in self._children]
+
+    @property
+    def remaining(self) -> int:
+        """Nodes that are not completed yet, including the ones released for processing."""
+        return len(self._children) - len(self._completed)
+
+    def start(self) -> List[str]:
+        """Builds the counters once every node was added and returns the nodes ready right away."""
+        self._parents = {node_id: set() for node_id in self._children}
+        self._pending_children = {}
+
+        for node_id, child_ids in self._children.items():
+            if node_id in self._completed:
+                continue
+            pending = 0
+            for child_id in child_ids:
+                if child_id in self._children:
+                    self._parents[child_id].add(node_id)
+                    if child_id not in self._completed:
+                        pending += 1
+            self._pending_children[node_id] = pending
+
+        return self._release([node_id for node_id, pending in self._pending_children.items() if pending == 0])
+
+    def complete(self, node_id: str) -> List[str]:
+        """Marks the node as completed and returns the parents it was the last pending child of."""
+        if node_id in self._completed:
+            return []
+        self._completed.add(node_id)
+
+        ready = []
+        for parent_id in self._parents.get(node_id, ()):
+            if parent_id in self._completed or parent_id in self._released:
+                continue
+            self._pending_children[parent_id] -= 1
+            if self._pending_children[parent_id] == 0:
+                ready.append(parent_id)
+        return self._release(ready)
+
+    def release_blocked(self, prefer: Callable[[str], bool]) -> List[str]:
+        """
+        Releases the pending nodes that can't become ready because they wait on a cycle.
+
+        Only call it when nothing is being processed. The nodes matching prefer are released
+        first, every pending node is released when none matches.
+        """
+        blocked = [node_id for node_id in self._pending_children if node_id not in self._released]
+        preferred = [node_id for node_id in blocked if prefer(node_id)]
+        return self._release(preferred or blocked)
+
+    def _release(self, node_ids: List[str]) -> List[str]:
+        released = [node_id for node_id in node_ids if node_id not in self._released]
+        self._released.update(released)
+        return released
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import zlib
+from typing import Any, Dict, Optional
+
+from blarify.agents.prompt_templates import PromptTemplate
+from blarify.utils.sqlite_lru_cache import SqliteLruCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored descriptions or the way prompts are filled change, so stale entries stop matching
+LLM_RESPONSE_CACHE_FORMAT_VERSION = "1"
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def _normalize(value: Any) -> Any:
+    """Line endings and trailing whitespace don't change what the model is asked, drop them from keys."""
+    if isinstance(value, str):
+        return _TRAILING_WHITESPACE.sub("", value.replace("\r\n", "\n")).strip("\n")
+    return value
+
+
+class LlmResponseCache:
+    """
+    Opt-in on-disk cache of the descriptions generated for documentation nodes.
+
+    Entries are keyed by the prompt template, its text, the model and the normalized prompt
+    variables, which hold the node content and the descriptions of its children. Editing a
+    template or a child description therefore misses, unchanged subtrees cost no LLM call.
+    """
+
+    DEFAULT_MAX_SIZE_MB = 256
+
+    def __init__(self, cache_dir: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self._store = SqliteLruCache(
+            path=os.path.join(cache_dir, "llm_response_cache.sqlite"),
+            max_size_bytes=int(max_size_mb * 1024 * 1024),
+        )
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    def get_key(self, template: PromptTemplate, model: str, prompt_dict: Dict[str, Any]) -> str:
+        key = hashlib.sha256(LLM_RESPONSE_CACHE_FORMAT_VERSION.encode("utf-8"))
+        for part in (template.name, template.system_prompt, template.input_prompt, model):
+            key.update(b"\0" + part.encode("utf-8"))
+        normalized = {name: _normalize(value) for name, value in prompt_dict.items()}
+        key.update(b"\0" + json.dumps(normalized, sort_keys=True, default=str).encode("utf-8"))
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._store.get(key)
+        if value is None:
+            return None
+        return zlib.decompress(value).decode("utf-8")
+
+    def set(self, key: str, description: str) -> None:
+        self._store.set(key, zlib.compress(description.encode("utf-8")))
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"LLM response cache: {self.hits} hits, {self.misses} misses "
+            f"({100 * self._store.hit_rate:.1f}% hit rate), {self._store.evictions} evictions, "
+            f"{self._store.total_size / (1024 * 1024):.1f} MB stored"
+        )
+
+    def close(self) -> None:
+        self._store.close()
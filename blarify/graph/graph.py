@@ -1,13 +1,29 @@
 from collections import defaultdict
-from typing import List, Dict, Set, DefaultDict, Optional, TYPE_CHECKING, Any, Sequence, cast
+from typing import (
+    AbstractSet,
+    List,
+    Dict,
+    Set,
+    DefaultDict,
+    Iterable,
+    Iterator,
+    Optional,
+    TYPE_CHECKING,
+    Any,
+    Sequence,
+    cast,
+)
 
 from blarify.graph.node import Node, NodeLabels
 from blarify.graph.node.file_node import FileNode
 from blarify.graph.node.folder_node import FolderNode
+from blarify.utils.chunked import chunked
 
 if TYPE_CHECKING:
     from blarify.graph.relationship import Relationship
 
+DEFAULT_EXPORT_CHUNK_SIZE = 1000
+
 
 class Graph:
     nodes_by_path: DefaultDict[str, Set[Node]]
@@ -65,10 +81,21 @@ class Graph:
         return self.nodes_by_relative_id.get(relative_id)
 
     def get_relationships_as_objects(self) -> List[Dict[str, Any]]:
-        internal_relationships = [relationship.as_object() for relationship in self.get_relationships_from_nodes()]
-        reference_relationships = [relationship.as_object() for relationship in self.__references_relationships]
+        return list(self.iter_relationships_as_objects())
+
+    def iter_relationships_as_objects(self) -> Iterator[Dict[str, Any]]:
+        for node in self.__nodes.values():
+            for relationship in node.get_relationships():
+                yield relationship.as_object()
 
-        return internal_relationships + reference_relationships
+        for relationship in self.__references_relationships:
+            yield relationship.as_object()
+
+    def iter_relationship_object_chunks(
+        self, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the relationship objects in chunks, only one chunk of dicts is alive at a time."""
+        return chunked(self.iter_relationships_as_objects(), chunk_size)
 
     def get_relationships_from_nodes(self) -> List["Relationship"]:
         relationships: List["Relationship"] = []
@@ -77,22 +104,48 @@ class Graph:
 
         return relationships
 
+    def get_node_count(self) -> int:
+        return len(self.__nodes)
+
+    def get_relationship_count(self) -> int:
+        internal_relationships = sum(len(node.get_relationships()) for node in self.__nodes.values())
+        return internal_relationships + len(self.__references_relationships)
+
     def add_references_relationships(self, references_relationships: List["Relationship"]) -> None:
         self.__references_relationships.extend(references_relationships)
 
     def get_nodes_as_objects(self) -> List[Dict[str, Any]]:
-        return [node.as_object() for node in self.__nodes.values()]
+        return list(self.iter_nodes_as_objects())
+
+    def iter_nodes_as_objects(self) -> Iterator[Dict[str, Any]]:
+        for node in self.__nodes.values():
+            yield node.as_object()
+
+    def iter_node_object_chunks(self, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the node objects in chunks, only one chunk of dicts is alive at a time."""
+        return chunked(self.iter_nodes_as_objects(), chunk_size)
+
+    def filtered_graph_by_paths(self, paths_to_keep: Iterable[str]) -> "Graph":
+        """
+        Returns a graph with the nodes under the given paths, and the reference relationships touching them.
+
+        Every node and relationship is checked against the paths, pass a set to avoid copying them into one.
+        """
+        paths: AbstractSet[str] = paths_to_keep if isinstance(paths_to_keep, (set, frozenset)) else set(paths_to_keep)
 
-    def filtered_graph_by_paths(self, paths_to_keep: List[str]) -> "Graph":
         graph: Graph = Graph()
         for node in self.__nodes.values():
-            if node.path in paths_to_keep:
-                node.filter_children_by_path(paths_to_keep)
+            if node.path in paths:
+                node.filter_children_by_path(paths)
                 graph.add_node(node)
 
-        for relationship in self.__references_relationships:
-            if relationship.start_node.path in paths_to_keep or relationship.end_node.path in paths_to_keep:
-                graph.add_references_relationships([relationship])
+        graph.add_references_relationships(
+            [
+                relationship
+                for relationship in self.__references_relationships
+                if relationship.start_node.path in paths or relationship.end_node.path in paths
+            ]
+        )
 
         return graph
 
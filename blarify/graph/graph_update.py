@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from blarify.graph.graph import Graph
+from itertools import chain
+from blarify.graph.graph import DEFAULT_EXPORT_CHUNK_SIZE, Graph
 from blarify.graph.external_relationship_store import ExternalRelationshipStore
-from typing import List
+from blarify.utils.chunked import chunked
+from typing import Any, Dict, Iterator, List
 
 
 @dataclass
@@ -13,6 +15,27 @@ class GraphUpdate:
         return self.graph.get_nodes_as_objects()
 
     def get_relationships_as_objects(self) -> List[dict]:
-        return (
-            self.graph.get_relationships_as_objects() + self.external_relationship_store.get_relationships_as_objects()
+        return list(self.iter_relationships_as_objects())
+
+    def iter_nodes_as_objects(self) -> Iterator[Dict[str, Any]]:
+        return self.graph.iter_nodes_as_objects()
+
+    def iter_relationships_as_objects(self) -> Iterator[Dict[str, Any]]:
+        external_relationships = (
+            relationship.as_object() for relationship in self.external_relationship_store.relationships
         )
+        return chain(self.graph.iter_relationships_as_objects(), external_relationships)
+
+    def iter_node_object_chunks(self, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        return self.graph.iter_node_object_chunks(chunk_size)
+
+    def iter_relationship_object_chunks(
+        self, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        return chunked(self.iter_relationships_as_objects(), chunk_size)
+
+    def get_node_count(self) -> int:
+        return self.graph.get_node_count()
+
+    def get_relationship_count(self) -> int:
+        return self.graph.get_relationship_count() + len(self.external_relationship_store.relationships)
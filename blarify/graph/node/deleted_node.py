@@ -3,6 +3,8 @@ from blarify.utils.path_calculator import PathCalculator
 
 
 class DeletedNode(Node):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
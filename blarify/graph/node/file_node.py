@@ -4,7 +4,13 @@ from .types.definition_node import DefinitionNode
 
 
 class FileNode(DefinitionNode):
+    __slots__ = ("has_pending_tree_sitter_nodes",)
+
+    # True while the node was rebuilt from a ParsedFile and its tree-sitter nodes are not bound yet
+    has_pending_tree_sitter_nodes: bool
+
     def __init__(self, **kwargs) -> None:
+        self.has_pending_tree_sitter_nodes = False
         super().__init__(label=NodeLabels.FILE, **kwargs)
 
     @property
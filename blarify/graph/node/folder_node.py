@@ -1,6 +1,6 @@
 from blarify.graph.node import Node, NodeLabels
 from blarify.graph.node.file_node import FileNode
-from typing import Union, List, Sequence, TYPE_CHECKING, Optional
+from typing import AbstractSet, Union, List, Sequence, TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from blarify.graph.relationship import Relationship
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
 
 
 class FolderNode(Node):
+    __slots__ = ("_contains",)
+
     path: str
     name: str
     level: int
@@ -40,6 +42,9 @@ class FolderNode(Node):
         for node in nodes:
             self.relate_node_as_contain_relationship(node)
 
+    def _get_children(self) -> List[Union[FileNode, "FolderNode"]]:
+        return self._contains
+
     def get_relationships(self) -> List["Relationship"]:
         from blarify.graph.relationship import RelationshipCreator
 
@@ -49,5 +54,5 @@ class FolderNode(Node):
 
         return relationships
 
-    def filter_children_by_path(self, paths: List[str]):
+    def filter_children_by_path(self, paths: AbstractSet[str]):
         self._contains = [node for node in self._contains if node.path in paths]
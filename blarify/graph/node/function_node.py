@@ -1,20 +1,38 @@
+from typing import Optional
+
 from blarify.graph.node import NodeLabels
 from blarify.stats.complexity import CodeComplexityCalculator
 from .types.definition_node import DefinitionNode
 
 
 class FunctionNode(DefinitionNode):
+    __slots__ = ("_parameter_count",)
+
+    _parameter_count: Optional[int]
+
     def __init__(self, **kwargs):
+        self._parameter_count = None
         super().__init__(label=NodeLabels.FUNCTION, **kwargs)
 
+    @property
+    def parameter_count(self) -> int:
+        if self._tree_sitter_node is None:
+            return self._parameter_count or 0
+        if self._parameter_count is None:
+            self._parameter_count = CodeComplexityCalculator.calculate_parameter_count(self._tree_sitter_node)
+        return self._parameter_count
+
+    def release_tree_sitter_nodes(self) -> None:
+        self._parameter_count = self.parameter_count
+        super().release_tree_sitter_nodes()
+
     @property
     def node_repr_for_identifier(self) -> str:
         return "." + self.name
 
     def as_object(self) -> dict:
         obj = super().as_object()
-        obj["attributes"]["start_line"] = self.node_range.range.start.line
-        obj["attributes"]["end_line"] = self.node_range.range.end.line
+        obj["attributes"]["start_line"], obj["attributes"]["end_line"] = self.get_start_and_end_line()
         obj["attributes"]["text"] = self.code_text
-        obj["attributes"]["stats_parameter_count"] = CodeComplexityCalculator.calculate_parameter_count(self._tree_sitter_node)
+        obj["attributes"]["stats_parameter_count"] = self.parameter_count
         return obj
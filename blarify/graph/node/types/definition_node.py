@@ -1,5 +1,9 @@
-from typing import List, Optional, Tuple, Union, TYPE_CHECKING, Dict
+from typing import AbstractSet, List, Optional, Tuple, Union, TYPE_CHECKING, Dict
+from blarify.code_references.types import Reference
+from blarify.code_references.types.Reference import RangeTuple
 from blarify.graph.node.types.node import Node
+from blarify.graph.node.utils.definition_range_index import DefinitionRangeIndex
+from blarify.graph.node.utils.source_span import SourceSpan
 
 import re
 
@@ -9,36 +13,64 @@ if TYPE_CHECKING:
     from ..class_node import ClassNode
     from ..function_node import FunctionNode
     from blarify.graph.relationship import Relationship
-    from blarify.code_references.types import Reference
     from tree_sitter import Node as TreeSitterNode
     from blarify.graph.graph_environment import GraphEnvironment
 
 
 class DefinitionNode(Node):
+    # Ranges are kept packed as (start line, start character, end line, end character) tuples,
+    # node_range and definition_range build Reference objects from them on access.
+    # Code text parsed from a file is kept as a span of its source until it is first read
+    __slots__ = (
+        "_defines",
+        "_definition_range",
+        "_definition_range_uri",
+        "_node_range",
+        "_node_range_uri",
+        "_code_text",
+        "_code_span",
+        "extra_labels",
+        "extra_attributes",
+        "body_node",
+        "_tree_sitter_node",
+        "_definition_range_index",
+        "_stats",
+    )
+
     _defines: List[Union["ClassNode", "FunctionNode"]]
-    definition_range: "Reference"
-    node_range: "Reference"
-    code_text: str
-    _is_diff: bool
+    _definition_range: RangeTuple
+    _definition_range_uri: str
+    _node_range: RangeTuple
+    _node_range_uri: str
+    _code_text: Optional[str]
+    _code_span: Optional[SourceSpan]
     extra_labels: List[str]
     extra_attributes: Dict[str, str]
-    body_node: Optional["TreeSitterNode"] = None
-    _tree_sitter_node: Optional["TreeSitterNode"] = None
+    body_node: Optional["TreeSitterNode"]
+    _tree_sitter_node: Optional["TreeSitterNode"]
+    _definition_range_index: Optional[DefinitionRangeIndex]
+    _stats: Optional["NestingStats"]
 
     def __init__(
         self, 
         definition_range: "Reference", 
         node_range: "Reference", 
-        code_text: str, 
+        code_text: Union[str, SourceSpan], 
         body_node: Optional["TreeSitterNode"], 
         tree_sitter_node: "TreeSitterNode", 
         *args, 
         **kwargs
     ) -> None:
         self._defines: List[Union["ClassNode", "FunctionNode"]] = []
+        self._definition_range_index = None
+        self._stats = None
         self.definition_range = definition_range
         self.node_range = node_range
-        self.code_text = code_text
+        if isinstance(code_text, SourceSpan):
+            self._code_text = None
+            self._code_span = code_text
+        else:
+            self.code_text = code_text
         self.body_node = body_node
         self._tree_sitter_node = tree_sitter_node
         self.extra_labels = []
@@ -46,17 +78,54 @@ class DefinitionNode(Node):
 
         super().__init__(*args, **kwargs)
 
+    @property
+    def definition_range(self) -> Reference:
+        return Reference.from_range_tuple(self._definition_range, self._definition_range_uri)
+
+    @definition_range.setter
+    def definition_range(self, reference: Reference) -> None:
+        self._definition_range = reference.to_range_tuple()
+        self._definition_range_uri = reference.uri
+
+    @property
+    def node_range(self) -> Reference:
+        return Reference.from_range_tuple(self._node_range, self._node_range_uri)
+
+    @node_range.setter
+    def node_range(self, reference: Reference) -> None:
+        self._node_range = reference.to_range_tuple()
+        self._node_range_uri = reference.uri
+
+    @property
+    def code_text(self) -> str:
+        if self._code_text is None:
+            self._code_text = self._code_span.decode()
+            self._code_span = None
+        return self._code_text
+
+    @code_text.setter
+    def code_text(self, code_text: str) -> None:
+        self._code_text = code_text
+        self._code_span = None
+
     @property
     def stats(self) -> "NestingStats":
         if self.body_node is None:
-            return NestingStats(0, 0, 0, 0)
-        return CodeComplexityCalculator.calculate_nesting_stats(self.body_node, extension=self.extension)
+            return self._stats or NestingStats(0, 0, 0, 0)
+        if self._stats is None:
+            self._stats = CodeComplexityCalculator.calculate_nesting_stats(self.body_node, extension=self.extension)
+        return self._stats
 
     def relate_node_as_define_relationship(self, node: Union["ClassNode", "FunctionNode"]) -> None:
         self._defines.append(node)
+        self._definition_range_index = None
 
     def relate_nodes_as_define_relationship(self, nodes: List[Union["ClassNode", "FunctionNode"]]) -> None:
         self._defines.extend(nodes)
+        self._definition_range_index = None
+
+    def _get_children(self) -> List[Union["ClassNode", "FunctionNode"]]:
+        return self._defines
 
     def get_relationships(self) -> List["Relationship"]:
         from blarify.graph.relationship import RelationshipCreator
@@ -67,72 +136,86 @@ class DefinitionNode(Node):
         return relationships
 
     def get_start_and_end_line(self) -> Tuple[int, int]:
-        return self.node_range.range.start.line, self.node_range.range.end.line
+        return self._node_range[0], self._node_range[2]
 
     def reference_search(self, reference: "Reference") -> "DefinitionNode":
+        """Returns the innermost definition whose line range contains the reference."""
         reference_start = reference.range.start.line
         reference_end = reference.range.end.line
 
-        for node in self._defines:
-            start_line, end_line = node.get_start_and_end_line()
+        node = self
+        while enclosing_node := node._get_definition_range_index().find_enclosing(reference_start, reference_end):
+            node = enclosing_node
 
-            if self.is_reference_within_scope(
-                reference_start=reference_start,
-                reference_end=reference_end,
-                scope_start=start_line,
-                scope_end=end_line,
-            ):
-                return node.reference_search(reference=reference)
+        return node
 
-            if self.is_reference_end_before_scope_start(reference_end, start_line):
-                break
+    def reference_search_batch(self, references: List["Reference"]) -> List["DefinitionNode"]:
+        """
+        Resolve many references against this node at once.
 
-        return self
+        References spanning the same lines resolve to the same definition, so each distinct
+        line span is only searched once.
+        """
+        found_by_span: Dict[Tuple[int, int], "DefinitionNode"] = {}
+        found_nodes = []
+        for reference in references:
+            span = (reference.range.start.line, reference.range.end.line)
+            if span not in found_by_span:
+                found_by_span[span] = self.reference_search(reference)
+            found_nodes.append(found_by_span[span])
 
-    def is_reference_within_scope(
-        self, reference_start: int, reference_end: int, scope_start: int, scope_end: int
-    ) -> bool:
-        return scope_start <= reference_start and scope_end >= reference_end
+        return found_nodes
 
-    def is_reference_end_before_scope_start(self, reference_end: int, scope_start: int) -> bool:
-        return reference_end < scope_start
+    def _get_definition_range_index(self) -> DefinitionRangeIndex:
+        if self._definition_range_index is None:
+            self._definition_range_index = DefinitionRangeIndex(self._defines)
+        return self._definition_range_index
 
     def skeletonize(self) -> None:
+        """
+        Replace the bodies of the definitions of this node with a reference to their node, then skeletonize them.
+
+        The text is cut out of the source in a single pass, the kept parts are views into it until the final join.
+        """
         if self._tree_sitter_node is None:
             return
 
-        parent_node = self._tree_sitter_node
-        text_bytes = parent_node.text
-        bytes_offset = -self._tree_sitter_node.start_byte - 1
+        if self._code_span is not None:
+            source, source_offset = self._code_span.source, 0
+        else:
+            source, source_offset = self._tree_sitter_node.text, self._tree_sitter_node.start_byte
+
+        source_view = memoryview(source)
+        start_byte = self._tree_sitter_node.start_byte - source_offset
+        end_byte = self._tree_sitter_node.end_byte - source_offset
+
+        parts: List[Union[bytes, memoryview]] = []
+        kept_from = start_byte
+        # Every swallowed line break moves the following cuts one byte further, as skeletons have always been cut
+        shift = 0
         for node in self._defines:
             if node.body_node is None:
                 continue
-            start_text, start_byte = node.get_start_text_bytes(parent_text_bytes=text_bytes, bytes_offset=bytes_offset)
-            end_text, end_byte = node.get_end_text_bytes(parent_text_bytes=text_bytes, bytes_offset=bytes_offset)
-            text_bytes = start_text + node._get_text_for_skeleton() + end_text
-
-            bytes_offset += node.calculate_new_offset(start_byte=start_byte, end_byte=end_byte)
-
-            # TODO: This is a workaround to avoid decoding errors. We should find a better solution.
-            self.code_text = text_bytes.decode("utf-8", errors="ignore")
 
-            node.skeletonize()
+            # The cut starts two bytes before the body and swallows the line break that follows it
+            cut_start = max(node.body_node.start_byte - source_offset - 2 + shift, kept_from)
+            cut_end = node.body_node.end_byte - source_offset + shift
+            if cut_end < end_byte and source[cut_end : cut_end + 1] == b"\n":
+                cut_end += 1
+                shift += 1
 
-    def calculate_new_offset(self, start_byte: int, end_byte: int) -> int:
-        return len(self._get_text_for_skeleton()) - (end_byte - start_byte)
+            parts.append(source_view[kept_from:cut_start])
+            parts.append(node._get_text_for_skeleton())
+            kept_from = max(cut_end, cut_start)
 
-    def get_start_text_bytes(self, parent_text_bytes: bytes, bytes_offset: int) -> Tuple[bytes, int]:
-        start_byte = self.body_node.start_byte + bytes_offset - 1
-        return parent_text_bytes[:start_byte], start_byte
-
-    def get_end_text_bytes(self, parent_text_bytes: bytes, bytes_offset: int) -> Tuple[bytes, int]:
-        end_byte = self.body_node.end_byte + bytes_offset + 1
-        return self.remove_line_break_if_present(text=parent_text_bytes[end_byte:]), end_byte
+        if parts:
+            parts.append(source_view[kept_from:end_byte])
+            # TODO: This is a workaround to avoid decoding errors. We should find a better solution.
+            self.code_text = b"".join(parts).decode("utf-8", errors="ignore")
 
-    def remove_line_break_if_present(self, text: bytes) -> Tuple[bytes, int]:
-        if text[0:1] == b"\n":
-            return text[1:]
-        return text
+        for node in self._defines:
+            if node.body_node is not None:
+                node.skeletonize()
 
     def _get_text_for_skeleton(self) -> bytes:
         return f"# Code replaced for brevity, see node: {self.hashed_id}\n".encode("utf-8")
@@ -174,28 +257,42 @@ class DefinitionNode(Node):
     def __copy__(self):
         cls = self.__class__
         result = cls.__new__(cls)
-        result.__dict__.update(self.__dict__)
+        self._copy_attributes_to(result)
         result.extra_labels = self.extra_labels.copy()
         result.extra_attributes = self.extra_attributes.copy()
         return result
 
     def as_object(self):
         obj = super().as_object()
+        stats = self.stats
         obj["extra_labels"] = self.extra_labels
         obj["attributes"] = {
             **obj["attributes"],
             **self.extra_attributes,
-            "stats_max_indentation": self.stats.max_indentation,
-            "stats_min_indentation": self.stats.min_indentation,
-            "stats_average_indentation": self.stats.average_indentation,
-            "stats_sd_indentation": self.stats.sd,
+            "stats_max_indentation": stats.max_indentation,
+            "stats_min_indentation": stats.min_indentation,
+            "stats_average_indentation": stats.average_indentation,
+            "stats_sd_indentation": stats.sd,
         }
         return obj
 
-    def filter_children_by_path(self, paths_to_keep: List[str]) -> None:
+    def filter_children_by_path(self, paths_to_keep: AbstractSet[str]) -> None:
         self._defines = [node for node in self._defines if node.path in paths_to_keep]
+        self._definition_range_index = None
         for node in self._defines:
             node.filter_children_by_path(paths_to_keep)
 
     def has_tree_sitter_node(self):
         return self._tree_sitter_node is not None
+
+    def release_tree_sitter_nodes(self) -> None:
+        """
+        Drops the tree-sitter nodes of this node and its children so the parsed trees can be freed.
+
+        Stats are computed first, since they can't be calculated from the body node afterwards.
+        """
+        self._stats = self.stats
+        self.body_node = None
+        self._tree_sitter_node = None
+        for node in self._defines:
+            node.release_tree_sitter_nodes()
@@ -1,4 +1,4 @@
-from typing import List, TYPE_CHECKING, Optional, Dict, Any
+from typing import AbstractSet, List, TYPE_CHECKING, Optional, Dict, Any, Sequence
 from hashlib import md5
 from blarify.utils.format_verifier import FormatVerifier
 import os
@@ -12,13 +12,31 @@ if TYPE_CHECKING:
 
 
 class Node:
+    __slots__ = (
+        "label",
+        "path",
+        "name",
+        "level",
+        "_parent",
+        "_graph_environment",
+        "layer",
+        "_cached_identifier",
+        "_cached_id",
+        "_cached_hashed_id",
+        "_cached_relative_id",
+    )
+
     label: "NodeLabels"
     path: str
     name: str
     level: int
-    parent: Optional["Node"]
-    graph_environment: Optional["GraphEnvironment"]
+    _parent: Optional["Node"]
+    _graph_environment: Optional["GraphEnvironment"]
     layer: str
+    _cached_identifier: Optional[str]
+    _cached_id: Optional[str]
+    _cached_hashed_id: Optional[str]
+    _cached_relative_id: Optional[str]
 
     def __init__(
         self,
@@ -30,6 +48,10 @@ class Node:
         graph_environment: Optional["GraphEnvironment"] = None,
         layer: str = "code",
     ) -> None:
+        self._cached_identifier = None
+        self._cached_id = None
+        self._cached_hashed_id = None
+        self._cached_relative_id = None
         self.label = label
         self.path = path
         self.name = name
@@ -44,20 +66,65 @@ class Node:
     def is_path_format_valid(self) -> bool:
         return FormatVerifier.is_path_uri(self.path)
 
+    @property
+    def parent(self) -> Optional["Node"]:
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional["Node"]) -> None:
+        self._parent = parent
+        self.invalidate_identity()
+
+    @property
+    def graph_environment(self) -> Optional["GraphEnvironment"]:
+        return self._graph_environment
+
+    @graph_environment.setter
+    def graph_environment(self, graph_environment: Optional["GraphEnvironment"]) -> None:
+        # The environment is only a prefix of this node's id, children identifiers don't include it
+        self._graph_environment = graph_environment
+        self._invalidate_ids()
+
     @property
     def hashed_id(self) -> str:
-        return md5(self.id.encode()).hexdigest()
+        if self._cached_hashed_id is None:
+            self._cached_hashed_id = md5(self.id.encode()).hexdigest()
+        return self._cached_hashed_id
 
     @property
     def relative_id(self) -> str:
         """
         Returns the id without the graph environment prefix or root folder name
         """
-        return RelativeIdCalculator.calculate(self.id)
+        if self._cached_relative_id is None:
+            self._cached_relative_id = RelativeIdCalculator.calculate(self.id)
+        return self._cached_relative_id
 
     @property
     def id(self) -> str:
-        return str(self.graph_environment or "") + self._identifier()
+        if self._cached_id is None:
+            self._cached_id = str(self.graph_environment or "") + self._identifier()
+        return self._cached_id
+
+    def invalidate_identity(self) -> None:
+        """
+        Drops the memoized identifier and ids of this node and of the nodes below it.
+
+        They are derived from the parent chain and the names in it, call this after changing
+        anything the identifier is built from other than parent and graph_environment.
+        """
+        self._cached_identifier = None
+        self._invalidate_ids()
+        for child in self._get_children():
+            child.invalidate_identity()
+
+    def _invalidate_ids(self) -> None:
+        self._cached_id = None
+        self._cached_hashed_id = None
+        self._cached_relative_id = None
+
+    def _get_children(self) -> Sequence["Node"]:
+        return ()
 
     @property
     def node_repr_for_identifier(self) -> str:
@@ -91,20 +158,32 @@ class Node:
     def get_relationships(self) -> List["Relationship"]:
         return []
 
-    def filter_children_by_path(self, paths: List[str]) -> None:
+    def filter_children_by_path(self, paths: AbstractSet[str]) -> None:
         pass
 
     def _identifier(self) -> str:
-        identifier: str = ""
+        if self._cached_identifier is None:
+            identifier: str = ""
+
+            if self.parent:
+                identifier += self.parent._identifier()
+            identifier += self.node_repr_for_identifier
 
-        if self.parent:
-            identifier += self.parent._identifier()
-        identifier += self.node_repr_for_identifier
+            self._cached_identifier = identifier
 
-        return identifier
+        return self._cached_identifier
 
     def update_graph_environment(self, environment: "GraphEnvironment") -> None:
         self.graph_environment = environment
 
+    def _copy_attributes_to(self, other: "Node") -> None:
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(self, slot):
+                    setattr(other, slot, getattr(self, slot))
+
+        if hasattr(self, "__dict__"):
+            other.__dict__.update(self.__dict__)
+
     def __str__(self) -> str:
         return self._identifier()
@@ -0,0 +1,34 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from blarify.graph.node import DefinitionNode
+
+
+class DefinitionRangeIndex:
+    """
+    Sorted index over the line ranges of the definitions directly defined by a node.
+
+    Sibling definitions do not nest, so once they are sorted by start line the running
+    maximum of their end lines is non-decreasing and both can be binary searched.
+    """
+
+    _definitions: List["DefinitionNode"]
+    _start_lines: List[int]
+    _max_end_lines: List[int]
+
+    def __init__(self, definitions: Sequence["DefinitionNode"]):
+        # sorted() is stable, definitions starting on the same line keep their creation order
+        self._definitions = sorted(definitions, key=lambda node: node.get_start_and_end_line()[0])
+        self._start_lines = [node.get_start_and_end_line()[0] for node in self._definitions]
+        end_lines = [node.get_start_and_end_line()[1] for node in self._definitions]
+        self._max_end_lines = list(accumulate(end_lines, max))
+
+    def find_enclosing(self, start_line: int, end_line: int) -> Optional["DefinitionNode"]:
+        """Returns the first definition whose line range contains [start_line, end_line], if any."""
+        candidates_end = bisect_right(self._start_lines, start_line)
+        index = bisect_left(self._max_end_lines, end_line, 0, candidates_end)
+        if index < candidates_end:
+            return self._definitions[index]
+        return None
@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from blarify.graph.graph_environment import GraphEnvironment
     from blarify.code_references.types import Reference
     from tree_sitter import Node as TreeSitterNode
+    from .source_span import SourceSpan
 
 
 class NodeFactory:
@@ -36,7 +37,7 @@ class NodeFactory:
         level: int,
         node_range: "Reference",
         definition_range: "Reference",
-        code_text: str,
+        code_text: Union[str, "SourceSpan"],
         parent: FolderNode,
         tree_sitter_node: Optional["TreeSitterNode"] = None,
         body_node: Optional["TreeSitterNode"] = None,
@@ -61,7 +62,7 @@ class NodeFactory:
         path: str,
         definition_range: "Reference",
         node_range: "Reference",
-        code_text: str,
+        code_text: Union[str, "SourceSpan"],
         body_node: "TreeSitterNode",
         level: int,
         tree_sitter_node: "TreeSitterNode",
@@ -87,7 +88,7 @@ class NodeFactory:
         path: str,
         definition_range: "Reference",
         node_range: "Reference",
-        code_text: str,
+        code_text: Union[str, "SourceSpan"],
         body_node: "TreeSitterNode",
         level: int,
         tree_sitter_node: "TreeSitterNode",
@@ -114,7 +115,7 @@ class NodeFactory:
         path: str,
         definition_range: "Reference",
         node_range: "Reference",
-        code_text: str,
+        code_text: Union[str, "SourceSpan"],
         body_node: "TreeSitterNode",
         level: int,
         tree_sitter_node: "TreeSitterNode",
@@ -0,0 +1,20 @@
+from typing import NamedTuple
+
+
+class SourceSpan(NamedTuple):
+    """
+    Byte range of a definition in the source of its file.
+
+    Every definition of a file shares the same source buffer, the one tree-sitter parsed, so their
+    code text is only copied out of it and decoded when it is first read.
+    """
+
+    source: bytes
+    start_byte: int
+    end_byte: int
+
+    def view(self) -> memoryview:
+        return memoryview(self.source)[self.start_byte : self.end_byte]
+
+    def decode(self) -> str:
+        return str(self.view(), "utf-8", "replace")
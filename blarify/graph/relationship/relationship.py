@@ -6,6 +6,16 @@ if TYPE_CHECKING:
 
 
 class Relationship:
+    __slots__ = (
+        "start_node",
+        "end_node",
+        "rel_type",
+        "scope_text",
+        "start_line",
+        "reference_character",
+        "attributes",
+    )
+
     start_node: "Node"
     end_node: "Node"
     rel_type: "RelationshipType"
@@ -59,7 +69,9 @@ class Relationship:
 
 class WorkflowStepRelationship(Relationship):
     """Specialized relationship for WORKFLOW_STEP with additional workflow-specific attributes."""
-    
+
+    __slots__ = ("step_order", "depth", "call_line", "call_character", "relationship_type")
+
     step_order: Optional[int]
     depth: Optional[int]
     call_line: Optional[int]
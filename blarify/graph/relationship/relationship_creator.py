@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, TYPE_CHECKING
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from blarify.graph.node.commit_node import CommitNode
 from blarify.graph.node.documentation_node import DocumentationNode
 from blarify.graph.relationship import Relationship, WorkflowStepRelationship, RelationshipType
@@ -8,7 +9,7 @@ from blarify.repositories.version_control.dtos.blame_line_range_dto import Blame
 
 if TYPE_CHECKING:
     from blarify.graph.graph import Graph
-    from blarify.graph.node import Node
+    from blarify.graph.node import Node, DefinitionNode
     from blarify.code_hierarchy import TreeSitterHelper
     from blarify.code_references.types import Reference
 
@@ -19,12 +20,8 @@ class RelationshipCreator:
         references: list["Reference"], node: "Node", graph: "Graph", tree_sitter_helper: "TreeSitterHelper"
     ) -> List[Relationship]:
         relationships = []
-        for reference in references:
-            file_node_reference = graph.get_file_node_by_path(path=reference.uri)
-            if file_node_reference is None:
-                continue
-
-            node_referenced = file_node_reference.reference_search(reference=reference)
+        nodes_referenced = RelationshipCreator._find_nodes_referenced(references=references, graph=graph)
+        for reference, node_referenced in zip(references, nodes_referenced):
             if node_referenced is None or node.id == node_referenced.id:
                 continue
 
@@ -56,6 +53,25 @@ class RelationshipCreator:
             relationships.append(relationship)
         return relationships
 
+    @staticmethod
+    def _find_nodes_referenced(references: List["Reference"], graph: "Graph") -> List[Optional["DefinitionNode"]]:
+        """Resolve every reference to its enclosing definition, batching the lookups per file."""
+        references_by_path: Dict[str, List[int]] = defaultdict(list)
+        for index, reference in enumerate(references):
+            references_by_path[reference.uri].append(index)
+
+        nodes_referenced: List[Optional["DefinitionNode"]] = [None] * len(references)
+        for path, indexes in references_by_path.items():
+            file_node_reference = graph.get_file_node_by_path(path=path)
+            if file_node_reference is None:
+                continue
+
+            found_nodes = file_node_reference.reference_search_batch([references[index] for index in indexes])
+            for index, found_node in zip(indexes, found_nodes):
+                nodes_referenced[index] = found_node
+
+        return nodes_referenced
+
     @staticmethod
     def _get_relationship_type(defined_node: "Node") -> RelationshipType:
         if defined_node.label == NodeLabels.FUNCTION:
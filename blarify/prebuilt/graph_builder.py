@@ -1,12 +1,17 @@
 from typing import Optional
+from blarify.code_hierarchy.parse_cache import ParseCache
 from blarify.code_references.hybrid_resolver import HybridReferenceResolver, ResolverMode
-from blarify.graph.graph import Graph
+from blarify.code_references.reference_cache import ReferenceCache
+from blarify.graph.graph import DEFAULT_EXPORT_CHUNK_SIZE, Graph
+from blarify.graph.graph_update import GraphUpdate
 from blarify.graph.graph_environment import GraphEnvironment
 from blarify.project_file_explorer.project_files_iterator import ProjectFilesIterator
 from blarify.project_graph_creator import ProjectGraphCreator
 from blarify.project_graph_updater import ProjectGraphUpdater, UpdatedFile
 from blarify.documentation.workflow_creator import WorkflowCreator
 from blarify.documentation.documentation_creator import DocumentationCreator
+from blarify.documentation.utils.llm_response_cache import LlmResponseCache
+from blarify.services.embedding_cache import EmbeddingCache
 from blarify.agents.llm_provider import LLMProvider
 from blarify.repositories.graph_db_manager.db_manager import AbstractDbManager
 from blarify.utils.path_calculator import PathCalculator
@@ -29,6 +34,13 @@ class GraphBuilder:
         graph_environment: Optional[GraphEnvironment] = None,
         generate_embeddings: bool = False,
         resolver_mode: Optional[ResolverMode] = None,
+        hierarchy_workers: int = 1,
+        parse_cache_dir: Optional[str] = None,
+        parse_cache_max_size_mb: float = ParseCache.DEFAULT_MAX_SIZE_MB,
+        release_tree_sitter_nodes: bool = False,
+        reference_cache_dir: Optional[str] = None,
+        llm_cache_dir: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
     ):
         """
         A class responsible for constructing a graph representation of a project's codebase.
@@ -39,6 +51,17 @@ class GraphBuilder:
             names_to_skip: Filenames/directory names to exclude from analysis (e.g., ['venv', 'tests'])
             db_manager: Optional database manager for saving graph and creating workflows/documentation
             generate_embeddings: Whether to generate embeddings for documentation nodes
+            hierarchy_workers: Number of processes used to parse files, 1 parses them serially
+            parse_cache_dir: Directory of an on-disk cache of parsed files reused across builds, disabled when None
+            parse_cache_max_size_mb: Size above which the least recently used parse cache entries are evicted
+            release_tree_sitter_nodes: Drop the parsed tree-sitter trees once relationships are created to
+                lower the memory held by the returned graph
+            reference_cache_dir: Directory of an on-disk cache of the references of every definition, reused
+                across builds so that only definitions affected by changed files are resolved again, disabled when None
+            llm_cache_dir: Directory of an on-disk cache of the generated documentation, so that nodes whose
+                content and children didn't change don't call the LLM again, disabled when None
+            embedding_cache_dir: Directory of an on-disk cache of documentation embeddings by content hash, so
+                that only changed documentation is embedded again, disabled when None
 
         Example:
             builder = GraphBuilder(
@@ -58,6 +81,13 @@ class GraphBuilder:
         self.db_manager = db_manager
         self.generate_embeddings = generate_embeddings
         self.resolver_mode = resolver_mode or ResolverMode.AUTO
+        self.hierarchy_workers = hierarchy_workers
+        self.parse_cache_dir = parse_cache_dir
+        self.parse_cache_max_size_mb = parse_cache_max_size_mb
+        self.release_tree_sitter_nodes = release_tree_sitter_nodes
+        self.reference_cache_dir = reference_cache_dir
+        self.llm_cache_dir = llm_cache_dir
+        self.embedding_cache_dir = embedding_cache_dir
 
         self.only_hierarchy = only_hierarchy
 
@@ -93,12 +123,15 @@ class GraphBuilder:
         """
         reference_query_helper = self._get_started_reference_query_helper()
         project_files_iterator = self._get_project_files_iterator()
+        parse_cache = self._get_parse_cache()
 
         graph_creator = ProjectGraphCreator(
             root_path=self.root_path,
             reference_query_helper=reference_query_helper,
             project_files_iterator=project_files_iterator,
             graph_environment=self.graph_environment,
+            hierarchy_workers=self.hierarchy_workers,
+            parse_cache=parse_cache,
         )
 
         if self.only_hierarchy:
@@ -106,13 +139,18 @@ class GraphBuilder:
         else:
             graph = graph_creator.build()
 
+        if self.release_tree_sitter_nodes:
+            graph_creator.release_tree_sitter_nodes()
+
         reference_query_helper.shutdown()
+        if reference_query_helper.reference_cache:
+            reference_query_helper.reference_cache.close()
+        if parse_cache:
+            parse_cache.close()
 
         # Optionally save and create workflows/documentation
         if self.db_manager and save_to_db:
-            nodes = graph.get_nodes_as_objects()
-            relationships = graph.get_relationships_as_objects()
-            self.db_manager.save_graph(nodes, relationships)
+            self._save_graph_chunks(graph)
 
             # Create workflows if requested
             if create_workflows:
@@ -125,13 +163,21 @@ class GraphBuilder:
             # Create documentation if requested
             if create_documentation:
                 agent_caller = LLMProvider()
+                response_cache = self._get_llm_response_cache()
+                embedding_cache = self._get_embedding_cache()
                 doc_creator = DocumentationCreator(
                     db_manager=self.db_manager,
                     agent_caller=agent_caller,
                     graph_environment=self.graph_environment,
                     max_workers=max_workers,
+                    response_cache=response_cache,
+                    embedding_cache=embedding_cache,
                 )
                 doc_creator.create_documentation(generate_embeddings=self.generate_embeddings)
+                if response_cache:
+                    response_cache.close()
+                if embedding_cache:
+                    embedding_cache.close()
 
         return graph
 
@@ -173,12 +219,13 @@ class GraphBuilder:
                 create_documentation=True
             )
         """
-        reference_query_helper = self._get_started_reference_query_helper()
-        project_files_iterator = self._get_project_files_iterator()
         file_paths = [file.path for file in updated_files]
+        reference_query_helper = self._get_started_reference_query_helper(changed_files=file_paths)
+        project_files_iterator = self._get_project_files_iterator()
         node_paths = [self._convert_file_path_to_node_path(path) for path in file_paths]
 
         self._detatch_delete_nodes_by_paths(file_paths=file_paths)
+        parse_cache = self._get_parse_cache()
 
         graph_updater = ProjectGraphUpdater(
             updated_files=updated_files,
@@ -186,6 +233,8 @@ class GraphBuilder:
             reference_query_helper=reference_query_helper,
             project_files_iterator=project_files_iterator,
             graph_environment=self.graph_environment,
+            hierarchy_workers=self.hierarchy_workers,
+            parse_cache=parse_cache,
         )
 
         if self.only_hierarchy:
@@ -193,15 +242,20 @@ class GraphBuilder:
         else:
             graph = graph_updater.build()
 
+        if self.release_tree_sitter_nodes:
+            graph_updater.release_tree_sitter_nodes()
+
         reference_query_helper.shutdown()
+        if reference_query_helper.reference_cache:
+            reference_query_helper.reference_cache.close()
+        if parse_cache:
+            parse_cache.close()
 
         self._detatch_empty_folder_nodes_iteratively()
 
         # Optionally save and create workflows/documentation
         if save_to_db:
-            nodes = graph.get_nodes_as_objects()
-            relationships = graph.get_relationships_as_objects()
-            self.db_manager.save_graph(nodes, relationships)
+            self._save_graph_chunks(graph)
 
             # Create workflows if requested
             if create_workflows:
@@ -214,16 +268,46 @@ class GraphBuilder:
             # Create documentation if requested
             if create_documentation:
                 agent_caller = LLMProvider()
+                response_cache = self._get_llm_response_cache()
+                embedding_cache = self._get_embedding_cache()
                 doc_creator = DocumentationCreator(
                     db_manager=self.db_manager,
                     agent_caller=agent_caller,
                     graph_environment=self.graph_environment,
                     max_workers=max_workers,
+                    response_cache=response_cache,
+                    embedding_cache=embedding_cache,
                 )
                 doc_creator.create_documentation(target_paths=node_paths, generate_embeddings=self.generate_embeddings)
+                if response_cache:
+                    response_cache.close()
+                if embedding_cache:
+                    embedding_cache.close()
 
         return graph
 
+    def _save_graph_chunks(self, graph: Graph | GraphUpdate) -> None:
+        node_chunk_size = self.db_manager.node_export_chunk_size or DEFAULT_EXPORT_CHUNK_SIZE
+        edge_chunk_size = self.db_manager.edge_export_chunk_size or DEFAULT_EXPORT_CHUNK_SIZE
+        self.db_manager.save_graph_chunks(
+            graph.iter_node_object_chunks(node_chunk_size), graph.iter_relationship_object_chunks(edge_chunk_size)
+        )
+
+    def _get_parse_cache(self) -> Optional[ParseCache]:
+        if self.parse_cache_dir is None:
+            return None
+        return ParseCache(cache_dir=self.parse_cache_dir, max_size_mb=self.parse_cache_max_size_mb)
+
+    def _get_llm_response_cache(self) -> Optional[LlmResponseCache]:
+        if self.llm_cache_dir is None:
+            return None
+        return LlmResponseCache(cache_dir=self.llm_cache_dir)
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        if self.embedding_cache_dir is None or not self.generate_embeddings:
+            return None
+        return EmbeddingCache(cache_dir=self.embedding_cache_dir)
+
     def _detatch_delete_nodes_by_paths(self, file_paths: list[str]):
         query = detach_delete_nodes_by_paths_query()
         self.db_manager.query(
@@ -266,10 +350,22 @@ class GraphBuilder:
             blarignore_path=self.root_path + "/.blarignore",
         )
 
-    def _get_started_reference_query_helper(self) -> HybridReferenceResolver:
-        reference_query_helper = HybridReferenceResolver(root_uri=self.root_path, mode=self.resolver_mode)
+    def _get_started_reference_query_helper(
+        self, changed_files: Optional[list[str]] = None
+    ) -> HybridReferenceResolver:
+        reference_query_helper = HybridReferenceResolver(
+            root_uri=self.root_path,
+            mode=self.resolver_mode,
+            changed_files=changed_files,
+            reference_cache=self._get_reference_cache(),
+        )
         return reference_query_helper
 
+    def _get_reference_cache(self) -> Optional[ReferenceCache]:
+        if self.reference_cache_dir is None or self.only_hierarchy:
+            return None
+        return ReferenceCache(cache_dir=self.reference_cache_dir, root_path=self.root_path)
+
     def _convert_file_path_to_node_path(self, file_path: str) -> str:
         """
         Convert a file URI path to a node_path.
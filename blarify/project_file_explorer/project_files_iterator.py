@@ -57,6 +57,19 @@ class ProjectFilesIterator:
                     level=level,
                 )
 
+    def is_path_included(self, path: str) -> bool:
+        """Whether iterating the project would yield the file at path, checked without walking the tree."""
+        relative_path = os.path.relpath(path, self.root_path)
+        if relative_path == "." or relative_path.startswith(".."):
+            return False
+
+        current_path = self.root_path
+        for name in relative_path.split(os.sep):
+            current_path = os.path.join(current_path, name)
+            if self._should_skip(current_path):
+                return False
+        return os.path.isfile(path)
+
     def _get_filtered_dirs(self, root: str, dirs: List[str]) -> List[str]:
         dirs = [dir for dir in dirs if not self._should_skip(os.path.join(root, dir))]
         return dirs
@@ -9,7 +9,14 @@ from blarify.project_file_explorer import ProjectFilesIterator
 from blarify.graph.node import NodeLabels, NodeFactory
 from blarify.graph.relationship import RelationshipCreator
 from blarify.graph.graph import Graph
-from blarify.code_hierarchy import TreeSitterHelper
+from blarify.code_hierarchy import TreeSitterHelper, TreeSitterHelperRegistry
+from blarify.code_hierarchy.parallel_file_parser import (
+    FileParseTask,
+    ParallelFileParser,
+    folder_chain_from_folder_node,
+)
+from blarify.code_hierarchy.parse_cache import ParseCache
+from blarify.code_hierarchy.parsed_file import ParsedFile
 from blarify.code_hierarchy.languages import (
     PythonDefinitions,
     JavascriptDefinitions,
@@ -19,7 +26,7 @@ from blarify.code_hierarchy.languages import (
     CsharpDefinitions,
     JavaDefinitions,
 )
-from typing import Dict, List, TYPE_CHECKING, Optional, Type, cast
+from typing import Dict, Iterable, List, TYPE_CHECKING, Optional, Tuple, Type, cast
 from blarify.logger import Logger
 from blarify.graph.graph_environment import GraphEnvironment
 from blarify.graph.node import Node, FileNode
@@ -39,6 +46,9 @@ class ProjectGraphCreator:
     reference_query_helper: HybridReferenceResolver
     project_files_iterator: ProjectFilesIterator
     graph: Graph
+    hierarchy_workers: int
+    tree_sitter_helpers: TreeSitterHelperRegistry
+    parse_cache: Optional[ParseCache]
     languages: Dict[str, Type[LanguageDefinitions]] = {
         ".py": PythonDefinitions,
         ".js": JavascriptDefinitions,
@@ -58,11 +68,25 @@ class ProjectGraphCreator:
         reference_query_helper: HybridReferenceResolver,
         project_files_iterator: ProjectFilesIterator,
         graph_environment: Optional["GraphEnvironment"] = None,
+        hierarchy_workers: int = 1,
+        parse_cache: Optional[ParseCache] = None,
     ):
+        """
+        Args:
+            hierarchy_workers: Number of processes used to parse files while building the code
+                hierarchy. With 1 (the default) files are parsed serially in this process.
+            parse_cache: Optional on-disk cache of parsed files, unchanged files found in it are
+                rebuilt without being parsed.
+        """
         self.root_path = root_path
         self.reference_query_helper = reference_query_helper
         self.project_files_iterator = project_files_iterator
         self.graph_environment = graph_environment or GraphEnvironment("blarify", "0", self.root_path)
+        self.hierarchy_workers = hierarchy_workers
+        self.tree_sitter_helpers = TreeSitterHelperRegistry(graph_environment=self.graph_environment)
+        self.parse_cache = parse_cache
+        # File nodes rebuilt from ParsedFile snapshots whose tree-sitter nodes aren't bound yet, by path
+        self._file_nodes_pending_tree_sitter: Dict[str, FileNode] = {}
 
         self.graph = Graph()
 
@@ -80,15 +104,30 @@ class ProjectGraphCreator:
         self._create_code_hierarchy()
         return self.graph
 
+    def release_tree_sitter_nodes(self) -> None:
+        """
+        Drops the tree-sitter trees held by the file nodes of the graph.
+
+        Only call it once relationships have been created, they can't be resolved afterwards.
+        """
+        self._file_nodes_pending_tree_sitter = {}
+        for file_node in self.graph.get_nodes_by_label(NodeLabels.FILE.value):
+            cast(FileNode, file_node).release_tree_sitter_nodes()
+
     def _create_code_hierarchy(self):
         start_time = time.time()
 
-        for folder in self.project_files_iterator:
-            self._process_folder(folder)
+        if self.hierarchy_workers > 1:
+            self._create_code_hierarchy_in_parallel()
+        else:
+            for folder in self.project_files_iterator:
+                self._process_folder(folder)
 
         end_time = time.time()
         execution_time = end_time - start_time
         logger.info(f"Execution time of create_code_hierarchy: {execution_time:.2f} seconds")
+        if self.parse_cache:
+            self.parse_cache.log_stats()
 
     def _process_folder(self, folder: "Folder") -> None:
         folder_node = self._add_or_get_folder_node(folder)
@@ -100,6 +139,102 @@ class ProjectGraphCreator:
         files = folder.files
         self._process_files(files, parent_folder=folder_node)
 
+    def _create_code_hierarchy_in_parallel(self) -> None:
+        """
+        Parse files on a process pool and merge them back in traversal order.
+
+        Folder nodes are created up front so every file knows its parent chain, which keeps
+        node ids and relationships identical to a serial build.
+        """
+        files: List[Tuple["File", "FolderNode"]] = []
+        for folder in self.project_files_iterator:
+            folder_node = self._add_or_get_folder_node(folder)
+            folder_nodes = self._create_subfolder_nodes(folder, folder_node)
+            folder_node.relate_nodes_as_contain_relationship(nodes=folder_nodes)
+            self.graph.add_nodes(folder_nodes)
+
+            files.extend((file, folder_node) for file in folder.files)
+
+        self._process_files_in_parallel(files)
+
+    def _process_files_in_parallel(self, files: List[Tuple["File", "FolderNode"]]) -> None:
+        """Parse the files missing from the parse cache on a process pool and add them in the given order."""
+        files_to_process: List[Tuple["File", "FolderNode", Optional[str], Optional[ParsedFile]]] = []
+        for file, folder_node in files:
+            cache_key = self._get_parse_cache_key(file, folder_node)
+            files_to_process.append((file, folder_node, cache_key, self._get_cached_parsed_file(cache_key)))
+
+        tasks = [
+            FileParseTask(file=file, folder_chain=folder_chain_from_folder_node(parent_folder))
+            for file, parent_folder, _, cached_parsed_file in files_to_process
+            if cached_parsed_file is None
+        ]
+        logger.info(f"Parsing {len(tasks)} files with {self.hierarchy_workers} workers")
+
+        with ParallelFileParser(
+            max_workers=self.hierarchy_workers,
+            languages=self.languages,
+            graph_environment=self.graph_environment,
+        ) as parser:
+            parsed_files = iter(parser.parse_files(tasks))
+            for file, parent_folder, cache_key, cached_parsed_file in files_to_process:
+                parsed_file = cached_parsed_file or next(parsed_files)
+                if cached_parsed_file is None:
+                    self._store_parsed_file(cache_key, parsed_file)
+
+                self._process_parsed_file(file, parent_folder, parsed_file)
+
+    def _process_parsed_file(self, file: "File", parent_folder: "FolderNode", parsed_file: ParsedFile) -> None:
+        tree_sitter_helper = self._get_tree_sitter_for_file_extension(file.extension)
+        self._try_initialize_directory(file)
+        file_nodes = tree_sitter_helper.create_nodes_from_parsed_file(parsed_file, file, parent_folder=parent_folder)
+        self.graph.add_nodes(file_nodes)
+
+        file_node = self._get_file_node_from_file_nodes(file_nodes)
+        if file_node.has_pending_tree_sitter_nodes:
+            self._file_nodes_pending_tree_sitter[file_node.path] = file_node
+        parent_folder.relate_node_as_contain_relationship(file_node)
+
+    def _get_parse_cache_key(self, file: "File", parent_folder: "FolderNode") -> Optional[str]:
+        if self.parse_cache is None:
+            return None
+
+        try:
+            with open(file.path, "rb") as file_content:
+                content = file_content.read()
+        except OSError:
+            return None
+
+        language = self._get_language_definition(file_extension=file.extension)
+        file_node_id = f"{parent_folder.id}/{file.name}"
+        return self.parse_cache.get_key(content=content, language=language.__name__, file_node_id=file_node_id)
+
+    def _get_cached_parsed_file(self, cache_key: Optional[str]) -> Optional[ParsedFile]:
+        if self.parse_cache is None or cache_key is None:
+            return None
+        return self.parse_cache.get(cache_key)
+
+    def _store_parsed_file(self, cache_key: Optional[str], parsed_file: ParsedFile) -> None:
+        if self.parse_cache is not None and cache_key is not None:
+            self.parse_cache.set(cache_key, parsed_file)
+
+    def _bind_pending_tree_sitter_nodes(self, paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Bind tree-sitter nodes to files rebuilt from ParsedFile snapshots, relationships need them.
+
+        Binding re-parses the file, so builds that only create the relationships of some files pass
+        their paths and the other cache hits are left unparsed. Every pending file is bound otherwise.
+        """
+        if paths is None:
+            paths = list(self._file_nodes_pending_tree_sitter)
+
+        for path in paths:
+            file_node = self._file_nodes_pending_tree_sitter.pop(path, None)
+            if file_node is None:
+                continue
+            tree_sitter_helper = self._get_tree_sitter_for_file_extension(file_node.extension)
+            tree_sitter_helper.bind_tree_sitter_nodes(file_node)
+
     def _add_or_get_folder_node(self, folder: "Folder", parent_folder: Optional["FolderNode"] = None) -> "FolderNode":
         if self.graph.has_folder_node_with_path(folder.uri_path):
             return self.graph.get_folder_node_by_path(folder.uri_path)
@@ -123,6 +258,11 @@ class ProjectGraphCreator:
             self._process_file(file, parent_folder)
 
     def _process_file(self, file: "File", parent_folder: "FolderNode") -> None:
+        cache_key = self._get_parse_cache_key(file, parent_folder)
+        if parsed_file := self._get_cached_parsed_file(cache_key):
+            self._process_parsed_file(file, parent_folder, parsed_file)
+            return
+
         tree_sitter_helper = self._get_tree_sitter_for_file_extension(file.extension)
         self._try_initialize_directory(file)
         file_nodes = self._create_file_nodes(
@@ -134,6 +274,8 @@ class ProjectGraphCreator:
 
         file_node = self._get_file_node_from_file_nodes(file_nodes)
         file_node.skeletonize()
+        if cache_key is not None:
+            self._store_parsed_file(cache_key, ParsedFile.from_nodes(file_nodes))
 
         parent_folder.relate_node_as_contain_relationship(file_node)
 
@@ -145,7 +287,7 @@ class ProjectGraphCreator:
 
     def _get_tree_sitter_for_file_extension(self, file_extension: str) -> TreeSitterHelper:
         language = self._get_language_definition(file_extension=file_extension)
-        return TreeSitterHelper(language_definitions=language, graph_environment=self.graph_environment)
+        return self.tree_sitter_helpers.get(language)
 
     def _get_language_definition(self, file_extension: str) -> Type[LanguageDefinitions]:
         return self.languages.get(file_extension, FallbackDefinitions)
@@ -169,6 +311,8 @@ class ProjectGraphCreator:
 
     def _create_relationships_from_references_for_files(self, files_nodes: Optional[List[FileNode]] = None) -> None:
         start_time = time.time()
+        if files_nodes:
+            self._bind_pending_tree_sitter_nodes(file_node.path for file_node in files_nodes)
         file_nodes = files_nodes or self.graph.get_nodes_by_label(NodeLabels.FILE.value)
         logger.info(f"Processing {len(file_nodes)} files for reference relationships")
 
@@ -201,9 +345,15 @@ class ProjectGraphCreator:
         batch_end_time = time.time()
 
         logger.info(f"Batch LSP queries completed in {batch_end_time - batch_start_time:.2f} seconds")
+        self._add_referencing_files_to_graph(batch_results)
+        # Relationships start at the referencing nodes, so the files they are in need their trees too
+        self._bind_pending_tree_sitter_nodes(
+            {reference.uri for references in batch_results.values() for reference in references}
+        )
 
         # Process the results and create relationships
         processed_files = set()
+        file_indexes = {file_node: index for index, file_node in enumerate(file_nodes)}
         file_relationship_counts: Dict[str, int] = {}
 
         for node, references in batch_results.items():
@@ -212,7 +362,7 @@ class ProjectGraphCreator:
             # Log progress per file (only once per file)
             if file_node not in processed_files:
                 processed_files.add(file_node)
-                file_index = list(file_nodes).index(file_node)
+                file_index = file_indexes[file_node]
                 self._log_if_multiple_of_x(
                     index=file_index,
                     x=log_interval,
@@ -245,6 +395,9 @@ class ProjectGraphCreator:
         )
         logger.info(f"Created {len(references_relationships)} reference relationships")
 
+    def _add_referencing_files_to_graph(self, references_by_node: Dict[Node, List[Reference]]) -> None:
+        """Hook for builds that don't parse the whole project, a full build already holds every referencing file."""
+
     def _log_if_multiple_of_x(self, index: int, x: int, text: str) -> None:
         if index % x == 0:
             Logger.log(text)
@@ -1,3 +1,6 @@
+import logging
+from blarify.code_hierarchy import TreeSitterHelperRegistry
+from blarify.code_hierarchy.parse_cache import ParseCache
 from blarify.code_references.hybrid_resolver import HybridReferenceResolver
 from blarify.code_references.types import Reference
 from blarify.graph.node.utils.node_factory import NodeFactory
@@ -7,7 +10,7 @@ from blarify.graph.graph import Graph
 from blarify.graph.graph_environment import GraphEnvironment
 from blarify.project_file_explorer import ProjectFilesIterator
 from blarify.graph.node import FileNode
-from typing import List, Optional, cast
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, cast
 from dataclasses import dataclass
 from enum import Enum
 from blarify.graph.external_relationship_store import ExternalRelationshipStore
@@ -17,6 +20,11 @@ from blarify.utils.path_calculator import PathCalculator
 from blarify.graph.node import Node, DefinitionNode
 from blarify.utils.relative_id_calculator import RelativeIdCalculator
 
+logger = logging.getLogger(__name__)
+
+# Name of an identifier and id of the innermost definition using it
+IdentifierKey = Tuple[str, str]
+
 
 class ChangeType(Enum):
     ADDED = "ADDED"
@@ -48,6 +56,7 @@ class PreviousNodeState:
 class ProjectGraphDiffCreator(ProjectGraphCreator):
     diff_identifier: str
     added_and_modified_paths: List[str]
+    added_and_modified_path_set: Set[str]
     file_diffs: List[FileDiff]
     pr_environment: "GraphEnvironment"
 
@@ -59,20 +68,35 @@ class ProjectGraphDiffCreator(ProjectGraphCreator):
         file_diffs: List[FileDiff],
         graph_environment: Optional["GraphEnvironment"] = None,
         pr_environment: Optional["GraphEnvironment"] = None,
+        hierarchy_workers: int = 1,
+        parse_cache: Optional[ParseCache] = None,
     ):
-        super().__init__(root_path, reference_query_helper, project_files_iterator, graph_environment=graph_environment)
+        super().__init__(
+            root_path,
+            reference_query_helper,
+            project_files_iterator,
+            graph_environment=graph_environment,
+            hierarchy_workers=hierarchy_workers,
+            parse_cache=parse_cache,
+        )
         self.graph = Graph()
         self.external_relationship_store = ExternalRelationshipStore()
 
         self.file_diffs = file_diffs
+        self.file_diffs_by_path: Dict[str, FileDiff] = {}
+        for file_diff in file_diffs:
+            self.file_diffs_by_path.setdefault(file_diff.path, file_diff)
         self.graph_environment = graph_environment or GraphEnvironment("main", "0", root_path)
         self.pr_environment = pr_environment or GraphEnvironment("main", "0", root_path)
+        self.tree_sitter_helpers = TreeSitterHelperRegistry(graph_environment=self.graph_environment)
 
         self.added_paths = self.get_added_paths()
         self.modified_paths = self.get_modified_paths()
 
         self.added_and_modified_paths = self.added_paths + self.modified_paths
+        self.added_and_modified_path_set = set(self.added_and_modified_paths)
         self.deleted_nodes_added_paths = []
+        self.paths_referenced_by_path: Dict[str, Set[str]] = {}
 
     def get_added_paths(self) -> List[str]:
         return [file_diff.path for file_diff in self.file_diffs if file_diff.change_type == ChangeType.ADDED]
@@ -184,41 +208,46 @@ class ProjectGraphDiffCreator(ProjectGraphCreator):
             node.add_extra_label(ChangeType.DELETED.value)
 
     def mark_updated_and_added_nodes_as_diff(self):
+        self._bind_pending_tree_sitter_nodes(self.added_and_modified_paths)
         self.mark_file_nodes_as_diff(self.get_file_nodes_from_path_list(self.added_and_modified_paths))
 
     def keep_only_files_to_create(self):
         paths_to_keep = self.get_parent_paths_from_paths(self.added_and_modified_paths)
-        paths_to_keep.extend(self.added_and_modified_paths)
-        paths_to_keep.extend(self.deleted_nodes_added_paths)
+        paths_to_keep.update(self.added_and_modified_path_set)
+        paths_to_keep.update(self.deleted_nodes_added_paths)
 
         self.graph = self.graph.filtered_graph_by_paths(paths_to_keep)
 
-    def get_parent_paths_from_paths(self, paths: List[str]) -> List[str]:
-        parent_paths = []
+    def get_parent_paths_from_paths(self, paths: Iterable[str]) -> Set[str]:
+        parent_paths: Set[str] = set()
         for path in paths:
-            parent_paths.extend(self.get_parent_paths_from_path(path))
+            for parent_path in self._iter_parent_paths(path):
+                if parent_path in parent_paths:
+                    # Files in the same folder share the rest of the chain, it was collected already
+                    break
+                parent_paths.add(parent_path)
 
         return parent_paths
 
     def get_parent_paths_from_path(self, path: str) -> List[str]:
-        parents = []
+        return list(self._iter_parent_paths(path))
 
+    def _iter_parent_paths(self, path: str) -> Iterator[str]:
         iterations = 0
         while self.graph_environment.root_path in path:
             path = PathCalculator.get_parent_folder_path(path)
-            parents.append(path)
+            yield path
 
             self.raise_error_if_deeply_nested_file(iterations, path)
             iterations += 1
 
-        return parents
-
     def raise_error_if_deeply_nested_file(self, iteration: int, path: str):
         MAX_ITERATIONS = 100000
         if iteration > MAX_ITERATIONS:
             raise ValueError(f"Deeply nested file, probably an infinite loop: {path}")
 
     def create_relationship_from_references_for_modified_and_added_files(self):
+        self._bind_pending_tree_sitter_nodes(self.added_and_modified_paths)
         file_nodes = self.get_file_nodes_from_path_list(self.added_and_modified_paths)
 
         paths = self.get_paths_referenced_by_file_nodes(file_nodes)
@@ -228,13 +257,12 @@ class ProjectGraphDiffCreator(ProjectGraphCreator):
         self._create_relationships_from_references_for_files(files_nodes=file_nodes)
 
     def get_paths_referenced_by_file_nodes(self, file_nodes: List[FileNode]) -> set[str]:
-        paths = set()
-        for file in file_nodes:
-            if self.is_file_node_raw(file):
-                # Raw files can't be parsed, so we can't get references from them
-                continue
+        # Raw files can't be parsed, so we can't get references from them
+        parsed_file_nodes = [file for file in file_nodes if not self.is_file_node_raw(file)]
 
-            paths.update(self.get_paths_referenced_by_file_node(file))
+        paths = set()
+        for referenced_paths in self._get_paths_referenced_by_files(parsed_file_nodes).values():
+            paths.update(referenced_paths)
 
         return paths
 
@@ -250,30 +278,83 @@ class ProjectGraphDiffCreator(ProjectGraphCreator):
             file_node.skeletonize()
 
     def get_file_diff_for_path(self, path: str) -> FileDiff:
-        for file_diff in self.file_diffs:
-            if file_diff.path == path:
-                return file_diff
+        file_diff = self.file_diffs_by_path.get(path)
+        if file_diff is None:
+            raise ValueError(f"Path {path} not found in file diffs")
 
-        raise ValueError(f"Path {path} not found in file diffs")
+        return file_diff
 
     def remove_paths_to_create_from_paths_referenced(self, paths_referenced: set[str]) -> List[str]:
-        return [path for path in paths_referenced if path not in self.added_and_modified_paths]
+        return [path for path in paths_referenced if path not in self.added_and_modified_path_set]
 
     def get_paths_referenced_by_file_node(self, file_node: FileNode) -> set[str]:
+        return self._get_paths_referenced_by_files([file_node])[file_node.path]
+
+    def _get_paths_referenced_by_files(self, file_nodes: List[FileNode]) -> Dict[str, Set[str]]:
+        """
+        Resolve where the identifiers of the files are defined, with one concurrent batch per extension.
+
+        Identifiers with the same name in the same definition are defined in the same place, so
+        only the first one is looked up. The paths are kept per file for the rest of the build.
+        """
+        lookups_by_extension: Dict[str, Dict[IdentifierKey, Reference]] = {}
+        keys_by_path: Dict[str, Set[IdentifierKey]] = {}
+        identifier_count = 0
+        for file_node in file_nodes:
+            if file_node.path in self.paths_referenced_by_path or file_node.path in keys_by_path:
+                continue
+
+            lookups, file_identifier_count = self.get_definition_lookups_for_file_node(file_node)
+            identifier_count += file_identifier_count
+            keys_by_path[file_node.path] = set(lookups)
+            lookups_by_extension.setdefault(file_node.extension, {}).update(lookups)
+
+        if keys_by_path:
+            lookup_count = sum(len(lookups) for lookups in lookups_by_extension.values())
+            logger.info(
+                f"Looking up {lookup_count} definitions for {identifier_count} identifiers of {len(keys_by_path)} files"
+            )
+
+        path_by_key: Dict[IdentifierKey, str] = {}
+        for extension, lookups in lookups_by_extension.items():
+            keys = list(lookups)
+            definition_paths = self.reference_query_helper.get_definition_paths_for_references(
+                [lookups[key] for key in keys], extension
+            )
+            path_by_key.update(zip(keys, definition_paths))
+
+        for path, keys in keys_by_path.items():
+            self.paths_referenced_by_path[path] = {path_by_key[key] for key in keys}
+
+        return {file_node.path: self.paths_referenced_by_path[file_node.path] for file_node in file_nodes}
+
+    def get_definition_lookups_for_file_node(self, file_node: FileNode) -> Tuple[Dict[IdentifierKey, Reference], int]:
+        """Returns the identifier to look up for each name and enclosing definition, and the identifier count."""
         helper = self._get_tree_sitter_for_file_extension(file_node.extension)
+        named_identifiers = helper.get_all_identifiers_with_names(file_node)
+        name_by_range = {(reference.uri, reference.to_range_tuple()): name for name, reference in named_identifiers}
+
         definitions = file_node.get_all_definition_ranges()
-        identifiers = helper.get_all_identifiers(file_node)
-        filtered_identifiers = self.remove_definitions_from_identifiers(definitions, identifiers)
+        identifiers = self.remove_definitions_from_identifiers(definitions, [ref for _, ref in named_identifiers])
+        scopes = file_node.reference_search_batch(identifiers)
+
+        lookups: Dict[IdentifierKey, Reference] = {}
+        for identifier, scope in zip(identifiers, scopes):
+            name = name_by_range[(identifier.uri, identifier.to_range_tuple())]
+            lookups.setdefault((scope.id, name), identifier)
 
-        return {
-            self.reference_query_helper.lsp_resolver.get_definition_path_for_reference(ref, file_node.extension)
-            for ref in filtered_identifiers
-        }
+        return lookups, len(identifiers)
 
     def remove_definitions_from_identifiers(
         self, definitions: List[Reference], identifiers: List[Reference]
     ) -> List[Reference]:
-        return [identifier for identifier in identifiers if identifier not in definitions]
+        # References aren't hashable, compare them by uri and range
+        definition_keys = {(definition.uri, definition.to_range_tuple()) for definition in definitions}
+        return [
+            identifier
+            for identifier in identifiers
+            if (identifier.uri, identifier.to_range_tuple()) not in definition_keys
+        ]
 
     def get_file_nodes_from_path_list(self, paths: List[str]) -> List[FileNode]:
         file_nodes = []
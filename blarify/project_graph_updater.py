@@ -1,10 +1,19 @@
+import logging
+import os
+import time
 from dataclasses import dataclass
+from blarify.code_references.types import Reference
 from blarify.graph.graph import Graph
+from blarify.graph.node import FolderNode, Node
+from blarify.project_file_explorer import File, Folder
 from blarify.project_graph_diff_creator import ProjectGraphDiffCreator, FileDiff, ChangeType
-from typing import Any, List, cast
+from typing import Any, Dict, Iterable, List, Set, Tuple, cast
 from blarify.graph.graph_update import GraphUpdate
 
 from blarify.graph.graph_environment import GraphEnvironment
+from blarify.utils.path_calculator import PathCalculator
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -22,6 +31,11 @@ class ProjectGraphUpdater(ProjectGraphDiffCreator):
         This class is just a wrapper around ProjectGraphDiffCreator
 
         All the updated files are considered as added files and the pr_environment is set to the same as the graph_environment
+
+        Only the updated files and their ancestor folders are parsed, plus the files needed to resolve
+        their references: the files defining what they use and the files using what they define.
+        Those are rebuilt from the parse cache when one is set, so the cost of an update follows the
+        size of the change rather than the size of the repository.
         """
 
         self.updated_files = updated_files
@@ -34,7 +48,7 @@ class ProjectGraphUpdater(ProjectGraphDiffCreator):
         )
 
     def build(self) -> Graph:
-        self._create_code_hierarchy()
+        self._create_code_hierarchy_for_updated_files()
         self.create_relationship_from_references_for_modified_and_added_files()
         self.keep_only_files_to_create()
 
@@ -47,7 +61,7 @@ class ProjectGraphUpdater(ProjectGraphDiffCreator):
         )
 
     def build_hierarchy_only(self) -> Graph:
-        self._create_code_hierarchy()
+        self._create_code_hierarchy_for_updated_files()
         self.keep_only_files_to_create()
 
         return cast(
@@ -67,3 +81,95 @@ class ProjectGraphUpdater(ProjectGraphDiffCreator):
             )
             for updated_file in self.updated_files
         ]
+
+    def create_relationship_from_references_for_modified_and_added_files(self):
+        self._bind_pending_tree_sitter_nodes(self.added_and_modified_paths)
+        file_nodes = self.get_file_nodes_from_path_list(self.added_and_modified_paths)
+
+        paths = self.get_paths_referenced_by_file_nodes(file_nodes)
+        paths = self.remove_paths_to_create_from_paths_referenced(paths)
+        # Unlike in a full build, the files defining what the updated files reference aren't parsed yet
+        self._add_files_to_graph(paths)
+
+        file_nodes.extend(self.get_file_nodes_from_path_list(paths))
+        self._create_relationships_from_references_for_files(files_nodes=file_nodes)
+
+    def _create_code_hierarchy_for_updated_files(self) -> None:
+        start_time = time.time()
+        self._add_files_to_graph(self.added_and_modified_paths)
+
+        logger.info(
+            f"Execution time of create_code_hierarchy for {len(self.added_and_modified_paths)} updated files: "
+            f"{time.time() - start_time:.2f} seconds"
+        )
+        if self.parse_cache:
+            self.parse_cache.log_stats()
+
+    def _add_referencing_files_to_graph(self, references_by_node: Dict[Node, List[Reference]]) -> None:
+        """
+        Parse the files referencing the definitions of the updated files, the relationships start there.
+
+        References to definitions of other files are only kept when they come from an updated file,
+        so the files they come from don't need to be parsed.
+        """
+        referencing_paths: Set[str] = set()
+        for node, references in references_by_node.items():
+            if node.path in self.added_and_modified_path_set:
+                referencing_paths.update(reference.uri for reference in references)
+
+        self._add_files_to_graph(referencing_paths)
+
+    def _add_files_to_graph(self, paths: Iterable[str]) -> None:
+        """Parse the project files at the given uris missing from the graph, with their ancestor folders."""
+        files: List[Tuple[File, FolderNode]] = []
+        seen: Set[str] = set()
+        for uri in paths:
+            if not uri or uri in seen or self.graph.get_file_node_by_path(uri):
+                continue
+            seen.add(uri)
+
+            path = PathCalculator.uri_to_path(uri)
+            if not self.project_files_iterator.is_path_included(path):
+                continue
+
+            directory = os.path.dirname(path)
+            folder_node = self._add_or_get_folder_chain(directory)
+            file = File(name=os.path.basename(path), root_path=directory, level=folder_node.level + 1)
+            files.append((file, folder_node))
+
+        if not files:
+            return
+
+        logger.info(f"Adding {len(files)} files to the incremental update")
+        if self.hierarchy_workers > 1 and len(files) > 1:
+            self._process_files_in_parallel(files)
+        else:
+            for file, folder_node in files:
+                self._process_file(file, folder_node)
+
+    def _add_or_get_folder_chain(self, directory: str) -> FolderNode:
+        """
+        Create the folder nodes from the project root down to directory.
+
+        They are built the way iterating the project builds them, so their ids match the persisted
+        ones, but each folder only contains the children added to the update.
+        """
+        root_path = self.project_files_iterator.root_path
+        folder = Folder(name=os.path.basename(root_path.rstrip("/")), path=root_path, files=[], folders=[], level=0)
+        folder_node = self._add_or_get_folder_node(folder)
+
+        relative_path = os.path.relpath(directory, root_path)
+        if relative_path == ".":
+            return folder_node
+
+        for name in relative_path.split(os.sep):
+            folder = Folder(
+                name=name, path=os.path.join(folder.path, name), files=[], folders=[], level=folder.level + 1
+            )
+            is_new = not self.graph.has_folder_node_with_path(folder.uri_path)
+            child_node = self._add_or_get_folder_node(folder, parent_folder=folder_node)
+            if is_new:
+                folder_node.relate_node_as_contain_relationship(child_node)
+            folder_node = child_node
+
+        return folder_node
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Dict, Any, LiteralString, Optional
+from typing import Iterable, List, Dict, Any, LiteralString, Optional
 
 from blarify.repositories.graph_db_manager.dtos.node_search_result_dto import ReferenceSearchResultDTO
 
@@ -18,6 +18,29 @@ class AbstractDbManager:
         """Save nodes and edges to the database."""
         raise NotImplementedError
 
+    @property
+    def node_export_chunk_size(self) -> Optional[int]:
+        """Nodes per chunk handed to save_graph_chunks, None to keep the graph's default."""
+        return None
+
+    @property
+    def edge_export_chunk_size(self) -> Optional[int]:
+        """Edges per chunk handed to save_graph_chunks, None to keep the graph's default."""
+        return None
+
+    def save_graph_chunks(self, node_chunks: Iterable[List[Any]], edge_chunks: Iterable[List[Any]]) -> None:
+        """
+        Save nodes and edges chunk by chunk, so only one chunk has to be held in memory.
+
+        Every node chunk is written before the first edge chunk is consumed, since edges
+        are matched against nodes that already exist in the database.
+        """
+        for node_chunk in node_chunks:
+            self.create_nodes(node_chunk)
+
+        for edge_chunk in edge_chunks:
+            self.create_edges(edge_chunk)
+
     def create_nodes(self, nodeList: List[Any]) -> None:
         """Create nodes in the database."""
         raise NotImplementedError
@@ -1,11 +1,14 @@
 import os
-from typing import Any, List, Dict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Tuple
 import logging
 
 from dotenv import load_dotenv
 from falkordb import FalkorDB
 
 from blarify.repositories.graph_db_manager.db_manager import AbstractDbManager
+from blarify.utils.chunked import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,8 @@ class FalkorDBManager(AbstractDbManager):
     entity_id: str
     repo_id: str
     db: FalkorDB
+    edge_batch_size: int
+    pipeline_depth: int
 
     def __init__(
         self,
@@ -24,7 +29,15 @@ class FalkorDBManager(AbstractDbManager):
         uri: str = None,
         user: str = None,
         password: str = None,
+        edge_batch_size: int = 10000,
+        pipeline_depth: int = 4,
     ):
+        """
+        Args:
+            edge_batch_size: Edges sent per UNWIND query, edges of different types are never mixed
+            pipeline_depth: Edge batches in flight at once, so the next batch is sent while the
+                server runs the previous one. 1 sends them one after another.
+        """
         host = uri or os.getenv("FALKORDB_URI", "localhost")
         port = int(os.getenv("FALKORDB_PORT", 6379))
         user = user or os.getenv("FALKORDB_USERNAME")
@@ -34,10 +47,16 @@ class FalkorDBManager(AbstractDbManager):
 
         self.repo_id = repo_id if repo_id is not None else "default_repo"
         self.entity_id = entity_id if entity_id is not None else "default_user"
+        self.edge_batch_size = edge_batch_size
+        self.pipeline_depth = max(1, pipeline_depth)
 
     def close(self):
         pass
 
+    @property
+    def edge_export_chunk_size(self) -> int:
+        return self.edge_batch_size
+
     def save_graph(self, nodes: List[Any], edges: List[Any]):
         self.create_nodes(nodes)
         self.create_edges(edges)
@@ -60,32 +79,53 @@ class FalkorDBManager(AbstractDbManager):
 
     def create_edges(self, edgesList: List[dict]):
         graph = self.db.select_graph(self.repo_id)
-        
-        # Process each edge individually since FalkorDB doesn't support dynamic relationship types in UNWIND
+
+        # Relationship types can't be parameters, so edges are sent in one UNWIND batch per type
+        batches = [
+            (rel_type, batch)
+            for rel_type, edges in self._group_edges_by_type(edgesList).items()
+            for batch in chunked(edges, self.edge_batch_size)
+        ]
+        logger.info(f"Creating {len(edgesList)} edges in {len(batches)} batches, {self.pipeline_depth} in flight")
+
+        def send_batch(typed_batch: Tuple[str, List[dict]]) -> None:
+            rel_type, batch = typed_batch
+            graph.query(self._build_edges_query(rel_type), params={"edges": batch})
+
+        depth = min(self.pipeline_depth, len(batches))
+        if depth <= 1:
+            for typed_batch in batches:
+                send_batch(typed_batch)
+            return
+
+        # The client takes a pooled connection per query, so batches overlap on separate connections
+        with ThreadPoolExecutor(max_workers=depth, thread_name_prefix="falkordb-writer") as executor:
+            list(executor.map(send_batch, batches))
+
+    @staticmethod
+    def _group_edges_by_type(edgesList: List[dict]) -> Dict[str, List[dict]]:
+        edges_by_type: Dict[str, List[dict]] = defaultdict(list)
         for edge in edgesList:
-            rel_type = edge.get("type", "UNKNOWN")
-            cypher_query = f"""
-            MATCH (a {{node_id: $sourceId}}), (b {{node_id: $targetId}})
-            CREATE (a)-[r:{rel_type}]->(b)
-            SET r.scopeText = $scopeText
-            """
-            
-            # Add optional properties if they exist
-            params = {
-                "sourceId": edge["sourceId"],
-                "targetId": edge["targetId"],
-                "scopeText": edge.get("scopeText", "")
-            }
-            
-            if edge.get("startLine") is not None:
-                cypher_query += ", r.startLine = $startLine"
-                params["startLine"] = edge["startLine"]
-                
-            if edge.get("referenceCharacter") is not None:
-                cypher_query += ", r.referenceCharacter = $referenceCharacter"
-                params["referenceCharacter"] = edge["referenceCharacter"]
-            
-            graph.query(cypher_query, params=params)
+            edges_by_type[edge.get("type", "UNKNOWN")].append(
+                {
+                    "sourceId": edge["sourceId"],
+                    "targetId": edge["targetId"],
+                    "scopeText": edge.get("scopeText", ""),
+                    "startLine": edge.get("startLine"),
+                    "referenceCharacter": edge.get("referenceCharacter"),
+                }
+            )
+
+        return edges_by_type
+
+    @staticmethod
+    def _build_edges_query(rel_type: str) -> str:
+        return f"""
+        UNWIND $edges AS edge
+        MATCH (a {{node_id: edge.sourceId}}), (b {{node_id: edge.targetId}})
+        CREATE (a)-[r:`{rel_type.replace("`", "``")}`]->(b)
+        SET r.scopeText = edge.scopeText, r.startLine = edge.startLine, r.referenceCharacter = edge.referenceCharacter
+        """
 
     def detach_delete_nodes_with_path(self, path: str):
         graph = self.db.select_graph(self.repo_id)
@@ -1,6 +1,8 @@
 import os
 import time
-from typing import Any, List, Dict, LiteralString, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, LiteralString, Optional, Sequence, Tuple, TypeVar, cast
 
 from dotenv import load_dotenv
 from neo4j import Driver, GraphDatabase, ManagedTransaction, exceptions
@@ -10,6 +12,7 @@ from blarify.repositories.graph_db_manager.adapters.node_search_result_adapter i
 from blarify.repositories.graph_db_manager.db_manager import AbstractDbManager, ENVIRONMENT
 from blarify.repositories.graph_db_manager.dtos.node_search_result_dto import ReferenceSearchResultDTO
 from blarify.repositories.graph_db_manager.dtos.node_found_by_name_type import NodeFoundByNameTypeDto
+from blarify.utils.chunked import chunked
 from blarify.repositories.graph_db_manager.queries import (
     get_node_by_id_query,
     get_node_by_name_and_type_query,
@@ -18,6 +21,13 @@ from blarify.repositories.graph_db_manager.queries import (
 
 logger = logging.getLogger(__name__)
 
+Batch = TypeVar("Batch")
+
+EDGE_ENDPOINT_KEYS = ("sourceId", "targetId", "type")
+
+# Composite index nodes are merged and edge endpoints are matched on
+NODE_LOOKUP_INDEX = "node_lookup_NODE"
+
 # Disable Neo4j warning logs
 neo4j_logger = logging.getLogger("neo4j")
 neo4j_logger.setLevel(logging.ERROR)
@@ -25,10 +35,19 @@ neo4j_logger.setLevel(logging.ERROR)
 load_dotenv()
 
 
+def _escape_name(name: str) -> str:
+    return name.replace("`", "``")
+
+
 class Neo4jManager(AbstractDbManager):
     entity_id: str
     repo_ids: Optional[list[str]]  # List of repo IDs or None for entity-wide queries
     driver: Driver
+    node_write_workers: int
+    node_write_chunk_size: int
+    edge_write_workers: int
+    edge_write_chunk_size: int
+    index_online_timeout: int
 
     def __init__(
         self,
@@ -40,6 +59,11 @@ class Neo4jManager(AbstractDbManager):
         password: Optional[str] = None,
         database: Optional[str] = None,
         max_connections: int = 50,
+        node_write_workers: int = 4,
+        node_write_chunk_size: int = 1000,
+        edge_write_workers: int = 4,
+        edge_write_chunk_size: int = 10000,
+        index_online_timeout: int = 300,
     ):
         uri = uri or os.getenv("NEO4J_URI")
         user = user or os.getenv("NEO4J_USERNAME")
@@ -70,6 +94,17 @@ class Neo4jManager(AbstractDbManager):
 
         self.entity_id = entity_id or "default_user"
         self.environment = environment or ENVIRONMENT.MAIN
+        self.node_write_workers = max(1, node_write_workers)
+        self.node_write_chunk_size = node_write_chunk_size
+        self.edge_write_workers = max(1, edge_write_workers)
+        self.edge_write_chunk_size = edge_write_chunk_size
+        self.index_online_timeout = index_online_timeout
+        self._write_indexes_ready = False
+
+        try:
+            self.ensure_write_indexes()
+        except Exception as e:
+            logger.warning(f"Could not set up index {NODE_LOOKUP_INDEX}, retrying before the first write: {e}")
 
     @property
     def repo_id(self) -> Optional[str]:
@@ -84,117 +119,186 @@ class Neo4jManager(AbstractDbManager):
         self.create_nodes(nodes)
         self.create_edges(edges)
 
+    @property
+    def node_export_chunk_size(self) -> int:
+        # One export chunk fills every write session, so the sessions aren't idle between chunks
+        return self.node_write_chunk_size * self.node_write_workers
+
+    @property
+    def edge_export_chunk_size(self) -> int:
+        return self.edge_write_chunk_size * self.edge_write_workers
+
     def create_nodes(self, nodeList: List[Any]):
         # Function to create nodes in the Neo4j database
         if self.repo_id is None:
             raise ValueError("repo_id is required for creating nodes. Cannot create nodes with entity-wide scope.")
 
+        batches = [
+            (labels, batch)
+            for labels, nodes in self._group_nodes_by_labels(nodeList).items()
+            for batch in chunked(nodes, self.node_write_chunk_size)
+        ]
+        if not batches:
+            return
+
+        self.ensure_write_indexes()
+        logger.info(
+            f"Creating {len(nodeList)} nodes in {len(batches)} batches with {self.node_write_workers} sessions"
+        )
+        created_counts = self._run_write_batches(
+            lambda labeled_batch: self._write_nodes_batch(*labeled_batch), batches, self.node_write_workers
+        )
+        logger.info(f"Created {sum(created_counts)} nodes")
+
+    @staticmethod
+    def _run_write_batches(write_batch: Callable[[Batch], int], batches: Sequence[Batch], workers: int) -> List[int]:
+        """Runs write_batch for every batch, each on its own session and up to workers at once."""
+        workers = min(workers, len(batches))
+        if workers <= 1:
+            return [write_batch(batch) for batch in batches]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neo4j-writer") as executor:
+            return list(executor.map(write_batch, batches))
+
+    @staticmethod
+    def _group_nodes_by_labels(nodeList: List[Any]) -> Dict[Tuple[str, ...], List[Any]]:
+        nodes_by_labels: Dict[Tuple[str, ...], List[Any]] = defaultdict(list)
+        for node in nodeList:
+            labels = tuple(dict.fromkeys([*node.get("extra_labels", []), node["type"], "NODE"]))
+            nodes_by_labels[labels].append(node)
+
+        return nodes_by_labels
+
+    def _write_nodes_batch(self, labels: Tuple[str, ...], nodes: List[Any]) -> int:
         with self.driver.session(database=self.database) as session:
-            session.execute_write(
-                self._create_nodes_txn,
-                nodeList,
-                1000,
+            return session.execute_write(
+                self._merge_nodes_txn,
+                labels,
+                nodes,
                 repoId=self.repo_id,
                 entityId=self.entity_id,
                 environment=self.environment.value,
             )
 
+    @staticmethod
+    def _merge_nodes_txn(
+        tx: ManagedTransaction, labels: Tuple[str, ...], nodes: List[Any], repoId: str, entityId: str, environment: str
+    ) -> int:
+        # Labels can't be parameters, inlining them lets the planner use the label indexes for MERGE.
+        # node_id equals hashed_id and, with the scope properties, is covered by the node_lookup_NODE index
+        label_expression = "".join(f":`{_escape_name(label)}`" for label in labels)
+        node_merge_query = f"""
+        UNWIND $nodes AS node
+        MERGE (n{label_expression} {{
+            node_id: node.attributes.node_id,
+            repoId: $repoId,
+            entityId: $entityId,
+            environment: $environment,
+            diff_identifier: node.attributes.diff_identifier
+        }})
+        SET n += node.attributes, n.processing_status = null, n.processing_run_id = null
+        RETURN count(n) AS count
+        """
+
+        result = tx.run(
+            cast(LiteralString, node_merge_query),
+            nodes=nodes,
+            repoId=repoId,
+            entityId=entityId,
+            environment=environment,
+        )
+        return result.single(strict=True)["count"]
+
     def create_edges(self, edgesList: List[Any]):
         # Function to create edges between nodes in the Neo4j database
         if self.repo_id is None:
             raise ValueError("repo_id is required for creating edges. Cannot create edges with entity-wide scope.")
 
-        batch_size = 10000
-        total_edges = len(edgesList)
-        logger.info(f"Creating {total_edges} edges in batches of {batch_size}")
+        batches = [
+            (rel_type, property_keys, batch)
+            for (rel_type, property_keys), edges in self._group_edges_by_type(edgesList).items()
+            for batch in chunked(edges, self.edge_write_chunk_size)
+        ]
+        if not batches:
+            return
+
+        self.ensure_write_indexes()
+        logger.info(
+            f"Creating {len(edgesList)} edges in {len(batches)} batches with {self.edge_write_workers} sessions"
+        )
+        # Concurrent batches touching the same nodes can deadlock, execute_write retries those transactions
+        created_counts = self._run_write_batches(
+            lambda typed_batch: self._write_edges_batch(*typed_batch), batches, self.edge_write_workers
+        )
+        logger.info(f"Created {sum(created_counts)} edges")
+
+    @staticmethod
+    def _group_edges_by_type(edgesList: List[Any]) -> Dict[Tuple[str, Tuple[str, ...]], List[Any]]:
+        # MERGE patterns only take literal property maps, so edges are also grouped by their property keys
+        edges_by_type: Dict[Tuple[str, Tuple[str, ...]], List[Any]] = defaultdict(list)
+        for edge in edgesList:
+            property_keys = tuple(sorted(key for key in edge if key not in EDGE_ENDPOINT_KEYS))
+            edges_by_type[(edge["type"], property_keys)].append(edge)
+
+        return edges_by_type
 
+    def _write_edges_batch(self, rel_type: str, property_keys: Tuple[str, ...], edges: List[Any]) -> int:
         with self.driver.session(database=self.database) as session:
-            for i in range(0, total_edges, batch_size):
-                batch = edgesList[i:i + batch_size]
-                logger.info(f"Processing edges batch {i // batch_size + 1}/{(total_edges + batch_size - 1) // batch_size} ({i}/{total_edges})")
-                session.execute_write(
-                    self._create_edges_txn,
-                    batch,
-                    1000,
-                    entityId=self.entity_id,
-                    repoId=self.repo_id,
-                    environment=self.environment.value,
-                )
+            return session.execute_write(
+                self._merge_edges_txn,
+                rel_type,
+                property_keys,
+                edges,
+                entityId=self.entity_id,
+                repoId=self.repo_id,
+                environment=self.environment.value,
+            )
 
     @staticmethod
-    def _create_nodes_txn(
-        tx: ManagedTransaction, nodeList: List[Any], batch_size: int, repoId: str, entityId: str, environment: str
-    ):
-        node_creation_query = """
-        CALL apoc.periodic.iterate(
-            "UNWIND $nodeList AS node RETURN node",
-            "CALL apoc.merge.node(
-            node.extra_labels + [node.type, 'NODE'],
-            {hashed_id: node.attributes.hashed_id, repoId: $repoId, entityId: $entityId, environment: $environment, diff_identifier: node.attributes.diff_identifier},
-            apoc.map.merge(node.attributes, {processing_status: null, processing_run_id: null}),
-            apoc.map.merge(node.attributes, {processing_status: null, processing_run_id: null})
-            )
-            YIELD node as n RETURN count(n) as count",
-            {batchSize: $batchSize, parallel: false, iterateList: true, params: {nodeList: $nodeList, repoId: $repoId, entityId: $entityId, environment: $environment}}
-        )
-        YIELD batches, total, errorMessages, updateStatistics
-        RETURN batches, total, errorMessages, updateStatistics
+    def _merge_edges_txn(
+        tx: ManagedTransaction,
+        rel_type: str,
+        property_keys: Tuple[str, ...],
+        edges: List[Any],
+        entityId: str,
+        repoId: str,
+        environment: str,
+    ) -> int:
+        properties = ", ".join(f"`{_escape_name(key)}`: edge.`{_escape_name(key)}`" for key in property_keys)
+        edge_merge_query = f"""
+        UNWIND $edges AS edge
+        MATCH (source:NODE {{node_id: edge.sourceId, repoId: $repoId, entityId: $entityId, environment: $environment}})
+        MATCH (target:NODE {{node_id: edge.targetId, repoId: $repoId, entityId: $entityId, environment: $environment}})
+        MERGE (source)-[r:`{_escape_name(rel_type)}` {{{properties}}}]->(target)
+        RETURN count(r) AS count
         """
 
         result = tx.run(
-            node_creation_query,
-            nodeList=nodeList,
-            batchSize=batch_size,
-            repoId=repoId,
+            cast(LiteralString, edge_merge_query),
+            edges=edges,
             entityId=entityId,
+            repoId=repoId,
             environment=environment,
         )
+        return result.single(strict=True)["count"]
 
-        # Fetch the result
-        for record in result:
-            logger.info(f"Created {record['total']} nodes")
-            if record["errorMessages"]:
-                logger.error(f"Error creating nodes: {record['errorMessages']}")
-            print(record)
+    def ensure_write_indexes(self) -> None:
+        """
+        Creates the composite index writes look nodes up with and waits until it is online.
 
-    @staticmethod
-    def _create_edges_txn(
-        tx: ManagedTransaction, edgesList: List[Any], batch_size: int, entityId: str, repoId: str, environment: str
-    ):
-        # Cypher query using apoc.periodic.iterate for creating edges
-        edge_creation_query = """
-        CALL apoc.periodic.iterate(
-            "UNWIND $edgesList AS edgeObject RETURN edgeObject",
-            "MATCH (node1:NODE {node_id: edgeObject.sourceId, repoId: $repoId, entityId: $entityId, environment: $environment}) 
-            MATCH (node2:NODE {node_id: edgeObject.targetId, repoId: $repoId, entityId: $entityId, environment: $environment}) 
-            CALL apoc.merge.relationship(
-            node1, 
-            edgeObject.type, 
-            apoc.map.removeKeys(edgeObject, ['sourceId', 'targetId', 'type']), 
-            apoc.map.removeKeys(edgeObject, ['sourceId', 'targetId', 'type']), 
-            node2, 
-            apoc.map.removeKeys(edgeObject, ['sourceId', 'targetId', 'type'])
-            ) 
-            YIELD rel RETURN count(rel) as count",
-            {batchSize: $batchSize, parallel: false, iterateList: true, params: {edgesList: $edgesList, entityId: $entityId, repoId: $repoId, environment: $environment}}
-        )
-        YIELD batches, total, errorMessages, updateStatistics
-        RETURN batches, total, errorMessages, updateStatistics
+        A freshly created index is still populating, until then every lookup would scan the label.
+        The manager runs this at setup, writes only run it again if it failed there.
         """
-        # Execute the query
-        result = tx.run(
-            edge_creation_query,
-            edgesList=edgesList,
-            batchSize=batch_size,
-            entityId=entityId,
-            repoId=repoId,
-            environment=environment,
+        if self._write_indexes_ready:
+            return
+
+        self.create_node_lookup_index()
+        # Raises if the index isn't online within the timeout
+        self.query(
+            "CALL db.awaitIndex($index_name, $timeout)",
+            {"index_name": NODE_LOOKUP_INDEX, "timeout": self.index_online_timeout},
         )
-
-        # Fetch the result
-        for record in result:
-            logger.info(f"Created {record['total']} edges")
-            print(record)
+        self._write_indexes_ready = True
 
     @staticmethod
     def run_transaction(tx: ManagedTransaction, query: LiteralString, params: Dict[str, Any] = {}, entity: str = ""):
@@ -415,6 +519,15 @@ class Neo4jManager(AbstractDbManager):
         """
         self.query(node_query)
 
+    def create_node_lookup_index(self) -> None:
+        """Creates the composite index edges are matched on when they are created."""
+        node_query = """
+        CREATE INDEX node_lookup_NODE IF NOT EXISTS
+        FOR (n:NODE)
+        ON (n.node_id, n.repoId, n.entityId, n.environment)
+        """
+        self.query(node_query)
+
     def create_entityId_index(self) -> None:
         """Creates an index on entityId for data isolation."""
         user_query = """
@@ -452,6 +565,7 @@ class Neo4jManager(AbstractDbManager):
             self.create_function_name_index()
             # self.create_node_text_index()
             self.create_node_id_index()
+            self.create_node_lookup_index()
             self.create_entityId_index()
             self.create_unique_constraint()
             self.create_vector_index()
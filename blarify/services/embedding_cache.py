@@ -0,0 +1,53 @@
+import logging
+import os
+from array import array
+from typing import List, Optional
+
+from blarify.utils.sqlite_lru_cache import SqliteLruCache
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Opt-in on-disk cache of embedding vectors, reused across runs.
+
+    Vectors are keyed by the embedding model and the content hash of the embedded text, and
+    stored as packed float32 arrays, a quarter of their size as JSON.
+    """
+
+    DEFAULT_MAX_SIZE_MB = 512
+
+    def __init__(self, cache_dir: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self._store = SqliteLruCache(
+            path=os.path.join(cache_dir, "embedding_cache.sqlite"),
+            max_size_bytes=int(max_size_mb * 1024 * 1024),
+        )
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    def get(self, model: str, content_hash: str) -> Optional[List[float]]:
+        value = self._store.get(f"{model}:{content_hash}")
+        if value is None:
+            return None
+        vector = array("f")
+        vector.frombytes(value)
+        return vector.tolist()
+
+    def set(self, model: str, content_hash: str, vector: List[float]) -> None:
+        self._store.set(f"{model}:{content_hash}", array("f", vector).tobytes())
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"Embedding cache: {self.hits} hits, {self.misses} misses ({100 * self._store.hit_rate:.1f}% hit rate), "
+            f"{self._store.evictions} evictions, {self._store.total_size / (1024 * 1024):.1f} MB stored"
+        )
+
+    def close(self) -> None:
+        self._store.close()
@@ -1,28 +1,71 @@
 """Embedding service for generating vector embeddings from text content."""
 
+import asyncio
+import concurrent.futures
 import hashlib
+import logging
 import os
-import time
-from typing import Dict, List, Optional
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
 
 from langchain_openai import OpenAIEmbeddings
 
 from blarify.graph.node.documentation_node import DocumentationNode
+from blarify.services.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rough token count of English text and code, close enough to pack requests under the API limits
+CHARACTERS_PER_TOKEN = 4
+
+
+def _run_coroutine(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from synchronous code, also when the caller already runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
 
 
 class EmbeddingService:
     """Service for generating and managing text embeddings using OpenAI's text-embedding-ada-002."""
 
-    def __init__(self, batch_size: int = 100) -> None:
+    DEFAULT_MAX_BATCH_TOKENS = 100_000
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_retries: int = 3,
+        cache: Optional[EmbeddingCache] = None,
+        client: Optional[Any] = None,
+    ) -> None:
         """Initialize the EmbeddingService.
 
         Args:
-            batch_size: Number of texts to embed in a single batch request
+            batch_size: Maximum number of texts to embed in a single batch request
+            max_concurrency: Number of batch requests in flight at the same time
+            max_batch_tokens: Estimated token budget of a single batch request
+            max_retries: Attempts per batch before its texts are given up on
+            cache: Optional on-disk cache of vectors by content hash, reused across runs
+            client: Embeddings client exposing embed_documents, an OpenAI client is created when None
         """
         self.model = "text-embedding-ada-002"
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_batch_tokens = max_batch_tokens
+        self.max_retries = max_retries
         self.cache: Dict[str, List[float]] = {}
-        self._initialize_client()
+        self.persistent_cache = cache
+        if client is None:
+            self._initialize_client()
+        else:
+            self.client = client
 
     def _initialize_client(self) -> None:
         """Initialize the OpenAI embeddings client."""
@@ -45,60 +88,108 @@ class EmbeddingService:
         """
         return hashlib.sha256(text.encode()).hexdigest()
 
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
         """Embed a batch of texts using OpenAI embeddings.
 
         Args:
             texts: List of text strings to embed
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, None for the texts whose batch failed
         """
         if not texts:
             return []
+        return _run_coroutine(self.aembed_batch(texts))
+
+    async def aembed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed texts in token-packed batches, with up to max_concurrency requests in flight.
+
+        Args:
+            texts: List of text strings to embed
 
-        embeddings = []
-        for i in range(0, len(texts), self.batch_size):
-            batch = texts[i : i + self.batch_size]
+        Returns:
+            List of embedding vectors in the order of the texts, None for the texts whose batch failed
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed(batch_number: int, indices: List[int]) -> None:
             try:
-                batch_embeddings = self._embed_with_retry(batch)
-                embeddings.extend(batch_embeddings)
+                vectors = await self._aembed_with_retry([texts[index] for index in indices], semaphore)
             except Exception as e:
-                # Log error but continue processing
-                print(f"Error embedding batch {i // self.batch_size + 1}: {e}")
-                # Return None embeddings for failed texts
-                embeddings.extend([None] * len(batch))
-
+                # Log error but continue processing, the texts of the batch keep None embeddings
+                logger.error(f"Error embedding batch {batch_number}: {e}")
+                return
+            for index, vector in zip(indices, vectors):
+                embeddings[index] = vector
+
+        batches = self._pack_batches(texts)
+        await asyncio.gather(*(embed(number, indices) for number, indices in enumerate(batches, start=1)))
         return embeddings
 
-    def _embed_with_retry(self, texts: List[str], max_retries: int = 3) -> List[List[float]]:
+    def _pack_batches(self, texts: List[str]) -> List[List[int]]:
+        """Split the text indices into batches capped by both batch_size and max_batch_tokens."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for index, text in enumerate(texts):
+            tokens = max(1, len(text) // CHARACTERS_PER_TOKEN)
+            if current and (len(current) >= self.batch_size or current_tokens + tokens > self.max_batch_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _aembed_with_retry(self, texts: List[str], semaphore: asyncio.Semaphore) -> List[List[float]]:
         """Embed texts with retry logic for handling rate limits and failures.
 
+        The concurrency slot is released while backing off, so other batches keep the pool busy.
+
         Args:
             texts: List of texts to embed
-            max_retries: Maximum number of retry attempts
+            semaphore: Limits the number of requests in flight
 
         Returns:
             List of embedding vectors
         """
-        for attempt in range(max_retries):
+        for attempt in range(self.max_retries):
             try:
-                return self.client.embed_documents(texts)
+                async with semaphore:
+                    # The sync client is safe to share between threads, unlike the async one between event loops
+                    return await asyncio.to_thread(self.client.embed_documents, texts)
             except Exception as e:
-                if attempt == max_retries - 1:
+                if attempt == self.max_retries - 1:
                     raise
                 # Exponential backoff
                 wait_time = 2**attempt
-                print(f"Embedding attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
-                time.sleep(wait_time)
+                logger.warning(f"Embedding attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+                await asyncio.sleep(wait_time)
 
         return []
 
+    def _get_cached(self, content_hash: str) -> Optional[List[float]]:
+        embedding = self.cache.get(content_hash)
+        if embedding is None and self.persistent_cache:
+            embedding = self.persistent_cache.get(self.model, content_hash)
+            if embedding is not None:
+                self.cache[content_hash] = embedding
+        return embedding
+
+    def _set_cached(self, content_hash: str, embedding: List[float]) -> None:
+        self.cache[content_hash] = embedding
+        if self.persistent_cache:
+            self.persistent_cache.set(self.model, content_hash, embedding)
+
     def embed_documentation_nodes(self, nodes: List[DocumentationNode]) -> Dict[str, List[float]]:
         """Generate embeddings for documentation nodes' content field.
 
         Only embeds the content field of each node. Uses caching to avoid
-        re-embedding identical content.
+        re-embedding identical content, also across runs when a persistent cache is set.
 
         Args:
             nodes: List of DocumentationNode objects to embed
@@ -115,11 +206,10 @@ class EmbeddingService:
             if not node.content:
                 continue
 
-            content_hash = self._get_content_hash(node.content)
-
             # Check if we have this content cached
-            if content_hash in self.cache:
-                node_embeddings[node.id] = self.cache[content_hash]
+            cached = self._get_cached(self._get_content_hash(node.content))
+            if cached is not None:
+                node_embeddings[node.id] = cached
             else:
                 # Track which nodes need this content embedded
                 if node.content not in content_to_node_ids:
@@ -133,9 +223,9 @@ class EmbeddingService:
 
             # Store embeddings and update cache
             for text, embedding in zip(texts_to_embed, embeddings):
-                # Update cache
-                content_hash = self._get_content_hash(text)
-                self.cache[content_hash] = embedding
+                if embedding is None:
+                    continue
+                self._set_cached(self._get_content_hash(text), embedding)
 
                 # Map embedding to all nodes with this content
                 for node_id in content_to_node_ids[text]:
@@ -157,14 +247,11 @@ class EmbeddingService:
 
         # Check cache
         content_hash = self._get_content_hash(text)
-        if content_hash in self.cache:
-            return self.cache[content_hash]
-
-        try:
-            embedding = self._embed_with_retry([text])[0]
-            # Update cache
-            self.cache[content_hash] = embedding
-            return embedding
-        except Exception as e:
-            print(f"Error embedding text: {e}")
-            return None
+        cached = self._get_cached(content_hash)
+        if cached is not None:
+            return cached
+
+        embedding = self.embed_batch([text])[0]
+        if embedding is not None:
+            self._set_cached(content_hash, embedding)
+        return embedding
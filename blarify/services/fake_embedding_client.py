@@ -0,0 +1,47 @@
+"""Local stand-in for an embeddings API, used to benchmark the embedding pipeline without network calls."""
+
+import hashlib
+import random
+import threading
+import time
+from typing import List
+
+
+class FakeEmbeddingClient:
+    """
+    Returns deterministic pseudo-random vectors after a simulated request latency.
+
+    It exposes the embed_documents method of the langchain embedding clients, so it can be passed as
+    the client of EmbeddingService. The latency grows with the size of the batch like a real API does.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 1536,
+        latency_seconds: float = 0.05,
+        seconds_per_text: float = 0.0005,
+        failure_rate: float = 0.0,
+    ):
+        self.dimensions = dimensions
+        self.latency_seconds = latency_seconds
+        self.seconds_per_text = seconds_per_text
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.texts_embedded = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_seconds + self.seconds_per_text * len(texts))
+        with self._lock:
+            self.requests += 1
+            if self.failure_rate and random.random() < self.failure_rate:
+                raise RuntimeError("Simulated embedding request failure")
+            self.texts_embedded += len(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def _embed(self, text: str) -> List[float]:
+        generator = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        return [generator.uniform(-1.0, 1.0) for _ in range(self.dimensions)]
@@ -0,0 +1,64 @@
+from typing import Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _split_path(path: str) -> List[str]:
+    return [part for part in path.split("/") if part]
+
+
+class _TrieNode(Generic[T]):
+    __slots__ = ("children", "value", "has_value")
+
+    children: Dict[str, "_TrieNode[T]"]
+    value: Optional[T]
+    has_value: bool
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.value = None
+        self.has_value = False
+
+
+class PathPrefixTrie(Generic[T]):
+    """
+    Maps path prefixes to values, matching whole path components.
+
+    Lookups cost one dict access per component of the queried path, regardless of how many
+    prefixes are stored.
+    """
+
+    def __init__(self) -> None:
+        self._root: _TrieNode[T] = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, prefix: str, value: T) -> None:
+        node = self._root
+        for part in _split_path(prefix):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _TrieNode()
+            node = child
+
+        if not node.has_value:
+            self._size += 1
+        node.value = value
+        node.has_value = True
+
+    def longest_prefix_value(self, path: str) -> Optional[T]:
+        """Returns the value of the longest stored prefix of path, or None when no prefix matches."""
+        node = self._root
+        value = node.value if node.has_value else None
+
+        for part in _split_path(path):
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            if node.has_value:
+                value = node.value
+
+        return value
@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class SqliteLruCache:
+    """
+    Size-bounded key/value store backed by a single SQLite file.
+
+    Every read refreshes the entry's access time, once the stored values exceed
+    max_size_bytes the least recently used entries are evicted. Safe to share between threads.
+    """
+
+    path: str
+    max_size_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, path: str, max_size_bytes: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        size = len(value)
+        if size > self.max_size_bytes:
+            return
+
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), size, time.time()),
+            )
+            self._total_size += size - (previous[0] if previous else 0)
+            self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        while self._total_size > self.max_size_bytes:
+            oldest = self._connection.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not oldest:
+                self._total_size = 0
+                return
+
+            for key, size in oldest:
+                self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_size -= size
+                self.evictions += 1
+                if self._total_size <= self.max_size_bytes:
+                    return
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark filtering a graph down to the files of a diff.
+
+Builds a synthetic graph of file and function nodes with references between them, then times
+ProjectGraphDiffCreator.keep_only_files_to_create for a growing number of changed files. No files
+are parsed, so the numbers isolate the filtering.
+
+Usage:
+    python scripts/benchmark_diff_filtering.py --file-counts 2000 10000 --change-sizes 10 100 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+from unittest.mock import MagicMock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blarify.code_references.types import Point, Range, Reference  # noqa: E402
+from blarify.graph.graph import Graph  # noqa: E402
+from blarify.graph.graph_environment import GraphEnvironment  # noqa: E402
+from blarify.graph.node import NodeFactory  # noqa: E402
+from blarify.graph.relationship import Relationship, RelationshipType  # noqa: E402
+from blarify.project_graph_diff_creator import ChangeType, FileDiff, ProjectGraphDiffCreator  # noqa: E402
+
+ROOT = "/repo"
+FILES_PER_FOLDER = 25
+FUNCTIONS_PER_FILE = 10
+GRAPH_ENVIRONMENT = GraphEnvironment("benchmark", "0", ROOT)
+
+
+def _reference(path: str, line: int) -> Reference:
+    return Reference(range=Range(Point(line, 0), Point(line + 1, 0)), uri=path)
+
+
+def file_path(index: int) -> str:
+    return f"file://{ROOT}/package_{index // FILES_PER_FOLDER}/module_{index}.py"
+
+
+def generate_graph(file_count: int) -> Graph:
+    graph = Graph()
+    previous_function = None
+    for index in range(file_count):
+        path = file_path(index)
+        file_node = NodeFactory.create_file_node(
+            path=path,
+            name=f"module_{index}.py",
+            level=2,
+            node_range=_reference(path, 0),
+            definition_range=_reference(path, 0),
+            code_text="",
+            parent=None,
+            graph_environment=GRAPH_ENVIRONMENT,
+        )
+        graph.add_node(file_node)
+        for function_index in range(FUNCTIONS_PER_FILE):
+            function_node = NodeFactory.create_function_node(
+                function_name=f"function_{function_index}",
+                path=path,
+                definition_range=_reference(path, function_index * 2),
+                node_range=_reference(path, function_index * 2),
+                code_text="",
+                body_node=None,
+                level=3,
+                tree_sitter_node=None,
+                parent=file_node,
+                graph_environment=GRAPH_ENVIRONMENT,
+            )
+            file_node.relate_node_as_define_relationship(function_node)
+            graph.add_node(function_node)
+            if previous_function is not None:
+                # Chain the functions across files, so some references cross the filtered paths
+                relationship = Relationship(previous_function, function_node, RelationshipType.CALLS)
+                graph.add_references_relationships([relationship])
+            previous_function = function_node
+    return graph
+
+
+def benchmark(file_count: int, change_sizes: List[int]) -> None:
+    for change_size in change_sizes:
+        if change_size > file_count:
+            continue
+        changed_paths = [file_path(index) for index in range(0, file_count, file_count // change_size)][:change_size]
+        diff_creator = ProjectGraphDiffCreator(
+            root_path=ROOT,
+            reference_query_helper=MagicMock(),
+            project_files_iterator=MagicMock(),
+            file_diffs=[FileDiff(path=path, diff_text="", change_type=ChangeType.MODIFIED) for path in changed_paths],
+            graph_environment=GRAPH_ENVIRONMENT,
+        )
+        diff_creator.graph = generate_graph(file_count)
+
+        start = time.perf_counter()
+        diff_creator.keep_only_files_to_create()
+        elapsed = time.perf_counter() - start
+
+        kept = len(diff_creator.graph.get_nodes_as_objects())
+        print(f"{file_count:>8} files  {change_size:>6} changed  {elapsed * 1000:>10.1f} ms  {kept:>8} nodes kept")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file-counts", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--change-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for file_count in args.file_counts:
+        benchmark(file_count, args.change_sizes)
+
+
+if __name__ == "__main__":
+    main()
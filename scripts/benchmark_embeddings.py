@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark the throughput of the embedding pipeline against a local fake client.
+
+Usage:
+    python scripts/benchmark_embeddings.py --texts 5000 --latency 0.2 --concurrency 1 4 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blarify.services.embedding_service import EmbeddingService  # noqa: E402
+from blarify.services.fake_embedding_client import FakeEmbeddingClient  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000, help="Number of texts to embed")
+    parser.add_argument("--text-length", type=int, default=1200, help="Characters per text")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per request")
+    parser.add_argument("--batch-size", type=int, default=100, help="Maximum texts per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Requests in flight to try")
+    args = parser.parse_args()
+
+    texts = [f"{index} " + "x" * args.text_length for index in range(args.texts)]
+    for concurrency in args.concurrency:
+        client = FakeEmbeddingClient(latency_seconds=args.latency)
+        service = EmbeddingService(batch_size=args.batch_size, max_concurrency=concurrency, client=client)
+
+        start = time.perf_counter()
+        service.embed_batch(texts)
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"concurrency={concurrency:<3} requests={client.requests:<5} "
+            f"{elapsed:7.2f}s {args.texts / elapsed:9.1f} texts/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
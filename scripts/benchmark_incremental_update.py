@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental graph updates against repository size and change size.
+
+Generates synthetic Python repositories and times ProjectGraphUpdater on a growing number
+of updated files, next to a full hierarchy build of the same repository. Only the code
+hierarchy is built, so no language server is needed and the numbers isolate parsing.
+
+Usage:
+    python scripts/benchmark_incremental_update.py --repo-sizes 250 1000 4000 --change-sizes 1 10 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blarify.graph.graph_environment import GraphEnvironment  # noqa: E402
+from blarify.project_file_explorer import ProjectFilesIterator  # noqa: E402
+from blarify.project_graph_creator import ProjectGraphCreator  # noqa: E402
+from blarify.project_graph_updater import ProjectGraphUpdater, UpdatedFile  # noqa: E402
+
+FILES_PER_FOLDER = 25
+
+MODULE_TEMPLATE = '''
+class Service{index}:
+    def __init__(self, value):
+        self.value = value
+
+    def compute(self, other):
+        return helper_{index}(self.value) + other
+
+
+def helper_{index}(value):
+    return value * {index}
+'''
+
+
+class NoReferences:
+    """Stands in for the reference resolver, a hierarchy build only asks it to track directories."""
+
+    def initialize_directory(self, file) -> None:
+        pass
+
+
+def generate_repository(root: str, file_count: int) -> List[str]:
+    paths = []
+    for index in range(file_count):
+        folder = os.path.join(root, f"package_{index // FILES_PER_FOLDER}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"module_{index}.py")
+        with open(path, "w") as f:
+            f.write(MODULE_TEMPLATE.format(index=index))
+        paths.append(path)
+    return paths
+
+
+def time_full_build(root: str) -> float:
+    start = time.perf_counter()
+    ProjectGraphCreator(
+        root_path=root,
+        reference_query_helper=NoReferences(),
+        project_files_iterator=ProjectFilesIterator(root_path=root),
+        graph_environment=GraphEnvironment("benchmark", "0", root),
+    ).build_hierarchy_only()
+    return time.perf_counter() - start
+
+
+def time_incremental_update(root: str, updated_paths: List[str]) -> float:
+    start = time.perf_counter()
+    ProjectGraphUpdater(
+        updated_files=[UpdatedFile(path=path) for path in updated_paths],
+        root_path=root,
+        reference_query_helper=NoReferences(),
+        project_files_iterator=ProjectFilesIterator(root_path=root),
+        graph_environment=GraphEnvironment("benchmark", "0", root),
+    ).build_hierarchy_only()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repo-sizes", type=int, nargs="+", default=[250, 1000, 4000], help="Files per repository")
+    parser.add_argument("--change-sizes", type=int, nargs="+", default=[1, 10, 100], help="Updated files per run")
+    args = parser.parse_args()
+
+    header = " ".join(f"{f'{size} updated':>12}" for size in args.change_sizes)
+    print(f"{'repo files':>10} {'full build':>11} {header}")
+    for repo_size in args.repo_sizes:
+        with tempfile.TemporaryDirectory() as root:
+            paths = generate_repository(root, repo_size)
+            full = time_full_build(root)
+            updates = [time_incremental_update(root, paths[:change_size]) for change_size in args.change_sizes]
+            print(f"{repo_size:>10} {full:>10.2f}s " + " ".join(f"{seconds:>11.3f}s" for seconds in updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark FalkorDBManager edge throughput against a FalkorDB test container."""
+
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from blarify.repositories.graph_db_manager.falkordb_manager import FalkorDBManager
+
+EDGES_COUNT = int(os.environ.get("BLARIFY_BENCHMARK_EDGES", "5000"))
+REL_TYPES = ["CALLS", "CONTAINS", "FUNCTION_DEFINITION", "IMPORTS"]
+
+
+def _create_nodes(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"attributes": {"node_id": f"node_{index}", "name": f"node_{index}"}, "extra_labels": []}
+        for index in range(count)
+    ]
+
+
+def _create_edges(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "sourceId": f"node_{index}",
+            "targetId": f"node_{index + 1}",
+            "type": REL_TYPES[index % len(REL_TYPES)],
+            "scopeText": "helper(value)",
+            "startLine": index,
+            "referenceCharacter": 4,
+        }
+        for index in range(count)
+    ]
+
+
+def _measure(host: str, edges: List[Dict[str, Any]], edge_batch_size: int, pipeline_depth: int) -> float:
+    manager = FalkorDBManager(
+        repo_id=f"benchmark_{uuid.uuid4().hex}",
+        uri=host,
+        edge_batch_size=edge_batch_size,
+        pipeline_depth=pipeline_depth,
+    )
+    graph = manager.db.select_graph(manager.repo_id)
+    try:
+        manager.create_nodes(_create_nodes(len(edges) + 1))
+
+        start = time.perf_counter()
+        manager.create_edges(edges)
+        elapsed = time.perf_counter() - start
+
+        created = graph.query("MATCH ()-[r]->() RETURN count(r)").result_set[0][0]
+        assert created == len(edges)
+        return elapsed
+    finally:
+        graph.delete()
+
+
+@pytest.mark.slow
+def test_falkordb_edge_ingest_throughput(falkordb_container: Tuple[str, int], monkeypatch: pytest.MonkeyPatch):
+    """Reports edges/sec one query per edge, in UNWIND batches sent serially, and with batches pipelined."""
+    host, port = falkordb_container
+    monkeypatch.setenv("FALKORDB_PORT", str(port))
+    edges = _create_edges(EDGES_COUNT)
+
+    per_edge_time = _measure(host, edges, edge_batch_size=1, pipeline_depth=1)
+    batched_time = _measure(host, edges, edge_batch_size=1000, pipeline_depth=1)
+    pipelined_time = _measure(host, edges, edge_batch_size=1000, pipeline_depth=4)
+
+    print(
+        f"\n{EDGES_COUNT} edges: {EDGES_COUNT / per_edge_time:.0f} edges/sec one edge per query, "
+        f"{EDGES_COUNT / batched_time:.0f} edges/sec in serial UNWIND batches, "
+        f"{EDGES_COUNT / pipelined_time:.0f} edges/sec with 4 batches in flight"
+    )
+    assert batched_time < per_edge_time
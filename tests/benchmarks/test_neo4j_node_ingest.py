@@ -0,0 +1,72 @@
+"""Benchmark node ingestion throughput of Neo4jManager against the local Neo4j test container."""
+
+import os
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from blarify.repositories.graph_db_manager.neo4j_manager import Neo4jManager
+
+NODES_COUNT = int(os.environ.get("BLARIFY_BENCHMARK_NODES", "20000"))
+LABELS = ["FILE", "CLASS", "FUNCTION"]
+
+
+def _create_node_objects(count: int) -> List[Dict[str, Any]]:
+    nodes = []
+    for index in range(count):
+        label = LABELS[index % len(LABELS)]
+        nodes.append(
+            {
+                "type": label,
+                "extra_labels": [],
+                "attributes": {
+                    "label": label,
+                    "path": f"file:///benchmark/module_{index // 10}.py",
+                    "node_id": f"node_{index}",
+                    "hashed_id": f"node_{index}",
+                    "diff_identifier": "0",
+                    "name": f"name_{index}",
+                    "text": "def name():\n    return None\n",
+                },
+            }
+        )
+    return nodes
+
+
+def _ingest(test_data_isolation: Dict[str, Any], nodes: List[Dict[str, Any]], workers: int, suffix: str) -> float:
+    db_manager = Neo4jManager(
+        uri=test_data_isolation["uri"],
+        user="neo4j",
+        password=test_data_isolation["password"],
+        repo_id=f"{test_data_isolation['repo_id']}{suffix}",
+        entity_id=test_data_isolation["entity_id"],
+        node_write_workers=workers,
+    )
+    try:
+        start = time.perf_counter()
+        db_manager.create_nodes(nodes)
+        elapsed = time.perf_counter() - start
+
+        stored = db_manager.query(
+            "MATCH (n:NODE {repoId: $repo_id, entityId: $entity_id}) RETURN count(n) AS count"
+        )[0]["count"]
+        assert stored == len(nodes)
+        return elapsed
+    finally:
+        db_manager.close()
+
+
+@pytest.mark.slow
+@pytest.mark.neo4j_performance
+def test_node_ingest_throughput(docker_check: Any, test_data_isolation: Dict[str, Any]) -> None:
+    """Reports nodes/sec writing the same nodes with one session and with several concurrent sessions."""
+    nodes = _create_node_objects(NODES_COUNT)
+
+    single_session = _ingest(test_data_isolation, nodes, workers=1, suffix="")
+    concurrent_sessions = _ingest(test_data_isolation, nodes, workers=4, suffix="_concurrent")
+
+    print(
+        f"\n{NODES_COUNT} nodes: {NODES_COUNT / single_session:.0f} nodes/sec with 1 session, "
+        f"{NODES_COUNT / concurrent_sessions:.0f} nodes/sec with 4 sessions"
+    )
@@ -0,0 +1,100 @@
+"""Benchmark get_nodes_as_objects with memoized node identities against recomputing them on every access."""
+
+import os
+import time
+from hashlib import md5
+from pathlib import Path
+from typing import Callable
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import Node
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_creator import ProjectGraphCreator
+from blarify.utils.relative_id_calculator import RelativeIdCalculator
+
+FILES_COUNT = int(os.environ.get("BLARIFY_BENCHMARK_FILES", "2000"))
+
+SOURCE = '''
+class Service{index}:
+    def run(self, value):
+        def validate(item):
+            return item is not None
+
+        return validate(value)
+
+    def stop(self):
+        return None
+
+
+def helper_{index}(value):
+    return value * 2
+'''
+
+
+def _uncached_identifier(node: Node) -> str:
+    identifier = _uncached_identifier(node.parent) if node.parent else ""
+    return identifier + node.node_repr_for_identifier
+
+
+def _uncached_id(node: Node) -> str:
+    return str(node.graph_environment or "") + node._identifier()
+
+
+def _uncached_hashed_id(node: Node) -> str:
+    return md5(node.id.encode()).hexdigest()
+
+
+def _uncached_relative_id(node: Node) -> str:
+    return RelativeIdCalculator.calculate(node.id)
+
+
+def _build_graph(root: Path) -> Graph:
+    for index in range(FILES_COUNT):
+        package = root / f"package_{index // 100}" / f"subpackage_{index // 10}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"module_{index}.py").write_text(SOURCE.format(index=index))
+
+    creator = ProjectGraphCreator(
+        root_path=str(root),
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=str(root)),
+        graph_environment=GraphEnvironment("benchmark", "0", str(root)),
+    )
+    return creator.build_hierarchy_only()
+
+
+def _time(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+@pytest.mark.slow
+def test_get_nodes_as_objects_with_memoized_identity(tmp_path: Path):
+    """Reports the export time when node identities are recomputed on every access and when memoized."""
+    graph = _build_graph(tmp_path)
+
+    with (
+        patch.object(Node, "_identifier", _uncached_identifier),
+        patch.object(Node, "id", property(_uncached_id)),
+        patch.object(Node, "hashed_id", property(_uncached_hashed_id)),
+        patch.object(Node, "relative_id", property(_uncached_relative_id)),
+    ):
+        uncached_nodes = graph.get_nodes_as_objects()
+        uncached = _time(graph.get_nodes_as_objects)
+        uncached_relationships = _time(graph.get_relationships_as_objects)
+
+    memoized_nodes = graph.get_nodes_as_objects()
+    memoized = _time(graph.get_nodes_as_objects)
+    memoized_relationships = _time(graph.get_relationships_as_objects)
+
+    print(
+        f"\n{graph.get_node_count()} nodes: get_nodes_as_objects {uncached:.3f}s recomputing ids, "
+        f"{memoized:.3f}s memoized; get_relationships_as_objects {uncached_relationships:.3f}s recomputing ids, "
+        f"{memoized_relationships:.3f}s memoized"
+    )
+    assert memoized_nodes == uncached_nodes
@@ -0,0 +1,83 @@
+"""Benchmark the memory held by the node model of a built code hierarchy."""
+
+import gc
+import os
+import tracemalloc
+from pathlib import Path
+from typing import Tuple
+from unittest.mock import MagicMock
+
+import pytest
+
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_creator import ProjectGraphCreator
+
+FILES_COUNT = int(os.environ.get("BLARIFY_BENCHMARK_FILES", "2000"))
+
+SOURCE = '''
+class Service{index}:
+    def __init__(self, repository):
+        self.repository = repository
+
+    def run(self, value, retries=3):
+        for _ in range(retries):
+            if value:
+                return helper_{index}(value)
+        return None
+
+    def stop(self):
+        return self.repository.close()
+
+
+def helper_{index}(value):
+    return value * 2
+'''
+
+
+def _create_repository(root: Path, count: int) -> None:
+    for index in range(count):
+        package = root / f"package_{index // 100}"
+        package.mkdir(exist_ok=True)
+        (package / f"module_{index}.py").write_text(SOURCE.format(index=index))
+
+
+def _build(root: Path) -> Tuple[ProjectGraphCreator, Graph]:
+    creator = ProjectGraphCreator(
+        root_path=str(root),
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=str(root)),
+        graph_environment=GraphEnvironment("benchmark", "0", str(root)),
+    )
+    return creator, creator.build_hierarchy_only()
+
+
+def _retained_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+@pytest.mark.slow
+def test_node_model_memory(tmp_path: Path):
+    """Reports the peak and retained memory of a built hierarchy, and after releasing tree-sitter trees."""
+    _create_repository(tmp_path, FILES_COUNT)
+
+    tracemalloc.start()
+    baseline = _retained_bytes()
+    creator, graph = _build(tmp_path)
+    retained = _retained_bytes() - baseline
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+
+    creator.release_tree_sitter_nodes()
+    retained_without_trees = _retained_bytes() - baseline
+    tracemalloc.stop()
+
+    nodes_count = graph.get_node_count()
+    print(
+        f"\n{FILES_COUNT} files, {nodes_count} nodes: peak {peak / 2**20:.1f} MB, "
+        f"retained {retained / 2**20:.1f} MB ({retained / nodes_count:.0f} B/node), "
+        f"{retained_without_trees / 2**20:.1f} MB ({retained_without_trees / nodes_count:.0f} B/node) "
+        "after releasing tree-sitter nodes"
+    )
+    assert retained_without_trees <= retained
@@ -0,0 +1,96 @@
+"""Benchmark SCIP symbol matching with per-document position maps against scanning each document per node."""
+
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from blarify import scip_pb2
+from blarify.code_references.scip_helper import ScipReferenceResolver
+from blarify.code_references.scip_lookup_table import ScipLookupTable
+
+FILES_COUNT = int(os.environ.get("BLARIFY_BENCHMARK_SCIP_FILES", "20"))
+DEFINITIONS_PER_FILE = 2000
+REFERENCES_PER_DEFINITION = 4
+
+
+class _BenchmarkNode:
+    """Stands in for a DefinitionNode, the resolver only reads its path and definition range."""
+
+    def __init__(self, path: str, line: int, character: int):
+        self.path = path
+        self.definition_range = SimpleNamespace(start_dict={"line": line, "character": character})
+
+
+def _scan_definition_symbols(table: ScipLookupTable, document_index: int) -> Dict[Tuple[int, int], int]:
+    # What every lookup used to cost: a pass over the document's definitions
+    definition_symbols: Dict[Tuple[int, int], int] = {}
+    for position, symbol_index in table.iter_document_definitions(document_index):
+        definition_symbols.setdefault(position, symbol_index)
+    return definition_symbols
+
+
+def _write_index(root: Path) -> str:
+    index = scip_pb2.Index()
+    for file_index in range(FILES_COUNT):
+        document = index.documents.add()
+        document.relative_path = f"pkg/module_{file_index}.py"
+        for definition in range(DEFINITIONS_PER_FILE):
+            symbol = f"scip-python python bench 0.1 `pkg.module_{file_index}`/function_{definition}()."
+            occurrence = document.occurrences.add()
+            occurrence.symbol = symbol
+            occurrence.symbol_roles = scip_pb2.SymbolRole.Definition
+            occurrence.range.extend([definition * 3, 4, 16])
+            for reference in range(REFERENCES_PER_DEFINITION):
+                occurrence = document.occurrences.add()
+                occurrence.symbol = symbol
+                occurrence.symbol_roles = scip_pb2.SymbolRole.ReadAccess
+                occurrence.range.extend([definition * 3 + 1, reference * 20, reference * 20 + 12])
+
+    index_path = root / "index.scip"
+    index_path.write_bytes(index.SerializeToString())
+    return str(index_path)
+
+
+@pytest.mark.slow
+def test_scip_symbol_matching(tmp_path: Path):
+    """Reports the time to resolve references node by node, with and without position maps, and batched."""
+    resolver = ScipReferenceResolver(str(tmp_path), scip_index_path=_write_index(tmp_path), language="python")
+    assert resolver.ensure_loaded()
+
+    nodes = [
+        _BenchmarkNode(f"file://{tmp_path}/pkg/module_{file_index}.py", definition * 3, 4)
+        for file_index in range(FILES_COUNT)
+        for definition in range(DEFINITIONS_PER_FILE)
+    ]
+    # Scanning is quadratic per document, so time it on a single file
+    scanned_nodes = nodes[:DEFINITIONS_PER_FILE]
+
+    with patch.object(ScipLookupTable, "get_definition_symbols", _scan_definition_symbols):
+        start = time.perf_counter()
+        scanned = {node: resolver.get_references_for_node(node) for node in scanned_nodes}
+        scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_node = {node: resolver.get_references_for_node(node) for node in nodes}
+    per_node_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = resolver.get_references_batch_with_progress(nodes)  # type: ignore[arg-type]
+    batched_time = time.perf_counter() - start
+
+    print(
+        f"\n{len(nodes)} nodes in {FILES_COUNT} files of {DEFINITIONS_PER_FILE} definitions: "
+        f"scanning documents {scan_time:.3f}s for {len(scanned_nodes)} nodes "
+        f"(~{scan_time * FILES_COUNT:.1f}s extrapolated), per-node with position maps {per_node_time:.3f}s, "
+        f"batched {batched_time:.3f}s"
+    )
+    assert all(len(references) == REFERENCES_PER_DEFINITION for references in batched.values())
+    assert {node: len(references) for node, references in scanned.items()} == {
+        node: len(per_node[node]) for node in scanned_nodes
+    }
+    assert per_node == batched
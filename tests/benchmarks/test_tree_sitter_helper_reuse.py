@@ -0,0 +1,82 @@
+"""Benchmark reusing TreeSitterHelper instances instead of building one per file."""
+
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from blarify.code_hierarchy import TreeSitterHelper, TreeSitterHelperRegistry
+from blarify.code_hierarchy.languages import PythonDefinitions
+from blarify.project_file_explorer import File
+
+FILES_COUNT = int(os.environ.get("BLARIFY_BENCHMARK_FILES", "10000"))
+
+SOURCE = '''
+class Service:
+    def run(self, value):
+        if value:
+            return helper(value)
+        return None
+
+
+def helper(value):
+    return value * 2
+'''
+
+
+def _create_files(root: Path, count: int) -> List[File]:
+    files = []
+    for index in range(count):
+        name = f"module_{index}.py"
+        (root / name).write_text(SOURCE)
+        files.append(File(name=name, root_path=str(root), level=1))
+    return files
+
+
+def _measure(files: List[File], get_helper: Callable[[], TreeSitterHelper]) -> Tuple[float, int, int]:
+    original = PythonDefinitions.get_parsers_for_extensions
+    parser_constructions = 0
+
+    def counting_get_parsers():
+        nonlocal parser_constructions
+        parser_constructions += 1
+        return original()
+
+    with patch.object(PythonDefinitions, "get_parsers_for_extensions", staticmethod(counting_get_parsers)):
+        start = time.perf_counter()
+        for file in files:
+            get_helper().create_nodes_and_relationships_in_file(file)
+        elapsed = time.perf_counter() - start
+        timed_parser_constructions = parser_constructions
+
+        # Allocations are traced in a separate pass so tracing overhead does not skew the timing
+        tracemalloc.start()
+        for file in files:
+            get_helper().create_nodes_and_relationships_in_file(file)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return elapsed, peak, timed_parser_constructions
+
+
+@pytest.mark.slow
+def test_helper_registry_reuses_parsers(tmp_path: Path):
+    """Compare one TreeSitterHelper per file against the per-build registry."""
+    files = _create_files(tmp_path, FILES_COUNT)
+    registry = TreeSitterHelperRegistry()
+
+    per_file_time, per_file_peak, per_file_parsers = _measure(files, lambda: TreeSitterHelper(PythonDefinitions))
+    registry_time, registry_peak, registry_parsers = _measure(files, lambda: registry.get(PythonDefinitions))
+
+    print(
+        f"\n{FILES_COUNT} files: per-file helpers {per_file_time:.2f}s, {per_file_parsers} parser sets, "
+        f"peak {per_file_peak / 1024:.0f} KiB | registry {registry_time:.2f}s, {registry_parsers} parser sets, "
+        f"peak {registry_peak / 1024:.0f} KiB | saved {per_file_time - registry_time:.2f}s"
+    )
+
+    assert per_file_parsers == FILES_COUNT
+    assert registry_parsers == 1
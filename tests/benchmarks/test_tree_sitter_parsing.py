@@ -0,0 +1,56 @@
+"""Benchmark building code hierarchies and finding identifiers for the languages in tests/code_examples."""
+
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from blarify.code_hierarchy import TreeSitterHelperRegistry
+from blarify.project_file_explorer import File
+from blarify.project_graph_creator import ProjectGraphCreator
+
+CODE_EXAMPLES = Path(__file__).resolve().parents[1] / "code_examples"
+ROUNDS = int(os.environ.get("BLARIFY_BENCHMARK_ROUNDS", "50"))
+
+
+def _files_by_extension() -> Dict[str, List[File]]:
+    files_by_extension: Dict[str, List[File]] = defaultdict(list)
+    for path in sorted(CODE_EXAMPLES.rglob("*")):
+        if path.is_file() and path.suffix in ProjectGraphCreator.languages:
+            files_by_extension[path.suffix].append(File(name=path.name, root_path=str(path.parent), level=1))
+    return files_by_extension
+
+
+@pytest.mark.slow
+def test_parsing_benchmark_across_languages():
+    """Time the hierarchy build and the identifier search of every example file, per language."""
+    registry = TreeSitterHelperRegistry()
+    files_by_extension = _files_by_extension()
+    assert files_by_extension
+
+    print(f"\n{'extension':>10} {'files':>6} {'hierarchy ms/file':>18} {'identifiers ms/file':>20} {'definitions':>12}")
+    for extension, files in files_by_extension.items():
+        helper = registry.get(ProjectGraphCreator.languages[extension])
+
+        hierarchy_time = identifiers_time = 0.0
+        definitions = 0
+        for _ in range(ROUNDS):
+            for file in files:
+                start = time.perf_counter()
+                nodes = helper.create_nodes_and_relationships_in_file(file)
+                hierarchy_time += time.perf_counter() - start
+
+                start = time.perf_counter()
+                helper.get_all_identifiers_with_names(nodes[0])
+                identifiers_time += time.perf_counter() - start
+                definitions += len(nodes) - 1
+
+        runs = ROUNDS * len(files)
+        print(
+            f"{extension:>10} {len(files):>6} {hierarchy_time / runs * 1000:>18.3f} "
+            f"{identifiers_time / runs * 1000:>20.3f} {definitions // ROUNDS:>12}"
+        )
+        assert definitions > 0
@@ -24,7 +24,7 @@ from neo4j_container_manager.fixtures import (
 from neo4j_container_manager.types import Neo4jContainerConfig, Environment, Neo4jContainerInstance
 from neo4j_container_manager.container_manager import Neo4jContainerManager
 from tests.utils.graph_assertions import create_graph_assertions, GraphAssertions
-from tests.utils.fixtures import docker_check  # noqa: F401
+from tests.utils.fixtures import docker_check, falkordb_container  # noqa: F401
 from blarify.mcp_server.config import MCPServerConfig
 from blarify.mcp_server.server import BlarifyMCPServer
 
@@ -0,0 +1,58 @@
+"""Test the definition lookups a diff sends to find the files its changed files depend on."""
+
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock
+
+from blarify.code_references.types import Reference
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_diff_creator import ChangeType, FileDiff, ProjectGraphDiffCreator
+
+CODE_EXAMPLES = str(Path(__file__).resolve().parents[2] / "code_examples")
+MODIFIED_FILE = f"file://{CODE_EXAMPLES}/python/class_with_inheritance.py"
+
+
+def _definition_paths(references: List[Reference], extension: str) -> List[str]:
+    return [f"file:///definitions/line_{reference.range.start.line}.py" for reference in references]
+
+
+def _create_diff_creator() -> ProjectGraphDiffCreator:
+    reference_query_helper = MagicMock()
+    reference_query_helper.get_definition_paths_for_references.side_effect = _definition_paths
+    diff_creator = ProjectGraphDiffCreator(
+        root_path=CODE_EXAMPLES,
+        reference_query_helper=reference_query_helper,
+        project_files_iterator=ProjectFilesIterator(root_path=CODE_EXAMPLES, names_to_skip=["__pycache__"]),
+        file_diffs=[FileDiff(path=MODIFIED_FILE, diff_text="", change_type=ChangeType.MODIFIED)],
+        graph_environment=GraphEnvironment("test", "0", CODE_EXAMPLES),
+    )
+    diff_creator._create_code_hierarchy()
+    diff_creator._bind_pending_tree_sitter_nodes()
+    return diff_creator
+
+
+def test_identifiers_are_looked_up_once_per_name_and_definition():
+    """Test repeated identifiers share a lookup while every looked up identifier keeps its definition path."""
+    diff_creator = _create_diff_creator()
+    file_node = diff_creator.graph.get_file_node_by_path(MODIFIED_FILE)
+    assert file_node is not None
+
+    lookups, identifier_count = diff_creator.get_definition_lookups_for_file_node(file_node)
+    paths = diff_creator.get_paths_referenced_by_file_nodes([file_node])
+
+    assert 0 < len(lookups) < identifier_count
+    assert paths == set(_definition_paths(list(lookups.values()), file_node.extension))
+    diff_creator.reference_query_helper.get_definition_paths_for_references.assert_called_once()
+
+
+def test_paths_referenced_by_a_file_are_kept_for_the_build():
+    """Test asking again for the same file doesn't send its lookups again."""
+    diff_creator = _create_diff_creator()
+    file_node = diff_creator.graph.get_file_node_by_path(MODIFIED_FILE)
+
+    first = diff_creator.get_paths_referenced_by_file_nodes([file_node])
+    second = diff_creator.get_paths_referenced_by_file_node(file_node)
+
+    assert first == second
+    diff_creator.reference_query_helper.get_definition_paths_for_references.assert_called_once()
@@ -0,0 +1,64 @@
+"""Test that incremental updates only parse the updated files and still match a full build."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import NodeLabels
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_updater import ProjectGraphUpdater, UpdatedFile
+
+CODE_EXAMPLES = str(Path(__file__).resolve().parents[2] / "code_examples")
+UPDATED_FILES = [
+    f"{CODE_EXAMPLES}/duplicate_names/module1/utils.py",
+    f"{CODE_EXAMPLES}/python/simple_module.py",
+]
+
+
+def _create_updater(hierarchy_workers: int = 1) -> ProjectGraphUpdater:
+    return ProjectGraphUpdater(
+        updated_files=[UpdatedFile(path=path) for path in UPDATED_FILES],
+        root_path=CODE_EXAMPLES,
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=CODE_EXAMPLES, names_to_skip=["__pycache__"]),
+        graph_environment=GraphEnvironment("test", "0", CODE_EXAMPLES),
+        hierarchy_workers=hierarchy_workers,
+    )
+
+
+def _sorted_nodes(graph: Graph) -> List[Dict[str, Any]]:
+    return sorted(graph.get_nodes_as_objects(), key=lambda node: node["attributes"]["node_id"])
+
+
+def _sorted_relationships(graph: Graph) -> List[str]:
+    return sorted(str(relationship) for relationship in graph.get_relationships_as_objects())
+
+
+def _build_from_full_hierarchy() -> Graph:
+    """The previous behavior: parse the whole project, then keep the updated files and their folders."""
+    updater = _create_updater()
+    updater._create_code_hierarchy()
+    updater.keep_only_files_to_create()
+    return updater.graph
+
+
+def test_incremental_hierarchy_matches_filtered_full_build():
+    """Test the updated files and their ancestor folders get the same nodes and relationships as before."""
+    expected = _build_from_full_hierarchy()
+
+    for hierarchy_workers in (1, 2):
+        graph = _create_updater(hierarchy_workers).build_hierarchy_only()
+
+        assert _sorted_nodes(graph) == _sorted_nodes(expected)
+        assert _sorted_relationships(graph) == _sorted_relationships(expected)
+
+
+def test_incremental_hierarchy_parses_only_updated_files():
+    """Test no file outside the update is parsed."""
+    updater = _create_updater()
+    updater._create_code_hierarchy_for_updated_files()
+
+    parsed_paths = {node.path for node in updater.graph.get_nodes_by_label(NodeLabels.FILE.value)}
+    assert parsed_paths == {f"file://{path}" for path in UPDATED_FILES}
@@ -0,0 +1,85 @@
+"""Test that the parallel code hierarchy matches a serial build."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from blarify.code_references.types import Point, Range, Reference
+
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import Node, NodeLabels
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_creator import ProjectGraphCreator
+
+CODE_EXAMPLES = str(Path(__file__).resolve().parents[2] / "code_examples")
+REFERENCING_FILE = f"file://{CODE_EXAMPLES}/python/class_with_inheritance.py"
+
+
+def _references_from_one_file(nodes: List[Node]) -> Dict[Node, List[Reference]]:
+    # Every Python definition is referenced by the self.process(item) call of TextProcessor.batch_process
+    call = Range(Point(37, 21), Point(37, 28))
+    return {node: [Reference(range=call, uri=REFERENCING_FILE)] if node.extension == ".py" else [] for node in nodes}
+
+
+def _create_graph_creator(hierarchy_workers: int) -> ProjectGraphCreator:
+    return ProjectGraphCreator(
+        root_path=CODE_EXAMPLES,
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=CODE_EXAMPLES, names_to_skip=["__pycache__"]),
+        graph_environment=GraphEnvironment("test", "0", CODE_EXAMPLES),
+        hierarchy_workers=hierarchy_workers,
+    )
+
+
+def _build_hierarchy(hierarchy_workers: int) -> Graph:
+    return _create_graph_creator(hierarchy_workers).build_hierarchy_only()
+
+
+def _sorted_nodes(graph: Graph) -> List[Dict[str, Any]]:
+    return sorted(graph.get_nodes_as_objects(), key=lambda node: node["attributes"]["node_id"])
+
+
+def _sorted_relationships(graph: Graph) -> List[str]:
+    return sorted(str(relationship) for relationship in graph.get_relationships_as_objects())
+
+
+def test_parallel_hierarchy_matches_serial_build():
+    """Test parallel parsing produces the same nodes and relationships as serial parsing."""
+    serial_graph = _build_hierarchy(hierarchy_workers=1)
+    parallel_graph = _build_hierarchy(hierarchy_workers=2)
+
+    assert _sorted_nodes(parallel_graph) == _sorted_nodes(serial_graph)
+    assert _sorted_relationships(parallel_graph) == _sorted_relationships(serial_graph)
+
+
+def test_parallel_hierarchy_binds_tree_sitter_nodes():
+    """Test nodes rebuilt from worker results can still resolve relationship scopes."""
+    creator = _create_graph_creator(hierarchy_workers=2)
+    graph = creator.build_hierarchy_only()
+    creator._bind_pending_tree_sitter_nodes()
+
+    for label in (NodeLabels.CLASS.value, NodeLabels.FUNCTION.value):
+        for node in graph.get_nodes_by_label(label):
+            assert node.has_tree_sitter_node()
+            assert node._tree_sitter_node.start_point == (
+                node.node_range.range.start.line,
+                node.node_range.range.start.character,
+            )
+
+
+def test_parallel_build_only_reparses_referencing_files():
+    """Test a full parallel build creates the serial relationships while re-parsing only the files references are in."""
+    creators = [_create_graph_creator(hierarchy_workers) for hierarchy_workers in (1, 2)]
+    for creator in creators:
+        creator.reference_query_helper.get_paths_where_nodes_are_referenced_batch.side_effect = (
+            _references_from_one_file
+        )
+    serial_graph, parallel_graph = [creator.build() for creator in creators]
+
+    pending_paths = set(creators[1]._file_nodes_pending_tree_sitter)
+    file_paths = {file_node.path for file_node in parallel_graph.get_nodes_by_label(NodeLabels.FILE.value)}
+    assert REFERENCING_FILE in file_paths and REFERENCING_FILE not in pending_paths
+    assert pending_paths
+    assert len(parallel_graph.get_relationships_as_objects()) > len(_build_hierarchy(1).get_relationships_as_objects())
+    assert _sorted_relationships(parallel_graph) == _sorted_relationships(serial_graph)
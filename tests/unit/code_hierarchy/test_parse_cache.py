@@ -0,0 +1,125 @@
+"""Tests for the on-disk parse cache."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+from blarify.code_hierarchy.parse_cache import ParseCache
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import NodeLabels
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_creator import ProjectGraphCreator
+from blarify.utils.sqlite_lru_cache import SqliteLruCache
+
+CODE_EXAMPLES = str(Path(__file__).resolve().parents[2] / "code_examples")
+
+
+def _create_graph_creator(parse_cache: Optional[ParseCache], hierarchy_workers: int = 1) -> ProjectGraphCreator:
+    return ProjectGraphCreator(
+        root_path=CODE_EXAMPLES,
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=CODE_EXAMPLES, names_to_skip=["__pycache__"]),
+        graph_environment=GraphEnvironment("test", "0", CODE_EXAMPLES),
+        hierarchy_workers=hierarchy_workers,
+        parse_cache=parse_cache,
+    )
+
+
+def _sorted_nodes(graph: Graph) -> List[Dict[str, Any]]:
+    return sorted(graph.get_nodes_as_objects(), key=lambda node: node["attributes"]["node_id"])
+
+
+def test_cached_build_matches_fresh_build(tmp_path: Path):
+    """Test a build served from the parse cache exports the same nodes as a fresh build."""
+    fresh_graph = _create_graph_creator(parse_cache=None).build_hierarchy_only()
+
+    parse_cache = ParseCache(cache_dir=str(tmp_path))
+    _create_graph_creator(parse_cache).build_hierarchy_only()
+    assert parse_cache.hits == 0
+    files_parsed = parse_cache.misses
+
+    cached_creator = _create_graph_creator(parse_cache)
+    cached_graph = cached_creator.build_hierarchy_only()
+    assert parse_cache.hits == files_parsed
+    assert parse_cache.misses == files_parsed
+
+    assert _sorted_nodes(cached_graph) == _sorted_nodes(fresh_graph)
+
+    cached_creator._bind_pending_tree_sitter_nodes()
+    for node in cached_graph.get_nodes_by_label(NodeLabels.FUNCTION.value):
+        assert node.has_tree_sitter_node()
+
+    parse_cache.close()
+
+
+def test_only_the_requested_cached_files_are_bound(tmp_path: Path):
+    """Test binding some files by path leaves the other cache hits unparsed until they are requested."""
+    parse_cache = ParseCache(cache_dir=str(tmp_path))
+    _create_graph_creator(parse_cache).build_hierarchy_only()
+    cached_creator = _create_graph_creator(parse_cache)
+    cached_graph = cached_creator.build_hierarchy_only()
+    bound_file, *other_files = cached_graph.get_nodes_by_label(NodeLabels.FILE.value)
+
+    cached_creator._bind_pending_tree_sitter_nodes([bound_file.path, "file:///not/in/the/graph.py"])
+
+    assert not bound_file.has_pending_tree_sitter_nodes
+    assert all(file_node.has_pending_tree_sitter_nodes for file_node in other_files)
+    assert set(cached_creator._file_nodes_pending_tree_sitter) == {file_node.path for file_node in other_files}
+    parse_cache.close()
+
+
+def test_parallel_build_reuses_cached_files(tmp_path: Path):
+    """Test files found in the cache are not dispatched to the parsing workers."""
+    parse_cache = ParseCache(cache_dir=str(tmp_path))
+    serial_graph = _create_graph_creator(parse_cache).build_hierarchy_only()
+
+    parallel_graph = _create_graph_creator(parse_cache, hierarchy_workers=2).build_hierarchy_only()
+
+    assert parse_cache.hits == parse_cache.misses
+    assert _sorted_nodes(parallel_graph) == _sorted_nodes(serial_graph)
+    parse_cache.close()
+
+
+def test_cache_key_depends_on_content_and_file_node_id(tmp_path: Path):
+    """Test the same content in a different file or environment gets its own entry."""
+    parse_cache = ParseCache(cache_dir=str(tmp_path))
+
+    key = parse_cache.get_key(content=b"def a(): pass", language="PythonDefinitions", file_node_id="/env/a.py")
+
+    assert key == parse_cache.get_key(b"def a(): pass", "PythonDefinitions", "/env/a.py")
+    assert key != parse_cache.get_key(b"def b(): pass", "PythonDefinitions", "/env/a.py")
+    assert key != parse_cache.get_key(b"def a(): pass", "PythonDefinitions", "/other_env/a.py")
+    parse_cache.close()
+
+
+def test_lru_cache_evicts_least_recently_used_entries(tmp_path: Path):
+    """Test entries read recently survive eviction once the cache is over its size bound."""
+    cache = SqliteLruCache(path=str(tmp_path / "cache.sqlite"), max_size_bytes=30)
+
+    cache.set("a", b"a" * 10)
+    cache.set("b", b"b" * 10)
+    cache.set("c", b"c" * 10)
+    assert cache.get("a") == b"a" * 10
+
+    cache.set("d", b"d" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.evictions == 1
+    assert cache.total_size == 30
+    cache.close()
+
+
+def test_lru_cache_persists_between_instances(tmp_path: Path):
+    """Test entries written by one instance are visible to the next one."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = SqliteLruCache(path=path, max_size_bytes=1024)
+    cache.set("key", b"value")
+    cache.close()
+
+    reopened = SqliteLruCache(path=path, max_size_bytes=1024)
+    assert reopened.get("key") == b"value"
+    assert reopened.total_size == 5
+    assert reopened.hit_rate == 1.0
+    reopened.close()
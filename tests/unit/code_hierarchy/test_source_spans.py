@@ -0,0 +1,69 @@
+"""Test the code text of definitions is kept as spans of the source of their file until it is read."""
+
+from pathlib import Path
+
+from blarify.code_hierarchy import TreeSitterHelper
+from blarify.code_hierarchy.languages import PythonDefinitions
+from blarify.project_file_explorer import File
+
+SOURCE = """class Greeter:
+    def greet(self, name):
+        return f"hé {name}"
+
+    def leave(self):
+        return "bye"
+
+
+def main():
+    Greeter().greet("you")
+"""
+
+
+def _create_nodes(root: Path, content: bytes):
+    (root / "greeter.py").write_bytes(content)
+    helper = TreeSitterHelper(PythonDefinitions)
+    return helper, helper.create_nodes_and_relationships_in_file(File(name="greeter.py", root_path=str(root), level=1))
+
+
+def test_definitions_share_the_parsed_source_until_read(tmp_path: Path):
+    """Test every definition keeps a span of the one source buffer and decodes it only once it is read."""
+    helper, nodes = _create_nodes(tmp_path, SOURCE.encode("utf-8"))
+
+    assert all(node._code_span.source is helper.base_node_source for node in nodes)
+    assert nodes[0].code_text == SOURCE
+    assert nodes[2].code_text == 'def greet(self, name):\n        return f"hé {name}"'
+    assert nodes[2]._code_span is None
+
+
+def test_files_are_read_like_text(tmp_path: Path):
+    """Test Windows line breaks are translated and files that aren't UTF-8 are left empty."""
+    _, crlf_nodes = _create_nodes(tmp_path, SOURCE.replace("\n", "\r\n").encode("utf-8"))
+    assert [node.code_text for node in crlf_nodes][:2] == [SOURCE, SOURCE.split("\n\n\n")[0]]
+
+    _, latin_nodes = _create_nodes(tmp_path, SOURCE.encode("latin-1"))
+    assert [node.code_text for node in latin_nodes] == [""]
+
+
+def test_skeletonize_replaces_the_bodies_of_definitions(tmp_path: Path):
+    """Test the bodies of the definitions of a node are replaced by a reference to them, a level at a time."""
+    _, nodes = _create_nodes(tmp_path, SOURCE.encode("utf-8"))
+    file_node, class_node, greet, leave, main = nodes
+
+    file_node.skeletonize()
+
+    assert file_node.code_text == (
+        "class Greeter:\n"
+        f"  # Code replaced for brevity, see node: {class_node.hashed_id}\n"
+        "\n\n"
+        "def main():\n"
+        f"   # Code replaced for brevity, see node: {main.hashed_id}\n"
+    )
+    assert class_node.code_text == (
+        "class Greeter:\n"
+        "    def greet(self, name):\n"
+        f"      # Code replaced for brevity, see node: {greet.hashed_id}\n"
+        "\n"
+        "    def leave(self):\n"
+        f"       # Code replaced for brevity, see node: {leave.hashed_id}\n"
+    )
+    assert leave.code_text == 'def leave(self):\n        return "bye"'
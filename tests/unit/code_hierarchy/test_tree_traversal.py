@@ -0,0 +1,64 @@
+"""Test the tree-sitter traversals of TreeSitterHelper on trees deeper than the recursion limit."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from blarify.code_hierarchy import TreeSitterHelper
+from blarify.code_hierarchy.languages import PythonDefinitions
+from blarify.graph.node import NodeLabels
+from blarify.project_file_explorer import File
+
+NESTING_DEPTH = sys.getrecursionlimit() * 2
+
+DEEP_SOURCE = f"""
+class Outer:
+    def build(self, value):
+        return {"[" * NESTING_DEPTH}value{"]" * NESTING_DEPTH}
+
+
+def after(other):
+    return other
+"""
+
+
+def _create_deep_file(root: Path) -> File:
+    (root / "deep.py").write_text(DEEP_SOURCE)
+    return File(name="deep.py", root_path=str(root), level=1)
+
+
+def test_definitions_of_deep_trees_keep_their_parents(tmp_path: Path):
+    """Test a definition after a deeply nested one is still defined by the file, not the nested one."""
+    helper = TreeSitterHelper(PythonDefinitions)
+    nodes = helper.create_nodes_and_relationships_in_file(_create_deep_file(tmp_path))
+
+    names = {node.name: node for node in nodes}
+    assert [node.label for node in nodes] == [NodeLabels.FILE, NodeLabels.CLASS, NodeLabels.FUNCTION, NodeLabels.FUNCTION]
+    assert names["build"].parent is names["Outer"]
+    assert names["after"].parent is nodes[0]
+
+
+def test_identifiers_of_deep_trees_are_found_in_source_order(tmp_path: Path):
+    """Test the identifier query and the cursor walk find the same identifiers, in source order."""
+    helper = TreeSitterHelper(PythonDefinitions)
+    file_node = helper.create_nodes_and_relationships_in_file(_create_deep_file(tmp_path))[0]
+
+    identifiers = helper.get_all_identifiers_with_names(file_node)
+    walked = helper._traverse_and_find_identifiers(file_node._tree_sitter_node)
+
+    assert [name for name, _ in identifiers] == ["Outer", "build", "self", "value", "value", "after", "other", "other"]
+    assert [reference.range.start.line for _, reference in identifiers] == [
+        identifier.start_point[0] for identifier in walked
+    ]
+
+
+def test_grammars_without_identifier_nodes_fall_back_to_the_walk(tmp_path: Path):
+    """Test an identifier query the grammar can't compile is dropped for the cursor walk, once per extension."""
+    helper = TreeSitterHelper(PythonDefinitions)
+    file_node = helper.create_nodes_and_relationships_in_file(_create_deep_file(tmp_path))[0]
+
+    with patch("blarify.code_hierarchy.tree_sitter_helper.IDENTIFIER_QUERY", "(not_a_node_type) @identifier"):
+        identifiers = helper.get_all_identifiers_with_names(file_node)
+
+    assert helper._identifier_queries[".py"] is None
+    assert [name for name, _ in identifiers][:3] == ["Outer", "build", "self"]
@@ -0,0 +1,117 @@
+"""Tests for the work-stealing LSP reference scheduler."""
+
+import concurrent.futures
+import threading
+import time
+from typing import Dict, List
+
+from blarify.code_references.lsp_helper import ProgressTracker
+from blarify.code_references.lsp_reference_scheduler import LspReferenceScheduler
+
+
+class FakeServer:
+    """Answers requests on a thread pool after a fixed delay, tracking how many run at once."""
+
+    def __init__(self, name: str, delay: float, stalled: bool = False, failing: bool = False):
+        self.name = name
+        self.delay = delay
+        self.stalled = stalled
+        self.failing = failing
+        self.handled: List[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=32)
+
+    def request(self, node: int) -> "concurrent.futures.Future[List[Dict[str, int]]]":
+        if self.stalled:
+            return concurrent.futures.Future()
+        return self._executor.submit(self._answer, node)
+
+    def _answer(self, node: int) -> List[Dict[str, int]]:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if self.failing:
+            raise ConnectionResetError("server went away")
+        self.handled.append(node)
+        return [{"node": node}]
+
+
+def _send(server: FakeServer, node: int) -> "concurrent.futures.Future[List[Dict[str, int]]]":
+    return server.request(node)
+
+
+def test_fast_servers_take_more_work_within_in_flight_bound():
+    """Test idle instances pull work from the shared queue without exceeding their in-flight bound."""
+    fast, slow = FakeServer("fast", delay=0.001), FakeServer("slow", delay=0.05)
+    scheduler = LspReferenceScheduler([fast, slow], _send, max_in_flight=2)
+
+    results = scheduler.run(list(range(100)))
+
+    assert results == {node: [{"node": node}] for node in range(100)}
+    assert len(fast.handled) > len(slow.handled)
+    assert fast.max_in_flight <= 2 and slow.max_in_flight <= 2
+    assert [stats.completed for stats in scheduler.stats] == [len(fast.handled), len(slow.handled)]
+
+
+def test_timed_out_and_failed_requests_are_retried_on_another_instance():
+    """Test requests stuck or failing on one instance are answered by another one."""
+    stalled, failing, healthy = (
+        FakeServer("stalled", delay=0, stalled=True),
+        FakeServer("failing", delay=0, failing=True),
+        FakeServer("healthy", delay=0.001),
+    )
+    progress = ProgressTracker(30)
+    scheduler = LspReferenceScheduler(
+        [stalled, failing, healthy], _send, max_in_flight=2, request_timeout=0.05, max_attempts=3, progress=progress
+    )
+
+    results = scheduler.run(list(range(30)))
+
+    assert results == {node: [{"node": node}] for node in range(30)}
+    assert sorted(healthy.handled) == list(range(30))
+    stats = progress.get_server_stats()
+    assert stats["server-1"].timed_out > 0
+    assert stats["server-2"].failed > 0
+    assert stats["server-3"].completed == 30
+    assert progress.completed_nodes == 30
+
+
+def test_requests_failing_everywhere_map_to_none():
+    """Test a request that fails on every attempt is given up instead of retried forever."""
+    scheduler = LspReferenceScheduler(
+        [FakeServer("a", delay=0, failing=True), FakeServer("b", delay=0, failing=True)], _send, max_attempts=2
+    )
+
+    assert scheduler.run([1, 2, 3]) == {1: None, 2: None, 3: None}
+
+
+def test_single_server_retries_once_it_is_backed_by_a_new_instance():
+    """Test a request failing on the only server is retried there after the server was swapped."""
+
+    class SwappedServer(FakeServer):
+        generation = 0
+
+        def request(self, node: int) -> "concurrent.futures.Future[List[Dict[str, int]]]":
+            if not self.failing:
+                return super().request(node)
+            # The pool replaces the instance after its failed request
+            self.failing = False
+            self.generation += 1
+            future: "concurrent.futures.Future[List[Dict[str, int]]]" = concurrent.futures.Future()
+            future.set_exception(ConnectionResetError("server went away"))
+            return future
+
+    server = SwappedServer("only", delay=0, failing=True)
+    scheduler = LspReferenceScheduler(
+        [server], _send, max_in_flight=1, max_attempts=2, server_generation=lambda server: server.generation
+    )
+    without_generations = LspReferenceScheduler([FakeServer("only", delay=0, failing=True)], _send, max_attempts=2)
+
+    assert scheduler.run([1, 2]) == {1: [{"node": 1}], 2: [{"node": 2}]}
+    assert scheduler.stats[0].failed == 1
+    assert without_generations.run([1]) == {1: None}
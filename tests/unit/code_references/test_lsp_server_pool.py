@@ -0,0 +1,216 @@
+"""Tests for the warm-spare LSP server pool."""
+
+import concurrent.futures
+import itertools
+import threading
+import time
+from typing import List
+from unittest.mock import patch
+
+from blarify.code_references.lsp_helper import LspQueryHelper, LspResourceOptimizer
+from blarify.code_references.lsp_server_pool import LspServerPool
+
+
+class FakeServer:
+    def __init__(self, number: int):
+        self.number = number
+        self.alive = True
+        self.stopped = False
+
+
+class FakeServerFactory:
+    """Starts numbered fake servers, optionally with a cold-start delay."""
+
+    def __init__(self, start_delay: float = 0.0):
+        self.start_delay = start_delay
+        self.started: List[FakeServer] = []
+        self._numbers = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self):
+        time.sleep(self.start_delay)
+        with self._lock:
+            server = FakeServer(next(self._numbers))
+            self.started.append(server)
+        return server, None
+
+    @staticmethod
+    def stop(server: FakeServer, context) -> None:
+        server.stopped = True
+
+
+def _make_pool(factory: FakeServerFactory, **kwargs) -> LspServerPool[FakeServer]:
+    options = dict(size=2, spares=1, health_check_interval=None)
+    options.update(kwargs)
+    return LspServerPool(
+        name="python",
+        start_server=factory.start,
+        stop_server=factory.stop,
+        is_alive=lambda server: server.alive,
+        **options,
+    )
+
+
+def _wait_for_spares(pool: LspServerPool, count: int, timeout: float = 2.0) -> None:
+    deadline = time.time() + timeout
+    while pool.stats.warm_spares < count and time.time() < deadline:
+        time.sleep(0.01)
+    assert pool.stats.warm_spares == count
+
+
+def test_failed_request_swaps_in_warm_spare_without_cold_start():
+    """Test a server failing a request is replaced by the spare and a new spare is warmed."""
+    factory = FakeServerFactory()
+    pool = _make_pool(factory)
+    slots = pool.slots()
+    _wait_for_spares(pool, 1)
+    failing = slots[0].server
+
+    instance = pool.checkout(slots[0])
+    pool.checkin(slots[0], instance, failed=True)
+
+    assert slots[0].server is not failing
+    assert _eventually(lambda: failing.stopped)
+    assert pool.stats.replaced == 1 and pool.stats.spares_used == 1 and pool.stats.cold_starts == 0
+    _wait_for_spares(pool, 1)
+    pool.shutdown()
+
+
+def test_servers_are_recycled_after_max_requests_once_drained():
+    """Test a server is swapped out after its request budget and stopped after its in-flight requests."""
+    factory = FakeServerFactory()
+    pool = _make_pool(factory, size=1, max_requests_per_server=3)
+    slot = pool.slots()[0]
+    _wait_for_spares(pool, 1)
+    original = slot.server
+
+    instances = [pool.checkout(slot) for _ in range(3)]
+
+    assert slot.server is not original
+    assert all(instance.server is original for instance in instances)
+    assert not original.stopped
+
+    for instance in instances:
+        pool.checkin(slot, instance)
+
+    assert _eventually(lambda: original.stopped)
+    assert pool.stats.recycled == 1
+    pool.shutdown()
+
+
+def test_health_check_replaces_dead_servers_and_spares():
+    """Test servers and spares failing the liveness ping are discarded and replaced."""
+    factory = FakeServerFactory()
+    pool = _make_pool(factory)
+    slots = pool.slots()
+    _wait_for_spares(pool, 1)
+    dead_server = slots[1].server
+    dead_server.alive = False
+
+    pool.check_health()
+
+    assert slots[1].server is not dead_server and slots[1].server.alive
+    assert pool.stats.failed_health_checks == 1
+    _wait_for_spares(pool, 1)
+    pool.shutdown()
+    assert all(server.stopped for server in factory.started)
+
+
+def test_slots_start_missing_servers_concurrently():
+    """Test the pool pays a single cold start for all its instances."""
+    factory = FakeServerFactory(start_delay=0.2)
+    pool = _make_pool(factory, size=4, spares=0)
+
+    start = time.time()
+    slots = pool.slots()
+
+    assert len(slots) == 4
+    assert time.time() - start < 0.6
+    assert pool.slots(2) == slots[:2]
+    pool.shutdown()
+
+
+def test_cold_replacement_only_blocks_the_replaced_slot():
+    """Test a failed request without warm spares cold-starts the replacement off the other slots' path."""
+    factory = FakeServerFactory()
+    pool = _make_pool(factory, spares=0)
+    slots = pool.slots()
+    failing = slots[0].server
+    factory.start_delay = 0.5
+
+    instance = pool.checkout(slots[0])
+    start = time.time()
+    pool.checkin(slots[0], instance, failed=True)
+    healthy = pool.checkout(slots[1])
+    assert time.time() - start < 0.2
+    pool.checkin(slots[1], healthy)
+
+    assert slots[0].replacing
+    replacement = pool.checkout(slots[0])
+    assert replacement.server is not failing and slots[0].server is replacement.server
+    assert _eventually(lambda: failing.stopped)
+    assert pool.stats.cold_starts == 1 and pool.stats.replaced == 1
+    pool.checkin(slots[0], replacement)
+    pool.shutdown()
+
+
+def test_consecutive_timeouts_replace_a_wedged_server():
+    """Test a server timing out requests in a row is replaced while a single timeout is tolerated."""
+    factory = FakeServerFactory()
+    pool = _make_pool(factory, size=1, max_consecutive_timeouts=2)
+    slot = pool.slots()[0]
+    _wait_for_spares(pool, 1)
+    wedged = slot.server
+
+    for timed_out in (True, False, True):
+        pool.checkin(slot, pool.checkout(slot), timed_out=timed_out)
+    assert slot.server is wedged
+
+    pool.checkin(slot, pool.checkout(slot), timed_out=True)
+
+    assert slot.server is not wedged and slot.generation == 1
+    assert pool.stats.timeouts == 3 and pool.stats.replaced == 1
+    pool.shutdown()
+
+
+def test_cancelled_pooled_requests_are_reported_as_timeouts():
+    """Test cancelling a pooled request, as the scheduler does on timeouts, cancels it and replaces the server."""
+    factory = FakeServerFactory()
+    pool = _make_pool(factory, size=1, max_consecutive_timeouts=1)
+    slot = pool.slots()[0]
+    _wait_for_spares(pool, 1)
+    wedged = slot.server
+    helper = LspQueryHelper(root_uri="file:///repo", max_lsp_instances=1, auto_optimize=False)
+    request: "concurrent.futures.Future[list]" = concurrent.futures.Future()
+
+    future = helper._send_pooled_request(pool, slot, lambda server: request)
+    future.cancel()
+
+    assert request.cancelled()
+    assert slot.server is not wedged
+    assert pool.stats.timeouts == 1 and slot.instance.in_flight == 0
+    pool.shutdown()
+
+
+def _eventually(condition, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_warm_spares_only_come_out_of_the_optimizer_headroom():
+    """Test spares are sized from the optimal instance count, with none when it leaves no headroom."""
+    system_info = dict(cpu_cores=8, memory_gb=16.0, available_memory_gb=8.0)
+    with patch.object(LspResourceOptimizer, "get_system_info", return_value=system_info):
+        helper = LspQueryHelper(root_uri="file:///repo", max_lsp_instances=4)
+
+    with patch.object(LspResourceOptimizer, "get_optimal_lsp_instances", side_effect=[1, 5, 12]):
+        assert [helper._get_warm_spare_count("python") for _ in range(3)] == [0, 1, 2]
+
+    fixed_helper = LspQueryHelper(root_uri="file:///repo", auto_optimize=False)
+    assert fixed_helper._get_warm_spare_count("python") == 0
+    opted_in_helper = LspQueryHelper(root_uri="file:///repo", auto_optimize=False, warm_spares=3)
+    assert opted_in_helper._get_warm_spare_count("python") == 3
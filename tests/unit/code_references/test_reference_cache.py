@@ -0,0 +1,101 @@
+"""Tests for the on-disk reference cache."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from blarify.code_references.reference_cache import ReferenceCache
+from blarify.code_references.types.Reference import Reference
+
+
+@dataclass(frozen=True)
+class FakeDefinition:
+    id: str
+    name: str
+    path: str
+
+
+def _write_project(root: Path) -> Dict[str, FakeDefinition]:
+    (root / "lib.py").write_text("def foo():\n    pass\n\n\ndef bar():\n    pass\n")
+    (root / "main.py").write_text("from lib import foo\n\nfoo()\n")
+    (root / "other.py").write_text("from lib import bar\n\nbar()\n")
+    return {
+        name: FakeDefinition(id=f"lib.{name}", name=name, path=f"file://{root / 'lib.py'}") for name in ("foo", "bar")
+    }
+
+
+def _references(root: Path) -> Dict[str, List[Reference]]:
+    return {
+        "foo": [Reference.from_range_tuple((2, 0, 2, 3), str(root / "main.py"))],
+        "bar": [Reference.from_range_tuple((2, 0, 2, 3), str(root / "other.py"))],
+    }
+
+
+def _build(cache_dir: Path, root: Path, definitions: Dict[str, FakeDefinition]) -> ReferenceCache:
+    """Runs one build against a fresh cache instance, resolving the misses with the fixed references."""
+    cache = ReferenceCache(cache_dir=str(cache_dir), root_path=str(root))
+    cache.refresh()
+    hits = cache.get_many("lsp", list(definitions.values()))
+    references = _references(root)
+    cache.set_many(
+        "lsp",
+        {node: references[name] for name, node in definitions.items() if node not in hits},
+        resolve_seconds=2.0,
+    )
+    return cache
+
+
+def test_unchanged_project_is_served_from_cache(tmp_path: Path):
+    """Test a second build over unchanged sources hits for every definition with the same references."""
+    root, cache_dir = tmp_path / "project", tmp_path / "cache"
+    root.mkdir()
+    definitions = _write_project(root)
+
+    first = _build(cache_dir, root, definitions)
+    assert (first.stats.hits, first.stats.misses) == (0, 2)
+    first.close()
+
+    cache = ReferenceCache(cache_dir=str(cache_dir), root_path=str(root))
+    cache.refresh()
+    hits = cache.get_many("lsp", list(definitions.values()))
+
+    assert hits == {definitions[name]: references for name, references in _references(root).items()}
+    assert cache.stats.hit_rate == 1.0
+    assert cache.stats.time_saved == 2.0
+    assert cache.get_many("scip", list(definitions.values())) == {}
+    cache.close()
+
+
+def test_changed_file_only_invalidates_definitions_it_can_reference(tmp_path: Path):
+    """Test a file change drops the definitions it names or references, and keeps the others."""
+    root, cache_dir = tmp_path / "project", tmp_path / "cache"
+    root.mkdir()
+    definitions = _write_project(root)
+    _build(cache_dir, root, definitions).close()
+    (root / "unrelated.py").write_text("x = 1\n")
+    _build(cache_dir, root, definitions).close()
+
+    (root / "main.py").write_text("from lib import foo\n\nfoo()\nfoo()\n")
+    cache = ReferenceCache(cache_dir=str(cache_dir), root_path=str(root))
+    cache.refresh()
+
+    assert set(cache.get_many("lsp", list(definitions.values()))) == {definitions["bar"]}
+    assert cache.stats.invalidated == 1
+    cache.close()
+
+
+def test_deleted_referencing_file_invalidates_its_definitions(tmp_path: Path):
+    """Test removing a file drops the definitions it used to reference."""
+    root, cache_dir = tmp_path / "project", tmp_path / "cache"
+    root.mkdir()
+    definitions = _write_project(root)
+    for index in range(8):
+        (root / f"module_{index}.py").write_text(f"value_{index} = {index}\n")
+    _build(cache_dir, root, definitions).close()
+
+    (root / "other.py").unlink()
+    cache = ReferenceCache(cache_dir=str(cache_dir), root_path=str(root))
+    cache.refresh(changed_files=[f"file://{root / 'other.py'}"])
+
+    assert set(cache.get_many("lsp", list(definitions.values()))) == {definitions["foo"]}
+    cache.close()
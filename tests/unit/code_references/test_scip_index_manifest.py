@@ -0,0 +1,103 @@
+"""Tests for content-hash driven SCIP re-indexing."""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from blarify.code_references.scip_helper import ScipReferenceResolver
+from blarify.code_references.scip_index_manifest import ScipIndexManifest
+
+
+def _touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+
+class _RecordingResolver(ScipReferenceResolver):
+    """Writes an empty index instead of running the indexer, recording what was generated."""
+
+    def __init__(self, root_path: str, language: str):
+        super().__init__(root_path, language=language)
+        self.generated: List[str] = []
+
+    def _generate_index(
+        self,
+        project_name: str,
+        tsconfig_path: Optional[str] = None,
+        package_root: Optional[str] = None,
+        output_path: Optional[str] = None,
+    ) -> bool:
+        index_path = output_path or self.scip_index_path
+        Path(index_path).write_bytes(b"")
+        self.generated.append(os.path.relpath(os.path.dirname(index_path), self.root_path))
+        return True
+
+
+def test_manifest_reports_content_changes_only(tmp_path: Path):
+    """Test touched files aren't reported while added, modified and removed files are."""
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "skipped.py").write_text("")
+    index_path = str(tmp_path / "index.scip")
+
+    manifest = ScipIndexManifest(index_path, str(tmp_path), [".py"])
+    assert not manifest.exists
+    assert manifest.refresh() == ["a.py", "b.py"]
+    manifest.save()
+
+    _touch(tmp_path / "a.py")
+    (tmp_path / "b.py").write_text("b = 2\n")
+    (tmp_path / "c.py").write_text("c = 1\n")
+    manifest = ScipIndexManifest(index_path, str(tmp_path), [".py"])
+    assert manifest.exists
+    assert manifest.refresh() == ["b.py", "c.py"]
+    manifest.save()
+
+    (tmp_path / "c.py").unlink()
+    manifest = ScipIndexManifest(index_path, str(tmp_path), [".py"])
+    assert manifest.refresh([str(tmp_path / "c.py"), str(tmp_path / "README.md")]) == ["c.py"]
+
+
+def test_index_regenerated_only_when_sources_change(tmp_path: Path):
+    """Test the single index is regenerated on content changes but not on touches or unrelated hints."""
+    (tmp_path / "app.py").write_text("x = 1\n")
+    (tmp_path / "other.py").write_text("y = 1\n")
+    resolver = _RecordingResolver(str(tmp_path), language="python")
+
+    assert resolver.generate_index_if_needed()
+    assert resolver.generated == ["."]
+
+    _touch(tmp_path / "app.py")
+    assert resolver.generate_index_if_needed()
+    assert resolver.generated == ["."]
+
+    (tmp_path / "other.py").write_text("y = 2\n")
+    assert resolver.generate_index_if_needed(changed_files=[f"file://{tmp_path / 'app.py'}"])
+    assert resolver.generated == ["."]
+
+    assert resolver.generate_index_if_needed(changed_files=[f"file://{tmp_path / 'other.py'}"])
+    assert resolver.generated == [".", "."]
+
+
+def test_monorepo_reindexes_only_changed_packages(tmp_path: Path):
+    """Test only the packages holding changed files are reindexed."""
+    for name in ("api", "web"):
+        package = tmp_path / "packages" / name
+        package.mkdir(parents=True)
+        (package / "tsconfig.json").write_text(json.dumps({}))
+        (package / "index.ts").write_text(f"export const {name} = 1;\n")
+
+    resolver = _RecordingResolver(str(tmp_path), language="typescript")
+    assert resolver.generate_index_if_needed()
+    assert sorted(resolver.generated) == ["packages/api", "packages/web"]
+
+    resolver.generated.clear()
+    (tmp_path / "packages" / "web" / "index.ts").write_text("export const web = 2;\n")
+    assert resolver.generate_index_if_needed()
+    assert resolver.generated == ["packages/web"]
+
+    resolver.generated.clear()
+    assert resolver.generate_index_if_needed()
+    assert resolver.generated == []
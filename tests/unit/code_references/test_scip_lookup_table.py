@@ -0,0 +1,184 @@
+"""Tests for the compiled SCIP lookup tables."""
+
+import os
+from pathlib import Path
+from typing import List, Tuple
+from unittest.mock import MagicMock
+
+from blarify import scip_pb2
+from blarify.code_references.types import Point, Range, Reference
+from blarify.code_references.scip_helper import ScipReferenceResolver
+from blarify.code_references.scip_lookup_table import LOOKUP_TABLE_SUFFIX, NO_POSITION, ScipLookupTable
+
+DEFINITION = scip_pb2.SymbolRole.Definition
+READ = scip_pb2.SymbolRole.ReadAccess
+
+HELPER = "scip-python python app 0.1 `app.utils`/helper()."
+SERVICE = "scip-python python app 0.1 `app.service`/Service#"
+
+
+def _add_document(index: scip_pb2.Index, path: str, occurrences: List[Tuple[str, int, List[int]]]) -> None:
+    document = index.documents.add()
+    document.relative_path = path
+    for symbol, roles, occurrence_range in occurrences:
+        occurrence = document.occurrences.add()
+        occurrence.symbol = symbol
+        occurrence.symbol_roles = roles
+        occurrence.range.extend(occurrence_range)
+
+
+def _write_index(root: Path) -> str:
+    index = scip_pb2.Index()
+    _add_document(
+        index,
+        "app/utils.py",
+        [(HELPER, DEFINITION, [0, 4, 10]), (SERVICE, READ, [5, 0, 7])],
+    )
+    _add_document(
+        index,
+        "app/service.py",
+        [
+            (SERVICE, DEFINITION, [2, 6, 13]),
+            (HELPER, READ, [4, 8, 14]),
+            (HELPER, READ, [7, 8, 9, 2]),
+            (HELPER, READ, [9]),
+        ],
+    )
+    index_path = root / "index.scip"
+    index_path.write_bytes(index.SerializeToString())
+    return str(index_path)
+
+
+def _parse_index(data: bytes) -> scip_pb2.Index:
+    index = scip_pb2.Index()
+    index.ParseFromString(data)
+    return index
+
+
+def _node(root: Path, relative_path: str, line: int, character: int) -> MagicMock:
+    node = MagicMock()
+    node.path = f"file://{root / relative_path}"
+    node.definition_range.start_dict = {"line": line, "character": character}
+    return node
+
+
+def test_table_answers_symbol_and_document_queries(tmp_path: Path):
+    """Test the compiled table keeps occurrences per symbol in index order with normalized ranges."""
+    table = ScipLookupTable.load_or_build(_write_index(tmp_path), _parse_index)
+
+    assert table.symbol_count == 2
+    assert table.occurrence_count == 6
+    assert sorted(table.get_document_paths()) == ["app/service.py", "app/utils.py"]
+
+    helper = table.find_symbol(HELPER)
+    assert helper is not None
+    assert table.get_symbol(helper) == HELPER
+    assert table.find_symbol("missing") is None
+
+    ranges = [table.get_occurrence_range(occurrence) for occurrence in table.get_symbol_occurrences(helper)]
+    assert ranges == [
+        (0, 4, 0, 10),
+        (4, 8, 4, 14),
+        (7, 8, 9, 2),
+        (NO_POSITION, NO_POSITION, NO_POSITION, NO_POSITION),
+    ]
+
+    service_document = table.find_document("app/service.py")
+    assert service_document is not None
+    definitions = list(table.iter_document_definitions(service_document))
+    assert [(position, table.get_symbol(symbol)) for position, symbol in definitions] == [((2, 6), SERVICE)]
+
+
+def test_later_loads_map_the_compiled_file(tmp_path: Path):
+    """Test the compiled table is reused while the index is unchanged and rebuilt once it changes."""
+    index_path = _write_index(tmp_path)
+    ScipLookupTable.load_or_build(index_path, _parse_index)
+    assert os.path.exists(index_path + LOOKUP_TABLE_SUFFIX)
+
+    parse_index = MagicMock(side_effect=_parse_index)
+    table = ScipLookupTable.load_or_build(index_path, parse_index)
+    parse_index.assert_not_called()
+    assert table.occurrence_count == 6
+
+    index = _parse_index(Path(index_path).read_bytes())
+    _add_document(index, "app/extra.py", [(HELPER, READ, [1, 0, 6])])
+    Path(index_path).write_bytes(index.SerializeToString())
+
+    table = ScipLookupTable.load_or_build(index_path, parse_index)
+    parse_index.assert_called_once()
+    assert table.occurrence_count == 7
+
+
+def test_document_paths_are_only_decoded_once_looked_up(tmp_path: Path):
+    """Test loading a table doesn't index its document paths, the first lookup by path does."""
+    table = ScipLookupTable.load_or_build(_write_index(tmp_path), _parse_index)
+    assert table._document_index_by_path is None
+
+    document_index = table.find_document("app/utils.py")
+
+    assert document_index is not None and table.get_document_path(document_index) == "app/utils.py"
+    assert table._document_index_by_path is not None
+    assert len(table._document_index_by_path) == table.document_count
+
+
+def test_path_prefix_is_applied_to_document_paths(tmp_path: Path):
+    """Test monorepo package tables expose document paths relative to the repository root."""
+    table = ScipLookupTable.load_or_build(_write_index(tmp_path), _parse_index, path_prefix="packages/app")
+
+    assert table.find_document("packages/app/app/utils.py") is not None
+    assert table.find_document("app/utils.py") is None
+
+
+def test_resolver_references_from_lookup_table(tmp_path: Path):
+    """Test the resolver finds references through the compiled table, skipping definitions and bad ranges."""
+    index_path = _write_index(tmp_path)
+    resolver = ScipReferenceResolver(str(tmp_path), scip_index_path=index_path, language="python")
+    helper_node = _node(tmp_path, "app/utils.py", 0, 4)
+    service_node = _node(tmp_path, "app/service.py", 2, 6)
+
+    references = resolver.get_references_for_node(helper_node)
+    assert [(ref.uri, ref.range.start.line, ref.range.end.line, ref.range.end.character) for ref in references] == [
+        (f"file://{tmp_path / 'app/service.py'}", 4, 4, 14),
+        (f"file://{tmp_path / 'app/service.py'}", 7, 9, 2),
+    ]
+
+    batch = resolver.get_references_batch_with_progress([helper_node, service_node, _node(tmp_path, "app/utils.py", 3, 0)])
+    assert [len(batch[node]) for node in (helper_node, service_node)] == [2, 1]
+    assert resolver.get_statistics() == {"documents": 2, "symbols": 2, "total_occurrences": 6}
+
+
+def test_definition_symbols_are_built_once_per_document(tmp_path: Path):
+    """Test the position map of a document is cached and keeps the first definition at a position."""
+    index = scip_pb2.Index()
+    _add_document(index, "app/dup.py", [(HELPER, DEFINITION, [1, 0, 5]), (SERVICE, DEFINITION, [1, 0, 5])])
+    table = ScipLookupTable(memoryview(ScipLookupTable.compile(index)))
+
+    definition_symbols = table.get_definition_symbols(0)
+    assert {position: table.get_symbol(symbol) for position, symbol in definition_symbols.items()} == {(1, 0): HELPER}
+    assert table.get_definition_symbols(0) is definition_symbols
+
+
+def test_resolver_finds_definition_files_of_references(tmp_path: Path):
+    """Test references are resolved to the file defining the symbol at their position."""
+    index_path = _write_index(tmp_path)
+    resolver = ScipReferenceResolver(str(tmp_path), scip_index_path=index_path, language="python")
+
+    def reference(relative_path: str, line: int, character: int) -> Reference:
+        uri = f"file://{tmp_path / relative_path}"
+        return Reference(range=Range(Point(line, character), Point(line, character + 1)), uri=uri)
+
+    definition_paths = resolver.get_definition_paths_for_references(
+        [
+            reference("app/service.py", 4, 8),
+            reference("app/utils.py", 5, 0),
+            reference("app/service.py", 3, 0),
+            reference("app/missing.py", 0, 0),
+        ]
+    )
+
+    assert definition_paths == [
+        f"file://{tmp_path / 'app/utils.py'}",
+        f"file://{tmp_path / 'app/service.py'}",
+        None,
+        None,
+    ]
@@ -0,0 +1,72 @@
+"""Tests for loading the SCIP indexes of monorepo packages."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from blarify import scip_pb2
+from blarify.code_references.scip_helper import ScipReferenceResolver
+from blarify.code_references.scip_lookup_table import ScipLookupTable
+from blarify.utils.path_prefix_trie import PathPrefixTrie
+
+PACKAGES = ("api", "api-client", "web")
+
+
+def _write_package(root: Path, name: str) -> None:
+    package = root / "packages" / name
+    (package / "src").mkdir(parents=True)
+    (package / "tsconfig.json").write_text(json.dumps({"compilerOptions": {}}))
+    (package / "src" / "index.ts").write_text("export function run() {}\n")
+
+    symbol = f"scip-typescript npm {name} 1.0 src/`index.ts`/run()."
+    index = scip_pb2.Index()
+    document = index.documents.add()
+    document.relative_path = "src/index.ts"
+    for roles, occurrence_range in ((scip_pb2.SymbolRole.Definition, [0, 16, 19]), (0, [3, 2, 5])):
+        occurrence = document.occurrences.add()
+        occurrence.symbol = symbol
+        occurrence.symbol_roles = roles
+        occurrence.range.extend(occurrence_range)
+    (package / "index.scip").write_bytes(index.SerializeToString())
+
+
+def _node(root: Path, name: str) -> MagicMock:
+    node = MagicMock()
+    node.path = f"file://{root / 'packages' / name / 'src' / 'index.ts'}"
+    node.definition_range.start_dict = {"line": 0, "character": 16}
+    return node
+
+
+@pytest.mark.parametrize("index_load_workers", [1, 2])
+def test_monorepo_packages_are_compiled_and_routed(tmp_path: Path, index_load_workers: int):
+    """Test every package table is compiled, loaded and picked by the longest matching package root."""
+    for name in PACKAGES:
+        _write_package(tmp_path, name)
+
+    resolver = ScipReferenceResolver(str(tmp_path), language="typescript", index_load_workers=index_load_workers)
+    assert resolver.ensure_loaded()
+
+    for name in PACKAGES:
+        assert ScipLookupTable.is_compiled(str(tmp_path / "packages" / name / "index.scip"))
+        references = resolver.get_references_for_node(_node(tmp_path, name))
+        assert [reference.uri for reference in references] == [
+            f"file://{tmp_path / 'packages' / name / 'src' / 'index.ts'}"
+        ]
+
+    assert resolver.get_statistics()["documents"] == len(PACKAGES)
+
+
+def test_path_prefix_trie_matches_whole_components():
+    """Test the trie returns the longest prefix and doesn't match partial path components."""
+    trie: PathPrefixTrie[str] = PathPrefixTrie()
+    trie.insert("/repo/packages/api", "api")
+    trie.insert("/repo/packages/api/nested", "nested")
+    trie.insert("/repo", "root")
+
+    assert len(trie) == 3
+    assert trie.longest_prefix_value("/repo/packages/api/src/index.ts") == "api"
+    assert trie.longest_prefix_value("/repo/packages/api/nested/index.ts") == "nested"
+    assert trie.longest_prefix_value("/repo/packages/api-client/index.ts") == "root"
+    assert trie.longest_prefix_value("/elsewhere/index.ts") is None
@@ -0,0 +1,96 @@
+"""Tests for the dependency-driven scheduling of bottom-up documentation."""
+
+import threading
+import time
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, Mock
+
+from blarify.documentation.utils.bottom_up_batch_processor import BottomUpBatchProcessor
+from blarify.documentation.utils.dependency_graph import DocumentationDependencyGraph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.repositories.graph_db_manager.dtos.node_with_content_dto import NodeWithContentDto
+
+
+def test_parents_become_ready_when_their_last_child_completes():
+    """Test a parent is released only once every child in the graph is completed."""
+    graph = DocumentationDependencyGraph()
+    graph.add_node("file", ["class", "helper", "outside"])
+    graph.add_node("class", ["method"])
+    graph.add_node("method", ["helper"])
+    graph.add_node("helper", [])
+
+    assert graph.start() == ["helper"]
+    assert graph.complete("helper") == ["method"]
+    assert graph.complete("method") == ["class"]
+    assert graph.complete("class") == ["file"]
+    assert graph.complete("file") == []
+    assert graph.remaining == 0
+
+
+def test_completed_nodes_do_not_block_and_cycles_are_released():
+    """Test nodes completed by a previous run are skipped and cycles release their functions first."""
+    graph = DocumentationDependencyGraph()
+    graph.add_node("file", ["a", "b", "done"])
+    graph.add_node("a", ["b"])
+    graph.add_node("b", ["a", "b"])
+    graph.add_node("done", [], completed=True)
+
+    assert graph.start() == []
+    assert graph.remaining == 3
+    assert sorted(graph.release_blocked(prefer=lambda node_id: node_id in {"a", "b"})) == ["a", "b"]
+    assert graph.complete("a") == []
+    assert graph.complete("b") == ["file"]
+
+
+def _row(node_id: str, labels: List[str], hier: List[str] = (), calls: List[str] = ()) -> Dict[str, Any]:
+    return {
+        "id": node_id,
+        "name": node_id,
+        "labels": labels,
+        "path": f"file:///repo/{node_id}",
+        "content": f"content of {node_id}",
+        "hier_child_ids": list(hier),
+        "call_child_ids": list(calls),
+        "completed": False,
+        "description": None,
+    }
+
+
+def test_processor_feeds_ready_nodes_without_waiting_for_slow_siblings():
+    """Test a parent starts as soon as its own children are done while an unrelated slow node runs."""
+    rows = [
+        _row("folder", ["FOLDER"], hier=["fast.py", "slow.py"]),
+        _row("fast.py", ["FILE"], hier=["fast_fn"]),
+        _row("fast_fn", ["FUNCTION"]),
+        _row("slow.py", ["FILE"]),
+    ]
+    db_manager = MagicMock()
+    db_manager.query.side_effect = lambda query, params: rows if "subgraphNodes" in query else []
+
+    order: List[str] = []
+    lock = threading.Lock()
+
+    def describe(system_prompt: str, input_dict: Dict[str, Any], input_prompt: str) -> str:
+        if input_dict["node_name"] == "slow.py":
+            time.sleep(0.2)
+        with lock:
+            order.append(input_dict["node_name"])
+        return f"Description of {input_dict['node_name']}"
+
+    agent_caller = Mock()
+    agent_caller.call_dumb_agent.side_effect = describe
+
+    processor = BottomUpBatchProcessor(
+        db_manager=db_manager,
+        agent_caller=agent_caller,
+        graph_environment=GraphEnvironment("test", "0", "/repo"),
+        max_workers=2,
+    )
+    root = NodeWithContentDto(id="root", name="repo", labels=["FOLDER"], path="file:///repo")
+
+    assert processor._process_node_query_based(root) == 5
+
+    assert order.index("fast_fn") < order.index("fast.py") < order.index("slow.py") < order.index("folder")
+    assert order[-1] == "repo"
+    saved_ids = {doc.source_id for doc in processor.all_documentation_nodes}
+    assert saved_ids == {"root", "folder", "fast.py", "fast_fn", "slow.py"}
@@ -0,0 +1,50 @@
+"""Tests for the on-disk LLM response cache used by documentation generation."""
+
+from pathlib import Path
+from typing import Any, Dict
+from unittest.mock import Mock
+
+from blarify.agents.prompt_templates import LEAF_NODE_ANALYSIS_TEMPLATE, PARENT_NODE_ANALYSIS_TEMPLATE
+from blarify.documentation.utils.bottom_up_batch_processor import BottomUpBatchProcessor
+from blarify.documentation.utils.llm_response_cache import LlmResponseCache
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.repositories.graph_db_manager.dtos.node_with_content_dto import NodeWithContentDto
+
+
+def _prompt(content: str) -> Dict[str, Any]:
+    return {"node_name": "foo", "node_labels": "FUNCTION", "node_path": "file:///repo/foo.py", "node_content": content}
+
+
+def test_keys_ignore_formatting_and_change_with_template_model_and_input(tmp_path: Path):
+    """Test the key survives line ending changes and misses for another template, model or content."""
+    cache = LlmResponseCache(cache_dir=str(tmp_path))
+    key = cache.get_key(LEAF_NODE_ANALYSIS_TEMPLATE, "gpt-4.1-nano", _prompt("def foo():\n    pass\n"))
+
+    assert key == cache.get_key(LEAF_NODE_ANALYSIS_TEMPLATE, "gpt-4.1-nano", _prompt("def foo():  \r\n    pass"))
+    assert key != cache.get_key(PARENT_NODE_ANALYSIS_TEMPLATE, "gpt-4.1-nano", _prompt("def foo():\n    pass\n"))
+    assert key != cache.get_key(LEAF_NODE_ANALYSIS_TEMPLATE, "gemini-2.5-flash", _prompt("def foo():\n    pass\n"))
+    assert key != cache.get_key(LEAF_NODE_ANALYSIS_TEMPLATE, "gpt-4.1-nano", _prompt("def foo():\n    return 1\n"))
+    cache.close()
+
+
+def test_unchanged_nodes_are_described_without_calling_the_llm(tmp_path: Path):
+    """Test a second run over the same node reuses the stored description."""
+    node = NodeWithContentDto(id="foo", name="foo", labels=["FUNCTION"], path="file:///repo/foo.py", content="pass")
+    agent_caller = Mock(dumb_agent="gpt-4.1-nano")
+    agent_caller.call_dumb_agent.return_value = "Does nothing"
+
+    descriptions = []
+    for _ in range(2):
+        cache = LlmResponseCache(cache_dir=str(tmp_path))
+        processor = BottomUpBatchProcessor(
+            db_manager=Mock(),
+            agent_caller=agent_caller,
+            graph_environment=GraphEnvironment("test", "0", "/repo"),
+            response_cache=cache,
+        )
+        descriptions.append(processor._process_leaf_node(node).content)
+        cache.close()
+
+    assert descriptions == ["Does nothing", "Does nothing"]
+    assert agent_caller.call_dumb_agent.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 0)
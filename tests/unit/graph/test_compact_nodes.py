@@ -0,0 +1,77 @@
+"""Tests for the slotted node model and releasing tree-sitter nodes."""
+
+import copy
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from blarify.code_references.types import Point, Range, Reference
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import NodeLabels
+from blarify.graph.relationship import Relationship, RelationshipType
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_creator import ProjectGraphCreator
+
+CODE_EXAMPLES = str(Path(__file__).resolve().parents[2] / "code_examples" / "python")
+
+
+@pytest.fixture
+def creator() -> ProjectGraphCreator:
+    creator = ProjectGraphCreator(
+        root_path=CODE_EXAMPLES,
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=CODE_EXAMPLES, names_to_skip=["__pycache__"]),
+        graph_environment=GraphEnvironment("test", "0", CODE_EXAMPLES),
+    )
+    creator.build_hierarchy_only()
+    return creator
+
+
+def test_nodes_and_references_have_no_instance_dict(creator: ProjectGraphCreator):
+    """Test the hot node, relationship and reference types are slotted."""
+    for label in (NodeLabels.FOLDER, NodeLabels.FILE, NodeLabels.CLASS, NodeLabels.FUNCTION):
+        for node in creator.graph.get_nodes_by_label(label.value):
+            assert not hasattr(node, "__dict__")
+
+    function_node = next(iter(creator.graph.get_nodes_by_label(NodeLabels.FUNCTION.value)))
+    relationship = Relationship(function_node, function_node, RelationshipType.CALLS)
+    assert not hasattr(relationship, "__dict__")
+    assert not hasattr(function_node.node_range, "__dict__")
+
+
+def test_packed_ranges_round_trip(creator: ProjectGraphCreator):
+    """Test ranges set as References are returned unchanged from their packed form."""
+    function_node = next(iter(creator.graph.get_nodes_by_label(NodeLabels.FUNCTION.value)))
+    reference = Reference(range=Range(Point(4, 2), Point(9, 13)), uri="file:///tmp/module.py")
+
+    function_node.node_range = reference
+
+    assert function_node.node_range == reference
+    assert function_node.get_start_and_end_line() == (4, 9)
+    assert function_node.as_object()["attributes"]["start_line"] == 4
+
+
+def test_copy_keeps_slots_and_separates_labels(creator: ProjectGraphCreator):
+    """Test copying a slotted node copies every attribute but not the extra labels list."""
+    class_node = next(iter(creator.graph.get_nodes_by_label(NodeLabels.CLASS.value)))
+
+    copied = copy.copy(class_node)
+    copied.add_extra_label("DIFF")
+
+    assert copied.id == class_node.id
+    assert copied.code_text == class_node.code_text
+    assert "DIFF" not in class_node.extra_labels
+
+
+def test_release_tree_sitter_nodes_keeps_exported_objects(creator: ProjectGraphCreator):
+    """Test nodes export the same objects after their tree-sitter nodes are released."""
+    before = sorted(creator.graph.get_nodes_as_objects(), key=lambda node: node["attributes"]["node_id"])
+
+    creator.release_tree_sitter_nodes()
+
+    after = sorted(creator.graph.get_nodes_as_objects(), key=lambda node: node["attributes"]["node_id"])
+    assert after == before
+    for node in creator.graph.get_nodes_by_label(NodeLabels.FUNCTION.value):
+        assert not node.has_tree_sitter_node()
+        assert node.body_node is None
@@ -0,0 +1,102 @@
+"""Test the interval index used by DefinitionNode.reference_search."""
+
+from typing import List, Optional
+
+from blarify.code_references.types import Point, Range, Reference
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import DefinitionNode, FileNode, NodeFactory
+
+PATH = "file:///repo/module.py"
+GRAPH_ENVIRONMENT = GraphEnvironment("test", "0", "/repo")
+
+
+def _reference(start_line: int, end_line: int) -> Reference:
+    return Reference(range=Range(Point(start_line, 0), Point(end_line, 0)), uri=PATH)
+
+
+def _create_file_node() -> FileNode:
+    return NodeFactory.create_file_node(
+        path=PATH,
+        name="module.py",
+        level=1,
+        node_range=_reference(0, 10_000),
+        definition_range=_reference(0, 10_000),
+        code_text="",
+        parent=None,
+        graph_environment=GRAPH_ENVIRONMENT,
+    )
+
+
+def _add_definition(parent: DefinitionNode, name: str, start_line: int, end_line: int, is_class: bool = False):
+    create = NodeFactory.create_class_node if is_class else NodeFactory.create_function_node
+    name_argument = {"class_name": name} if is_class else {"function_name": name}
+    node = create(
+        **name_argument,
+        path=PATH,
+        definition_range=_reference(start_line, start_line),
+        node_range=_reference(start_line, end_line),
+        code_text="",
+        body_node=None,
+        level=parent.level + 1,
+        tree_sitter_node=None,
+        parent=parent,
+        graph_environment=GRAPH_ENVIRONMENT,
+    )
+    parent.relate_node_as_define_relationship(node)
+    return node
+
+
+def _linear_reference_search(node: DefinitionNode, start_line: int, end_line: int) -> DefinitionNode:
+    for child in node._defines:
+        child_start, child_end = child.get_start_and_end_line()
+        if child_start <= start_line and child_end >= end_line:
+            return _linear_reference_search(child, start_line, end_line)
+        if end_line < child_start:
+            break
+    return node
+
+
+def _create_large_file_node() -> FileNode:
+    file_node = _create_file_node()
+    line = 0
+    for class_index in range(50):
+        class_node = _add_definition(file_node, f"Class{class_index}", line, line + 60, is_class=True)
+        for method_index in range(10):
+            method_start = line + 1 + method_index * 6
+            _add_definition(class_node, f"method{method_index}", method_start, method_start + 4)
+        line += 61
+    for function_index in range(1000):
+        _add_definition(file_node, f"function{function_index}", line, line + 3)
+        line += 5
+    return file_node
+
+
+def test_reference_search_matches_linear_scan():
+    """Test indexed lookups return the same node as scanning every definition."""
+    file_node = _create_large_file_node()
+
+    for start_line in range(0, 8_100, 7):
+        for end_line in (start_line, start_line + 2):
+            expected = _linear_reference_search(file_node, start_line, end_line)
+            assert file_node.reference_search(_reference(start_line, end_line)) is expected
+
+
+def test_reference_search_batch_matches_single_lookups():
+    """Test a batched lookup resolves each reference like a single lookup."""
+    file_node = _create_large_file_node()
+    references = [_reference(line, line) for line in range(0, 8_100, 3)]
+
+    found_nodes: List[Optional[DefinitionNode]] = file_node.reference_search_batch(references)
+
+    assert found_nodes == [file_node.reference_search(reference) for reference in references]
+
+
+def test_reference_search_sees_definitions_added_after_first_lookup():
+    """Test the index is rebuilt when new definitions are related."""
+    file_node = _create_file_node()
+    _add_definition(file_node, "first", 0, 5)
+    assert file_node.reference_search(_reference(10, 10)) is file_node
+
+    second = _add_definition(file_node, "second", 8, 12)
+
+    assert file_node.reference_search(_reference(10, 10)) is second
@@ -0,0 +1,84 @@
+"""Test filtering a graph and a diff down to the updated paths."""
+
+from unittest.mock import MagicMock
+
+from blarify.code_references.types import Point, Range, Reference
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import FileNode, NodeFactory
+from blarify.project_graph_diff_creator import ChangeType, FileDiff, ProjectGraphDiffCreator
+
+ROOT = "/repo"
+GRAPH_ENVIRONMENT = GraphEnvironment("test", "0", ROOT)
+
+
+def _reference(path: str, line: int = 0) -> Reference:
+    return Reference(range=Range(Point(line, 0), Point(line + 10, 0)), uri=path)
+
+
+def _add_file_with_function(graph: Graph, path: str) -> FileNode:
+    file_node = NodeFactory.create_file_node(
+        path=path,
+        name=path.rsplit("/", 1)[-1],
+        level=1,
+        node_range=_reference(path),
+        definition_range=_reference(path),
+        code_text="",
+        parent=None,
+        graph_environment=GRAPH_ENVIRONMENT,
+    )
+    function_node = NodeFactory.create_function_node(
+        function_name="run",
+        path=path,
+        definition_range=_reference(path, 1),
+        node_range=_reference(path, 1),
+        code_text="",
+        body_node=None,
+        level=2,
+        tree_sitter_node=None,
+        parent=file_node,
+        graph_environment=GRAPH_ENVIRONMENT,
+    )
+    file_node.relate_node_as_define_relationship(function_node)
+    graph.add_node(file_node)
+    graph.add_node(function_node)
+    return file_node
+
+
+def _create_graph(file_count: int) -> Graph:
+    graph = Graph()
+    for index in range(file_count):
+        _add_file_with_function(graph, f"file://{ROOT}/package_{index % 3}/module_{index}.py")
+    return graph
+
+
+def test_filtered_graph_by_paths_accepts_lists_and_sets():
+    """Test filtering with a list keeps the same nodes, in the same order, as filtering with a set."""
+    paths = [f"file://{ROOT}/package_0/module_0.py", f"file://{ROOT}/package_1/module_4.py"]
+
+    from_list = _create_graph(9).filtered_graph_by_paths(paths)
+    from_set = _create_graph(9).filtered_graph_by_paths(set(paths))
+
+    list_ids = [node["attributes"]["node_id"] for node in from_list.get_nodes_as_objects()]
+    set_ids = [node["attributes"]["node_id"] for node in from_set.get_nodes_as_objects()]
+    assert list_ids == set_ids
+    assert len(list_ids) == 4
+    assert {node["attributes"]["path"] for node in from_list.get_nodes_as_objects()} == set(paths)
+
+
+def test_parent_paths_of_many_files_match_parent_paths_of_each_file():
+    """Test the shared ancestors of many updated files are collected once, without missing any."""
+    paths = [f"file://{ROOT}/package_{index % 3}/nested/module_{index}.py" for index in range(30)]
+    diff_creator = ProjectGraphDiffCreator(
+        root_path=ROOT,
+        reference_query_helper=MagicMock(),
+        project_files_iterator=MagicMock(),
+        file_diffs=[FileDiff(path=path, diff_text="", change_type=ChangeType.MODIFIED) for path in paths],
+        graph_environment=GRAPH_ENVIRONMENT,
+    )
+
+    expected = {parent for path in paths for parent in diff_creator.get_parent_paths_from_path(path)}
+
+    assert diff_creator.get_parent_paths_from_paths(paths) == expected
+    assert f"file://{ROOT}/package_2/nested" in expected
+    assert diff_creator.get_file_diff_for_path(paths[7]).path == paths[7]
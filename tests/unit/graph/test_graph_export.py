@@ -0,0 +1,99 @@
+"""Tests for the chunked graph export used when saving to a database."""
+
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from blarify.graph.external_relationship_store import ExternalRelationshipStore
+from blarify.graph.graph import Graph
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.graph_update import GraphUpdate
+from blarify.graph.node import Node
+from blarify.graph.relationship import RelationshipType
+from blarify.project_file_explorer import ProjectFilesIterator
+from blarify.project_graph_creator import ProjectGraphCreator
+from blarify.repositories.graph_db_manager.db_manager import AbstractDbManager
+from blarify.utils.chunked import chunked
+
+CODE_EXAMPLES = str(Path(__file__).resolve().parents[2] / "code_examples")
+
+
+@pytest.fixture(scope="module")
+def graph() -> Graph:
+    creator = ProjectGraphCreator(
+        root_path=CODE_EXAMPLES,
+        reference_query_helper=MagicMock(),
+        project_files_iterator=ProjectFilesIterator(root_path=CODE_EXAMPLES, names_to_skip=["__pycache__"]),
+        graph_environment=GraphEnvironment("test", "0", CODE_EXAMPLES),
+    )
+    return creator.build_hierarchy_only()
+
+
+class RecordingDbManager(AbstractDbManager):
+    def __init__(self) -> None:
+        self.calls: List[tuple[str, List[Any]]] = []
+
+    def create_nodes(self, nodeList: List[Any]) -> None:
+        self.calls.append(("nodes", nodeList))
+
+    def create_edges(self, edgesList: List[Any]) -> None:
+        self.calls.append(("edges", edgesList))
+
+
+def test_chunked_yields_bounded_chunks():
+    """Test chunked splits an iterable into lists of at most chunk_size items."""
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+    with pytest.raises(ValueError):
+        list(chunked(range(3), 0))
+
+
+def test_chunks_match_full_export(graph: Graph):
+    """Test concatenated chunks equal the list based export, in the same order."""
+    node_chunks = list(graph.iter_node_object_chunks(chunk_size=7))
+    relationship_chunks = list(graph.iter_relationship_object_chunks(chunk_size=7))
+
+    assert all(len(chunk) <= 7 for chunk in node_chunks + relationship_chunks)
+    assert [node for chunk in node_chunks for node in chunk] == graph.get_nodes_as_objects()
+    assert [rel for chunk in relationship_chunks for rel in chunk] == graph.get_relationships_as_objects()
+    assert graph.get_node_count() == len(graph.get_nodes_as_objects())
+    assert graph.get_relationship_count() == len(graph.get_relationships_as_objects())
+
+
+def test_node_chunks_are_produced_lazily(graph: Graph):
+    """Test taking the first chunk only serializes the nodes in that chunk."""
+    with patch.object(Node, "as_object", autospec=True, side_effect=lambda node: {"id": node.id}) as as_object:
+        first_chunk = next(graph.iter_node_object_chunks(chunk_size=5))
+
+    assert len(first_chunk) == 5
+    assert as_object.call_count == 5
+
+
+def test_graph_update_chunks_include_external_relationships(graph: Graph):
+    """Test GraphUpdate streams graph relationships followed by external ones."""
+    store = ExternalRelationshipStore()
+    store.create_and_add_relationship("start", "end", RelationshipType.MODIFIED)
+    graph_update = GraphUpdate(graph=graph, external_relationship_store=store)
+
+    relationships = [rel for chunk in graph_update.iter_relationship_object_chunks(chunk_size=4) for rel in chunk]
+
+    assert relationships == graph_update.get_relationships_as_objects()
+    assert relationships[-1]["sourceId"] == "start"
+    assert graph_update.get_relationship_count() == len(relationships)
+
+
+def test_save_graph_chunks_writes_every_node_before_edges(graph: Graph):
+    """Test the default save_graph_chunks consumes node chunks before any edge chunk."""
+    db_manager = RecordingDbManager()
+
+    db_manager.save_graph_chunks(
+        graph.iter_node_object_chunks(chunk_size=10), graph.iter_relationship_object_chunks(chunk_size=10)
+    )
+
+    kinds = [kind for kind, _ in db_manager.calls]
+    assert kinds == sorted(kinds, key=lambda kind: kind != "nodes")
+    assert sum(len(chunk) for kind, chunk in db_manager.calls if kind == "nodes") == graph.get_node_count()
+    assert sum(len(chunk) for kind, chunk in db_manager.calls if kind == "edges") == graph.get_relationship_count()
@@ -0,0 +1,50 @@
+"""Tests for the memoized node identifiers and their invalidation."""
+
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node import FolderNode
+
+
+def _folder(name: str, parent: FolderNode | None = None) -> FolderNode:
+    path = f"file:///repo/{name}" if parent is None else f"{parent.path}/{name}"
+    return FolderNode(
+        path=path,
+        name=name,
+        level=0 if parent is None else parent.level + 1,
+        parent=parent,
+        graph_environment=GraphEnvironment("main", "0", "/repo"),
+    )
+
+
+def test_ids_are_computed_once():
+    """Test id, hashed_id and relative_id are memoized."""
+    folder = _folder("src")
+
+    assert folder.id is folder.id
+    assert folder.hashed_id is folder.hashed_id
+    assert folder.relative_id is folder.relative_id
+
+
+def test_updating_graph_environment_invalidates_ids():
+    """Test the memoized ids follow graph environment changes."""
+    folder = _folder("src")
+    hashed_id = folder.hashed_id
+
+    folder.update_graph_environment(GraphEnvironment("pr", "1", "/repo"))
+
+    assert folder.id.startswith("/pr/1")
+    assert folder.hashed_id != hashed_id
+
+
+def test_reassigning_parent_invalidates_descendants():
+    """Test moving a folder updates the ids of the nodes below it."""
+    root = _folder("src")
+    other_root = _folder("lib")
+    package = _folder("package", parent=root)
+    module = _folder("module", parent=package)
+    package.relate_node_as_contain_relationship(module)
+    assert module.id.endswith("/src/package/module")
+
+    package.parent = other_root
+
+    assert package.id.endswith("/lib/package")
+    assert module.id.endswith("/lib/package/module")
@@ -0,0 +1,93 @@
+"""Tests for the batched edge creation of FalkorDBManager."""
+
+from typing import Any, Dict
+from unittest.mock import patch
+
+from blarify.repositories.graph_db_manager.falkordb_manager import FalkorDBManager
+from tests.utils.fake_falkordb import FakeFalkorDB
+
+
+def _edge(rel_type: str, index: int, **properties: Any) -> Dict[str, Any]:
+    return {"sourceId": f"source_{index}", "targetId": f"target_{index}", "type": rel_type, "scopeText": "", **properties}
+
+
+def _create_manager(db: FakeFalkorDB, **kwargs: Any) -> FalkorDBManager:
+    with patch("blarify.repositories.graph_db_manager.falkordb_manager.FalkorDB", return_value=db):
+        return FalkorDBManager(repo_id="repo", entity_id="entity", uri="localhost", **kwargs)
+
+
+def test_edges_are_sent_in_one_batch_per_type():
+    """Test each relationship type becomes an UNWIND query whose parameters carry only the edge properties."""
+    db = FakeFalkorDB()
+    manager = _create_manager(db)
+
+    manager.create_edges(
+        [_edge("CALLS", 0, startLine=3, referenceCharacter=7), _edge("CONTAINS", 1), _edge("CALLS", 2)]
+    )
+
+    queries = db.select_graph("repo").queries
+    assert len(queries) == 2
+    calls_query, calls_params = next((query, params) for query, params in queries if "[r:`CALLS`]" in query)
+    assert "UNWIND $edges AS edge" in calls_query
+    assert [edge["sourceId"] for edge in calls_params["edges"]] == ["source_0", "source_2"]
+    assert calls_params["edges"][0] == {
+        "sourceId": "source_0",
+        "targetId": "target_0",
+        "scopeText": "",
+        "startLine": 3,
+        "referenceCharacter": 7,
+    }
+
+
+def test_edges_of_a_type_are_split_by_edge_batch_size():
+    """Test a type with more edges than edge_batch_size is sent as several queries."""
+    db = FakeFalkorDB()
+    manager = _create_manager(db, edge_batch_size=10)
+
+    manager.create_edges([_edge("CALLS", index) for index in range(95)])
+
+    batch_sizes = sorted(len(params["edges"]) for _, params in db.select_graph("repo").queries)
+    assert batch_sizes == [5] + [10] * 9
+
+
+def test_batches_are_kept_in_flight_up_to_the_pipeline_depth():
+    """Test the next batches are sent while earlier ones are still running, never more than pipeline_depth."""
+    db = FakeFalkorDB(latency=0.05)
+    manager = _create_manager(db, edge_batch_size=10, pipeline_depth=3)
+
+    manager.create_edges([_edge("CALLS", index) for index in range(100)])
+
+    graph = db.select_graph("repo")
+    assert len(graph.queries) == 10
+    assert graph.max_in_flight == 3
+
+
+def test_pipeline_depth_of_one_sends_batches_in_order():
+    """Test a depth of 1 sends the batches one after another, in the order they were grouped."""
+    db = FakeFalkorDB()
+    manager = _create_manager(db, edge_batch_size=2, pipeline_depth=1)
+
+    manager.create_edges([_edge("CALLS", index) for index in range(5)])
+
+    graph = db.select_graph("repo")
+    assert graph.max_in_flight == 1
+    assert [edge["sourceId"] for _, params in graph.queries for edge in params["edges"]] == [
+        f"source_{index}" for index in range(5)
+    ]
+
+
+def test_no_queries_without_edges():
+    """Test creating an empty edge list does not talk to the database."""
+    db = FakeFalkorDB()
+
+    _create_manager(db).create_edges([])
+
+    assert db.select_graph("repo").queries == []
+
+
+def test_edge_export_chunks_match_the_edge_batches():
+    """Test edges are exported in chunks of one batch, while nodes keep the graph's default chunks."""
+    manager = _create_manager(FakeFalkorDB(), edge_batch_size=250)
+
+    assert manager.edge_export_chunk_size == 250
+    assert manager.node_export_chunk_size is None
@@ -0,0 +1,180 @@
+"""Tests for the chunked, concurrent node and edge writes of Neo4jManager."""
+
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from blarify.repositories.graph_db_manager.neo4j_manager import Neo4jManager
+
+
+def _node(label: str, index: int, extra_labels: List[str] | None = None) -> Dict[str, Any]:
+    return {
+        "type": label,
+        "extra_labels": extra_labels or [],
+        "attributes": {"hashed_id": f"{label}_{index}", "diff_identifier": "0", "node_id": f"{label}_{index}"},
+    }
+
+
+@pytest.fixture
+def db_manager() -> Neo4jManager:
+    # The lookup index is set up through query, which the write tests don't count as sessions
+    with patch("blarify.repositories.graph_db_manager.neo4j_manager.GraphDatabase"), patch.object(
+        Neo4jManager, "query", return_value=[]
+    ):
+        return Neo4jManager(
+            repo_id="repo",
+            entity_id="entity",
+            uri="bolt://localhost:7687",
+            user="neo4j",
+            password="password",
+            node_write_workers=3,
+            node_write_chunk_size=2,
+            edge_write_workers=2,
+            edge_write_chunk_size=2,
+        )
+
+
+def test_nodes_are_grouped_by_label_set():
+    """Test nodes with the same labels share a group and NODE is always included."""
+    nodes = [_node("FUNCTION", 0), _node("CLASS", 1), _node("FUNCTION", 2), _node("FUNCTION", 3, ["DIFF"])]
+
+    groups = Neo4jManager._group_nodes_by_labels(nodes)
+
+    assert groups[("FUNCTION", "NODE")] == [nodes[0], nodes[2]]
+    assert groups[("CLASS", "NODE")] == [nodes[1]]
+    assert groups[("DIFF", "FUNCTION", "NODE")] == [nodes[3]]
+
+
+def test_create_nodes_writes_fixed_size_chunks(db_manager: Neo4jManager):
+    """Test every chunk is written in its own session with at most node_write_chunk_size nodes."""
+    nodes = [_node("FUNCTION", index) for index in range(5)] + [_node("CLASS", 5)]
+    session = db_manager.driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda txn, labels, batch, **kwargs: len(batch)
+
+    db_manager.create_nodes(nodes)
+
+    written = [call.args[2] for call in session.execute_write.call_args_list]
+    assert sorted(len(batch) for batch in written) == [1, 1, 2, 2]
+    assert sorted(node["attributes"]["node_id"] for batch in written for node in batch) == sorted(
+        node["attributes"]["node_id"] for node in nodes
+    )
+    assert db_manager.driver.session.call_count == 4
+
+
+def test_merge_query_inlines_static_labels():
+    """Test the MERGE uses static labels and the node_id of the lookup index so the planner can use indexes."""
+    tx = MagicMock()
+    tx.run.return_value.single.return_value = {"count": 1}
+
+    count = Neo4jManager._merge_nodes_txn(
+        tx, ("FUNCTION", "NODE"), [_node("FUNCTION", 0)], repoId="repo", entityId="entity", environment="main"
+    )
+
+    query = tx.run.call_args.args[0]
+    assert count == 1
+    assert "UNWIND $nodes AS node" in query
+    assert "MERGE (n:`FUNCTION`:`NODE` {" in query
+    assert "node_id: node.attributes.node_id" in query and "hashed_id" not in query
+    assert "apoc" not in query
+
+
+def test_create_nodes_requires_repo_id():
+    """Test creating nodes without a repo scope is rejected."""
+    with patch("blarify.repositories.graph_db_manager.neo4j_manager.GraphDatabase"):
+        db_manager = Neo4jManager(entity_id="entity", uri="bolt://localhost", user="neo4j", password="password")
+
+    with pytest.raises(ValueError):
+        db_manager.create_nodes([_node("FUNCTION", 0)])
+
+
+def _edge(rel_type: str, index: int, **properties: Any) -> Dict[str, Any]:
+    return {"sourceId": f"source_{index}", "targetId": f"target_{index}", "type": rel_type, "scopeText": "", **properties}
+
+
+def test_edges_are_grouped_by_type_and_property_keys():
+    """Test edges only share a batch when their type and property keys match."""
+    edges = [_edge("CALLS", 0, startLine=1), _edge("CALLS", 1, startLine=2), _edge("CALLS", 2), _edge("CONTAINS", 3)]
+
+    groups = Neo4jManager._group_edges_by_type(edges)
+
+    assert groups[("CALLS", ("scopeText", "startLine"))] == edges[:2]
+    assert groups[("CALLS", ("scopeText",))] == [edges[2]]
+    assert groups[("CONTAINS", ("scopeText",))] == [edges[3]]
+
+
+def _create_manager(**kwargs: Any) -> Neo4jManager:
+    with patch("blarify.repositories.graph_db_manager.neo4j_manager.GraphDatabase"):
+        return Neo4jManager(
+            repo_id="repo", entity_id="entity", uri="bolt://localhost", user="neo4j", password="password", **kwargs
+        )
+
+
+def test_lookup_index_is_created_and_awaited_at_setup():
+    """Test the manager creates the lookup index and waits for it to be online before any write."""
+    with patch.object(Neo4jManager, "query", return_value=[]) as query:
+        db_manager = _create_manager(index_online_timeout=60)
+        session = db_manager.driver.session.return_value.__enter__.return_value
+        session.execute_write.side_effect = lambda txn, rel_type, keys, batch, **kwargs: len(batch)
+        db_manager.create_edges([_edge("CALLS", index) for index in range(3)])
+
+    queries = [call.args for call in query.call_args_list]
+    assert len(queries) == 2
+    assert "CREATE INDEX node_lookup_NODE IF NOT EXISTS" in queries[0][0]
+    assert queries[1] == ("CALL db.awaitIndex($index_name, $timeout)", {"index_name": "node_lookup_NODE", "timeout": 60})
+    assert [len(call.args[3]) for call in session.execute_write.call_args_list] == [3]
+
+
+def test_nodes_are_only_written_once_the_lookup_index_is_online():
+    """Test a manager that couldn't set up the index awaits it before its first node batch."""
+    with patch.object(Neo4jManager, "query", side_effect=RuntimeError("unavailable")):
+        db_manager = _create_manager()
+    session = db_manager.driver.session.return_value.__enter__.return_value
+    calls: List[str] = []
+    session.execute_write.side_effect = lambda txn, labels, batch, **kwargs: calls.append("write") or len(batch)
+
+    with patch.object(db_manager, "query", side_effect=lambda *args: calls.append("index") or []):
+        db_manager.create_nodes([_node("FUNCTION", 0)])
+        db_manager.create_nodes([_node("CLASS", 1)])
+
+    assert calls == ["index", "index", "write", "write"]
+
+
+def test_lookup_index_failing_at_setup_is_retried_before_writing():
+    """Test a manager that couldn't set up the index awaits it before its first edges only."""
+    with patch.object(Neo4jManager, "query", side_effect=RuntimeError("unavailable")):
+        db_manager = _create_manager(edge_write_chunk_size=2)
+    session = db_manager.driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda txn, rel_type, keys, batch, **kwargs: len(batch)
+
+    with patch.object(db_manager, "query", return_value=[]) as query:
+        db_manager.create_edges([_edge("CALLS", index) for index in range(3)])
+        db_manager.create_edges([_edge("CONTAINS", 3)])
+
+    assert query.call_count == 2
+    assert sorted(len(call.args[3]) for call in session.execute_write.call_args_list) == [1, 1, 2]
+
+
+def test_merge_edges_query_uses_static_type():
+    """Test edges MERGE on a static relationship type with a literal property map."""
+    tx = MagicMock()
+    tx.run.return_value.single.return_value = {"count": 1}
+
+    Neo4jManager._merge_edges_txn(
+        tx, "CALLS", ("scopeText", "startLine"), [_edge("CALLS", 0, startLine=1)], "entity", "repo", "main"
+    )
+
+    query = tx.run.call_args.args[0]
+    assert "UNWIND $edges AS edge" in query
+    assert "MERGE (source)-[r:`CALLS` {`scopeText`: edge.`scopeText`, `startLine`: edge.`startLine`}]->(target)" in query
+    assert "apoc" not in query
+
+
+def test_export_chunks_fill_every_write_session():
+    """Test an export chunk is sized so all writer sessions get a full batch from it."""
+    db_manager = _create_manager(
+        node_write_workers=3, node_write_chunk_size=500, edge_write_workers=2, edge_write_chunk_size=4000
+    )
+
+    assert db_manager.node_export_chunk_size == 1500
+    assert db_manager.edge_export_chunk_size == 8000
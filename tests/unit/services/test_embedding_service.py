@@ -0,0 +1,90 @@
+"""Tests for the concurrent embedding pipeline and its on-disk vector cache."""
+
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from blarify.graph.graph_environment import GraphEnvironment
+from blarify.graph.node.documentation_node import DocumentationNode
+from blarify.services.embedding_cache import EmbeddingCache
+from blarify.services.embedding_service import EmbeddingService
+from blarify.services.fake_embedding_client import FakeEmbeddingClient
+
+
+def _documentation(contents: List[str]) -> List[DocumentationNode]:
+    return [
+        DocumentationNode(
+            content=content,
+            info_type="leaf_analysis",
+            source_type="code",
+            source_path=f"file:///repo/{index}.py",
+            source_name=str(index),
+            source_id=str(index),
+            source_labels=["FILE"],
+            graph_environment=GraphEnvironment("test", "0", "/repo"),
+        )
+        for index, content in enumerate(contents)
+    ]
+
+
+def test_batches_are_packed_by_tokens_and_sent_concurrently():
+    """Test batches respect the token budget and run in parallel instead of one after the other."""
+    client = FakeEmbeddingClient(dimensions=8, latency_seconds=0.2, seconds_per_text=0.0)
+    service = EmbeddingService(batch_size=10, max_concurrency=4, max_batch_tokens=100, client=client)
+    texts = ["x" * 160 for _ in range(8)]  # 40 estimated tokens each, two per batch
+
+    start = time.time()
+    embeddings = service.embed_batch(texts)
+
+    assert service._pack_batches(texts) == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    assert client.requests == 4
+    assert time.time() - start < 0.6
+    assert embeddings[0] == embeddings[1] == client.embed_query("x" * 160)
+
+
+def test_backoff_of_a_failing_batch_does_not_hold_up_the_others():
+    """Test a retried batch releases its slot while waiting and still succeeds."""
+
+    class FlakyClient(FakeEmbeddingClient):
+        def __init__(self):
+            super().__init__(dimensions=4, latency_seconds=0.0, seconds_per_text=0.0)
+            self.failed = threading.Event()
+            self.completed: List[str] = []
+
+        def embed_documents(self, texts: List[str]) -> List[List[float]]:
+            if texts[0] == "flaky" and not self.failed.is_set():
+                self.failed.set()
+                raise RuntimeError("rate limited")
+            self.completed.extend(texts)
+            return super().embed_documents(texts)
+
+    client = FlakyClient()
+    service = EmbeddingService(batch_size=1, max_concurrency=1, client=client)
+
+    embeddings = service.embed_batch(["flaky", "a", "b"])
+
+    assert all(embedding is not None for embedding in embeddings)
+    assert client.completed == ["a", "b", "flaky"]
+
+
+def test_vectors_are_reused_across_runs_from_disk(tmp_path: Path):
+    """Test a second service only embeds the documentation whose content changed."""
+    cache = EmbeddingCache(cache_dir=str(tmp_path))
+    first_client = FakeEmbeddingClient(dimensions=8)
+    first = EmbeddingService(cache=cache, client=first_client).embed_documentation_nodes(
+        _documentation(["alpha", "beta"])
+    )
+    cache.close()
+
+    cache = EmbeddingCache(cache_dir=str(tmp_path))
+    client = FakeEmbeddingClient(dimensions=8)
+    second = EmbeddingService(cache=cache, client=client).embed_documentation_nodes(
+        _documentation(["alpha", "gamma"])
+    )
+
+    assert client.texts_embedded == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    first_alpha, second_alpha = list(first.values())[0], list(second.values())[0]
+    assert all(abs(a - b) < 1e-6 for a, b in zip(first_alpha, second_alpha))
+    cache.close()
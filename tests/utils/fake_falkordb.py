@@ -0,0 +1,44 @@
+"""In-process stand-in for the FalkorDB client, recording the queries FalkorDBManager sends."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeQueryResult:
+    def __init__(self):
+        self.header: List[Any] = []
+        self.result_set: List[List[Any]] = []
+
+
+class FakeFalkorDBGraph:
+    """Records every query and its parameters, no Cypher is executed."""
+
+    def __init__(self, name: str, latency: float = 0.0):
+        self.name = name
+        self.latency = latency
+        self.queries: List[Tuple[str, Dict[str, Any]]] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def query(self, q: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[int] = None) -> FakeQueryResult:
+        with self._lock:
+            self.queries.append((q, params or {}))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self._in_flight -= 1
+        return FakeQueryResult()
+
+
+class FakeFalkorDB:
+    """Drop-in for falkordb.FalkorDB whose graphs record the queries sent to them."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.graphs: Dict[str, FakeFalkorDBGraph] = {}
+
+    def select_graph(self, graph_id: str) -> FakeFalkorDBGraph:
+        return self.graphs.setdefault(graph_id, FakeFalkorDBGraph(graph_id, self.latency))
@@ -5,8 +5,11 @@ This module provides reusable fixtures for testing, including
 Docker availability checks and other common test utilities.
 """
 
+import time
+
 import pytest
-from typing import TYPE_CHECKING
+import redis
+from typing import TYPE_CHECKING, Generator, Tuple
 
 if TYPE_CHECKING:
     import docker
@@ -31,3 +34,31 @@ def docker_check() -> "docker.DockerClient":
         return client
     except Exception as e:
         pytest.skip(f"Docker not accessible: {e}")
+
+
+FALKORDB_IMAGE = "falkordb/falkordb:latest"
+
+
+@pytest.fixture(scope="module")
+def falkordb_container(docker_check: "docker.DockerClient") -> Generator[Tuple[str, int], None, None]:
+    """Start a throwaway FalkorDB container for the module, yields the host and port it listens on."""
+    container = docker_check.containers.run(FALKORDB_IMAGE, detach=True, remove=True, ports={"6379/tcp": None})
+    try:
+        deadline = time.time() + 30
+        while True:
+            container.reload()
+            bindings = container.ports.get("6379/tcp")
+            if bindings:
+                port = int(bindings[0]["HostPort"])
+                try:
+                    if redis.Redis(host="localhost", port=port).ping():
+                        break
+                except redis.ConnectionError:
+                    pass
+            if time.time() > deadline:
+                pytest.fail("FalkorDB container did not accept connections within 30 seconds")
+            time.sleep(0.5)
+
+        yield "localhost", port
+    finally:
+        container.stop()